@@ -0,0 +1,334 @@
+# ============================================
+# ARCHIVOS - LECTURA Y ESCRITURA DE RESEÑAS POR BLOQUES
+# ============================================
+#
+# Lectura en streaming de archivos CSV, JSONL y Parquet de reseñas, y
+# escritura de los resultados en cualquiera de esos formatos. Ningún archivo
+# se carga entero en memoria: se procesan por bloques de filas. Parquet es
+# opcional y requiere pyarrow (no está en requirements.txt).
+
+import csv
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+# Extensión -> formato
+FORMATOS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+}
+
+# Columnas en las que se busca el texto si no se indica una
+COLUMNAS_TEXTO = ("text", "texto", "review", "reseña", "resena", "comentario")
+
+# Columnas de los resultados
+COLUMNAS_RESULTADO = ("fila", "id", "prevision", "probabilidad", "confianza", "idioma_detectado", "error")
+
+# Reseñas largas en un solo campo CSV
+csv.field_size_limit(16 * 1024 * 1024)
+
+# Filas por lote leído de un archivo Parquet
+LOTE_PARQUET = 8192
+
+
+class Registro(NamedTuple):
+    """Fila de entrada: número de fila (desde 1), id opcional y texto"""
+    fila: int
+    id: Any
+    texto: Any
+
+
+def detectar_formato(nombre: str) -> str:
+    """
+    Formato de un archivo por su extensión.
+
+    Raises:
+        ValueError: Si la extensión no es de un formato soportado
+    """
+    extension = Path(nombre).suffix.lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Formato no soportado: '{extension}' (use {', '.join(sorted(FORMATOS))})")
+    return FORMATOS[extension]
+
+
+def _importar_pyarrow():
+    """
+    Importa pyarrow (solo para Parquet).
+
+    Raises:
+        ValueError: Si pyarrow no está instalado
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("El formato Parquet requiere pyarrow (pip install pyarrow)")
+    return pyarrow, pyarrow.parquet
+
+
+def _elegir_columna(columnas: Sequence[str], columna: Optional[str]) -> str:
+    """Columna de texto indicada o la primera de COLUMNAS_TEXTO presente."""
+    if columna is not None:
+        if columna not in columnas:
+            raise ValueError(f"La columna '{columna}' no existe (columnas: {', '.join(columnas)})")
+        return columna
+    for candidata in COLUMNAS_TEXTO:
+        if candidata in columnas:
+            return candidata
+    raise ValueError(f"No se encontró una columna de texto ({', '.join(COLUMNAS_TEXTO)}); indique 'columna'")
+
+
+# ============================================
+# LECTURA
+# ============================================
+
+class LectorArchivo:
+    """
+    Lee un CSV, JSONL o Parquet fila a fila y lo entrega por bloques.
+
+    En JSONL cada línea es un objeto (texto en 'columna') o un string JSON.
+    Una línea que no es JSON válido se entrega con texto None, para que se
+    cuente como error sin detener la lectura.
+    """
+
+    def __init__(
+        self,
+        ruta: Union[str, Path],
+        formato: Optional[str] = None,
+        columna: Optional[str] = None,
+        columna_id: Optional[str] = None
+    ):
+        """
+        Args:
+            ruta: Archivo de entrada
+            formato: 'csv', 'jsonl' o 'parquet' (default: según la extensión)
+            columna: Columna o campo del texto (default: ver COLUMNAS_TEXTO)
+            columna_id: Columna o campo que se copia como 'id' en los resultados
+        """
+        self.ruta = Path(ruta)
+        self.formato = formato or detectar_formato(self.ruta.name)
+        if self.formato not in FORMATOS.values():
+            raise ValueError(f"Formato no soportado: {self.formato}")
+        self.columna = columna
+        self.columna_id = columna_id
+        self.tamano = os.path.getsize(self.ruta)
+
+        self._binario = open(self.ruta, "rb")
+
+        if self.formato == "parquet":
+            _, parquet = _importar_pyarrow()
+            self._parquet = parquet.ParquetFile(self._binario)
+            nombres = self._parquet.schema_arrow.names
+            self.columna = _elegir_columna(nombres, columna)
+            if columna_id is not None and columna_id not in nombres:
+                raise ValueError(f"La columna '{columna_id}' no existe")
+            self._filas_total = self._parquet.metadata.num_rows
+            self._filas_leidas = 0
+            return
+
+        self._texto = io.TextIOWrapper(self._binario, encoding="utf-8-sig", newline="")
+
+        if self.formato == "csv":
+            self._lector = csv.reader(self._texto)
+            cabecera = next(self._lector, None)
+            if cabecera is None:
+                raise ValueError("El CSV está vacío")
+            self.columna = _elegir_columna(cabecera, columna)
+            self._indice = cabecera.index(self.columna)
+            self._indice_id = None
+            if columna_id is not None:
+                if columna_id not in cabecera:
+                    raise ValueError(f"La columna '{columna_id}' no existe")
+                self._indice_id = cabecera.index(columna_id)
+
+    def __enter__(self) -> "LectorArchivo":
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    def cerrar(self):
+        self._binario.close()
+
+    @property
+    def fraccion_leida(self) -> float:
+        """Fracción del archivo ya leída (para el progreso)."""
+        if self.formato == "parquet":
+            return self._filas_leidas / self._filas_total if self._filas_total else 1.0
+        return min(self._binario.tell() / self.tamano, 1.0) if self.tamano else 1.0
+
+    def _registros_csv(self) -> Iterator[Registro]:
+        for fila, valores in enumerate(self._lector, start=1):
+            if not valores:
+                continue
+            texto = valores[self._indice] if self._indice < len(valores) else None
+            id_ = None
+            if self._indice_id is not None and self._indice_id < len(valores):
+                id_ = valores[self._indice_id]
+            yield Registro(fila, id_, texto)
+
+    def _registros_jsonl(self) -> Iterator[Registro]:
+        columna = None
+        for fila, linea in enumerate(self._texto, start=1):
+            if not linea.strip():
+                continue
+            try:
+                valor = json.loads(linea)
+            except json.JSONDecodeError:
+                yield Registro(fila, None, None)
+                continue
+            if isinstance(valor, str):
+                yield Registro(fila, None, valor)
+            elif isinstance(valor, dict):
+                if columna is None:
+                    # La columna se decide con el primer objeto
+                    columna = _elegir_columna(list(valor), self.columna)
+                    self.columna = columna
+                id_ = valor.get(self.columna_id) if self.columna_id is not None else None
+                yield Registro(fila, id_, valor.get(columna))
+            else:
+                yield Registro(fila, None, None)
+
+    def _registros_parquet(self) -> Iterator[Registro]:
+        columnas = [self.columna] + ([self.columna_id] if self.columna_id not in (None, self.columna) else [])
+        fila = 0
+        for lote in self._parquet.iter_batches(batch_size=LOTE_PARQUET, columns=columnas):
+            textos = lote.column(self.columna).to_pylist()
+            ids = lote.column(self.columna_id).to_pylist() if self.columna_id is not None else [None] * len(textos)
+            self._filas_leidas += len(textos)
+            for texto, id_ in zip(textos, ids):
+                fila += 1
+                yield Registro(fila, id_, texto)
+
+    def __iter__(self) -> Iterator[Registro]:
+        if self.formato == "csv":
+            return self._registros_csv()
+        if self.formato == "parquet":
+            return self._registros_parquet()
+        return self._registros_jsonl()
+
+    def bloques(self, tamano: int) -> Iterator[List[Registro]]:
+        """
+        Registros en listas de hasta 'tamano' elementos.
+
+        Args:
+            tamano: Filas por bloque
+        """
+        bloque: List[Registro] = []
+        for registro in self:
+            bloque.append(registro)
+            if len(bloque) >= tamano:
+                yield bloque
+                bloque = []
+        if bloque:
+            yield bloque
+
+
+# ============================================
+# ESCRITURA
+# ============================================
+
+class EscritorResultados:
+    """Escribe resultados por bloques en CSV, JSONL o Parquet (columnas de COLUMNAS_RESULTADO)."""
+
+    def __init__(self, ruta: Union[str, Path], formato: str):
+        """
+        Args:
+            ruta: Archivo de salida (se sobrescribe)
+            formato: 'csv', 'jsonl' o 'parquet'
+        """
+        if formato not in FORMATOS.values():
+            raise ValueError(f"Formato no soportado: {formato}")
+        self.ruta = Path(ruta)
+        self.formato = formato
+
+        if formato == "parquet":
+            pyarrow, parquet = _importar_pyarrow()
+            self._pyarrow = pyarrow
+            # Un row group por bloque; el id se guarda como texto (su tipo varía)
+            self._esquema = pyarrow.schema([
+                ("fila", pyarrow.int64()),
+                ("id", pyarrow.string()),
+                ("prevision", pyarrow.string()),
+                ("probabilidad", pyarrow.float64()),
+                ("confianza", pyarrow.string()),
+                ("idioma_detectado", pyarrow.string()),
+                ("error", pyarrow.string())
+            ])
+            self._parquet = parquet.ParquetWriter(self.ruta, self._esquema)
+            return
+
+        self._archivo = open(self.ruta, "w", encoding="utf-8", newline="")
+        if formato == "csv":
+            self._csv = csv.writer(self._archivo)
+            self._csv.writerow(COLUMNAS_RESULTADO)
+
+    def __enter__(self) -> "EscritorResultados":
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    def escribir(self, filas: List[Dict]):
+        """
+        Escribe un bloque de resultados y lo pasa al sistema operativo.
+
+        Args:
+            filas: Dicts con las claves de COLUMNAS_RESULTADO
+        """
+        if self.formato == "parquet":
+            columnas = {c: [fila.get(c) for fila in filas] for c in COLUMNAS_RESULTADO}
+            columnas["id"] = [None if v is None else str(v) for v in columnas["id"]]
+            self._parquet.write_table(self._pyarrow.table(columnas, schema=self._esquema))
+            return
+        if self.formato == "csv":
+            self._csv.writerows([fila.get(c) for c in COLUMNAS_RESULTADO] for fila in filas)
+        else:
+            self._archivo.writelines(json.dumps(fila, ensure_ascii=False) + "\n" for fila in filas)
+        self._archivo.flush()
+
+    def cerrar(self):
+        if self.formato == "parquet":
+            self._parquet.close()
+        else:
+            self._archivo.close()
+
+
+def resultados_de_lote(registros: List[Registro], lote: Dict) -> List[Dict]:
+    """
+    Filas de resultado de un bloque puntuado con predecir_lote.
+
+    Args:
+        registros: Registros del bloque
+        lote: Resultado de SentimentPredictor.predecir_lote para sus textos
+
+    Returns:
+        Lista de dicts con las claves de COLUMNAS_RESULTADO
+    """
+    filas = []
+    for j, registro in enumerate(registros):
+        if lote['validos'][j]:
+            filas.append({
+                "fila": registro.fila,
+                "id": registro.id,
+                "prevision": lote['prevision'][j],
+                "probabilidad": round(float(lote['probabilidad'][j]), 4),
+                "confianza": lote['confianza'][j],
+                "idioma_detectado": lote['idioma_detectado'][j],
+                "error": None
+            })
+        else:
+            filas.append({
+                "fila": registro.fila,
+                "id": registro.id,
+                "prevision": None,
+                "probabilidad": None,
+                "confianza": None,
+                "idioma_detectado": None,
+                "error": lote['errores'][j] if registro.texto is not None else "Fila sin texto o JSON inválido"
+            })
+    return filas
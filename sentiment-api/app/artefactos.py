@@ -0,0 +1,291 @@
+# ============================================
+# ARTEFACTOS - BUNDLE DE MODELO PARA SERVIR
+# ============================================
+#
+# Uso como herramienta (desde sentiment-api/):
+#   python -m app.artefactos exportar [--modelo M.pkl] [--vectorizador V.pkl] [--destino DIR]
+#   python -m app.artefactos info DIR
+#
+# Un bundle es un directorio con arrays NumPy sin comprimir (se cargan con
+# np.load(mmap_mode='r'), sin copiar ni importar scikit-learn) y un
+# metadata.json con los parámetros del vectorizador y del modelo:
+#
+#   metadata.json          formato, versión, parámetros y huella de origen
+#   idf.npy                float64[n_features] (si el vectorizador usa idf)
+#   pesos.npy              float64[n_features]  puntuación = x · pesos + sesgo
+#   coeficientes.npy       float64[n_features]  coeficientes para explicabilidad
+#
+# Los arrays float pueden ser float32/float16 en bundles cuantizados con
+# app/poda.py; el motor calcula siempre en float64.
+#   vocab_terminos.bin     términos ordenados (UTF-8) separados por '\n'
+#   vocab_offsets.npy      int64[n_terminos + 1] inicio de cada término en bytes
+#   vocab_columnas.npy     int32[n_terminos]     columna de cada término
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Sequence, Union
+import logging
+
+import numpy as np
+
+from . import config
+from .motor import MotorLineal
+from .vocabulario import VocabularioCompacto, empaquetar
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+FORMATO = "sentiment-bundle"
+VERSION_FORMATO = 1
+
+
+class Bundle(NamedTuple):
+    """Bundle cargado: motor de scoring, datos de explicabilidad y metadatos"""
+    motor: MotorLineal
+    coeficientes: Optional[np.ndarray]
+    metadata: Dict
+
+
+# ============================================
+# EXPORTAR
+# ============================================
+
+def exportar_bundle(
+    modelo,
+    vectorizador,
+    destino: Union[str, Path],
+    origen: Optional[Dict[str, str]] = None
+) -> Path:
+    """
+    Convierte un modelo y un TfidfVectorizer de scikit-learn en un bundle.
+
+    Args:
+        modelo: MultinomialNB o LogisticRegression binario ajustado
+        vectorizador: TfidfVectorizer ajustado
+        destino: Directorio del bundle (se crea si no existe)
+        origen: Datos de los artefactos de origen para los metadatos
+
+    Returns:
+        Ruta del bundle
+
+    Raises:
+        ValueError: Si el modelo no se puede reducir al motor lineal
+    """
+    motor = MotorLineal.desde_sklearn(modelo, vectorizador)
+
+    # Coeficientes de explicabilidad: los mismos que usa SentimentPredictor
+    idx_positivo = list(modelo.classes_).index('Positivo')
+    if hasattr(modelo, 'feature_log_prob_'):
+        coeficientes = modelo.feature_log_prob_[idx_positivo]
+    else:
+        coeficientes = modelo.coef_[0]
+
+    return escribir_bundle(
+        motor, np.asarray(coeficientes, dtype=np.float64), destino, type(modelo).__name__, origen
+    )
+
+
+def escribir_bundle(
+    motor: MotorLineal,
+    coeficientes: Optional[np.ndarray],
+    destino: Union[str, Path],
+    modelo_tipo: str,
+    origen: Optional[Dict[str, str]] = None,
+    extra: Optional[Dict] = None
+) -> Path:
+    """
+    Escribe un motor lineal y sus coeficientes de explicabilidad como bundle.
+    Los arrays se guardan con su tipo (float64, o float32/float16 si se
+    cuantizaron).
+
+    Args:
+        motor: Motor lineal a guardar
+        coeficientes: Coeficientes por columna para explicabilidad (o None)
+        destino: Directorio del bundle (se crea si no existe)
+        modelo_tipo: Nombre de la clase del modelo original
+        origen: Datos de los artefactos de origen para los metadatos
+        extra: Metadatos adicionales (p. ej. los de la poda)
+
+    Returns:
+        Ruta del bundle
+    """
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    for nombre in ("idf.npy", "coeficientes.npy"):
+        # Un bundle anterior en el mismo directorio no debe dejar arrays sueltos
+        (destino / nombre).unlink(missing_ok=True)
+
+    datos, offsets, columnas = empaquetar(motor.vocabulario)
+    (destino / "vocab_terminos.bin").write_bytes(datos)
+    np.save(destino / "vocab_offsets.npy", offsets)
+    np.save(destino / "vocab_columnas.npy", columnas)
+    np.save(destino / "pesos.npy", motor.pesos)
+    if coeficientes is not None:
+        np.save(destino / "coeficientes.npy", coeficientes)
+    if motor.idf is not None:
+        np.save(destino / "idf.npy", motor.idf)
+
+    huella = hashlib.sha256()
+    for nombre in sorted(p.name for p in destino.iterdir() if p.name != "metadata.json"):
+        huella.update((destino / nombre).read_bytes())
+
+    metadata = {
+        "formato": FORMATO,
+        "version_formato": VERSION_FORMATO,
+        "version_modelo": f"bundle-{huella.hexdigest()[:12]}",
+        "creado": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "modelo_tipo": modelo_tipo,
+        "clases": motor.clases,
+        "n_features": motor.n_features,
+        "tipo_pesos": str(motor.pesos.dtype),
+        "sesgo": motor.sesgo,
+        "escala": motor.escala,
+        "complemento_exacto": motor.complemento_exacto,
+        "vectorizador": {
+            "token_pattern": motor.token_pattern,
+            "ngram_range": list(motor.ngram_range),
+            "lowercase": motor.lowercase,
+            "stop_words": sorted(motor.stop_words) if motor.stop_words else None,
+            "binary": motor.binary,
+            "sublinear_tf": motor.sublinear_tf,
+            "norm": motor.norm,
+            "use_idf": motor.idf is not None
+        },
+        "origen": origen or {},
+        **(extra or {})
+    }
+    (destino / "metadata.json").write_text(json.dumps(metadata, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    logger.info(f"✅ Bundle exportado en {destino} ({metadata['version_modelo']})")
+    return destino
+
+
+# ============================================
+# CARGAR
+# ============================================
+
+def cargar_bundle(ruta: Union[str, Path]) -> Bundle:
+    """
+    Carga un bundle con memory-mapping, sin importar scikit-learn.
+
+    Args:
+        ruta: Directorio del bundle
+
+    Returns:
+        Bundle con el motor listo para puntuar
+
+    Raises:
+        ValueError: Si el directorio no es un bundle de una versión soportada
+    """
+    ruta = Path(ruta)
+    metadata = json.loads((ruta / "metadata.json").read_text(encoding="utf-8"))
+    if metadata.get("formato") != FORMATO:
+        raise ValueError(f"{ruta} no es un bundle de modelo")
+    if metadata.get("version_formato") != VERSION_FORMATO:
+        raise ValueError(f"Versión de bundle no soportada: {metadata.get('version_formato')}")
+
+    def cargar(nombre: str) -> Optional[np.ndarray]:
+        archivo = ruta / nombre
+        return np.load(archivo, mmap_mode="r") if archivo.exists() else None
+
+    if config.VOCABULARIO_COMPACTO:
+        vocabulario = VocabularioCompacto.cargar(ruta)
+    else:
+        terminos = (ruta / "vocab_terminos.bin").read_bytes().decode("utf-8").split("\n")
+        vocabulario = dict(zip(terminos, cargar("vocab_columnas.npy").tolist()))
+    parametros = metadata["vectorizador"]
+
+    motor = MotorLineal(
+        vocabulario=vocabulario,
+        idf=cargar("idf.npy"),
+        pesos=cargar("pesos.npy"),
+        sesgo=metadata["sesgo"],
+        clases=metadata["clases"],
+        token_pattern=parametros["token_pattern"],
+        ngram_range=tuple(parametros["ngram_range"]),
+        lowercase=parametros["lowercase"],
+        stop_words=parametros["stop_words"],
+        binary=parametros["binary"],
+        sublinear_tf=parametros["sublinear_tf"],
+        norm=parametros["norm"],
+        escala=metadata["escala"],
+        complemento_exacto=metadata["complemento_exacto"]
+    )
+
+    return Bundle(
+        motor=motor,
+        coeficientes=cargar("coeficientes.npy"),
+        metadata=metadata
+    )
+
+
+def nombres_features(bundle: Bundle) -> Sequence[str]:
+    """Nombres de features indexables por columna (como get_feature_names_out)."""
+    vocabulario = bundle.motor.vocabulario
+    if isinstance(vocabulario, VocabularioCompacto):
+        return vocabulario.nombres_features()
+
+    nombres = np.empty(len(vocabulario), dtype=object)
+    for termino, columna in vocabulario.items():
+        nombres[columna] = termino
+    return nombres
+
+
+# ============================================
+# HERRAMIENTA DE LÍNEA DE COMANDOS
+# ============================================
+
+def main():
+    directorio = Path(__file__).parent.parent / "modelos_serializados"
+
+    parser = argparse.ArgumentParser(description="Exportar e inspeccionar bundles de modelo")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    exportar = subparsers.add_parser("exportar", help="Convertir los .pkl en un bundle")
+    exportar.add_argument("--modelo", default=str(directorio / "sentiment_model.pkl"))
+    exportar.add_argument("--vectorizador", default=str(directorio / "tfidf_vectorizer.pkl"))
+    exportar.add_argument("--destino", default=str(directorio / "bundle"))
+
+    info = subparsers.add_parser("info", help="Mostrar los metadatos de un bundle")
+    info.add_argument("ruta")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.comando == "info":
+        bundle = cargar_bundle(args.ruta)
+        print(json.dumps(bundle.metadata, indent=2, ensure_ascii=False))
+        return
+
+    import joblib
+    from .normalizacion import limpiar_many
+    from .prediccion import FRASES_VERIFICACION
+
+    modelo = joblib.load(args.modelo)
+    vectorizador = joblib.load(args.vectorizador)
+
+    origen = {}
+    for clave, archivo in (("modelo", args.modelo), ("vectorizador", args.vectorizador)):
+        origen[clave] = Path(archivo).name
+        origen[f"sha256_{clave}"] = hashlib.sha256(Path(archivo).read_bytes()).hexdigest()
+
+    destino = exportar_bundle(modelo, vectorizador, args.destino, origen)
+
+    # Verificar que el bundle reproduce a scikit-learn
+    frases = limpiar_many(FRASES_VERIFICACION)
+    referencia = modelo.predict_proba(vectorizador.transform(frases))[:, list(modelo.classes_).index('Positivo')]
+    prob_positivo, _ = cargar_bundle(destino).motor.probabilidades(frases)
+    diferencia = float(np.max(np.abs(prob_positivo - referencia)))
+
+    print(f"Bundle: {destino}")
+    print(f"Diferencia máx. de probabilidad frente a sklearn: {diferencia:.2e}")
+    if diferencia > 1e-9:
+        sys.exit("❌ El bundle no reproduce las probabilidades del modelo")
+
+
+if __name__ == "__main__":
+    main()
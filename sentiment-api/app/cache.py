@@ -0,0 +1,163 @@
+# ============================================
+# CACHE - PREDICCIONES RECIENTES (LRU + TTL)
+# ============================================
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+import logging
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class CachePredicciones:
+    """
+    Cache LRU con expiración por tiempo para resultados de predicción.
+
+    Es segura entre hilos: todas las operaciones toman un único lock, y las
+    variantes *_muchos resuelven un lote completo con una sola adquisición.
+    """
+
+    def __init__(self, max_entradas: int = 10000, ttl_segundos: float = 3600.0):
+        """
+        Args:
+            max_entradas: Máximo de entradas antes de desalojar las más antiguas
+            ttl_segundos: Tiempo de vida de cada entrada
+        """
+        if max_entradas < 1:
+            raise ValueError("max_entradas debe ser al menos 1")
+
+        self.max_entradas = max_entradas
+        self.ttl = ttl_segundos
+
+        self._datos: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Contadores
+        self._aciertos = 0
+        self._fallos = 0
+        self._desalojos = 0
+        self._expiraciones = 0
+        self._invalidaciones = 0
+
+    # ============================================
+    # LECTURA
+    # ============================================
+
+    def _buscar(self, clave: Hashable, ahora: float) -> Optional[Any]:
+        """Busca una clave; debe llamarse con el lock tomado."""
+        entrada = self._datos.get(clave)
+        if entrada is None:
+            self._fallos += 1
+            return None
+
+        valor, expira = entrada
+        if expira < ahora:
+            del self._datos[clave]
+            self._expiraciones += 1
+            self._fallos += 1
+            return None
+
+        self._datos.move_to_end(clave)
+        self._aciertos += 1
+        return valor
+
+    def obtener(self, clave: Hashable) -> Optional[Any]:
+        """
+        Obtiene un valor de la cache.
+
+        Returns:
+            Valor guardado o None si no existe o expiró
+        """
+        with self._lock:
+            return self._buscar(clave, time.monotonic())
+
+    def obtener_muchos(self, claves: Sequence[Hashable]) -> List[Optional[Any]]:
+        """
+        Obtiene varios valores con una sola adquisición del lock.
+
+        Returns:
+            Lista alineada con las claves (None en cada fallo)
+        """
+        ahora = time.monotonic()
+        with self._lock:
+            return [self._buscar(clave, ahora) for clave in claves]
+
+    def recientes(self, n: int) -> List[Tuple[Hashable, Any]]:
+        """
+        Entradas vigentes usadas más recientemente, sin contar como consultas.
+
+        Args:
+            n: Máximo de entradas
+
+        Returns:
+            Lista de pares (clave, valor), de la más reciente a la más antigua
+        """
+        ahora = time.monotonic()
+        pares = []
+        with self._lock:
+            for clave in reversed(self._datos):
+                if len(pares) >= n:
+                    break
+                valor, expira = self._datos[clave]
+                if expira >= ahora:
+                    pares.append((clave, valor))
+        return pares
+
+    # ============================================
+    # ESCRITURA
+    # ============================================
+
+    def _insertar(self, clave: Hashable, valor: Any, expira: float):
+        """Inserta una entrada; debe llamarse con el lock tomado."""
+        self._datos[clave] = (valor, expira)
+        self._datos.move_to_end(clave)
+        while len(self._datos) > self.max_entradas:
+            self._datos.popitem(last=False)
+            self._desalojos += 1
+
+    def guardar(self, clave: Hashable, valor: Any):
+        """Guarda un valor en la cache."""
+        with self._lock:
+            self._insertar(clave, valor, time.monotonic() + self.ttl)
+
+    def guardar_muchos(self, pares: Sequence[Tuple[Hashable, Any]]):
+        """Guarda varios pares (clave, valor) con una sola adquisición del lock."""
+        expira = time.monotonic() + self.ttl
+        with self._lock:
+            for clave, valor in pares:
+                self._insertar(clave, valor, expira)
+
+    def invalidar(self):
+        """Elimina todas las entradas (p. ej. al cambiar de modelo o threshold)."""
+        with self._lock:
+            self._datos.clear()
+            self._invalidaciones += 1
+        logger.info("Cache de predicciones invalidada")
+
+    # ============================================
+    # MÉTRICAS
+    # ============================================
+
+    def estadisticas(self) -> Dict:
+        """
+        Obtiene los contadores de la cache.
+
+        Returns:
+            Dict con tamaño, aciertos, fallos, desalojos y tasa de aciertos
+        """
+        with self._lock:
+            consultas = self._aciertos + self._fallos
+            return {
+                "entradas": len(self._datos),
+                "max_entradas": self.max_entradas,
+                "ttl_segundos": self.ttl,
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "tasa_aciertos": round(self._aciertos / consultas, 4) if consultas else 0.0,
+                "desalojos": self._desalojos,
+                "expiraciones": self._expiraciones,
+                "invalidaciones": self._invalidaciones
+            }
@@ -0,0 +1,368 @@
+# ============================================
+# CACHE DE TRADUCCIONES - PERSISTENTE EN SQLITE
+# ============================================
+#
+# Uso como herramienta (desde sentiment-api/):
+#   python -m app.cache_traducciones exportar traducciones.jsonl
+#   python -m app.cache_traducciones importar traducciones.jsonl
+#   python -m app.cache_traducciones precargar frases.txt --origen en
+#   python -m app.cache_traducciones stats
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+from . import config
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class CacheTraducciones:
+    """
+    Cache de traducciones en un archivo SQLite en modo WAL.
+
+    Las entradas se indexan por (idioma origen, idioma destino, hash del
+    texto). El archivo se comparte entre todos los workers de uvicorn de la
+    máquina: WAL permite lecturas concurrentes con un escritor. Cuando se
+    supera max_entradas se eliminan las entradas usadas hace más tiempo.
+    """
+
+    # Cada cuántas escrituras se comprueba el tamaño de la tabla
+    INTERVALO_PODA = 500
+
+    # Resolución del registro de último uso (evita una escritura por lectura)
+    RESOLUCION_USO_SEGUNDOS = 60.0
+
+    def __init__(self, ruta: str, max_entradas: int = 200000):
+        """
+        Args:
+            ruta: Ruta del archivo SQLite (se crea si no existe)
+            max_entradas: Máximo de traducciones guardadas
+        """
+        self.ruta = Path(ruta)
+        self.max_entradas = max_entradas
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._escrituras = 0
+        self._aciertos = 0
+        self._fallos = 0
+
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        with self._conexion() as conexion:
+            conexion.execute("""
+                CREATE TABLE IF NOT EXISTS traducciones (
+                    origen TEXT NOT NULL,
+                    destino TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    texto TEXT NOT NULL,
+                    traduccion TEXT NOT NULL,
+                    ultimo_uso REAL NOT NULL,
+                    PRIMARY KEY (origen, destino, hash)
+                ) WITHOUT ROWID
+            """)
+            conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_traducciones_uso ON traducciones (ultimo_uso)"
+            )
+
+    # ============================================
+    # CONEXIÓN
+    # ============================================
+
+    def _conexion(self) -> sqlite3.Connection:
+        """Conexión propia de cada hilo (sqlite3 no comparte conexiones entre hilos)."""
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.ruta, timeout=5.0, isolation_level=None)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = conexion
+        return conexion
+
+    @staticmethod
+    def _hash(texto: str) -> str:
+        return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+    # ============================================
+    # LECTURA Y ESCRITURA
+    # ============================================
+
+    def obtener(self, origen: str, destino: str, texto: str) -> Optional[str]:
+        """
+        Busca la traducción de un texto.
+
+        Returns:
+            Texto traducido o None si no está en la cache
+        """
+        return self.obtener_muchos(origen, destino, [texto]).get(texto)
+
+    def obtener_muchos(self, origen: str, destino: str, textos: Iterable[str]) -> Dict[str, str]:
+        """
+        Busca las traducciones de varios textos con una sola consulta.
+
+        Returns:
+            Dict texto -> traducción con los textos encontrados
+        """
+        hashes = {self._hash(texto): texto for texto in textos}
+        if not hashes:
+            return {}
+
+        try:
+            encontrados = self._buscar(origen, destino, hashes)
+        except sqlite3.Error as e:
+            # La cache nunca debe impedir la traducción
+            logger.warning(f"Error leyendo la cache de traducciones: {e}")
+            encontrados = {}
+
+        with self._lock:
+            self._aciertos += len(encontrados)
+            self._fallos += len(hashes) - len(encontrados)
+
+        return encontrados
+
+    def _buscar(self, origen: str, destino: str, hashes: Dict[str, str]) -> Dict[str, str]:
+        """Consulta SQLite por hash y refresca el último uso de los encontrados."""
+        ahora = time.time()
+        encontrados: Dict[str, str] = {}
+        conexion = self._conexion()
+
+        # SQLite limita el número de parámetros por consulta
+        claves = list(hashes)
+        for inicio in range(0, len(claves), 500):
+            bloque = claves[inicio:inicio + 500]
+            marcas = ",".join("?" * len(bloque))
+            filas = conexion.execute(
+                f"SELECT hash, traduccion, ultimo_uso FROM traducciones "
+                f"WHERE origen = ? AND destino = ? AND hash IN ({marcas})",
+                (origen, destino, *bloque)
+            ).fetchall()
+
+            antiguos = []
+            for clave, traduccion, ultimo_uso in filas:
+                encontrados[hashes[clave]] = traduccion
+                if ahora - ultimo_uso > self.RESOLUCION_USO_SEGUNDOS:
+                    antiguos.append((ahora, origen, destino, clave))
+
+            if antiguos:
+                conexion.executemany(
+                    "UPDATE traducciones SET ultimo_uso = ? WHERE origen = ? AND destino = ? AND hash = ?",
+                    antiguos
+                )
+
+        return encontrados
+
+    def guardar(self, origen: str, destino: str, texto: str, traduccion: str):
+        """Guarda la traducción de un texto."""
+        self.guardar_muchos(origen, destino, [(texto, traduccion)])
+
+    def guardar_muchos(self, origen: str, destino: str, pares: Iterable[Tuple[str, str]]):
+        """Guarda varias traducciones (texto, traducción) en una transacción."""
+        ahora = time.time()
+        filas = [
+            (origen, destino, self._hash(texto), texto, traduccion, ahora)
+            for texto, traduccion in pares
+        ]
+        if not filas:
+            return
+
+        conexion = self._conexion()
+        try:
+            conexion.execute("BEGIN")
+            try:
+                conexion.executemany(
+                    "INSERT OR REPLACE INTO traducciones "
+                    "(origen, destino, hash, texto, traduccion, ultimo_uso) VALUES (?, ?, ?, ?, ?, ?)",
+                    filas
+                )
+                conexion.execute("COMMIT")
+            except sqlite3.Error:
+                conexion.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"Error escribiendo en la cache de traducciones: {e}")
+            return
+
+        with self._lock:
+            self._escrituras += len(filas)
+            podar = self._escrituras >= self.INTERVALO_PODA
+            if podar:
+                self._escrituras = 0
+        if podar:
+            try:
+                self.podar()
+            except sqlite3.Error as e:
+                logger.warning(f"Error podando la cache de traducciones: {e}")
+
+    def podar(self) -> int:
+        """
+        Elimina las entradas usadas hace más tiempo si se supera max_entradas.
+
+        Returns:
+            Número de entradas eliminadas
+        """
+        conexion = self._conexion()
+        total = conexion.execute("SELECT COUNT(*) FROM traducciones").fetchone()[0]
+        exceso = total - self.max_entradas
+        if exceso <= 0:
+            return 0
+
+        conexion.execute(
+            "DELETE FROM traducciones WHERE (origen, destino, hash) IN ("
+            "SELECT origen, destino, hash FROM traducciones ORDER BY ultimo_uso LIMIT ?)",
+            (exceso,)
+        )
+        logger.info(f"Cache de traducciones podada: {exceso} entradas eliminadas")
+        return exceso
+
+    # ============================================
+    # IMPORTAR / EXPORTAR
+    # ============================================
+
+    def exportar(self) -> Iterator[Dict[str, str]]:
+        """Recorre todas las traducciones guardadas."""
+        cursor = self._conexion().execute(
+            "SELECT origen, destino, texto, traduccion FROM traducciones ORDER BY ultimo_uso DESC"
+        )
+        for origen, destino, texto, traduccion in cursor:
+            yield {"origen": origen, "destino": destino, "texto": texto, "traduccion": traduccion}
+
+    def importar(self, registros: Iterable[Dict[str, str]]) -> int:
+        """
+        Carga traducciones con el formato de exportar().
+
+        Returns:
+            Número de traducciones importadas
+        """
+        grupos: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        for registro in registros:
+            clave = (registro["origen"], registro.get("destino", "es"))
+            grupos.setdefault(clave, []).append((registro["texto"], registro["traduccion"]))
+
+        total = 0
+        for (origen, destino), pares in grupos.items():
+            self.guardar_muchos(origen, destino, pares)
+            total += len(pares)
+        return total
+
+    # ============================================
+    # MÉTRICAS
+    # ============================================
+
+    def estadisticas(self) -> Dict:
+        """
+        Obtiene el tamaño y los contadores de la cache.
+
+        Returns:
+            Dict con entradas, aciertos y fallos de este proceso
+        """
+        entradas = self._conexion().execute("SELECT COUNT(*) FROM traducciones").fetchone()[0]
+        with self._lock:
+            consultas = self._aciertos + self._fallos
+            return {
+                "ruta": str(self.ruta),
+                "entradas": entradas,
+                "max_entradas": self.max_entradas,
+                "aciertos": self._aciertos,
+                "fallos": self._fallos,
+                "tasa_aciertos": round(self._aciertos / consultas, 4) if consultas else 0.0
+            }
+
+
+# ============================================
+# INSTANCIA GLOBAL
+# ============================================
+
+_cache: Optional[CacheTraducciones] = None
+_cache_lock = threading.Lock()
+
+
+def obtener_cache_traducciones() -> Optional[CacheTraducciones]:
+    """
+    Obtiene la cache de traducciones del proceso (la crea en el primer uso).
+
+    Returns:
+        CacheTraducciones, o None si está desactivada o no se pudo abrir
+    """
+    global _cache
+    if not config.TRADUCCION_CACHE_ACTIVA:
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = CacheTraducciones(
+                        ruta=config.TRADUCCION_CACHE_RUTA,
+                        max_entradas=config.TRADUCCION_CACHE_MAX
+                    )
+                except sqlite3.Error as e:
+                    logger.error(f"❌ No se pudo abrir la cache de traducciones: {e}")
+                    return None
+    return _cache
+
+
+# ============================================
+# HERRAMIENTA DE LÍNEA DE COMANDOS
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Gestión de la cache persistente de traducciones")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    exportar = subparsers.add_parser("exportar", help="Exportar traducciones a JSONL")
+    exportar.add_argument("salida")
+
+    importar = subparsers.add_parser("importar", help="Importar traducciones desde JSONL")
+    importar.add_argument("entrada")
+
+    precargar = subparsers.add_parser("precargar", help="Traducir y guardar frases (una por línea)")
+    precargar.add_argument("entrada")
+    precargar.add_argument("--origen", default="auto")
+    precargar.add_argument("--destino", default="es")
+
+    subparsers.add_parser("stats", help="Mostrar tamaño de la cache")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    cache = obtener_cache_traducciones()
+    if cache is None:
+        parser.error("La cache de traducciones está desactivada (TRADUCCION_CACHE_ACTIVA)")
+
+    if args.comando == "exportar":
+        total = 0
+        with open(args.salida, "w", encoding="utf-8") as f:
+            for registro in cache.exportar():
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                total += 1
+        print(f"{total} traducciones exportadas a {args.salida}")
+
+    elif args.comando == "importar":
+        with open(args.entrada, encoding="utf-8") as f:
+            total = cache.importar(json.loads(linea) for linea in f if linea.strip())
+        print(f"{total} traducciones importadas desde {args.entrada}")
+
+    elif args.comando == "precargar":
+        from .utils import traducir_texto
+
+        exitosas = 0
+        with open(args.entrada, encoding="utf-8") as f:
+            for linea in f:
+                if linea.strip():
+                    resultado = traducir_texto(linea.strip(), args.origen, args.destino)
+                    exitosas += resultado['traduccion_exitosa']
+        print(f"{exitosas} frases traducidas y guardadas")
+
+    else:
+        print(json.dumps(cache.estadisticas(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
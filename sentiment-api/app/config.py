@@ -0,0 +1,250 @@
+# ============================================
+# CONFIG - PARÁMETROS DE EJECUCIÓN
+# ============================================
+
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Cargar variables desde .env si existe
+load_dotenv()
+
+
+def _leer_bool(nombre: str, default: bool) -> bool:
+    """Lee una variable de entorno booleana (1/true/si/yes)."""
+    valor = os.getenv(nombre)
+    if valor is None:
+        return default
+    return valor.strip().lower() in ("1", "true", "si", "sí", "yes", "on")
+
+
+def _leer_int(nombre: str, default: int) -> int:
+    """Lee una variable de entorno entera."""
+    valor = os.getenv(nombre)
+    return int(valor) if valor not in (None, "") else default
+
+
+def _leer_float(nombre: str, default: float) -> float:
+    """Lee una variable de entorno decimal."""
+    valor = os.getenv(nombre)
+    return float(valor) if valor not in (None, "") else default
+
+
+# ============================================
+# MOTOR DE SCORING
+# ============================================
+
+# 'lineal': motor NumPy fusionado (app/motor.py); 'sklearn': transform + predict_proba
+MOTOR_PUNTUACION = os.getenv("MOTOR_PUNTUACION", "lineal").strip().lower()
+
+# Directorio de un bundle de app/artefactos.py; si se indica, se carga en lugar
+# de los .pkl (solo motor lineal, sin importar scikit-learn)
+MODELO_BUNDLE = os.getenv("MODELO_BUNDLE", "").strip()
+
+# Vocabulario del bundle como índice compacto con memory-mapping (app/vocabulario.py)
+# en lugar de un dict: menos memoria por proceso a cambio de búsquedas más lentas
+# (compensa con vocabularios grandes; ver benchmarks/vocabulario.py)
+VOCABULARIO_COMPACTO = _leer_bool("VOCABULARIO_COMPACTO", False)
+
+# Diferencia máxima de probabilidad admitida frente a sklearn al verificar el motor
+MOTOR_TOLERANCIA_PARIDAD = _leer_float("MOTOR_TOLERANCIA_PARIDAD", 1e-9)
+
+
+# ============================================
+# REGISTRO DE MODELOS (ACTIVACIÓN EN CALIENTE)
+# ============================================
+
+# Directorio con las versiones disponibles: sentiment_model*.pkl y bundles
+MODELOS_DIRECTORIO = os.getenv(
+    "MODELOS_DIRECTORIO",
+    str(Path(__file__).parent.parent / "modelos_serializados")
+)
+
+# Entradas de la cache de predicciones (las usadas más recientemente) que se
+# puntúan con el modelo nuevo antes de activarlo (0: empieza con la cache vacía)
+MODELOS_CALENTAR_CACHE = _leer_int("MODELOS_CALENTAR_CACHE", 5000)
+
+
+# ============================================
+# MODELO SOMBRA (EVALUACIÓN CON TRÁFICO REAL)
+# ============================================
+
+# Versión del registro que se evalúa en sombra al arrancar ('' desactivado)
+SOMBRA_MODELO = os.getenv("SOMBRA_MODELO", "").strip()
+
+# Fracción de los textos puntuados que se copian al modelo sombra
+SOMBRA_MUESTREO = _leer_float("SOMBRA_MUESTREO", 0.1)
+
+# Máximo de lotes en cola; con la cola llena la copia se descarta
+SOMBRA_COLA_MAX = _leer_int("SOMBRA_COLA_MAX", 1000)
+
+# Últimos textos evaluados que cuentan en las métricas móviles
+SOMBRA_VENTANA = _leer_int("SOMBRA_VENTANA", 10000)
+
+
+# ============================================
+# CACHE DE PREDICCIONES
+# ============================================
+
+CACHE_PREDICCIONES_ACTIVA = _leer_bool("CACHE_PREDICCIONES_ACTIVA", True)
+
+# Máximo de entradas (desaloja las menos usadas recientemente)
+CACHE_PREDICCIONES_MAX = _leer_int("CACHE_PREDICCIONES_MAX", 50000)
+
+# Tiempo de vida de cada entrada
+CACHE_PREDICCIONES_TTL_SEGUNDOS = _leer_float("CACHE_PREDICCIONES_TTL_SEGUNDOS", 3600.0)
+
+
+# ============================================
+# EJECUCIÓN (POOLS Y EVENT LOOP)
+# ============================================
+
+# Hilos del pool de inferencia (0: min(4, núcleos))
+INFERENCIA_HILOS = _leer_int("INFERENCIA_HILOS", 0)
+
+# Hilos del pool de administración: subidas y consultas de /jobs, carga de
+# modelos (/shadow, /sentiment/compare) y barridos de thresholds, para que no
+# ocupen el pool de inferencia
+ADMIN_HILOS = _leer_int("ADMIN_HILOS", 2)
+
+# Procesos worker para el scoring (0: desactivado, todo en el proceso de la API)
+INFERENCIA_PROCESOS = _leer_int("INFERENCIA_PROCESOS", 0)
+
+# Mínimo de textos por bloque enviado a un proceso worker (salvo el último);
+# un lote de hasta este tamaño no se reparte y lo puntúa un solo worker
+INFERENCIA_PROCESOS_BLOQUE = _leer_int("INFERENCIA_PROCESOS_BLOQUE", 256)
+
+# Cada cuánto se mide el retraso del event loop (milisegundos)
+LOOP_INTERVALO_MS = _leer_float("LOOP_INTERVALO_MS", 100.0)
+
+# Retraso del event loop que se registra como bloqueo (milisegundos)
+LOOP_UMBRAL_LAG_MS = _leer_float("LOOP_UMBRAL_LAG_MS", 100.0)
+
+
+# ============================================
+# MICRO-BATCHING DE PETICIONES /sentiment
+# ============================================
+
+# Agrupa peticiones concurrentes en un solo predict_proba
+MICROLOTE_ACTIVO = _leer_bool("MICROLOTE_ACTIVO", True)
+
+# Máximo de textos por lote (se procesa en cuanto se alcanza)
+MICROLOTE_MAX_TAMANO = _leer_int("MICROLOTE_MAX_TAMANO", 64)
+
+# Tiempo máximo que espera el primer texto de un lote (milisegundos)
+MICROLOTE_MAX_ESPERA_MS = _leer_float("MICROLOTE_MAX_ESPERA_MS", 2.0)
+
+
+# ============================================
+# PRE-FORK (GUNICORN --preload)
+# ============================================
+
+# Carga el modelo y el detector al importar app.main, en el proceso maestro,
+# para que los workers creados con fork compartan esas páginas de memoria
+PRECARGA_MODELO = _leer_bool("PRECARGA_MODELO", False)
+
+
+# ============================================
+# CLIENTE DE TRADUCCIÓN
+# ============================================
+
+# 'google': Google Translate con sesión HTTP compartida; 'local': sin red (pruebas)
+TRADUCCION_BACKEND = os.getenv("TRADUCCION_BACKEND", "google").strip().lower()
+
+# Máximo de traducciones simultáneas (también tamaño del pool de conexiones)
+TRADUCCION_MAX_CONCURRENCIA = _leer_int("TRADUCCION_MAX_CONCURRENCIA", 8)
+
+# Deadline de cada petición de traducción, reintentos incluidos (un lote
+# grande hace varias peticiones, cada una con su deadline)
+TRADUCCION_TIMEOUT_SEGUNDOS = _leer_float("TRADUCCION_TIMEOUT_SEGUNDOS", 5.0)
+
+# Intentos por traducción antes de devolver el texto original
+TRADUCCION_MAX_REINTENTOS = _leer_int("TRADUCCION_MAX_REINTENTOS", 3)
+
+# Latencia simulada del backend 'local' (milisegundos)
+TRADUCCION_LATENCIA_LOCAL_MS = _leer_float("TRADUCCION_LATENCIA_LOCAL_MS", 0.0)
+
+
+# ============================================
+# CACHE PERSISTENTE DE TRADUCCIONES
+# ============================================
+
+TRADUCCION_CACHE_ACTIVA = _leer_bool("TRADUCCION_CACHE_ACTIVA", True)
+
+# Archivo SQLite compartido por todos los workers de la máquina
+TRADUCCION_CACHE_RUTA = os.getenv(
+    "TRADUCCION_CACHE_RUTA",
+    str(Path(__file__).parent.parent / "cache" / "traducciones.sqlite3")
+)
+
+# Máximo de traducciones guardadas (se eliminan las usadas hace más tiempo)
+TRADUCCION_CACHE_MAX = _leer_int("TRADUCCION_CACHE_MAX", 200000)
+
+
+# ============================================
+# DETECCIÓN DE IDIOMA
+# ============================================
+
+# Máximo de textos normalizados con idioma ya detectado
+IDIOMA_CACHE_MAX = _leer_int("IDIOMA_CACHE_MAX", 20000)
+
+
+# ============================================
+# STREAMING NDJSON (/sentiment/stream)
+# ============================================
+
+# Textos puntuados por bloque (una llamada al camino vectorizado)
+STREAM_TAMANO_BLOQUE = _leer_int("STREAM_TAMANO_BLOQUE", 256)
+
+# Longitud máxima de una línea de entrada; las más largas se marcan como error
+STREAM_MAX_BYTES_LINEA = _leer_int("STREAM_MAX_BYTES_LINEA", 1024 * 1024)
+
+
+# ============================================
+# TRABAJOS MASIVOS (/jobs)
+# ============================================
+
+# Archivos subidos, resultados y base de datos SQLite de los trabajos
+TRABAJOS_DIRECTORIO = os.getenv(
+    "TRABAJOS_DIRECTORIO",
+    str(Path(__file__).parent.parent / "trabajos")
+)
+
+# Trabajos ejecutados a la vez en cada proceso
+TRABAJOS_CONCURRENTES = _leer_int("TRABAJOS_CONCURRENTES", 1)
+
+# Filas por llamada a predecir_lote (y por escritura de resultados)
+TRABAJOS_TAMANO_BLOQUE = _leer_int("TRABAJOS_TAMANO_BLOQUE", 2000)
+
+# Tamaño máximo del archivo subido
+TRABAJOS_MAX_BYTES = _leer_int("TRABAJOS_MAX_BYTES", 2 * 1024 ** 3)
+
+# Horas que se conservan los trabajos terminados y sus resultados
+TRABAJOS_RETENCION_HORAS = _leer_float("TRABAJOS_RETENCION_HORAS", 24.0)
+
+
+# ============================================
+# MÉTRICAS (/metrics)
+# ============================================
+
+# Registra latencias por etapa, peticiones por endpoint y tamaños de lote
+# (app/metricas.py); con False, /metrics solo expone los recolectores
+METRICAS_ACTIVAS = _leer_bool("METRICAS_ACTIVAS", True)
+
+
+# ============================================
+# PERFILADO (SERVER-TIMING Y /admin/profile)
+# ============================================
+
+# Añade a cada respuesta la cabecera Server-Timing con la duración por etapa
+SERVER_TIMING = _leer_bool("SERVER_TIMING", True)
+
+# Token de /admin/* y de la activación de modelos (cabecera X-Admin-Token);
+# vacío: sin token
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "").strip()
+
+# Intervalo por defecto entre muestras del perfilador (milisegundos)
+PERFILADOR_INTERVALO_MS = _leer_float("PERFILADOR_INTERVALO_MS", 10.0)
+
+# Duración máxima de un perfilado (segundos)
+PERFILADOR_MAX_SEGUNDOS = _leer_float("PERFILADOR_MAX_SEGUNDOS", 60.0)
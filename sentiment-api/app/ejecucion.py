@@ -0,0 +1,221 @@
+# ============================================
+# EJECUCION - INFERENCIA FUERA DEL EVENT LOOP
+# ============================================
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import logging
+
+from . import config
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class EjecutorInferencia:
+    """
+    Pool acotado de hilos para el trabajo de CPU (vectorizar y puntuar).
+
+    Los endpoints async esperan aquí en lugar de bloquear el event loop.
+    numpy y sklearn liberan el GIL en la mayor parte del cálculo, por lo que
+    unos pocos hilos bastan; el tamaño acota también la memoria en uso.
+    """
+
+    def __init__(self, max_hilos: int = 4, prefijo: str = "inferencia"):
+        """
+        Args:
+            max_hilos: Número de hilos del pool
+            prefijo: Prefijo del nombre de los hilos
+        """
+        if max_hilos < 1:
+            raise ValueError("max_hilos debe ser al menos 1")
+
+        self.max_hilos = max_hilos
+        self.pool = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix=prefijo)
+
+        self._lock = threading.Lock()
+        self._en_curso = 0
+        self._completadas = 0
+        self._tiempo_total = 0.0
+
+    def _medir(self, funcion: Callable, *args, **kwargs) -> Any:
+        """Ejecuta la función en el hilo del pool llevando los contadores."""
+        inicio = time.perf_counter()
+        with self._lock:
+            self._en_curso += 1
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._en_curso -= 1
+                self._completadas += 1
+                self._tiempo_total += time.perf_counter() - inicio
+
+    async def ejecutar(self, funcion: Callable, *args, **kwargs) -> Any:
+        """
+        Ejecuta una función bloqueante en el pool y espera su resultado.
+
+        Las variables de contexto (contextvars) de la petición se copian al
+        hilo, igual que hace asyncio.to_thread.
+        """
+        loop = asyncio.get_running_loop()
+        contexto = contextvars.copy_context()
+        llamada = functools.partial(contexto.run, self._medir, funcion, *args, **kwargs)
+        return await loop.run_in_executor(self.pool, llamada)
+
+    def estadisticas(self) -> Dict:
+        """
+        Obtiene los contadores del pool.
+
+        Returns:
+            Dict con hilos, tareas en curso, completadas y duración media
+        """
+        with self._lock:
+            return {
+                "max_hilos": self.max_hilos,
+                "en_curso": self._en_curso,
+                "completadas": self._completadas,
+                "duracion_promedio_ms": round(self._tiempo_total / self._completadas * 1000, 3) if self._completadas else 0.0
+            }
+
+    def cerrar(self):
+        """Espera las tareas en curso y cierra el pool."""
+        self.pool.shutdown(wait=True)
+
+
+class MonitorEventLoop:
+    """
+    Mide el retraso del event loop: programa un sleep periódico y compara
+    cuándo despierta con cuándo debía despertar. Un retraso grande indica
+    que algo bloqueó el loop (cálculo o E/S síncrona en un endpoint).
+    """
+
+    def __init__(self, intervalo_ms: float = 100.0, umbral_ms: float = 100.0):
+        """
+        Args:
+            intervalo_ms: Cada cuánto se toma una muestra
+            umbral_ms: Retraso a partir del cual se registra un bloqueo
+        """
+        self.intervalo = intervalo_ms / 1000.0
+        self.umbral = umbral_ms / 1000.0
+
+        self._tarea: Optional[asyncio.Task] = None
+        self._muestras = 0
+        self._lag_total = 0.0
+        self._lag_max = 0.0
+        self._lag_ultimo = 0.0
+        self._bloqueos = 0
+
+    def iniciar(self):
+        """Lanza la tarea de medición en el event loop actual."""
+        if self._tarea is None:
+            self._tarea = asyncio.get_running_loop().create_task(self._medir())
+
+    async def detener(self):
+        """Cancela la tarea de medición."""
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+
+    async def _medir(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            inicio = loop.time()
+            await asyncio.sleep(self.intervalo)
+            lag = max(loop.time() - inicio - self.intervalo, 0.0)
+
+            self._muestras += 1
+            self._lag_total += lag
+            self._lag_ultimo = lag
+            self._lag_max = max(self._lag_max, lag)
+            if lag > self.umbral:
+                self._bloqueos += 1
+                logger.warning(f"⚠️ Event loop bloqueado {lag * 1000:.0f} ms")
+
+    def estadisticas(self) -> Dict:
+        """
+        Obtiene las métricas de retraso del event loop.
+
+        Returns:
+            Dict con retraso medio, máximo, último y número de bloqueos
+        """
+        return {
+            "activo": self._tarea is not None,
+            "intervalo_ms": self.intervalo * 1000,
+            "umbral_ms": self.umbral * 1000,
+            "muestras": self._muestras,
+            "lag_promedio_ms": round(self._lag_total / self._muestras * 1000, 3) if self._muestras else 0.0,
+            "lag_max_ms": round(self._lag_max * 1000, 3),
+            "lag_ultimo_ms": round(self._lag_ultimo * 1000, 3),
+            "bloqueos": self._bloqueos
+        }
+
+
+# ============================================
+# INSTANCIAS GLOBALES
+# ============================================
+
+_ejecutor: Optional[EjecutorInferencia] = None
+_ejecutor_admin: Optional[EjecutorInferencia] = None
+_ejecutor_lock = threading.Lock()
+
+monitor_loop = MonitorEventLoop(
+    intervalo_ms=config.LOOP_INTERVALO_MS,
+    umbral_ms=config.LOOP_UMBRAL_LAG_MS
+)
+
+
+def obtener_ejecutor() -> EjecutorInferencia:
+    """
+    Obtiene el pool de inferencia del proceso (lo crea en el primer uso).
+
+    Returns:
+        EjecutorInferencia con INFERENCIA_HILOS hilos
+    """
+    global _ejecutor
+    if _ejecutor is None:
+        with _ejecutor_lock:
+            if _ejecutor is None:
+                _ejecutor = EjecutorInferencia(max_hilos=config.INFERENCIA_HILOS or min(4, os.cpu_count() or 1))
+    return _ejecutor
+
+
+def obtener_ejecutor_admin() -> EjecutorInferencia:
+    """
+    Obtiene el pool de administración del proceso (lo crea en el primer uso).
+
+    E/S de archivos, consultas de trabajos, cargas de modelos y otras tareas
+    largas que no son la puntuación en línea: así una subida de 2 GB o un
+    joblib.load no dejan sin hilos a /sentiment.
+
+    Returns:
+        EjecutorInferencia con ADMIN_HILOS hilos
+    """
+    global _ejecutor_admin
+    if _ejecutor_admin is None:
+        with _ejecutor_lock:
+            if _ejecutor_admin is None:
+                _ejecutor_admin = EjecutorInferencia(max_hilos=max(config.ADMIN_HILOS, 1), prefijo="admin")
+    return _ejecutor_admin
+
+
+def cerrar_ejecutor():
+    """Cierra los pools globales (se llama al apagar la API)."""
+    global _ejecutor, _ejecutor_admin
+    with _ejecutor_lock:
+        if _ejecutor is not None:
+            _ejecutor.cerrar()
+            _ejecutor = None
+        if _ejecutor_admin is not None:
+            _ejecutor_admin.cerrar()
+            _ejecutor_admin = None
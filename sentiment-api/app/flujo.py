@@ -0,0 +1,192 @@
+# ============================================
+# FLUJO - ENTRADA Y SALIDA NDJSON INCREMENTAL
+# ============================================
+#
+# POST /sentiment/stream lee el cuerpo línea a línea mientras llega, puntúa
+# bloques de tamaño fijo con el camino vectorizado y escribe cada resultado
+# en cuanto está listo: la memoria depende del tamaño de bloque, no del
+# tamaño de la entrada.
+
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from .prediccion import usar_predictor
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class RespuestaNDJSON(StreamingResponse):
+    """
+    StreamingResponse que no escucha la desconexión en paralelo.
+
+    StreamingResponse consume receive() para detectar la desconexión, lo que
+    le quitaría al generador los fragmentos del cuerpo de la petición que aún
+    está leyendo; aquí la desconexión la detecta request.stream().
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _linea(registro: Dict) -> bytes:
+    return (json.dumps(registro, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _interpretar(linea: bytes) -> Tuple[Any, Any]:
+    """
+    Texto e id de una línea de entrada: un string JSON o un objeto con
+    'text' (o 'texto') y un 'id' opcional que se devuelve en el resultado.
+
+    Raises:
+        ValueError: Si la línea no es JSON válido o no tiene texto
+    """
+    try:
+        valor = json.loads(linea)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"JSON inválido: {e}")
+    if isinstance(valor, str):
+        return valor, None
+    if isinstance(valor, dict):
+        texto = valor.get("text", valor.get("texto"))
+        if texto is None:
+            raise ValueError("El objeto debe tener el campo 'text'")
+        return texto, valor.get("id")
+    raise ValueError("Cada línea debe ser un string o un objeto JSON")
+
+
+async def leer_lineas(request: Request, max_bytes: int) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Líneas no vacías del cuerpo de la petición a medida que llegan.
+
+    Args:
+        request: Petición con cuerpo NDJSON
+        max_bytes: Longitud máxima de una línea
+
+    Yields:
+        Tupla (número de línea desde 1, bytes de la línea); una línea
+        demasiado larga se entrega vacía (b"") para marcarla como error
+    """
+    pendiente = b""
+    numero = 0
+    descartando = False
+
+    async for fragmento in request.stream():
+        pendiente += fragmento
+        *lineas, pendiente = pendiente.split(b"\n")
+        for linea in lineas:
+            numero += 1
+            if descartando:
+                # Resto de una línea que ya superó el máximo
+                descartando = False
+                yield numero, b""
+            elif len(linea) > max_bytes:
+                # Línea completa dentro de un mismo fragmento
+                yield numero, b""
+            elif linea.strip():
+                yield numero, linea
+        if len(pendiente) > max_bytes:
+            pendiente = b""
+            descartando = True
+
+    if descartando:
+        yield numero + 1, b""
+    elif pendiente.strip():
+        yield numero + 1, pendiente
+
+
+async def puntuar_flujo(
+    request: Request,
+    traducir: bool,
+    idioma_origen: str,
+    tamano_bloque: int,
+    max_bytes_linea: int
+) -> AsyncIterator[bytes]:
+    """
+    Genera los resultados NDJSON de una entrada NDJSON, bloque a bloque.
+
+    Cada línea de salida lleva el 'indice' (número de línea de entrada) y
+    el resultado o el error; la última es un registro 'resumen' con los
+    totales. Todo el flujo usa el mismo predictor, que se retiene hasta el
+    final aunque se active otro modelo (o el cliente se desconecte).
+
+    Args:
+        request: Petición con cuerpo NDJSON
+        traducir: Si True, intenta traducir cada texto al español
+        idioma_origen: Código de idioma origen
+        tamano_bloque: Textos por llamada a predecir_lote_async
+        max_bytes_linea: Longitud máxima de una línea de entrada
+
+    Yields:
+        Líneas NDJSON codificadas en UTF-8
+    """
+    with usar_predictor() as predictor:
+        inicio = time.time()
+        totales = {"total": 0, "positivos": 0, "negativos": 0, "errores": 0}
+        # (índice, id, texto) de los textos pendientes de puntuar
+        bloque: List[Tuple[int, Any, str]] = []
+
+        async def puntuar_bloque() -> bytes:
+            lote = await predictor.predecir_lote_async(
+                textos=[texto for _, _, texto in bloque],
+                traducir=traducir,
+                idioma_origen=idioma_origen
+            )
+            salida = []
+            for j, (indice, id_, texto) in enumerate(bloque):
+                registro: Dict[str, Any] = {"indice": indice}
+                if id_ is not None:
+                    registro["id"] = id_
+                if not lote['validos'][j]:
+                    registro["error"] = lote['errores'][j]
+                    totales["errores"] += 1
+                else:
+                    registro.update({
+                        "texto": texto[:200],
+                        "prevision": lote['prevision'][j],
+                        "probabilidad": round(float(lote['probabilidad'][j]), 4),
+                        "confianza": lote['confianza'][j],
+                        "idioma_detectado": lote['idioma_detectado'][j]
+                    })
+                    totales["total"] += 1
+                    totales["positivos" if lote['prevision'][j] == "Positivo" else "negativos"] += 1
+                salida.append(_linea(registro))
+            bloque.clear()
+            return b"".join(salida)
+
+        async for indice, linea in leer_lineas(request, max_bytes_linea):
+            if not linea:
+                totales["errores"] += 1
+                yield _linea({"indice": indice, "error": f"Línea de más de {max_bytes_linea} bytes"})
+                continue
+            try:
+                texto, id_ = _interpretar(linea)
+            except ValueError as e:
+                totales["errores"] += 1
+                yield _linea({"indice": indice, "error": str(e)})
+                continue
+
+            bloque.append((indice, id_, texto))
+            if len(bloque) >= tamano_bloque:
+                yield await puntuar_bloque()
+
+        if bloque:
+            yield await puntuar_bloque()
+
+        total = totales["total"]
+        logger.info(f"✅ Stream completado: {total} textos, {totales['errores']} errores")
+        yield _linea({"resumen": {
+            **totales,
+            "porcentaje_positivos": round(totales["positivos"] / total * 100, 2) if total else 0,
+            "tiempo_procesamiento_segundos": round(time.time() - inicio, 2)
+        }})
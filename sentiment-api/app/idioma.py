@@ -0,0 +1,203 @@
+# ============================================
+# IDIOMA - DETECCIÓN RÁPIDA Y DETERMINISTA
+# ============================================
+
+import re
+import threading
+from typing import Dict, List, Optional
+import logging
+
+from . import config
+from .cache import CachePredicciones
+from .normalizacion import limpiar_many
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+# Palabras frecuentes del español que no existen (con esa grafía) en los
+# otros idiomas latinos que detecta langdetect: portugués, italiano, catalán,
+# francés, gallego... Palabras compartidas como 'una', 'lo', 'mi', 'su', 'es',
+# 'sin', 'el', 'del', 'y', 'porque' o 'todos' no cuentan: con ellas una reseña
+# italiana o portuguesa tomaría el atajo y se puntuaría sin traducir
+STOPWORDS_ES = frozenset("""
+    los las muy están estaba estaban estoy fue fueron unos unas sus hay
+    también cuando más ya hasta así estos eso allí había qué cómo usted
+    ustedes ellos nosotros gustó encantó volvería habitación bueno buena
+    pésimo pésima
+""".split())
+
+# Palabras frecuentes de idiomas que langdetect confunde con el español
+STOPWORDS_OTROS = frozenset("""
+    the and is was were are very this that with for not but you it of
+    não muito é os um uma com do da dos das em você foi eram mas também isso
+    et est très une des du il elle nous vous sont avec pour pas
+    il di che molto è sono della degli gli anche questo per ho ma nel
+""".split())
+
+CARACTERES_ES = frozenset("ñ¿¡")
+CARACTERES_OTROS = frozenset("ãõçàèùâêîôûœ")
+
+_PATRON_PALABRAS = re.compile(r"\w+")
+
+
+class DetectorIdioma:
+    """
+    Detección de idioma sobre langdetect con perfiles cargados una sola vez
+    y semilla fija (mismo texto, mismo resultado).
+
+    Antes del detector completo aplica una heurística de palabras y
+    caracteres que resuelve sin coste el texto claramente en español, y
+    guarda el resultado por texto normalizado (app.normalizacion).
+    """
+
+    # Mínimo de palabras exclusivas del español para el atajo
+    MIN_STOPWORDS_ES = 2
+
+    # Proporción mínima de esas palabras sobre el total
+    MIN_PROPORCION_ES = 0.2
+
+    def __init__(self, max_cache: int = 20000, semilla: int = 0):
+        """
+        Args:
+            max_cache: Máximo de textos normalizados con resultado guardado
+            semilla: Semilla del muestreo aleatorio de langdetect
+        """
+        from langdetect.detector_factory import DetectorFactory, PROFILES_DIRECTORY
+
+        self._fabrica = DetectorFactory()
+        self._fabrica.load_profile(PROFILES_DIRECTORY)
+        self._fabrica.set_seed(semilla)
+
+        self.cache = CachePredicciones(max_entradas=max_cache, ttl_segundos=float("inf"))
+
+        self._lock = threading.Lock()
+        self._atajos = 0
+        self._detecciones = 0
+
+        logger.info(f"✅ Detector de idioma cargado ({len(self._fabrica.langlist)} idiomas)")
+
+    # ============================================
+    # DETECCIÓN
+    # ============================================
+
+    def _es_espanol(self, normalizado: str) -> bool:
+        """Heurística: ¿el texto es claramente español?"""
+        palabras = _PATRON_PALABRAS.findall(normalizado)
+        if not palabras:
+            return False
+
+        if any(p in STOPWORDS_OTROS for p in palabras):
+            return False
+        if any(c in CARACTERES_OTROS for c in normalizado):
+            return False
+
+        coincidencias = sum(p in STOPWORDS_ES for p in palabras)
+        if any(c in CARACTERES_ES for c in normalizado):
+            coincidencias += 1
+
+        return (
+            coincidencias >= self.MIN_STOPWORDS_ES
+            and coincidencias / len(palabras) >= self.MIN_PROPORCION_ES
+        )
+
+    def _detectar_normalizado(self, normalizado: str) -> Optional[str]:
+        """Resuelve un texto normalizado (sin pasar por la cache)."""
+        if not normalizado:
+            return None
+
+        if self._es_espanol(normalizado):
+            with self._lock:
+                self._atajos += 1
+            return 'es'
+
+        with self._lock:
+            self._detecciones += 1
+        try:
+            detector = self._fabrica.create()
+            detector.append(normalizado)
+            return detector.detect()
+        except Exception as e:
+            logger.warning(f"Error detectando idioma: {str(e)}")
+            return None
+
+    def detectar(self, texto: str) -> Optional[str]:
+        """
+        Detecta el idioma de un texto.
+
+        Returns:
+            Código del idioma o None si no se puede detectar
+        """
+        return self.detectar_muchos([texto])[0]
+
+    def detectar_muchos(self, textos: List[str]) -> List[Optional[str]]:
+        """
+        Detecta el idioma de varios textos; los que coinciden una vez
+        normalizados se resuelven una sola vez.
+
+        Returns:
+            Lista alineada con la entrada (None donde falla la detección)
+        """
+        # Clave de detección: la misma limpieza que recibe el modelo
+        normalizados = limpiar_many(textos)
+        unicos = list(dict.fromkeys(normalizados))
+
+        idiomas: Dict[str, Optional[str]] = dict(zip(unicos, self.cache.obtener_muchos(unicos)))
+        nuevos = []
+        for normalizado, idioma in idiomas.items():
+            if idioma is None:
+                idioma = self._detectar_normalizado(normalizado)
+                idiomas[normalizado] = idioma
+                if idioma is not None:
+                    nuevos.append((normalizado, idioma))
+
+        if nuevos:
+            self.cache.guardar_muchos(nuevos)
+
+        return [idiomas[normalizado] for normalizado in normalizados]
+
+    # ============================================
+    # MÉTRICAS
+    # ============================================
+
+    def estadisticas(self) -> Dict:
+        """
+        Obtiene los contadores del detector.
+
+        Returns:
+            Dict con atajos de español, detecciones completas y cache
+        """
+        with self._lock:
+            atajos, detecciones = self._atajos, self._detecciones
+        cache = self.cache.estadisticas()
+        return {
+            "atajos_espanol": atajos,
+            "detecciones_completas": detecciones,
+            "cache_entradas": cache["entradas"],
+            "cache_aciertos": cache["aciertos"],
+            "cache_tasa_aciertos": cache["tasa_aciertos"]
+        }
+
+
+# ============================================
+# INSTANCIA GLOBAL
+# ============================================
+
+_detector: Optional[DetectorIdioma] = None
+_detector_lock = threading.Lock()
+
+
+def obtener_detector() -> DetectorIdioma:
+    """
+    Obtiene el detector del proceso (carga los perfiles en el primer uso;
+    la API lo crea al arrancar).
+
+    Returns:
+        DetectorIdioma configurado según app/config.py
+    """
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = DetectorIdioma(max_cache=config.IDIOMA_CACHE_MAX)
+    return _detector
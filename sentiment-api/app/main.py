@@ -2,13 +2,15 @@
 # MAIN - API FASTAPI PRINCIPAL
 # ============================================
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
+import asyncio
+import hmac
 import logging
 from datetime import datetime
 import time
-from typing import List
+from typing import List, Optional
 
 # Importar schemas
 from .schemas import (
@@ -26,7 +28,17 @@ from .schemas import (
 )
 
 # Importar predictor
-from .prediccion import inicializar_predictor, obtener_predictor
+from .prediccion import inicializar_predictor, obtener_predictor, obtener_registro, usar_predictor
+from .ejecucion import cerrar_ejecutor, monitor_loop, obtener_ejecutor, obtener_ejecutor_admin
+from .idioma import obtener_detector
+from .traduccion import cerrar_cliente_traduccion, obtener_cliente_traduccion
+from .config import ADMIN_TOKEN, PRECARGA_MODELO, SOMBRA_MODELO, STREAM_MAX_BYTES_LINEA, STREAM_TAMANO_BLOQUE
+from . import memoria
+from .flujo import RespuestaNDJSON, puntuar_flujo
+from .trabajos import ArchivoDemasiadoGrande, cerrar_gestor_trabajos, obtener_gestor_trabajos
+from .sombra import detener_sombra, iniciar_sombra, obtener_evaluador
+from .metricas import MiddlewareMetricas, registro_metricas
+from .perfilado import MiddlewareServerTiming, formato_colapsado, perfilador
 
 # Configurar logging
 logging.basicConfig(
@@ -59,6 +71,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ============================================
+# MÉTRICAS POR PETICIÓN
+# ============================================
+
+# Latencia, peticiones y errores por endpoint (ver app/metricas.py)
+app.add_middleware(MiddlewareMetricas)
+
+# Cabecera Server-Timing con la duración por etapa (ver app/perfilado.py)
+app.add_middleware(MiddlewareServerTiming)
+
+# ============================================
+# PRECARGA DEL MODELO (PRE-FORK)
+# ============================================
+
+# Con gunicorn --preload este módulo se importa en el proceso maestro:
+# los workers heredan el modelo ya cargado (ver app/memoria.py)
+if PRECARGA_MODELO:
+    memoria.precargar_en_maestro()
+
 # ============================================
 # EVENTOS DE INICIO/CIERRE
 # ============================================
@@ -68,7 +99,14 @@ async def startup_event():
     """Se ejecuta al iniciar la aplicación"""
     try:
         logger.info("🚀 Iniciando Sentiment Analysis API...")
-        inicializar_predictor()
+        if PRECARGA_MODELO:
+            memoria.iniciar_worker()
+        else:
+            inicializar_predictor()
+            obtener_detector()
+        if SOMBRA_MODELO:
+            iniciar_sombra(SOMBRA_MODELO)
+        monitor_loop.iniciar()
         logger.info("✅ API iniciada correctamente")
     except Exception as e:
         logger.error(f"❌ Error al iniciar la API: {e}")
@@ -79,6 +117,16 @@ async def startup_event():
 async def shutdown_event():
     """Se ejecuta al cerrar la aplicación"""
     logger.info("👋 Cerrando Sentiment Analysis API...")
+    await monitor_loop.detener()
+    detener_sombra()
+    cerrar_gestor_trabajos()
+    try:
+        obtener_predictor().cerrar()
+    except RuntimeError:
+        # El predictor no llegó a inicializarse
+        pass
+    cerrar_cliente_traduccion()
+    cerrar_ejecutor()
 
 
 # ============================================
@@ -116,8 +164,25 @@ async def root():
             "sentiment": "/sentiment (POST)",
             "sentiment_explain": "/sentiment/explain (POST)",
             "batch": "/sentiment/batch (POST)",
+            "compare": "/sentiment/compare (POST)",
+            "thresholds": "/sentiment/thresholds (POST)",
+            "stream": "/sentiment/stream (POST, NDJSON)",
+            "jobs": "/jobs (POST archivo, GET)",
+            "job_status": "/jobs/{id} (GET)",
+            "job_result": "/jobs/{id}/result (GET)",
             "stats": "/stats (GET)",
-            "threshold": "/threshold (POST)"
+            "threshold": "/threshold (POST)",
+            "microbatch_stats": "/microbatch/stats (GET)",
+            "cache_stats": "/cache/stats (GET)",
+            "translation_stats": "/translation/stats (GET)",
+            "runtime_stats": "/runtime/stats (GET)",
+            "memory_stats": "/memory/stats (GET)",
+            "metrics": "/metrics (GET, Prometheus)",
+            "admin_profile": "/admin/profile (POST, pilas colapsadas)",
+            "models": "/models (GET)",
+            "models_activate": "/models/{nombre}/activate (POST)",
+            "shadow": "/shadow (POST, DELETE)",
+            "shadow_stats": "/shadow/stats (GET)"
         }
     }
 
@@ -163,27 +228,24 @@ async def analyze_sentiment(request: SentimentRequest):
     
     - **text**: Texto a analizar (mínimo 3 caracteres)
     - **idioma**: Código del idioma ('auto' para detección automática, 'es', 'en', 'pt', etc.)
-    - **threshold**: Umbral de decisión personalizado (opcional, 0.0-1.0)
+    - **threshold**: Umbral de decisión personalizado (opcional, 0.0-1.0); solo
+      se aplica a esta petición (default: el de POST /threshold)
     
     Returns:
         Sentimiento predicho (Positivo/Negativo) con probabilidad
     """
     try:
-        predictor = obtener_predictor()
-        
-        # Configurar threshold si se proporciona
-        if request.threshold is not None:
-            predictor.configurar_threshold(request.threshold)
-        
         # Determinar si necesita traducción
         traducir = request.idioma != 'es'
         
-        # Realizar predicción
-        resultado = predictor.predecir(
-            texto=request.text,
-            traducir=traducir,
-            idioma_origen=request.idioma
-        )
+        # Realizar predicción (agrupada con peticiones concurrentes)
+        with usar_predictor() as predictor:
+            resultado = await predictor.predecir_async(
+                texto=request.text,
+                traducir=traducir,
+                idioma_origen=request.idioma,
+                threshold=request.threshold
+            )
         
         logger.info(f"Predicción exitosa: {resultado.prevision} ({resultado.probabilidad:.4f})")
         
@@ -209,7 +271,8 @@ async def explain_sentiment(request: dict):
     Body:
         - text (str): Texto a analizar
         - idioma (str, opcional): Código de idioma ('es', 'en', 'pt', 'auto')
-        - threshold (float, opcional): Umbral de clasificación
+        - threshold (float, opcional): Umbral de clasificación de esta petición
+          (default: el de POST /threshold)
         - top_n (int, opcional): Número de palabras a mostrar (default: 10)
     
     Returns:
@@ -222,30 +285,25 @@ async def explain_sentiment(request: dict):
             raise HTTPException(status_code=400, detail="El campo 'text' es requerido y no puede estar vacío")
         
         idioma = request.get("idioma", "auto")
-        threshold = request.get("threshold", 0.5)
+        threshold = request.get("threshold")
         top_n = request.get("top_n", 10)
         
         # Validar threshold
-        if not 0 <= threshold <= 1:
+        if threshold is not None and (not isinstance(threshold, (int, float)) or not 0 <= threshold <= 1):
             raise HTTPException(status_code=400, detail="El threshold debe estar entre 0 y 1")
         
-        # Obtener predictor
-        predictor = obtener_predictor()
-        
-        # Cambiar threshold si es diferente al default
-        if threshold != 0.5:
-            predictor.configurar_threshold(threshold)
-        
         # Determinar si traducir
         traducir = idioma != 'es' and idioma != 'auto'
         
-        # Usar la función existente predecir_con_explicacion
-        resultado = predictor.predecir_con_explicacion(
-            texto=texto,
-            top_n=top_n,
-            traducir=traducir,
-            idioma_origen=idioma if idioma != 'auto' else 'auto'
-        )
+        # Traducción en el cliente asíncrono, cálculo en el pool de inferencia
+        with usar_predictor() as predictor:
+            resultado = await predictor.predecir_con_explicacion_async(
+                texto=texto,
+                top_n=top_n,
+                traducir=traducir,
+                idioma_origen=idioma if idioma != 'auto' else 'auto',
+                threshold=threshold
+            )
         
         # Convertir palabras_importantes al formato esperado por el frontend
         palabras_importantes_formateadas = []
@@ -319,12 +377,17 @@ async def analyze_batch(request: dict):
     
     - **textos**: Lista de textos a analizar
     - **idioma**: Código de idioma o 'auto' para detección automática
+    - **threshold**: Umbral de decisión de esta petición (opcional, 0.0-1.0)
+    
+    Con 'auto' detecta el idioma de todos los textos, los agrupa por idioma
+    y traduce cada grupo con una sola petición masiva antes de puntuar.
     
-    Retorna estadísticas agregadas y resultados individuales
+    Retorna estadísticas agregadas, resultados individuales y tiempos por etapa
     """
     try:
         textos = request.get("textos", [])
         idioma = request.get("idioma", "auto")
+        threshold = request.get("threshold")
         
         logger.info(f"📦 Recibida petición batch con {len(textos)} textos")
         
@@ -340,50 +403,41 @@ async def analyze_batch(request: dict):
                 detail=f"Máximo 1000 textos. Se recibieron {len(textos)}"
             )
         
-        # Obtener el predictor
-        predictor = obtener_predictor()
+        if threshold is not None and (not isinstance(threshold, (int, float)) or not 0 <= threshold <= 1):
+            raise HTTPException(status_code=400, detail="El threshold debe estar entre 0 y 1")
         
         logger.info(f"🔄 Iniciando procesamiento de {len(textos)} textos")
         start_time = time.time()
         
-        # Procesar todos los textos
+        # Determinar si necesita traducción ('auto' detecta y agrupa por idioma)
+        traducir = idioma != 'es'
+        
+        # Procesar todos los textos en una sola pasada vectorizada
+        # (fuera del event loop: pool de inferencia y traducción asíncrona)
+        with usar_predictor() as predictor:
+            lote = await predictor.predecir_lote_async(
+                textos=textos,
+                traducir=traducir,
+                idioma_origen=idioma,
+                threshold=threshold
+            )
+        
         resultados = []
         errores = 0
         
-        for idx, texto_original in enumerate(textos, 1):
-            try:
-                # Validar que el texto no esté vacío
-                if not texto_original or not texto_original.strip():
-                    logger.warning(f"Texto {idx} está vacío, saltando...")
-                    errores += 1
-                    continue
-                
-                # Determinar si necesita traducción
-                traducir = idioma != 'es' and idioma != 'auto'
-                
-                # Usar el método predecir del predictor
-                resultado_pred = predictor.predecir(
-                    texto=texto_original,
-                    traducir=traducir,
-                    idioma_origen=idioma if idioma != 'auto' else None
-                )
-                
-                resultados.append({
-                    "texto": texto_original[:200],  # Limitar longitud en respuesta
-                    "prevision": resultado_pred.prevision,
-                    "probabilidad": float(resultado_pred.probabilidad),
-                    "confianza": resultado_pred.confianza,
-                    "idioma_detectado": resultado_pred.idioma_detectado if hasattr(resultado_pred, 'idioma_detectado') else idioma
-                })
-                
-                # Log cada 50 textos
-                if idx % 50 == 0:
-                    logger.info(f"Procesados {idx}/{len(textos)} textos...")
-                    
-            except Exception as e:
-                logger.warning(f"Error procesando texto {idx}: {str(e)}")
+        for idx, texto_original in enumerate(textos):
+            if not lote['validos'][idx]:
+                logger.warning(f"Error procesando texto {idx + 1}: {lote['errores'][idx]}")
                 errores += 1
                 continue
+            
+            resultados.append({
+                "texto": texto_original[:200],  # Limitar longitud en respuesta
+                "prevision": lote['prevision'][idx],
+                "probabilidad": round(float(lote['probabilidad'][idx]), 4),
+                "confianza": lote['confianza'][idx],
+                "idioma_detectado": lote['idioma_detectado'][idx]
+            })
         
         elapsed_time = time.time() - start_time
         
@@ -406,6 +460,7 @@ async def analyze_batch(request: dict):
             "porcentaje_positivos": round(porcentaje_positivos, 2),
             "resultados": resultados,
             "tiempo_procesamiento_segundos": round(elapsed_time, 2),
+            "tiempos_etapas": lote['tiempos_etapas'],
             "errores": errores
         }
         
@@ -419,6 +474,266 @@ async def analyze_batch(request: dict):
         )
 
 
+# ============================================
+# ENDPOINT: BARRIDO DE THRESHOLDS
+# ============================================
+
+@app.post("/sentiment/thresholds", tags=["Batch Processing"])
+async def sweep_thresholds(request: dict):
+    """
+    Evaluar varios thresholds sobre un lote para ajustar el umbral.
+    
+    - **textos**: Lista de textos (máximo 20000)
+    - **thresholds**: Lista de thresholds a evaluar (máximo 1000, cada uno 0.0-1.0)
+    - **etiquetas**: Clase real de cada texto ('Positivo'/'Negativo'), opcional;
+      con ellas se devuelve la matriz de confusión, precision, recall, F1 y
+      exactitud de cada threshold
+    - **idioma**: Código de idioma (default: 'es', sin traducción)
+    - **incluir_predicciones**: Si es true, añade la clase de cada texto por threshold
+    
+    Las probabilidades se calculan una sola vez; cada threshold solo añade
+    una comparación vectorizada. No modifica el threshold del servicio.
+    
+    Retorna los conteos de cada threshold y el mejor por F1 (con etiquetas)
+    """
+    try:
+        textos = request.get("textos", [])
+        thresholds = request.get("thresholds", [])
+        etiquetas = request.get("etiquetas")
+        idioma = request.get("idioma", "es")
+        
+        if not isinstance(textos, list) or len(textos) == 0:
+            raise HTTPException(status_code=400, detail="La lista de textos está vacía")
+        
+        if len(textos) > 20000:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Máximo 20000 textos. Se recibieron {len(textos)}"
+            )
+        
+        if not isinstance(thresholds, list) or len(thresholds) == 0:
+            raise HTTPException(status_code=400, detail="Se requiere una lista 'thresholds' no vacía")
+        
+        if len(thresholds) > 1000:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Máximo 1000 thresholds. Se recibieron {len(thresholds)}"
+            )
+        
+        if not all(isinstance(t, (int, float)) and not isinstance(t, bool) for t in thresholds):
+            raise HTTPException(status_code=400, detail="Cada threshold debe ser un número entre 0 y 1")
+        
+        if etiquetas is not None and not isinstance(etiquetas, list):
+            raise HTTPException(status_code=400, detail="'etiquetas' debe ser una lista")
+        
+        logger.info(f"🎚️ Barrido de {len(thresholds)} thresholds sobre {len(textos)} textos")
+        
+        with usar_predictor() as predictor:
+            return await obtener_ejecutor_admin().ejecutar(
+                predictor.barrer_thresholds,
+                textos,
+                thresholds,
+                etiquetas,
+                idioma != 'es',
+                idioma,
+                bool(request.get("incluir_predicciones", False))
+            )
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Error en barrido de thresholds: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error en barrido de thresholds: {str(e)}"
+        )
+
+
+# ============================================
+# ENDPOINT: ANÁLISIS EN STREAMING (NDJSON)
+# ============================================
+
+@app.post("/sentiment/stream", tags=["Batch Processing"])
+async def analyze_stream(request: Request, idioma: str = "auto"):
+    """
+    Análisis de una entrada NDJSON de cualquier tamaño, con salida NDJSON.
+    
+    - **cuerpo**: Una línea por texto: un string JSON o un objeto con
+      'text' y un 'id' opcional que se devuelve con el resultado
+    - **idioma** (query): Código de idioma o 'auto' para detección automática
+    
+    La entrada se lee a medida que llega y se puntúa en bloques de
+    STREAM_TAMANO_BLOQUE textos; cada resultado se envía en cuanto está
+    listo, así que la memoria no crece con el tamaño de la entrada y no hay
+    límite de textos. El cliente debe leer la respuesta mientras envía la
+    entrada (p. ej. curl -T archivo.ndjson): un cliente que envía todo el
+    cuerpo antes de leer se bloquea cuando se llenan los buffers.
+    
+    Retorna una línea por texto ('indice' = línea de entrada) y una última
+    línea 'resumen' con los totales
+    """
+    # Falla antes de empezar la respuesta si el modelo no está cargado; el
+    # flujo retiene el predictor mientras dura (ver puntuar_flujo)
+    obtener_predictor()
+    logger.info("🌊 Recibida petición de streaming NDJSON")
+    
+    return RespuestaNDJSON(puntuar_flujo(
+        request,
+        traducir=idioma != 'es',
+        idioma_origen=idioma,
+        tamano_bloque=STREAM_TAMANO_BLOQUE,
+        max_bytes_linea=STREAM_MAX_BYTES_LINEA
+    ))
+
+
+# ============================================
+# ENDPOINT: TRABAJOS MASIVOS (ARCHIVOS)
+# ============================================
+
+@app.post("/jobs", status_code=status.HTTP_202_ACCEPTED, tags=["Batch Processing"])
+async def create_job(
+    archivo: UploadFile = File(...),
+    columna: Optional[str] = Form(None),
+    columna_id: Optional[str] = Form(None),
+    idioma: str = Form("es")
+):
+    """
+    Crear un trabajo de puntuación masiva a partir de un archivo.
+    
+    - **archivo**: CSV (con cabecera), JSONL o Parquet de reseñas
+    - **columna**: Columna/campo del texto (default: text, texto, review...)
+    - **columna_id**: Columna/campo que se copia como 'id' en los resultados
+    - **idioma**: 'es' (default, sin traducción) u otro código / 'auto'
+    
+    El archivo se procesa en segundo plano por bloques y sin límite de
+    filas; el progreso se consulta en GET /jobs/{id} y los resultados (en el
+    mismo formato) se descargan de GET /jobs/{id}/result.
+    
+    Returns:
+        Estado inicial del trabajo (con su id)
+    """
+    try:
+        return await obtener_ejecutor_admin().ejecutar(
+            obtener_gestor_trabajos().crear,
+            archivo.filename or "",
+            archivo.file,
+            columna=columna,
+            columna_id=columna_id,
+            idioma=idioma
+        )
+    except ArchivoDemasiadoGrande as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        await archivo.close()
+
+
+@app.get("/jobs", tags=["Batch Processing"])
+async def list_jobs(limite: int = 50):
+    """
+    Listar los trabajos más recientes.
+    
+    Returns:
+        Lista de trabajos con su estado y progreso
+    """
+    return await obtener_ejecutor_admin().ejecutar(obtener_gestor_trabajos().listar, limite)
+
+
+@app.get("/jobs/{id_trabajo}", tags=["Batch Processing"])
+async def get_job(id_trabajo: str):
+    """
+    Consultar el estado y el progreso de un trabajo.
+    
+    Returns:
+        Estado (pendiente, procesando, completado, error), filas procesadas,
+        totales por clase, porcentaje leído del archivo y velocidad
+    """
+    trabajo = await obtener_ejecutor_admin().ejecutar(obtener_gestor_trabajos().obtener, id_trabajo)
+    if trabajo is None:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return trabajo
+
+
+@app.get("/jobs/{id_trabajo}/result", tags=["Batch Processing"])
+async def get_job_result(id_trabajo: str):
+    """
+    Descargar los resultados de un trabajo completado.
+    
+    Returns:
+        Archivo CSV, JSONL o Parquet con una fila por fila de entrada (fila, id,
+        prevision, probabilidad, confianza, idioma_detectado, error)
+    """
+    gestor = obtener_gestor_trabajos()
+    ruta = await obtener_ejecutor_admin().ejecutar(gestor.ruta_resultado, id_trabajo)
+    if ruta is None:
+        trabajo = await obtener_ejecutor_admin().ejecutar(gestor.obtener, id_trabajo)
+        if trabajo is None:
+            raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+        raise HTTPException(status_code=409, detail=f"El trabajo no está completado (estado: {trabajo['estado']})")
+    
+    media_type = {".csv": "text/csv", ".jsonl": "application/x-ndjson"}.get(ruta.suffix, "application/octet-stream")
+    return FileResponse(ruta, media_type=media_type, filename=f"resultados_{id_trabajo}{ruta.suffix}")
+
+
+# ============================================
+# ENDPOINT: COMPARACIÓN DE MODELOS
+# ============================================
+
+@app.post("/sentiment/compare", tags=["Sentiment Analysis"])
+async def compare_models(request: dict):
+    """
+    Comparar todas las versiones de modelo registradas sobre los mismos textos.
+    
+    - **text**: Texto a comparar, o
+    - **textos**: Lista de textos (máximo 1000)
+    - **threshold**: Umbral de decisión (default: el threshold actual)
+    
+    Los textos se limpian y vectorizan una sola vez (por vectorizador
+    distinto) y cada versión solo añade su producto por los pesos. No se
+    traducen: se comparan tal como llegan.
+    
+    Retorna la predicción de cada versión por texto y el acuerdo entre versiones
+    """
+    try:
+        textos = request.get("textos")
+        if textos is None:
+            texto = request.get("text", "")
+            textos = [texto] if texto else []
+        
+        if not isinstance(textos, list) or len(textos) == 0:
+            raise HTTPException(status_code=400, detail="Se requiere 'text' o una lista 'textos' no vacía")
+        
+        if len(textos) > 1000:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Máximo 1000 textos. Se recibieron {len(textos)}"
+            )
+        
+        threshold = request.get("threshold")
+        if threshold is None:
+            threshold = obtener_predictor().threshold
+        elif not isinstance(threshold, (int, float)) or not 0 <= threshold <= 1:
+            raise HTTPException(status_code=400, detail="El threshold debe estar entre 0 y 1")
+        
+        logger.info(f"⚖️ Comparando modelos sobre {len(textos)} textos")
+        
+        return await obtener_ejecutor_admin().ejecutar(obtener_registro().comparar, textos, float(threshold))
+        
+    except HTTPException:
+        raise
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Error comparando modelos: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error comparando modelos: {str(e)}"
+        )
+
+
 # ============================================
 # ENDPOINT: ESTADÍSTICAS DEL MODELO
 # ============================================
@@ -455,6 +770,316 @@ async def get_model_stats():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ============================================
+# ENDPOINT: MÉTRICAS DE MICRO-BATCHING
+# ============================================
+
+@app.get("/microbatch/stats", tags=["Model Info"])
+async def get_microbatch_stats():
+    """
+    Obtener métricas del agrupador de peticiones concurrentes de /sentiment.
+    
+    Returns:
+        Profundidad de cola, lotes procesados y tamaño de lote
+    """
+    predictor = obtener_predictor()
+    
+    if predictor.microbatcher is None:
+        return {"activo": False}
+    
+    return {"activo": True, **predictor.microbatcher.estadisticas()}
+
+
+# ============================================
+# ENDPOINT: CACHE DE PREDICCIONES
+# ============================================
+
+@app.get("/cache/stats", tags=["Model Info"])
+async def get_cache_stats():
+    """
+    Obtener contadores de la cache de predicciones.
+    
+    Returns:
+        Tamaño, aciertos, fallos, desalojos y tasa de aciertos
+    """
+    predictor = obtener_predictor()
+    
+    if predictor.cache is None:
+        return {"activa": False}
+    
+    return {"activa": True, **predictor.cache.estadisticas()}
+
+
+@app.delete("/cache", tags=["Configuration"])
+async def clear_cache():
+    """
+    Vaciar la cache de predicciones.
+    
+    Returns:
+        Confirmación de la invalidación
+    """
+    predictor = obtener_predictor()
+    
+    if predictor.cache is None:
+        raise HTTPException(status_code=404, detail="La cache de predicciones está desactivada")
+    
+    predictor.cache.invalidar()
+    return {"mensaje": "Cache de predicciones invalidada"}
+
+
+# ============================================
+# ENDPOINT: CLIENTE DE TRADUCCIÓN
+# ============================================
+
+@app.get("/translation/stats", tags=["Model Info"])
+async def get_translation_stats():
+    """
+    Obtener contadores del cliente de traducción, de su cache persistente y
+    del detector de idioma.
+    
+    Returns:
+        Backend, llamadas, reintentos, errores, timeouts, estado de la cache
+        y atajos/detecciones del detector de idioma
+    """
+    cliente = obtener_cliente_traduccion()
+    estadisticas = cliente.estadisticas()
+    
+    if cliente.cache is not None:
+        estadisticas["cache"] = cliente.cache.estadisticas()
+    
+    estadisticas["deteccion_idioma"] = obtener_detector().estadisticas()
+    return estadisticas
+
+
+# ============================================
+# ENDPOINT: EJECUCIÓN (POOLS Y EVENT LOOP)
+# ============================================
+
+@app.get("/runtime/stats", tags=["Model Info"])
+async def get_runtime_stats():
+    """
+    Obtener el estado de los pools de inferencia y el retraso del event loop.
+    
+    Returns:
+        Tareas de los pools de inferencia y de administración, bloques del
+        pool de procesos (si está activo) y retraso medio/máximo del event loop
+    """
+    predictor = obtener_predictor()
+    
+    return {
+        "inferencia": obtener_ejecutor().estadisticas(),
+        "admin": obtener_ejecutor_admin().estadisticas(),
+        "procesos": predictor.procesos.estadisticas() if predictor.procesos is not None else None,
+        "event_loop": monitor_loop.estadisticas()
+    }
+
+
+# ============================================
+# ENDPOINT: MEMORIA POR WORKER
+# ============================================
+
+@app.get("/memory/stats", tags=["Model Info"])
+async def get_memory_stats():
+    """
+    Obtener el uso de memoria de este worker y, con el modelo precargado
+    en el maestro, el de todos los workers.
+    
+    Returns:
+        RSS/PSS del proceso, objetos congelados por gc.freeze y reporte por
+        worker (PSS total = memoria real del grupo)
+    """
+    # Lee /proc/*/smaps_rollup y los reportes de los demás workers
+    return await obtener_ejecutor_admin().ejecutar(memoria.estadisticas)
+
+
+# ============================================
+# ENDPOINT: MÉTRICAS (PROMETHEUS)
+# ============================================
+
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Model Info"])
+async def get_metrics():
+    """
+    Obtener las métricas de este worker en formato de texto de Prometheus.
+    
+    Returns:
+        Histogramas por etapa y por endpoint, contadores de peticiones y
+        errores, tamaños de lote, cache, traducción y modelo activo
+    """
+    return PlainTextResponse(registro_metricas.exportar(), media_type="text/plain; version=0.0.4")
+
+
+# ============================================
+# ENDPOINT: PERFILADOR (ADMINISTRACIÓN)
+# ============================================
+
+def _verificar_admin(request: Request):
+    """
+    Comprueba la cabecera X-Admin-Token si ADMIN_TOKEN está configurado.
+    
+    Raises:
+        HTTPException: 403 si el token no coincide
+    """
+    if ADMIN_TOKEN and not hmac.compare_digest(
+        request.headers.get("x-admin-token", "").encode(), ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Token de administración inválido")
+
+
+@app.post("/admin/profile", tags=["Configuration"])
+async def run_profiler(
+    request: Request,
+    segundos: float = 10.0,
+    peticiones: Optional[int] = None,
+    intervalo_ms: Optional[float] = None,
+    incluir_inactivos: bool = False,
+    formato: str = "colapsado"
+):
+    """
+    Perfilar este worker por muestreo durante un tiempo o un número de peticiones.
+    
+    - **segundos**: Duración máxima (default: 10, límite PERFILADOR_MAX_SEGUNDOS)
+    - **peticiones**: Termina antes si se completan estas peticiones (opcional)
+    - **intervalo_ms**: Tiempo entre muestras (default: PERFILADOR_INTERVALO_MS)
+    - **incluir_inactivos**: Conservar las pilas de hilos en espera (pools ociosos)
+    - **formato**: 'colapsado' (texto para flamegraph.pl/speedscope) o 'json'
+    
+    Requiere la cabecera X-Admin-Token si ADMIN_TOKEN está configurado. La
+    petición queda abierta mientras dura el perfilado; solo puede haber uno
+    a la vez por worker.
+    
+    Returns:
+        Pilas colapsadas ('hilo;modulo:funcion;... muestras' por línea) con
+        muestras, peticiones y duración en cabeceras X-Perfil-*, o un JSON
+        con los mismos datos
+    """
+    _verificar_admin(request)
+    
+    if formato not in ("colapsado", "json"):
+        raise HTTPException(status_code=400, detail="'formato' debe ser 'colapsado' o 'json'")
+    
+    try:
+        perfil = await asyncio.to_thread(
+            perfilador.perfilar, segundos, peticiones, intervalo_ms, incluir_inactivos
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    if formato == "json":
+        return perfil
+    
+    return PlainTextResponse(formato_colapsado(perfil["pilas"]), headers={
+        "X-Perfil-Muestras": str(perfil["muestras"]),
+        "X-Perfil-Peticiones": str(perfil["peticiones"]),
+        "X-Perfil-Duracion-Segundos": str(perfil["duracion_segundos"]),
+        "X-Perfil-Coste-Ms": str(perfil["coste_muestreo_ms"])
+    })
+
+
+# ============================================
+# ENDPOINT: REGISTRO DE MODELOS
+# ============================================
+
+@app.get("/models", tags=["Model Info"])
+async def list_models():
+    """
+    Listar las versiones de modelo disponibles.
+    
+    Returns:
+        Versiones (.pkl y bundles de MODELOS_DIRECTORIO), cuál está activa y
+        el estado de la última activación
+    """
+    return obtener_registro().listar()
+
+
+@app.post("/models/{nombre}/activate", status_code=status.HTTP_202_ACCEPTED, tags=["Configuration"])
+async def activate_model(nombre: str, request: Request):
+    """
+    Activar una versión de modelo sin reiniciar.
+    
+    La versión se carga y se calienta en segundo plano (también la cache de
+    predicciones) y después sustituye al modelo actual; las peticiones en
+    curso terminan con el anterior. El progreso se consulta en GET /models
+    (campo 'activacion').
+    
+    Requiere la cabecera X-Admin-Token si ADMIN_TOKEN está configurado.
+    
+    Returns:
+        Estado de la activación ('cargando')
+    """
+    _verificar_admin(request)
+    
+    try:
+        return obtener_registro().activar(nombre)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+# ============================================
+# ENDPOINT: MODELO SOMBRA
+# ============================================
+
+@app.post("/shadow", tags=["Configuration"])
+async def start_shadow(request: dict):
+    """
+    Evaluar una versión de modelo en sombra con tráfico real.
+    
+    - **modelo**: Versión del registro (ver GET /models)
+    - **muestreo**: Fracción de textos copiados (default: SOMBRA_MUESTREO)
+    
+    Una muestra de los textos puntuados se copia a una cola acotada y se
+    puntúa con el candidato en segundo plano; las respuestas no cambian ni
+    esperan al candidato. Sustituye al modelo sombra anterior.
+    
+    Returns:
+        Métricas iniciales del evaluador
+    """
+    modelo = request.get("modelo")
+    if not modelo:
+        raise HTTPException(status_code=400, detail="El campo 'modelo' es requerido")
+    
+    try:
+        evaluador = await obtener_ejecutor_admin().ejecutar(iniciar_sombra, modelo, request.get("muestreo"))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return evaluador.estadisticas()
+
+
+@app.delete("/shadow", tags=["Configuration"])
+async def stop_shadow():
+    """
+    Dejar de evaluar en sombra.
+    
+    Returns:
+        Confirmación
+    """
+    if not await obtener_ejecutor_admin().ejecutar(detener_sombra):
+        raise HTTPException(status_code=404, detail="No hay modelo sombra activo")
+    return {"mensaje": "Modelo sombra detenido"}
+
+
+@app.get("/shadow/stats", tags=["Model Info"])
+async def get_shadow_stats():
+    """
+    Obtener las métricas del modelo sombra.
+    
+    Returns:
+        Tasa de discrepancia, diferencias de probabilidad y latencia del
+        candidato sobre los últimos textos evaluados, y copias descartadas
+        por cola llena
+    """
+    evaluador = obtener_evaluador()
+    if evaluador is None:
+        return {"activo": False}
+    return {"activo": True, **evaluador.estadisticas()}
+
+
 # ============================================
 # ENDPOINT: CONFIGURAR THRESHOLD
 # ============================================
@@ -0,0 +1,169 @@
+# ============================================
+# MEMORIA - PRECARGA PRE-FORK Y USO POR WORKER
+# ============================================
+#
+# Con gunicorn --preload (ver gunicorn.conf.py) app.main se importa en el
+# proceso maestro antes de crear los workers con fork. Si PRECARGA_MODELO
+# está activo, el modelo y el detector de idioma se cargan en ese momento y
+# los workers heredan sus páginas en copy-on-write: la memoria total crece
+# con un modelo más un pequeño incremento por worker, no con N copias.
+#
+# Para que las páginas sigan compartidas:
+#   - el recolector de basura se desactiva durante la carga y los objetos
+#     cargados se congelan (gc.freeze): las colecciones de los workers no
+#     escriben en sus cabeceras y no fuerzan la copia de esas páginas. Tras
+#     congelar se reactiva, también en el maestro;
+#   - los pools de hilos, el MicroBatcher y el pool de procesos se crean en
+#     cada worker tras el fork (evento startup), nunca al importar app.main.
+
+import gc
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# PID del proceso que hizo la precarga (el maestro de gunicorn)
+_pid_maestro: Optional[int] = None
+
+# Campos de /proc/<pid>/smaps_rollup que se informan (kB en el origen)
+_CAMPOS_SMAPS = {
+    "Rss": "rss_mb",
+    "Pss": "pss_mb",
+    "Shared_Clean": "compartido_limpio_mb",
+    "Shared_Dirty": "compartido_sucio_mb",
+    "Private_Clean": "privado_limpio_mb",
+    "Private_Dirty": "privado_sucio_mb"
+}
+
+
+# ============================================
+# PRECARGA EN EL PROCESO MAESTRO
+# ============================================
+
+def precargar_en_maestro():
+    """
+    Carga el modelo y el detector antes del fork y congela los objetos
+    resultantes. Se llama al importar app.main con PRECARGA_MODELO activo.
+    """
+    global _pid_maestro
+    from .idioma import obtener_detector
+    from .prediccion import inicializar_predictor
+
+    inicio = time.perf_counter()
+    gc.disable()
+    try:
+        # Pools de hilos y de procesos: se crean en cada worker tras el fork
+        inicializar_predictor(iniciar_procesos=False)
+        obtener_detector()
+        gc.freeze()
+    finally:
+        gc.enable()
+    _pid_maestro = os.getpid()
+
+    logger.info(
+        f"✅ Modelo precargado en el proceso maestro ({(time.perf_counter() - inicio) * 1000:.0f} ms, "
+        f"{gc.get_freeze_count()} objetos congelados)"
+    )
+
+
+def iniciar_worker():
+    """
+    Completa el arranque de un worker que heredó el modelo precargado:
+    crea lo que no puede cruzar un fork (pools y MicroBatcher).
+    """
+    from .prediccion import inicializar_predictor
+
+    inicializar_predictor()
+    logger.info(f"✅ Worker {os.getpid()} usando el modelo precargado por {_pid_maestro}")
+
+
+# ============================================
+# USO DE MEMORIA
+# ============================================
+
+def memoria_proceso(pid: int) -> Dict:
+    """
+    Lee el uso de memoria de un proceso (solo Linux).
+
+    PSS reparte cada página compartida entre los procesos que la usan, por
+    lo que la suma de PSS de maestro y workers es la memoria real del grupo.
+
+    Args:
+        pid: PID del proceso
+
+    Returns:
+        Dict con RSS, PSS y páginas compartidas/privadas en MB (vacío si no
+        se puede leer)
+    """
+    memoria = {}
+    try:
+        lineas = Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()
+    except OSError:
+        return memoria
+
+    for linea in lineas:
+        partes = linea.split()
+        if len(partes) >= 2 and partes[0].rstrip(":") in _CAMPOS_SMAPS:
+            memoria[_CAMPOS_SMAPS[partes[0].rstrip(":")]] = round(int(partes[1]) / 1024, 1)
+    return memoria
+
+
+def _hijos(pid: int) -> List[int]:
+    """PIDs de los procesos hijos directos de pid."""
+    hijos = []
+    for entrada in Path("/proc").iterdir():
+        if not entrada.name.isdigit():
+            continue
+        try:
+            stat = (entrada / "stat").read_text()
+        except OSError:
+            continue
+        # El nombre del ejecutable va entre paréntesis y puede contener espacios
+        campos = stat[stat.rfind(")") + 2:].split()
+        if int(campos[1]) == pid:
+            hijos.append(int(entrada.name))
+    return sorted(hijos)
+
+
+def reporte_workers(pid_maestro: int) -> Dict:
+    """
+    Memoria del proceso maestro y de cada worker.
+
+    Args:
+        pid_maestro: PID del maestro de gunicorn
+
+    Returns:
+        Dict con el maestro, la lista de workers y los totales de RSS y PSS
+    """
+    maestro = {"pid": pid_maestro, **memoria_proceso(pid_maestro)}
+    workers = [{"pid": pid, **memoria_proceso(pid)} for pid in _hijos(pid_maestro)]
+    procesos = [maestro] + workers
+
+    return {
+        "maestro": maestro,
+        "workers": workers,
+        "total_rss_mb": round(sum(p.get("rss_mb", 0.0) for p in procesos), 1),
+        "total_pss_mb": round(sum(p.get("pss_mb", 0.0) for p in procesos), 1)
+    }
+
+
+def estadisticas() -> Dict:
+    """
+    Estado de la precarga y memoria de este proceso y, si el modelo se
+    precargó en un maestro, de todos los workers.
+
+    Returns:
+        Dict con pid, precarga, objetos congelados, memoria y reporte de workers
+    """
+    precargado = _pid_maestro is not None and _pid_maestro != os.getpid()
+    return {
+        "pid": os.getpid(),
+        "precargado_en_maestro": precargado,
+        "gc_objetos_congelados": gc.get_freeze_count(),
+        "proceso": memoria_proceso(os.getpid()),
+        "grupo": reporte_workers(_pid_maestro) if precargado else None
+    }
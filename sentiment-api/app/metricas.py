@@ -0,0 +1,389 @@
+# ============================================
+# MÉTRICAS - REGISTRO EN PROCESO Y EXPORTACIÓN PROMETHEUS
+# ============================================
+#
+# Contadores e histogramas del camino caliente (etapas de predicción,
+# peticiones por endpoint, tamaños de lote) exportados en GET /metrics con
+# el formato de texto de Prometheus.
+#
+# Registrar una observación no toma ningún lock: cada hilo escribe en su
+# propio fragmento (threading.local) y solo el hilo dueño lo modifica. La
+# exportación suma los fragmentos de todos los hilos; los contadores que ya
+# llevan otros módulos (cache, cliente de traducción, modelo activo) se leen
+# en ese momento con recolectores, sin coste en el camino caliente.
+#
+# Cada proceso exporta sus propias métricas: con varios workers de gunicorn,
+# cada scrape ve el worker que atiende la petición (etiqueta 'pid' en
+# sentiment_proceso_info).
+
+import bisect
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import config
+from .perfilado import anotar_etapa
+
+# Límites (segundos) de los histogramas de latencia: de 50 µs a 10 s
+LIMITES_SEGUNDOS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Límites de los histogramas de tamaño de lote
+LIMITES_TAMANO = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1000, 5000, 20000)
+
+# (nombre, valores de etiquetas, valor) de un recolector; tipo 'counter' o 'gauge'
+Muestra = Tuple[str, Tuple[str, ...], float]
+
+
+class _Fragmento:
+    """Métricas registradas por un hilo: solo ese hilo las modifica."""
+
+    __slots__ = ("contadores", "histogramas")
+
+    def __init__(self):
+        # (nombre, etiquetas) -> valor
+        self.contadores: Dict[Tuple[str, Tuple], float] = {}
+        # (nombre, etiquetas) -> [cuenta por límite..., cuenta +Inf, suma]
+        self.histogramas: Dict[Tuple[str, Tuple], List[float]] = {}
+
+
+class RegistroMetricas:
+    """
+    Registro de métricas con un fragmento por hilo.
+
+    Las métricas se declaran una vez (nombre, ayuda y nombres de etiquetas)
+    y se registran pasando solo los valores de las etiquetas, en el mismo
+    orden.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._fragmentos: List[_Fragmento] = []
+        self._lock = threading.Lock()
+        # nombre -> (tipo, ayuda, nombres de etiquetas, límites)
+        self._definiciones: Dict[str, Tuple[str, str, Tuple[str, ...], Tuple]] = {}
+        # (tipo, ayuda, nombres de etiquetas) por nombre de métrica recolectada
+        self._recolectados: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
+        self._recolectores: List[Callable[[], Iterable[Muestra]]] = []
+
+    # ============================================
+    # DECLARACIÓN
+    # ============================================
+
+    def contador(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = ()):
+        """Declara un contador."""
+        self._definiciones[nombre] = ("counter", ayuda, etiquetas, ())
+
+    def histograma(self, nombre: str, ayuda: str, etiquetas: Tuple[str, ...] = (), limites: Tuple = LIMITES_SEGUNDOS):
+        """Declara un histograma con sus límites (ordenados, sin +Inf)."""
+        self._definiciones[nombre] = ("histogram", ayuda, etiquetas, tuple(limites))
+
+    def recolector(
+        self,
+        funcion: Callable[[], Iterable[Muestra]],
+        metricas: Dict[str, Tuple[str, str, Tuple[str, ...]]]
+    ):
+        """
+        Añade una función que se llama en cada exportación.
+
+        Args:
+            funcion: Devuelve muestras (nombre, valores de etiquetas, valor)
+            metricas: nombre -> (tipo, ayuda, nombres de etiquetas) de las
+                métricas que produce
+        """
+        self._recolectados.update(metricas)
+        self._recolectores.append(funcion)
+
+    # ============================================
+    # REGISTRO (CAMINO CALIENTE, SIN LOCKS)
+    # ============================================
+
+    def _fragmento(self) -> _Fragmento:
+        try:
+            return self._local.fragmento
+        except AttributeError:
+            fragmento = _Fragmento()
+            self._local.fragmento = fragmento
+            with self._lock:
+                self._fragmentos.append(fragmento)
+            return fragmento
+
+    def incrementar(self, nombre: str, etiquetas: Tuple = (), valor: float = 1):
+        """Suma 'valor' a un contador."""
+        contadores = self._fragmento().contadores
+        clave = (nombre, etiquetas)
+        contadores[clave] = contadores.get(clave, 0) + valor
+
+    def observar(self, nombre: str, valor: float, etiquetas: Tuple = ()):
+        """Registra una observación en un histograma."""
+        histogramas = self._fragmento().histogramas
+        clave = (nombre, etiquetas)
+        cubetas = histogramas.get(clave)
+        limites = self._definiciones[nombre][3]
+        if cubetas is None:
+            cubetas = histogramas[clave] = [0] * (len(limites) + 2)
+        cubetas[bisect.bisect_left(limites, valor)] += 1
+        cubetas[-1] += valor
+
+    def _reiniciar(self):
+        """Descarta lo registrado (en el hijo tras un fork: no hereda el del padre)."""
+        self._local = threading.local()
+        self._fragmentos = []
+        self._lock = threading.Lock()
+
+    # ============================================
+    # EXPORTACIÓN
+    # ============================================
+
+    def _sumar_fragmentos(self) -> Tuple[Dict, Dict]:
+        with self._lock:
+            fragmentos = list(self._fragmentos)
+
+        contadores: Dict[Tuple[str, Tuple], float] = {}
+        histogramas: Dict[Tuple[str, Tuple], List[float]] = {}
+        for fragmento in fragmentos:
+            # list() copia de una vez aunque el hilo dueño siga escribiendo
+            for clave, valor in list(fragmento.contadores.items()):
+                contadores[clave] = contadores.get(clave, 0) + valor
+            for clave, cubetas in list(fragmento.histogramas.items()):
+                cubetas = list(cubetas)
+                total = histogramas.get(clave)
+                if total is None:
+                    histogramas[clave] = cubetas
+                else:
+                    for i, valor in enumerate(cubetas):
+                        total[i] += valor
+        return contadores, histogramas
+
+    def exportar(self) -> str:
+        """
+        Exporta todas las métricas.
+
+        Returns:
+            Texto en el formato de exposición de Prometheus (versión 0.0.4)
+        """
+        contadores, histogramas = self._sumar_fragmentos()
+        por_metrica: Dict[str, List[Tuple[Tuple, object]]] = {}
+        for (nombre, etiquetas), valor in list(contadores.items()) + list(histogramas.items()):
+            por_metrica.setdefault(nombre, []).append((etiquetas, valor))
+
+        recolectadas: Dict[str, List[Tuple[Tuple, float]]] = {}
+        for funcion in self._recolectores:
+            for nombre, etiquetas, valor in funcion():
+                recolectadas.setdefault(nombre, []).append((etiquetas, valor))
+
+        lineas: List[str] = []
+        for nombre, (tipo, ayuda, nombres, limites) in self._definiciones.items():
+            lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}"]
+            for etiquetas, valor in sorted(por_metrica.get(nombre, []), key=lambda muestra: muestra[0]):
+                if tipo == "histogram":
+                    lineas += _lineas_histograma(nombre, nombres, etiquetas, limites, valor)
+                else:
+                    lineas.append(f"{nombre}{_etiquetas(nombres, etiquetas)} {_numero(valor)}")
+
+        for nombre, (tipo, ayuda, nombres) in self._recolectados.items():
+            lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}"]
+            for etiquetas, valor in recolectadas.get(nombre, []):
+                lineas.append(f"{nombre}{_etiquetas(nombres, etiquetas)} {_numero(valor)}")
+
+        return "\n".join(lineas) + "\n"
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _etiquetas(nombres: Tuple[str, ...], valores: Tuple, extra: str = "") -> str:
+    pares = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+def _lineas_histograma(nombre: str, nombres: Tuple, etiquetas: Tuple, limites: Tuple, cubetas: List) -> List[str]:
+    lineas = []
+    acumulado = 0
+    for limite, cuenta in zip(limites, cubetas):
+        acumulado += cuenta
+        cubeta = _etiquetas(nombres, etiquetas, f'le="{limite}"')
+        lineas.append(f"{nombre}_bucket{cubeta} {acumulado}")
+    acumulado += cubetas[len(limites)]
+    cubeta = _etiquetas(nombres, etiquetas, 'le="+Inf"')
+    lineas.append(f"{nombre}_bucket{cubeta} {acumulado}")
+    lineas.append(f"{nombre}_sum{_etiquetas(nombres, etiquetas)} {_numero(float(cubetas[-1]))}")
+    lineas.append(f"{nombre}_count{_etiquetas(nombres, etiquetas)} {acumulado}")
+    return lineas
+
+
+# ============================================
+# MÉTRICAS DEL SERVICIO
+# ============================================
+
+registro_metricas = RegistroMetricas()
+os.register_at_fork(after_in_child=registro_metricas._reiniciar)
+
+registro_metricas.histograma(
+    "sentiment_etapa_segundos",
+    "Duración de cada etapa de predicción (una observación por texto o por lote)",
+    ("etapa",)
+)
+registro_metricas.histograma(
+    "sentiment_peticion_segundos",
+    "Duración de las peticiones HTTP por endpoint",
+    ("endpoint", "metodo")
+)
+registro_metricas.contador(
+    "sentiment_peticiones_total",
+    "Peticiones HTTP atendidas por endpoint y código de estado",
+    ("endpoint", "metodo", "codigo")
+)
+registro_metricas.contador(
+    "sentiment_errores_total",
+    "Peticiones HTTP con código de estado >= 400 por endpoint",
+    ("endpoint", "codigo")
+)
+registro_metricas.histograma(
+    "sentiment_tamano_lote",
+    "Textos por lote puntuado ('lote': predecir_lote; 'microlote': MicroBatcher)",
+    ("origen",),
+    LIMITES_TAMANO
+)
+
+
+def observar_etapa(etapa: str, segundos: float):
+    """
+    Registra la duración de una etapa de predicción en el histograma y en
+    la cabecera Server-Timing de la petición en curso (app/perfilado.py).
+
+    Etapas: validacion, limpieza, deteccion_idioma, traduccion,
+    vectorizacion, predict_proba, procesos (vectorización y scoring en el
+    pool de procesos), microlote (espera y scoring en el MicroBatcher) y
+    respuesta.
+    """
+    anotar_etapa(etapa, segundos)
+    if config.METRICAS_ACTIVAS:
+        registro_metricas.observar("sentiment_etapa_segundos", segundos, (etapa,))
+
+
+def registrar_etapa(etapa: str, inicio: float):
+    """Registra una etapa que empezó en 'inicio' (time.perf_counter()) y acaba ahora."""
+    observar_etapa(etapa, time.perf_counter() - inicio)
+
+
+def observar_tamano_lote(origen: str, tamano: int):
+    """Registra el tamaño de un lote puntuado."""
+    if config.METRICAS_ACTIVAS:
+        registro_metricas.observar("sentiment_tamano_lote", tamano, (origen,))
+
+
+# ============================================
+# RECOLECTORES (SE LEEN AL EXPORTAR)
+# ============================================
+
+def _recolectar_servicio() -> Iterable[Muestra]:
+    """Modelo activo, cache de predicciones y cliente de traducción."""
+    from .prediccion import obtener_predictor
+    from .traduccion import obtener_cliente_traduccion
+
+    yield "sentiment_proceso_info", (str(os.getpid()),), 1
+
+    try:
+        predictor = obtener_predictor()
+    except RuntimeError:
+        predictor = None
+    if predictor is not None:
+        motor = "lineal" if predictor.motor is not None else "sklearn"
+        yield "sentiment_modelo_info", (predictor.version_modelo, predictor.modelo_tipo, motor), 1
+        yield "sentiment_threshold", (), predictor.threshold
+        if predictor.cache is not None:
+            cache = predictor.cache.estadisticas()
+            yield "sentiment_cache_aciertos_total", (), cache["aciertos"]
+            yield "sentiment_cache_fallos_total", (), cache["fallos"]
+            yield "sentiment_cache_desalojos_total", (), cache["desalojos"]
+            yield "sentiment_cache_entradas", (), cache["entradas"]
+
+    traduccion = obtener_cliente_traduccion().estadisticas()
+    yield "sentiment_traduccion_llamadas_total", (traduccion["backend"],), traduccion["llamadas"]
+    yield "sentiment_traduccion_reintentos_total", (traduccion["backend"],), traduccion["reintentos"]
+    yield "sentiment_traduccion_errores_total", (traduccion["backend"],), traduccion["errores"]
+    yield "sentiment_traduccion_timeouts_total", (traduccion["backend"],), traduccion["timeouts"]
+
+
+registro_metricas.recolector(_recolectar_servicio, {
+    "sentiment_proceso_info": ("gauge", "Proceso que exporta estas métricas", ("pid",)),
+    "sentiment_modelo_info": ("gauge", "Modelo activo (siempre 1)", ("version", "tipo", "motor")),
+    "sentiment_threshold": ("gauge", "Threshold por defecto del servicio", ()),
+    "sentiment_cache_aciertos_total": ("counter", "Aciertos de la cache de predicciones", ()),
+    "sentiment_cache_fallos_total": ("counter", "Fallos de la cache de predicciones", ()),
+    "sentiment_cache_desalojos_total": ("counter", "Entradas desalojadas de la cache de predicciones", ()),
+    "sentiment_cache_entradas": ("gauge", "Entradas en la cache de predicciones", ()),
+    "sentiment_traduccion_llamadas_total": ("counter", "Llamadas al backend de traducción", ("backend",)),
+    "sentiment_traduccion_reintentos_total": ("counter", "Reintentos de traducción", ("backend",)),
+    "sentiment_traduccion_errores_total": ("counter", "Traducciones fallidas tras agotar los intentos", ("backend",)),
+    "sentiment_traduccion_timeouts_total": ("counter", "Traducciones que agotaron el deadline", ("backend",)),
+})
+
+
+# ============================================
+# MIDDLEWARE ASGI
+# ============================================
+
+class MiddlewareMetricas:
+    """
+    Cuenta peticiones, errores y latencia por endpoint.
+
+    Middleware ASGI puro (no BaseHTTPMiddleware): no envuelve el cuerpo de
+    la respuesta, así que no interfiere con las respuestas en streaming. El
+    endpoint es la plantilla de la ruta ('/jobs/{id_trabajo}'), no la URL,
+    para que el número de series no crezca con los ids.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._rutas: Optional[Dict] = None
+
+    def _plantilla(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "sin_ruta"
+        if self._rutas is None:
+            # Las rutas se registran al importar main.py: basta con leerlas una vez
+            self._rutas = {
+                getattr(ruta, "endpoint", None): ruta.path
+                for ruta in getattr(scope.get("app"), "routes", [])
+                if hasattr(ruta, "path")
+            }
+        return self._rutas.get(endpoint, "sin_ruta")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not config.METRICAS_ACTIVAS:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        codigo = 500
+
+        async def enviar(mensaje):
+            nonlocal codigo
+            if mensaje["type"] == "http.response.start":
+                codigo = mensaje["status"]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            endpoint = self._plantilla(scope)
+            metodo = scope["method"]
+            registro_metricas.observar(
+                "sentiment_peticion_segundos", time.perf_counter() - inicio, (endpoint, metodo)
+            )
+            registro_metricas.incrementar("sentiment_peticiones_total", (endpoint, metodo, str(codigo)))
+            if codigo >= 400:
+                registro_metricas.incrementar("sentiment_errores_total", (endpoint, str(codigo)))
@@ -0,0 +1,168 @@
+# ============================================
+# MICROLOTES - AGRUPADOR DE PETICIONES CONCURRENTES
+# ============================================
+
+import asyncio
+import contextvars
+import logging
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Agrupa peticiones concurrentes de un solo elemento en lotes.
+
+    Cada llamada a enviar() encola un elemento y espera su resultado. El lote
+    se procesa cuando alcanza max_tamano elementos o cuando el primero lleva
+    max_espera_ms esperando, lo que ocurra antes. La función de lote recibe la
+    lista de elementos y devuelve una secuencia de resultados alineada; si se
+    indica un ejecutor, se ejecuta en él para no bloquear el event loop.
+    """
+
+    def __init__(
+        self,
+        funcion_lote: Callable[[List[Any]], Sequence[Any]],
+        max_tamano: int = 64,
+        max_espera_ms: float = 2.0,
+        ejecutor: Optional[Executor] = None
+    ):
+        """
+        Args:
+            funcion_lote: Función que procesa una lista de elementos
+            max_tamano: Máximo de elementos por lote
+            max_espera_ms: Ventana máxima de espera en milisegundos
+            ejecutor: Pool donde ejecutar funcion_lote (None: en el event loop)
+        """
+        if max_tamano < 1:
+            raise ValueError("max_tamano debe ser al menos 1")
+        if max_espera_ms < 0:
+            raise ValueError("max_espera_ms no puede ser negativo")
+
+        self.funcion_lote = funcion_lote
+        self.max_tamano = max_tamano
+        self.max_espera = max_espera_ms / 1000.0
+        self.ejecutor = ejecutor
+
+        self._pendientes: List[Tuple[Any, asyncio.Future, float]] = []
+        self._temporizador: Optional[asyncio.TimerHandle] = None
+        self._detenido = False
+
+        # Métricas
+        self._lotes = 0
+        self._elementos = 0
+        self._tamano_max = 0
+        self._espera_total = 0.0
+        self._procesando = 0
+
+    # ============================================
+    # API PÚBLICA
+    # ============================================
+
+    async def enviar(self, elemento: Any) -> Any:
+        """
+        Encola un elemento y espera el resultado de su lote.
+
+        Args:
+            elemento: Elemento a procesar
+
+        Returns:
+            Resultado correspondiente al elemento
+
+        Raises:
+            RuntimeError: Si el agrupador está detenido
+        """
+        if self._detenido:
+            raise RuntimeError("El MicroBatcher está detenido")
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        self._pendientes.append((elemento, futuro, time.perf_counter()))
+
+        if len(self._pendientes) >= self.max_tamano:
+            self._vaciar()
+        elif self._temporizador is None:
+            self._temporizador = loop.call_later(self.max_espera, self._vaciar)
+
+        return await futuro
+
+    def detener(self):
+        """
+        Deja de aceptar elementos. Los lotes ya lanzados terminan; los
+        elementos que aún esperaban se procesan en cuanto venza su
+        temporizador. Puede llamarse desde cualquier hilo.
+        """
+        self._detenido = True
+
+    @property
+    def detenido(self) -> bool:
+        return self._detenido
+
+    def estadisticas(self) -> Dict:
+        """
+        Obtiene las métricas del agrupador.
+
+        Returns:
+            Dict con profundidad de cola y tamaños de lote
+        """
+        return {
+            "max_tamano": self.max_tamano,
+            "max_espera_ms": self.max_espera * 1000.0,
+            "profundidad_cola": len(self._pendientes),
+            "lotes_en_proceso": self._procesando,
+            "lotes_procesados": self._lotes,
+            "elementos_procesados": self._elementos,
+            "tamano_lote_promedio": round(self._elementos / self._lotes, 2) if self._lotes else 0.0,
+            "tamano_lote_max": self._tamano_max,
+            "espera_promedio_ms": round(self._espera_total / self._elementos * 1000.0, 3) if self._elementos else 0.0
+        }
+
+    # ============================================
+    # PROCESAMIENTO INTERNO
+    # ============================================
+
+    def _vaciar(self):
+        """Toma los elementos pendientes y lanza el procesamiento del lote."""
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+
+        lote = self._pendientes
+        self._pendientes = []
+        if lote:
+            # Contexto vacío: el lote no pertenece a ninguna de las peticiones
+            # (sus variables de contexto, p. ej. Server-Timing, no se heredan)
+            asyncio.get_running_loop().create_task(self._procesar(lote), context=contextvars.Context())
+
+    async def _procesar(self, lote: List[Tuple[Any, asyncio.Future, float]]):
+        """Ejecuta la función de lote y resuelve el futuro de cada llamada."""
+        inicio = time.perf_counter()
+        self._procesando += 1
+
+        try:
+            elementos = [elemento for elemento, _, _ in lote]
+            if self.ejecutor is not None:
+                loop = asyncio.get_running_loop()
+                resultados = await loop.run_in_executor(self.ejecutor, self.funcion_lote, elementos)
+            else:
+                resultados = self.funcion_lote(elementos)
+        except Exception as e:
+            logger.error(f"Error procesando microlote de {len(lote)} elementos: {e}")
+            for _, futuro, _ in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+        finally:
+            self._procesando -= 1
+            self._lotes += 1
+            self._elementos += len(lote)
+            self._tamano_max = max(self._tamano_max, len(lote))
+            self._espera_total += sum(inicio - encolado for _, _, encolado in lote)
+
+        for (_, futuro, _), resultado in zip(lote, resultados):
+            # El llamante puede haber cancelado (p. ej. desconexión del cliente)
+            if not futuro.done():
+                futuro.set_result(resultado)
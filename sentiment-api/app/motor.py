@@ -0,0 +1,392 @@
+# ============================================
+# MOTOR - SCORING LINEAL FUSIONADO (SIN SKLEARN)
+# ============================================
+
+import hashlib
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+import logging
+import numpy as np
+
+from .vocabulario import VocabularioCompacto, empaquetar
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Tipos de pesos que se conservan tal cual (bundles cuantizados); el resto se pasa a float64
+TIPOS_PESOS = (np.dtype(np.float64), np.dtype(np.float32), np.dtype(np.float16))
+
+
+def _array_pesos(valores) -> np.ndarray:
+    """Array contiguo de pesos sin copiar si ya tiene un tipo float admitido."""
+    valores = np.asarray(valores)
+    if valores.dtype not in TIPOS_PESOS:
+        valores = valores.astype(np.float64)
+    return np.ascontiguousarray(valores)
+
+
+class MatrizTfidf(NamedTuple):
+    """
+    Matriz TF-IDF dispersa en formato coordenado, ordenada por fila y columna.
+    Equivale a las filas CSR que produce TfidfVectorizer.transform.
+    """
+    filas: np.ndarray
+    columnas: np.ndarray
+    valores: np.ndarray
+    n_filas: int
+
+
+def matriz_desde_csr(csr) -> MatrizTfidf:
+    """Convierte la salida CSR de TfidfVectorizer.transform a MatrizTfidf."""
+    return MatrizTfidf(
+        filas=np.repeat(np.arange(csr.shape[0]), np.diff(csr.indptr)),
+        columnas=csr.indices,
+        valores=csr.data,
+        n_filas=csr.shape[0]
+    )
+
+
+def concatenar_matrices(matrices: List[MatrizTfidf]) -> MatrizTfidf:
+    """Une por filas varias MatrizTfidf (bloques consecutivos de un lote)."""
+    desplazamientos = np.cumsum([0] + [m.n_filas for m in matrices[:-1]])
+    return MatrizTfidf(
+        filas=np.concatenate([m.filas + d for m, d in zip(matrices, desplazamientos)]),
+        columnas=np.concatenate([m.columnas for m in matrices]),
+        valores=np.concatenate([m.valores for m in matrices]),
+        n_filas=int(sum(m.n_filas for m in matrices))
+    )
+
+
+class MotorLineal:
+    """
+    Motor de scoring para TF-IDF + modelo lineal (MultinomialNB o
+    LogisticRegression binarios).
+
+    Guarda el vocabulario, el vector idf y los pesos del modelo en arrays
+    planos de NumPy y calcula tokenización, ponderación, normalización y
+    probabilidad sin pasar por la validación de entrada de scikit-learn.
+    """
+
+    # Modelos cuya probabilidad se reduce a sigmoide(x · pesos + sesgo)
+    MODELOS_SOPORTADOS = ("MultinomialNB", "LogisticRegression")
+
+    # Hasta este tamaño de lote el conteo se hace en Python puro
+    LOTE_PEQUENO = 8
+
+    def __init__(
+        self,
+        vocabulario: Union[Dict[str, int], VocabularioCompacto],
+        idf: Optional[np.ndarray],
+        pesos: np.ndarray,
+        sesgo: float,
+        clases: List[str],
+        token_pattern: str = r"(?u)\b\w\w+\b",
+        ngram_range: Tuple[int, int] = (1, 1),
+        lowercase: bool = True,
+        stop_words: Optional[Iterable[str]] = None,
+        binary: bool = False,
+        sublinear_tf: bool = False,
+        norm: Optional[str] = "l2",
+        escala: float = 1.0,
+        complemento_exacto: bool = True
+    ):
+        """
+        Args:
+            vocabulario: Mapa token -> columna (vocabulary_ del vectorizador) o
+                índice compacto de app/vocabulario.py
+            idf: Vector idf (None si el vectorizador no usa idf)
+            pesos: Pesos por columna; la puntuación es x · pesos + sesgo
+            sesgo: Término independiente de la clase Positivo frente a Negativo
+            clases: Clases del modelo, en el orden de predict_proba
+            token_pattern: Expresión regular de tokens del vectorizador
+            ngram_range: Rango de n-gramas de palabras
+            lowercase: Si el vectorizador pasa el texto a minúsculas
+            stop_words: Palabras vacías a descartar
+            binary: Si las frecuencias se reducen a 0/1
+            sublinear_tf: Si se aplica 1 + log(tf)
+            norm: Normalización de filas ('l2', 'l1' o None)
+            escala: Factor de la sigmoide (2.0 para regresión logística multinomial)
+            complemento_exacto: Si True, prob_negativo = sigmoide(-d) (Naive Bayes);
+                si False, prob_negativo = 1 - prob_positivo (regresión logística)
+        """
+        if norm not in ("l1", "l2", None):
+            raise ValueError(f"Normalización no soportada: {norm}")
+
+        if isinstance(vocabulario, VocabularioCompacto):
+            self.vocabulario = vocabulario
+        else:
+            # Columnas como int de Python: sklearn guarda np.int64, más lentos de hashear y convertir
+            self.vocabulario = {token: int(col) for token, col in vocabulario.items()}
+        # float32/float16 se conservan (bundles cuantizados); las operaciones promueven a float64
+        self.idf = None if idf is None else _array_pesos(idf)
+        self.pesos = _array_pesos(pesos)
+        self.sesgo = float(sesgo)
+        self.clases = list(clases)
+        self.token_pattern = token_pattern
+        self.ngram_range = tuple(ngram_range)
+        self.lowercase = lowercase
+        self.stop_words = frozenset(stop_words) if stop_words else None
+        self.binary = binary
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.escala = float(escala)
+        self.complemento_exacto = complemento_exacto
+        self.n_features = len(self.pesos)
+
+        self._buscar_tokens = re.compile(token_pattern).findall
+        self._firma: Optional[str] = None
+
+    # ============================================
+    # CONSTRUCCIÓN DESDE SCIKIT-LEARN
+    # ============================================
+
+    @classmethod
+    def desde_sklearn(cls, modelo, vectorizador) -> "MotorLineal":
+        """
+        Construye el motor a partir de un modelo y un TfidfVectorizer ajustados.
+
+        Raises:
+            ValueError: Si la combinación de modelo y vectorizador no se puede
+                reducir a un producto escalar
+        """
+        nombre_modelo = type(modelo).__name__
+        if nombre_modelo not in cls.MODELOS_SOPORTADOS:
+            raise ValueError(f"Modelo no soportado por el motor lineal: {nombre_modelo}")
+
+        clases = [str(c) for c in modelo.classes_]
+        if sorted(clases) != ['Negativo', 'Positivo']:
+            raise ValueError(f"El motor lineal requiere clases Negativo/Positivo, no {clases}")
+        idx_positivo = clases.index('Positivo')
+        idx_negativo = clases.index('Negativo')
+
+        parametros = vectorizador.get_params()
+        if parametros['analyzer'] != 'word':
+            raise ValueError("El motor lineal solo soporta analyzer='word'")
+        if parametros['tokenizer'] is not None or parametros['preprocessor'] is not None:
+            raise ValueError("El motor lineal no soporta tokenizer/preprocessor personalizados")
+        if parametros['strip_accents'] is not None:
+            raise ValueError("El motor lineal no soporta strip_accents")
+        if parametros['input'] != 'content':
+            raise ValueError("El motor lineal solo soporta input='content'")
+
+        if nombre_modelo == "MultinomialNB":
+            pesos = modelo.feature_log_prob_[idx_positivo] - modelo.feature_log_prob_[idx_negativo]
+            sesgo = modelo.class_log_prior_[idx_positivo] - modelo.class_log_prior_[idx_negativo]
+            escala = 1.0
+            complemento_exacto = True
+        else:
+            if modelo.coef_.shape[0] != 1:
+                raise ValueError("El motor lineal solo soporta regresión logística binaria")
+            # decision_function puntúa la clase classes_[1]
+            signo = 1.0 if idx_positivo == 1 else -1.0
+            pesos = signo * modelo.coef_[0]
+            sesgo = signo * modelo.intercept_[0]
+            escala = 2.0 if getattr(modelo, 'multi_class', 'auto') == 'multinomial' else 1.0
+            complemento_exacto = False
+
+        return cls(
+            vocabulario=vectorizador.vocabulary_,
+            idf=vectorizador.idf_ if parametros['use_idf'] else None,
+            pesos=pesos,
+            sesgo=sesgo,
+            clases=clases,
+            token_pattern=parametros['token_pattern'],
+            ngram_range=parametros['ngram_range'],
+            lowercase=parametros['lowercase'],
+            stop_words=vectorizador.get_stop_words(),
+            binary=parametros['binary'],
+            sublinear_tf=parametros['sublinear_tf'],
+            norm=parametros['norm'],
+            escala=escala,
+            complemento_exacto=complemento_exacto
+        )
+
+    def firma_vectorizador(self) -> str:
+        """
+        Huella de todo lo que determina vectorizar_lote (vocabulario, idf y
+        parámetros): dos motores con la misma firma producen la misma matriz
+        para los mismos textos y pueden compartir la vectorización.
+
+        Returns:
+            Hash SHA-256 en hexadecimal (se calcula una vez)
+        """
+        if self._firma is None:
+            if isinstance(self.vocabulario, VocabularioCompacto):
+                datos, offsets, columnas = self.vocabulario.empaquetado()
+            else:
+                datos, offsets, columnas = empaquetar(self.vocabulario)
+            huella = hashlib.sha256()
+            huella.update(repr((
+                self.token_pattern, self.ngram_range, self.lowercase,
+                sorted(self.stop_words) if self.stop_words else None,
+                self.binary, self.sublinear_tf, self.norm
+            )).encode("utf-8"))
+            huella.update(datos)
+            huella.update(np.asarray(offsets, dtype=np.int64).tobytes())
+            huella.update(np.asarray(columnas, dtype=np.int64).tobytes())
+            if self.idf is not None:
+                huella.update(self.idf.astype(np.float64).tobytes())
+            self._firma = huella.hexdigest()
+        return self._firma
+
+    # ============================================
+    # TOKENIZACIÓN Y VECTORIZACIÓN
+    # ============================================
+
+    def _tokens(self, texto: str) -> List[str]:
+        """Tokens y n-gramas del texto, como los genera el vectorizador."""
+        if self.lowercase:
+            texto = texto.lower()
+
+        tokens = self._buscar_tokens(texto)
+        if self.stop_words is not None:
+            tokens = [t for t in tokens if t not in self.stop_words]
+
+        # Mismos n-gramas que sklearn (_word_ngrams); el orden no afecta al conteo
+        min_n, max_n = self.ngram_range
+        if max_n != 1:
+            originales = tokens
+            tokens = list(originales) if min_n == 1 else []
+            unir = " ".join
+            for n in range(max(min_n, 2), min(max_n, len(originales)) + 1):
+                tokens.extend(map(unir, zip(*(originales[k:] for k in range(n)))))
+
+        return tokens
+
+    def _columnas_por_texto(self, textos: List[str]) -> List[List[int]]:
+        """Columnas del vocabulario presentes en cada texto (con repeticiones)."""
+        if isinstance(self.vocabulario, dict):
+            buscar = self.vocabulario.get
+            return [
+                [col for col in map(buscar, self._tokens(texto)) if col is not None]
+                for texto in textos
+            ]
+
+        # Índice compacto: una sola búsqueda vectorizada para todo el lote
+        tokens_por_texto = [self._tokens(texto) for texto in textos]
+        columnas = self.vocabulario.buscar_muchos(
+            [token for tokens in tokens_por_texto for token in tokens]
+        ).tolist()
+
+        resultado = []
+        inicio = 0
+        for tokens in tokens_por_texto:
+            fin = inicio + len(tokens)
+            resultado.append([col for col in columnas[inicio:fin] if col >= 0])
+            inicio = fin
+        return resultado
+
+    def _contar_pequeno(self, textos: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Conteo (fila, columna) en Python puro: menos llamadas a NumPy para lotes chicos."""
+        filas: List[int] = []
+        columnas: List[int] = []
+        conteos: List[int] = []
+
+        for i, columnas_texto in enumerate(self._columnas_por_texto(textos)):
+            conteo: Dict[int, int] = {}
+            for col in columnas_texto:
+                conteo[col] = conteo.get(col, 0) + 1
+            presentes = sorted(conteo)
+            filas.extend([i] * len(presentes))
+            columnas.extend(presentes)
+            conteos.extend(map(conteo.__getitem__, presentes))
+
+        return (
+            np.array(filas, dtype=np.int64),
+            np.array(columnas, dtype=np.int64),
+            np.array(conteos, dtype=np.int64)
+        )
+
+    def _contar_lote(self, textos: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Conteo (fila, columna) de un lote grande con una sola ordenación en NumPy."""
+        n_filas = len(textos)
+        columnas_por_texto = self._columnas_por_texto(textos)
+        longitudes = np.fromiter(
+            (len(c) for c in columnas_por_texto), dtype=np.int64, count=n_filas
+        )
+
+        total = int(longitudes.sum())
+        columnas = np.fromiter(
+            (col for cols in columnas_por_texto for col in cols), dtype=np.int64, count=total
+        )
+        filas = np.repeat(np.arange(n_filas, dtype=np.int64), longitudes)
+
+        claves, conteos = np.unique(filas * self.n_features + columnas, return_counts=True)
+        filas = claves // self.n_features
+        return filas, claves - filas * self.n_features, conteos
+
+    def vectorizar_lote(self, textos: List[str]) -> MatrizTfidf:
+        """
+        Vectoriza un lote de textos con los mismos pasos que TfidfVectorizer:
+        conteo, tf sublineal, idf y normalización por fila.
+
+        Args:
+            textos: Textos ya limpios
+
+        Returns:
+            MatrizTfidf con las entradas no nulas ordenadas por (fila, columna)
+        """
+        n_filas = len(textos)
+        if n_filas <= self.LOTE_PEQUENO:
+            filas, columnas, conteos = self._contar_pequeno(textos)
+        else:
+            filas, columnas, conteos = self._contar_lote(textos)
+
+        valores = conteos.astype(np.float64)
+        if self.binary:
+            valores.fill(1.0)
+        if self.sublinear_tf:
+            np.log(valores, out=valores)
+            valores += 1
+        if self.idf is not None:
+            valores *= self.idf[columnas]
+
+        if self.norm is not None:
+            if self.norm == "l2":
+                normas = np.sqrt(np.bincount(filas, weights=valores * valores, minlength=n_filas))
+            else:
+                normas = np.bincount(filas, weights=np.abs(valores), minlength=n_filas)
+            normas[normas == 0.0] = 1.0
+            valores /= normas[filas]
+
+        return MatrizTfidf(filas, columnas, valores, n_filas)
+
+    # ============================================
+    # SCORING
+    # ============================================
+
+    def puntuar(self, matriz: MatrizTfidf) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula las probabilidades de una matriz ya vectorizada.
+
+        Returns:
+            Tupla (prob_positivo, prob_negativo) como arrays de NumPy
+        """
+        decision = np.bincount(
+            matriz.filas,
+            weights=matriz.valores * self.pesos[matriz.columnas],
+            minlength=matriz.n_filas
+        ).astype(np.float64, copy=False)  # sin tokens conocidos bincount devuelve int64
+        decision += self.sesgo
+        decision *= self.escala
+
+        with np.errstate(over='ignore'):
+            prob_positivo = 1.0 / (1.0 + np.exp(-decision))
+            if self.complemento_exacto:
+                prob_negativo = 1.0 / (1.0 + np.exp(decision))
+            else:
+                prob_negativo = 1.0 - prob_positivo
+
+        return prob_positivo, prob_negativo
+
+    def probabilidades(self, textos: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tokeniza, pondera, normaliza y puntúa un lote de textos.
+
+        Args:
+            textos: Textos ya limpios
+
+        Returns:
+            Tupla (prob_positivo, prob_negativo) como arrays de NumPy
+        """
+        return self.puntuar(self.vectorizar_lote(textos))
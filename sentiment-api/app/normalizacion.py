@@ -0,0 +1,68 @@
+# ============================================
+# NORMALIZACIÓN - LIMPIEZA DE TEXTO EN UNA SOLA PASADA
+# ============================================
+#
+# Única implementación de limpiar_texto (la API, los scripts de
+# modelos_serializados/ y streamlit_app.py la importan de aquí). Reproduce
+# exactamente la limpieza con la que se entrenó el modelo:
+#
+#   1. minúsculas
+#   2. quitar URLs          http\S+ | www\S+ | https\S+
+#   3. quitar menciones     @\w+
+#   4. quitar hashtags      #\w+
+#   5. quitar números       \d+
+#   6. quitar string.punctuation
+#   7. colapsar espacios y recortar
+#
+# Los pasos 2-6 se hacen con un único patrón precompilado y el 7 con
+# split/join, en lugar de seis pasadas. Como las pasadas originales eran
+# secuenciales, el patrón respeta su orden:
+#   - una mención o hashtag se corta antes de un 'http'/'www' seguido de un
+#     carácter no blanco, porque la URL se quitaba primero ('@ana' + URL
+#     pegada deja la mención 'ana', no 'anahttp');
+#   - '@' y '#' sueltos solo se borran como puntuación si no empiezan una
+#     mención o hashtag ('##tema' borra el primer '#' y luego '#tema').
+# La paridad con la implementación anterior se comprueba con
+# python -m benchmarks.normalizacion.
+
+import re
+import string
+from typing import Iterable, List
+
+# Puntuación que se borra carácter a carácter; '@' y '#' van aparte
+_PUNTUACION = re.escape(string.punctuation.replace('@', '').replace('#', ''))
+
+# URLs | menciones y hashtags | números y puntuación | '@' o '#' sueltos
+_PATRON_LIMPIEZA = re.compile(
+    r'(?:http|www)\S+'
+    r'|[@#](?:(?!(?:http|www)\S)\w)+'
+    rf'|[\d{_PUNTUACION}]+'
+    r'|[@#]'
+)
+
+
+def limpiar_texto(texto: str) -> str:
+    """
+    Limpia y preprocesa un texto para análisis de sentimiento.
+
+    Args:
+        texto: Texto a limpiar
+
+    Returns:
+        Texto limpio y procesado
+    """
+    return ' '.join(_PATRON_LIMPIEZA.sub('', texto.lower()).split())
+
+
+def limpiar_many(textos: Iterable[str]) -> List[str]:
+    """
+    Limpia muchos textos (mismo resultado que limpiar_texto en cada uno).
+
+    Args:
+        textos: Textos a limpiar
+
+    Returns:
+        Lista de textos limpios en el mismo orden
+    """
+    quitar = _PATRON_LIMPIEZA.sub
+    return [' '.join(quitar('', texto.lower()).split()) for texto in textos]
@@ -0,0 +1,270 @@
+# ============================================
+# PERFILADO - SERVER-TIMING Y PERFILADOR POR MUESTREO
+# ============================================
+#
+# Dos herramientas para saber dónde se va el tiempo de una petición lenta:
+#
+# - Cabecera Server-Timing en cada respuesta, con la duración de cada etapa
+#   (validacion, traduccion, predict_proba...). Las etapas son las mismas
+#   que las del histograma de app/metricas.py: observar_etapa las anota
+#   también en un dict de la petición en curso (contextvar). El contexto se
+#   copia a los hilos de ejecutor.ejecutar y de los endpoints síncronos, así
+#   que las etapas calculadas fuera del event loop también cuentan. En
+#   streaming la cabecera sale antes que el cuerpo y solo lleva lo medido
+#   hasta entonces.
+#
+# - Perfilador estadístico bajo demanda (POST /admin/profile): un hilo toma
+#   cada pocos milisegundos la pila de todos los hilos del proceso
+#   (sys._current_frames) durante N segundos o N peticiones y devuelve las
+#   pilas en formato colapsado ("hilo;modulo:funcion;... cuenta"), listo
+#   para flamegraph.pl o speedscope. No instala trazas ni hooks en el
+#   intérprete: fuera del perfilado no cuesta nada y durante él el coste es
+#   el de recorrer las pilas en cada muestra. Solo ve el proceso que atiende
+#   la petición (no los procesos de INFERENCIA_PROCESOS ni otros workers).
+
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+import logging
+
+from . import config
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Etapas de la petición en curso: nombre -> segundos (None fuera de una petición)
+_etapas_peticion: ContextVar[Optional[Dict[str, float]]] = ContextVar("etapas_peticion", default=None)
+
+# Profundidad máxima de pila que se recorre por muestra
+PROFUNDIDAD_MAXIMA = 200
+
+# Funciones en las que un hilo está esperando trabajo, no trabajando
+# (archivo, función del último frame Python de la pila)
+ESPERAS_INACTIVAS = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+# ============================================
+# SERVER-TIMING
+# ============================================
+
+def anotar_etapa(etapa: str, segundos: float):
+    """Suma la duración de una etapa a la petición en curso, si la hay."""
+    etapas = _etapas_peticion.get()
+    if etapas is not None:
+        etapas[etapa] = etapas.get(etapa, 0.0) + segundos
+
+
+def _cabecera_server_timing(etapas: Dict[str, float], total: float) -> bytes:
+    """Valor de Server-Timing: 'etapa;dur=ms, ..., total;dur=ms'."""
+    partes = [f"{etapa};dur={segundos * 1000:.3f}" for etapa, segundos in list(etapas.items())]
+    partes.append(f"total;dur={total * 1000:.3f}")
+    return ", ".join(partes).encode("latin-1")
+
+
+class MiddlewareServerTiming:
+    """
+    Añade la cabecera Server-Timing y cuenta las peticiones terminadas para
+    el perfilador.
+
+    Middleware ASGI puro, como MiddlewareMetricas: el dict de etapas se crea
+    en el contexto de la petición antes de llamar a la aplicación y la
+    cabecera se añade al mensaje http.response.start.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not config.SERVER_TIMING:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                perfilador.peticion_terminada()
+            return
+
+        inicio = time.perf_counter()
+        etapas: Dict[str, float] = {}
+        token = _etapas_peticion.set(etapas)
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                cabeceras = list(mensaje.get("headers", []))
+                cabeceras.append((b"server-timing", _cabecera_server_timing(etapas, time.perf_counter() - inicio)))
+                mensaje = {**mensaje, "headers": cabeceras}
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _etapas_peticion.reset(token)
+            perfilador.peticion_terminada()
+
+
+# ============================================
+# PERFILADOR POR MUESTREO
+# ============================================
+
+class PerfiladorMuestreo:
+    """
+    Perfilador estadístico de todos los hilos del proceso.
+
+    Solo puede haber un perfilado a la vez. Las pilas de hilos que esperan
+    trabajo (ESPERAS_INACTIVAS: pools ociosos, event loop en select) se
+    descartan salvo que se pidan, para que el resultado muestre en qué se
+    gasta el tiempo y no cuánto se espera. Una espera de E/S (la llamada
+    HTTP de una traducción) sí aparece: su último frame es el del socket.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._activo = False
+        self._detener = threading.Event()
+        self._peticiones = 0
+        self._max_peticiones: Optional[int] = None
+        # Etiqueta 'modulo:funcion' por objeto de código
+        self._etiquetas: Dict[object, str] = {}
+
+    @property
+    def activo(self) -> bool:
+        return self._activo
+
+    def peticion_terminada(self):
+        """Cuenta una petición terminada (solo durante un perfilado)."""
+        if not self._activo:
+            return
+        self._peticiones += 1
+        if self._max_peticiones is not None and self._peticiones >= self._max_peticiones:
+            self._detener.set()
+
+    def _etiqueta(self, codigo) -> str:
+        etiqueta = self._etiquetas.get(codigo)
+        if etiqueta is None:
+            ruta = codigo.co_filename
+            if "site-packages" + os.sep in ruta:
+                modulo = ruta.rsplit("site-packages" + os.sep, 1)[1]
+            elif os.sep + "app" + os.sep in ruta:
+                modulo = "app" + os.sep + ruta.rsplit(os.sep + "app" + os.sep, 1)[1]
+            else:
+                modulo = os.path.basename(ruta)
+            funcion = getattr(codigo, "co_qualname", codigo.co_name)
+            # ';' separa frames en el formato colapsado
+            etiqueta = f"{modulo}:{funcion}".replace(";", ",")
+            self._etiquetas[codigo] = etiqueta
+        return etiqueta
+
+    @staticmethod
+    def _inactivo(frame) -> bool:
+        codigo = frame.f_code
+        return (os.path.basename(codigo.co_filename), codigo.co_name) in ESPERAS_INACTIVAS
+
+    def perfilar(
+        self,
+        segundos: float = 10.0,
+        peticiones: Optional[int] = None,
+        intervalo_ms: float = None,
+        incluir_inactivos: bool = False
+    ) -> Dict:
+        """
+        Toma muestras de las pilas hasta que pasen 'segundos' o terminen
+        'peticiones' peticiones (lo que ocurra antes). Bloquea el hilo que
+        lo llama, que no se muestrea.
+
+        Args:
+            segundos: Duración máxima (se recorta a PERFILADOR_MAX_SEGUNDOS)
+            peticiones: Peticiones terminadas tras las que se detiene (opcional)
+            intervalo_ms: Tiempo entre muestras (default: PERFILADOR_INTERVALO_MS)
+            incluir_inactivos: Si True, conserva las pilas de hilos en espera
+
+        Returns:
+            Dict con muestras, duración, peticiones vistas, intervalo y
+            'pilas' (pila colapsada -> número de muestras)
+
+        Raises:
+            ValueError: Si los parámetros están fuera de rango
+            RuntimeError: Si ya hay un perfilado en curso
+        """
+        intervalo_ms = config.PERFILADOR_INTERVALO_MS if intervalo_ms is None else intervalo_ms
+        if not 0 < segundos:
+            raise ValueError("'segundos' debe ser mayor que 0")
+        if peticiones is not None and peticiones < 1:
+            raise ValueError("'peticiones' debe ser al menos 1")
+        if not 1 <= intervalo_ms <= 1000:
+            raise ValueError("'intervalo_ms' debe estar entre 1 y 1000")
+        segundos = min(segundos, config.PERFILADOR_MAX_SEGUNDOS)
+
+        with self._lock:
+            if self._activo:
+                raise RuntimeError("Ya hay un perfilado en curso")
+            self._detener.clear()
+            self._peticiones = 0
+            self._max_peticiones = peticiones
+            self._activo = True
+
+        logger.info(f"🔬 Perfilado iniciado ({segundos:.0f}s, peticiones={peticiones}, cada {intervalo_ms} ms)")
+        propio = threading.get_ident()
+        nombres: Dict[int, str] = {}
+        pilas: Dict[str, int] = {}
+        muestras = 0
+        coste = 0.0
+        intervalo = intervalo_ms / 1000.0
+        inicio = time.perf_counter()
+        fin = inicio + segundos
+
+        try:
+            while not self._detener.wait(intervalo) and time.perf_counter() < fin:
+                marca = time.perf_counter()
+                for ident, frame in sys._current_frames().items():
+                    if ident == propio or (not incluir_inactivos and self._inactivo(frame)):
+                        continue
+                    if ident not in nombres:
+                        nombres = {hilo.ident: hilo.name for hilo in threading.enumerate()}
+                    marcos: List[str] = []
+                    while frame is not None and len(marcos) < PROFUNDIDAD_MAXIMA:
+                        marcos.append(self._etiqueta(frame.f_code))
+                        frame = frame.f_back
+                    marcos.append(nombres.get(ident, f"hilo-{ident}").replace(";", ","))
+                    pila = ";".join(reversed(marcos))
+                    pilas[pila] = pilas.get(pila, 0) + 1
+                muestras += 1
+                coste += time.perf_counter() - marca
+        finally:
+            duracion = time.perf_counter() - inicio
+            with self._lock:
+                self._activo = False
+                self._max_peticiones = None
+
+        logger.info(f"🔬 Perfilado terminado: {muestras} muestras, {self._peticiones} peticiones")
+        return {
+            "muestras": muestras,
+            "duracion_segundos": round(duracion, 3),
+            "peticiones": self._peticiones,
+            "intervalo_ms": intervalo_ms,
+            # Tiempo que el muestreo tuvo el GIL (sobrecoste para el resto del proceso)
+            "coste_muestreo_ms": round(coste * 1000, 2),
+            "pilas": pilas
+        }
+
+
+def formato_colapsado(pilas: Dict[str, int]) -> str:
+    """Pilas en formato colapsado, una por línea y de más a menos muestras."""
+    return "".join(f"{pila} {n}\n" for pila, n in sorted(pilas.items(), key=lambda item: -item[1]))
+
+
+# ============================================
+# INSTANCIA GLOBAL
+# ============================================
+
+perfilador = PerfiladorMuestreo()
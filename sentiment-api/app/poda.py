@@ -0,0 +1,281 @@
+# ============================================
+# PODA - PODA DE FEATURES Y CUANTIZACIÓN DEL MODELO
+# ============================================
+#
+# Uso como herramienta (desde sentiment-api/):
+#   python -m app.poda --destino DIR (--umbral U | --conservar F)
+#                      [--bundle DIR | --modelo M.pkl --vectorizador V.pkl]
+#                      [--tipo float32|float16|float64] [--corpus textos.txt]
+#
+# Elimina del vocabulario las features cuya contribución máxima a la
+# puntuación está por debajo del umbral, reduce los pesos a float32/float16
+# y escribe un bundle (app/artefactos.py) que SentimentPredictor carga con
+# MODELO_BUNDLE=DIR. El informe compara etiquetas y probabilidades con el
+# modelo original sobre un corpus de muestra y se guarda en metadata.json.
+#
+# La poda cambia la normalización L2 de los textos que contenían features
+# eliminadas, así que las probabilidades se desplazan aunque el peso de la
+# feature fuera casi cero: el informe mide ese efecto.
+
+import argparse
+import json
+import math
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+
+from .artefactos import cargar_bundle, escribir_bundle
+from .motor import MotorLineal
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+TIPOS = {"float64": np.float64, "float32": np.float32, "float16": np.float16}
+
+
+# ============================================
+# PODA Y CUANTIZACIÓN
+# ============================================
+
+def contribuciones(motor: MotorLineal) -> np.ndarray:
+    """
+    Contribución máxima de cada feature a la puntuación: |peso| · idf, lo
+    que suma una aparición antes de normalizar la fila.
+
+    Returns:
+        Array float64 con una contribución por columna
+    """
+    contribucion = np.abs(motor.pesos.astype(np.float64))
+    if motor.idf is not None:
+        contribucion *= motor.idf
+    return contribucion
+
+
+def seleccionar(
+    contribucion: np.ndarray,
+    umbral: Optional[float] = None,
+    conservar: Optional[float] = None
+) -> np.ndarray:
+    """
+    Elige las features que se conservan.
+
+    Args:
+        contribucion: Contribución de cada feature (ver contribuciones())
+        umbral: Contribución mínima para conservar una feature
+        conservar: Fracción (0-1] de features con mayor contribución a conservar
+
+    Returns:
+        Máscara booleana por columna
+
+    Raises:
+        ValueError: Si no se indica exactamente un criterio o está fuera de rango
+    """
+    if (umbral is None) == (conservar is None):
+        raise ValueError("Indica un umbral o una fracción a conservar (solo uno)")
+
+    if umbral is not None:
+        return contribucion >= umbral
+
+    if not 0 < conservar <= 1:
+        raise ValueError("conservar debe estar en (0, 1]")
+    n = max(1, math.ceil(len(contribucion) * conservar))
+    # Orden estable: a igual contribución se conserva la columna menor
+    mascara = np.zeros(len(contribucion), dtype=bool)
+    mascara[np.argsort(-contribucion, kind="stable")[:n]] = True
+    return mascara
+
+
+def podar(
+    motor: MotorLineal,
+    coeficientes: Optional[np.ndarray],
+    mascara: np.ndarray,
+    tipo: str = "float32"
+) -> Tuple[MotorLineal, Optional[np.ndarray]]:
+    """
+    Construye un motor con solo las features de la máscara, renumeradas en
+    su orden original, y los pesos en el tipo indicado.
+
+    Args:
+        motor: Motor original
+        coeficientes: Coeficientes de explicabilidad del original (o None)
+        mascara: Features a conservar (ver seleccionar())
+        tipo: 'float64', 'float32' o 'float16'
+
+    Returns:
+        Tupla (motor podado, coeficientes podados)
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo no soportado: {tipo}")
+    dtype = TIPOS[tipo]
+
+    conservadas = np.flatnonzero(mascara)
+    nuevas = np.full(len(mascara), -1, dtype=np.int64)
+    nuevas[conservadas] = np.arange(len(conservadas))
+
+    vocabulario = {
+        termino: int(nuevas[columna])
+        for termino, columna in motor.vocabulario.items()
+        if mascara[columna]
+    }
+
+    podado = MotorLineal(
+        vocabulario=vocabulario,
+        idf=None if motor.idf is None else motor.idf[conservadas].astype(dtype),
+        pesos=motor.pesos[conservadas].astype(dtype),
+        sesgo=motor.sesgo,
+        clases=motor.clases,
+        token_pattern=motor.token_pattern,
+        ngram_range=motor.ngram_range,
+        lowercase=motor.lowercase,
+        stop_words=motor.stop_words,
+        binary=motor.binary,
+        sublinear_tf=motor.sublinear_tf,
+        norm=motor.norm,
+        escala=motor.escala,
+        complemento_exacto=motor.complemento_exacto
+    )
+    coeficientes_podados = None if coeficientes is None else np.asarray(coeficientes)[conservadas].astype(dtype)
+    return podado, coeficientes_podados
+
+
+# ============================================
+# INFORME
+# ============================================
+
+def tamano_bytes(motor: MotorLineal, coeficientes: Optional[np.ndarray]) -> int:
+    """Bytes que ocupan los arrays y el vocabulario empaquetado de un motor."""
+    terminos = sum(len(t.encode("utf-8")) + 1 for t in motor.vocabulario)
+    # offsets int64 (n + 1) y columnas int32 por término
+    vocabulario = terminos + 8 * (len(motor.vocabulario) + 1) + 4 * len(motor.vocabulario)
+    arrays = [motor.pesos, motor.idf, coeficientes]
+    return vocabulario + sum(a.nbytes for a in arrays if a is not None)
+
+
+def comparar(original: MotorLineal, podado: MotorLineal, textos: List[str]) -> Dict:
+    """
+    Compara el modelo podado con el original sobre un corpus.
+
+    Args:
+        original: Motor original
+        podado: Motor podado/cuantizado
+        textos: Textos ya limpios
+
+    Returns:
+        Dict con coincidencia de etiquetas y diferencias de probabilidad
+    """
+    positivo_o, negativo_o = original.probabilidades(textos)
+    positivo_p, negativo_p = podado.probabilidades(textos)
+
+    # Misma decisión que SentimentPredictor con el threshold por defecto
+    distintas = int(np.count_nonzero((positivo_o > negativo_o) != (positivo_p > negativo_p)))
+    delta = np.abs(positivo_p - positivo_o)
+
+    return {
+        "textos": len(textos),
+        "coincidencia_etiquetas": round(1 - distintas / len(textos), 6) if textos else 1.0,
+        "etiquetas_distintas": distintas,
+        "delta_prob_max": float(delta.max()) if len(delta) else 0.0,
+        "delta_prob_medio": float(delta.mean()) if len(delta) else 0.0,
+        "delta_prob_p99": float(np.percentile(delta, 99)) if len(delta) else 0.0
+    }
+
+
+def corpus_sintetico(motor: MotorLineal, n: int, semilla: int = 0) -> List[str]:
+    """Textos de 3 a 25 palabras del vocabulario (cuando no se da un corpus)."""
+    palabras = sorted(t for t in motor.vocabulario if " " not in t)
+    aleatorio = random.Random(semilla)
+    return [
+        " ".join(aleatorio.choice(palabras) for _ in range(aleatorio.randint(3, 25)))
+        for _ in range(n)
+    ]
+
+
+# ============================================
+# HERRAMIENTA DE LÍNEA DE COMANDOS
+# ============================================
+
+def _cargar_origen(args) -> Tuple[MotorLineal, Optional[np.ndarray], str, Dict[str, str]]:
+    """Motor, coeficientes, tipo de modelo y origen desde un bundle o los .pkl."""
+    if args.bundle:
+        bundle = cargar_bundle(args.bundle)
+        origen = {"bundle": str(args.bundle), "version_modelo": bundle.metadata["version_modelo"]}
+        return bundle.motor, bundle.coeficientes, bundle.metadata["modelo_tipo"], origen
+
+    import joblib
+
+    modelo = joblib.load(args.modelo)
+    vectorizador = joblib.load(args.vectorizador)
+    idx_positivo = list(modelo.classes_).index('Positivo')
+    if hasattr(modelo, 'feature_log_prob_'):
+        coeficientes = modelo.feature_log_prob_[idx_positivo]
+    else:
+        coeficientes = modelo.coef_[0]
+
+    origen = {"modelo": Path(args.modelo).name, "vectorizador": Path(args.vectorizador).name}
+    motor = MotorLineal.desde_sklearn(modelo, vectorizador)
+    return motor, np.asarray(coeficientes, dtype=np.float64), type(modelo).__name__, origen
+
+
+def main():
+    directorio = Path(__file__).parent.parent / "modelos_serializados"
+
+    parser = argparse.ArgumentParser(description="Podar features y cuantizar el modelo en un bundle")
+    parser.add_argument("--destino", required=True, help="Directorio del bundle podado")
+    criterio = parser.add_mutually_exclusive_group(required=True)
+    criterio.add_argument("--umbral", type=float, help="Contribución mínima |peso|·idf")
+    criterio.add_argument("--conservar", type=float, help="Fracción de features a conservar (0-1]")
+    parser.add_argument("--tipo", choices=sorted(TIPOS), default="float32")
+    parser.add_argument("--bundle", help="Bundle de origen (en lugar de los .pkl)")
+    parser.add_argument("--modelo", default=str(directorio / "sentiment_model.pkl"))
+    parser.add_argument("--vectorizador", default=str(directorio / "tfidf_vectorizer.pkl"))
+    parser.add_argument("--corpus", help="Archivo con un texto por línea para el informe")
+    parser.add_argument("--muestras", type=int, default=2000, help="Textos sintéticos si no hay corpus")
+    parser.add_argument("--delta-max", type=float, default=None,
+                        help="Falla si la diferencia máxima de probabilidad supera este valor")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from .normalizacion import limpiar_many
+    from .prediccion import FRASES_VERIFICACION
+
+    motor, coeficientes, modelo_tipo, origen = _cargar_origen(args)
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            textos = limpiar_many(linea for linea in f if linea.strip())
+    else:
+        logger.warning("⚠️ Sin --corpus: el informe usa textos sintéticos del vocabulario")
+        textos = corpus_sintetico(motor, args.muestras)
+    textos += limpiar_many(FRASES_VERIFICACION)
+
+    mascara = seleccionar(contribuciones(motor), umbral=args.umbral, conservar=args.conservar)
+    podado, coeficientes_podados = podar(motor, coeficientes, mascara, args.tipo)
+
+    informe = {
+        "criterio": {"umbral": args.umbral, "conservar": args.conservar, "tipo": args.tipo},
+        "features_originales": motor.n_features,
+        "features": podado.n_features,
+        "bytes_originales": tamano_bytes(motor, coeficientes),
+        "bytes": tamano_bytes(podado, coeficientes_podados),
+        "corpus": args.corpus or "sintetico",
+        **comparar(motor, podado, textos)
+    }
+
+    destino = escribir_bundle(podado, coeficientes_podados, args.destino, modelo_tipo, origen, {"poda": informe})
+
+    # El bundle escrito debe puntuar igual que el motor evaluado
+    cargado = cargar_bundle(destino).motor
+    if not np.array_equal(cargado.probabilidades(textos)[0], podado.probabilidades(textos)[0]):
+        sys.exit("❌ El bundle escrito no reproduce el modelo podado")
+
+    print(json.dumps(informe, indent=2, ensure_ascii=False))
+    if args.delta_max is not None and informe["delta_prob_max"] > args.delta_max:
+        sys.exit(f"❌ Diferencia máxima de probabilidad {informe['delta_prob_max']:.4f} > {args.delta_max}")
+
+
+if __name__ == "__main__":
+    main()
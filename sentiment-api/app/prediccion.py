@@ -2,16 +2,38 @@
 # PREDICCION - LÓGICA DEL MODELO
 # ============================================
 
+import hashlib
 import joblib
 import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 import logging
+import numpy as np
+from . import config
+from .artefactos import cargar_bundle, nombres_features
+from .cache import CachePredicciones
+from .ejecucion import obtener_ejecutor
+from .metricas import observar_tamano_lote, registrar_etapa
+from .microlotes import MicroBatcher
+from .motor import MatrizTfidf, MotorLineal, matriz_desde_csr
+from .procesos import PoolProcesos
+from .sombra import obtener_evaluador
 from .utils import (
+    limpiar_many,
     limpiar_texto,
     traducir_texto,
+    traducir_texto_async,
+    traducir_grupos,
+    traducir_grupos_async,
+    detectar_idiomas,
     validar_texto,
-    obtener_nivel_confianza
+    validar_textos,
+    obtener_nivel_confianza,
+    obtener_niveles_confianza
 )
 from .schemas import (
     SentimentResponse,
@@ -23,6 +45,49 @@ from .schemas import (
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+
+# Frases con las que se verifica el motor lineal al cargar el modelo
+FRASES_VERIFICACION = [
+    "Este hotel es excelente, me encantó todo",
+    "Servicio horrible, comida pésima, hotel sucio",
+    "La habitación estaba bien pero el desayuno era normal",
+    "No volvería nunca, una experiencia terrible",
+    "Muy buena ubicación y personal amable",
+    "zzz qqq"
+]
+
+
+class ResultadoPrediccion(NamedTuple):
+    """Resultado de una predicción, independiente del texto original"""
+    prevision: str
+    probabilidad: float
+    confianza: str
+    idioma_detectado: Optional[str]
+
+
+def _ms_desde(inicio: float) -> float:
+    """Milisegundos transcurridos desde un time.perf_counter()."""
+    return round((time.perf_counter() - inicio) * 1000, 2)
+
+
+def _es_positivo(prob_positivo, prob_negativo, threshold: float):
+    """Decisión Positivo/Negativo; con 0.5 reproduce modelo.predict."""
+    if threshold == 0.5:
+        return prob_positivo > prob_negativo
+    return prob_positivo >= threshold
+
+
+def _version_pkl(model_path: Path, vectorizer_path: Path) -> str:
+    """
+    Versión de un modelo .pkl como hash del contenido de los artefactos.
+    Forma parte de la clave de cache de predicciones.
+    """
+    huella = hashlib.sha256()
+    for ruta in (model_path, vectorizer_path):
+        huella.update(Path(ruta).read_bytes())
+    return f"{Path(model_path).stem}-{huella.hexdigest()[:12]}"
+
+
 # ============================================
 # CLASE PRINCIPAL - PREDICTOR DE SENTIMIENTOS
 # ============================================
@@ -33,13 +98,24 @@ class SentimentPredictor:
     Carga el modelo y vectorizador una sola vez al inicializar.
     """
     
-    def __init__(self, model_path: str = None, vectorizer_path: str = None):
+    def __init__(
+        self,
+        model_path: str = None,
+        vectorizer_path: str = None,
+        bundle_path: str = None,
+        iniciar_procesos: bool = True
+    ):
         """
-        Inicializa el predictor cargando el modelo y vectorizador.
+        Inicializa el predictor cargando el modelo y vectorizador, o un
+        bundle de app/artefactos.py (solo motor lineal, sin scikit-learn).
         
         Args:
             model_path: Ruta al archivo .pkl del modelo
             vectorizer_path: Ruta al archivo .pkl del vectorizador
+            bundle_path: Directorio del bundle (default: MODELO_BUNDLE)
+            iniciar_procesos: Si False, el pool de procesos y el MicroBatcher
+                (que usa el pool de hilos de inferencia) se crean después con
+                iniciar_procesos() (p. ej. en cada worker tras el fork)
         """
         # Rutas por defecto
         if model_path is None:
@@ -51,19 +127,85 @@ class SentimentPredictor:
         self.model_path = Path(model_path)
         self.vectorizer_path = Path(vectorizer_path)
         
-        # Cargar modelo y vectorizador
-        self._cargar_modelo()
-        self._cargar_vectorizador()
+        if bundle_path is None and config.MODELO_BUNDLE:
+            bundle_path = config.MODELO_BUNDLE
+        self.bundle_path = Path(bundle_path) if bundle_path else None
+        
+        if self.bundle_path is not None:
+            # Bundle: arrays con memory-mapping, sin unpickle ni sklearn
+            self._cargar_bundle()
+        else:
+            # Cargar modelo y vectorizador
+            self._cargar_modelo()
+            self._cargar_vectorizador()
+            self.version_modelo = self._calcular_version()
+            
+            # Motor de scoring lineal (evita transform + predict_proba de sklearn)
+            self.motor: Optional[MotorLineal] = self._construir_motor()
+            
+            # Nombres de features y coeficientes para explicabilidad (una sola vez)
+            self._preparar_explicabilidad()
         
         # Configuración de threshold por defecto
         self.threshold = 0.5
         
+        # Cache de predicciones (texto normalizado + idioma + modelo + threshold)
+        self.cache: Optional[CachePredicciones] = None
+        if config.CACHE_PREDICCIONES_ACTIVA:
+            self.cache = CachePredicciones(
+                max_entradas=config.CACHE_PREDICCIONES_MAX,
+                ttl_segundos=config.CACHE_PREDICCIONES_TTL_SEGUNDOS
+            )
+        
+        # Pool de procesos de inferencia (opcional, para usar varios núcleos) y
+        # agrupador de peticiones concurrentes para /sentiment
+        self.procesos: Optional[PoolProcesos] = None
+        self.microbatcher: Optional[MicroBatcher] = None
+        if iniciar_procesos:
+            self.iniciar_procesos()
+        
+        # Usuarios en curso (peticiones, flujos, trabajos): un predictor
+        # sustituido se cierra cuando termina el último (ver usar_predictor)
+        self._usos = 0
+        self._retirado = False
+        self._usos_lock = threading.Lock()
+        
         logger.info("✅ SentimentPredictor inicializado correctamente")
     
+    def iniciar_procesos(self):
+        """
+        Crea lo que no puede cruzar un fork, si está configurado y no existe:
+        el MicroBatcher (y con él el pool de hilos de inferencia) y el pool
+        de procesos de inferencia.
+        """
+        if self.microbatcher is None and config.MICROLOTE_ACTIVO:
+            self.microbatcher = MicroBatcher(
+                funcion_lote=self._puntuar_microlote,
+                max_tamano=config.MICROLOTE_MAX_TAMANO,
+                max_espera_ms=config.MICROLOTE_MAX_ESPERA_MS,
+                ejecutor=obtener_ejecutor().pool
+            )
+        if self.procesos is None and config.INFERENCIA_PROCESOS > 0:
+            self.procesos = PoolProcesos(
+                model_path=self.model_path,
+                vectorizer_path=self.vectorizer_path,
+                bundle_path=self.bundle_path,
+                usar_motor=self.motor is not None,
+                max_procesos=config.INFERENCIA_PROCESOS,
+                tamano_bloque=config.INFERENCIA_PROCESOS_BLOQUE
+            )
+    
     def _cargar_modelo(self):
         """Carga el modelo serializado."""
         try:
             self.modelo = joblib.load(self.model_path)
+            
+            # Índices de clase precalculados (evita list.index en cada predicción)
+            self.clases = [str(c) for c in self.modelo.classes_]
+            self.modelo_tipo = type(self.modelo).__name__
+            self._idx_positivo = self.clases.index('Positivo')
+            self._idx_negativo = self.clases.index('Negativo')
+            
             logger.info(f"✅ Modelo cargado desde: {self.model_path}")
         except Exception as e:
             logger.error(f"❌ Error cargando modelo: {e}")
@@ -78,84 +220,435 @@ class SentimentPredictor:
             logger.error(f"❌ Error cargando vectorizador: {e}")
             raise
     
+    def _cargar_bundle(self):
+        """Carga un bundle de artefactos: solo motor lineal, sin sklearn."""
+        try:
+            bundle = cargar_bundle(self.bundle_path)
+        except Exception as e:
+            logger.error(f"❌ Error cargando bundle: {e}")
+            raise
+        
+        self.modelo = None
+        self.vectorizador = None
+        self.motor = bundle.motor
+        self.clases = list(bundle.metadata["clases"])
+        self.modelo_tipo = bundle.metadata["modelo_tipo"]
+        self._idx_positivo = self.clases.index('Positivo')
+        self._idx_negativo = self.clases.index('Negativo')
+        self.version_modelo = bundle.metadata["version_modelo"]
+        
+        self._nombres_features = nombres_features(bundle)
+        self._coeficientes = bundle.coeficientes
+        
+        logger.info(f"✅ Bundle cargado desde: {self.bundle_path} ({self.version_modelo})")
+    
+    def _calcular_version(self) -> str:
+        """Calcula la versión del modelo (ver _version_pkl)."""
+        return _version_pkl(self.model_path, self.vectorizer_path)
+    
+    def _preparar_explicabilidad(self):
+        """
+        Precalcula los nombres de features y el vector de coeficientes usados
+        por predecir_con_explicacion, para no reconstruirlos en cada petición.
+        """
+        self._nombres_features = self.vectorizador.get_feature_names_out()
+        
+        # Coeficientes del modelo (solo funciona con modelos lineales)
+        try:
+            if hasattr(self.modelo, 'feature_log_prob_'):
+                # Para Naive Bayes
+                coeficientes = self.modelo.feature_log_prob_[self._idx_positivo]
+            elif hasattr(self.modelo, 'coef_'):
+                # Para Logistic Regression
+                coeficientes = self.modelo.coef_[0]
+            else:
+                coeficientes = None
+        except Exception:
+            coeficientes = None
+        
+        self._coeficientes = None if coeficientes is None else np.asarray(coeficientes, dtype=np.float64)
+    
+    def _construir_motor(self) -> Optional[MotorLineal]:
+        """
+        Construye el motor lineal si está activado en la configuración y
+        verifica que reproduce las probabilidades de sklearn.
+        
+        Returns:
+            MotorLineal, o None si se usa el camino de sklearn
+        """
+        if config.MOTOR_PUNTUACION != 'lineal':
+            logger.info("Motor de scoring: sklearn")
+            return None
+        
+        try:
+            motor = MotorLineal.desde_sklearn(self.modelo, self.vectorizador)
+        except ValueError as e:
+            logger.warning(f"⚠️ Motor lineal no disponible, se usa sklearn: {e}")
+            return None
+        
+        # Verificación de paridad contra sklearn con frases de referencia
+        frases = limpiar_many(FRASES_VERIFICACION)
+        probabilidades = self.modelo.predict_proba(self.vectorizador.transform(frases))
+        prob_positivo, _ = motor.probabilidades(frases)
+        diferencia = float(np.max(np.abs(prob_positivo - probabilidades[:, self._idx_positivo])))
+        
+        if diferencia > config.MOTOR_TOLERANCIA_PARIDAD:
+            logger.warning(f"⚠️ Motor lineal difiere de sklearn ({diferencia:.2e}), se usa sklearn")
+            return None
+        
+        logger.info(f"✅ Motor de scoring lineal activo (diferencia máx. {diferencia:.2e})")
+        return motor
+    
     # ============================================
-    # PREDICCIÓN BÁSICA
+    # SCORING VECTORIZADO
     # ============================================
     
-    def predecir(
+    def _vectorizar_y_puntuar(
         self,
-        texto: str,
-        traducir: bool = False,
-        idioma_origen: str = 'auto'
-    ) -> SentimentResponse:
+        textos_limpios: List[str],
+        con_matriz: bool = True
+    ) -> Tuple[Optional[MatrizTfidf], np.ndarray, np.ndarray]:
         """
-        Realiza predicción de sentimiento básica.
+        Vectoriza un lote de textos ya limpios y calcula sus probabilidades,
+        con una sola llamada a transform y una sola a predict_proba, o con el
+        motor lineal si está activo. Con pool de procesos el lote se reparte
+        entre los workers.
         
         Args:
-            texto: Texto a analizar
-            traducir: Si True, intenta traducir al español
-            idioma_origen: Código de idioma origen ('auto' para detección)
+            textos_limpios: Textos procesados con limpiar_texto
+            con_matriz: Si False, no se construye la matriz TF-IDF (None)
             
         Returns:
-            SentimentResponse con la predicción
+            Tupla (matriz TF-IDF, prob_positivo, prob_negativo)
+        """
+        marca = time.perf_counter()
+        if self.procesos is not None:
+            if con_matriz:
+                matriz, prob_positivo, prob_negativo = self.procesos.vectorizar_y_puntuar(textos_limpios)
+            else:
+                matriz = None
+                prob_positivo, prob_negativo = self.procesos.puntuar(textos_limpios)
+            registrar_etapa('procesos', marca)
+        elif self.motor is not None:
+            matriz = self.motor.vectorizar_lote(textos_limpios)
+            registrar_etapa('vectorizacion', marca)
+            marca = time.perf_counter()
+            prob_positivo, prob_negativo = self.motor.puntuar(matriz)
+            registrar_etapa('predict_proba', marca)
+        else:
+            csr = self.vectorizador.transform(textos_limpios)
+            registrar_etapa('vectorizacion', marca)
+            marca = time.perf_counter()
+            probabilidades = self.modelo.predict_proba(csr)
+            registrar_etapa('predict_proba', marca)
+            matriz = matriz_desde_csr(csr) if con_matriz else None
+            prob_positivo, prob_negativo = probabilidades[:, self._idx_positivo], probabilidades[:, self._idx_negativo]
+        
+        return matriz, prob_positivo, prob_negativo
+    
+    def _probabilidades(self, textos_limpios: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula las probabilidades de un lote de textos ya limpios.
+        
+        Args:
+            textos_limpios: Textos procesados con limpiar_texto
+            
+        Returns:
+            Tupla (prob_positivo, prob_negativo) como arrays de NumPy
+        """
+        _, prob_positivo, prob_negativo = self._vectorizar_y_puntuar(textos_limpios, con_matriz=False)
+        return prob_positivo, prob_negativo
+    
+    def _copiar_a_sombra(
+        self,
+        textos_limpios: List[str],
+        prob_positivo: np.ndarray,
+        prob_negativo: np.ndarray,
+        threshold: float
+    ):
+        """
+        Copia una muestra del lote al modelo sombra, si hay uno (no bloquea).
+        
+        La copia la hace quien conoce el threshold de la petición, no
+        _probabilidades: un micro-lote mezcla peticiones con thresholds
+        distintos y el sombra debe decidir con el mismo que el principal.
+        """
+        evaluador = obtener_evaluador()
+        if evaluador is not None:
+            evaluador.enviar(textos_limpios, prob_positivo, prob_negativo, threshold)
+    
+    def _resolver_threshold(self, threshold: Optional[float]) -> float:
+        """
+        Threshold de una petición: el indicado o, si es None, el configurado
+        por defecto (POST /threshold). Se resuelve una vez por petición y se
+        pasa por todo el cálculo, sin tocar el estado compartido.
+        
+        Raises:
+            ValueError: Si el threshold está fuera de [0, 1]
+        """
+        if threshold is None:
+            return self.threshold
+        if not 0 <= threshold <= 1:
+            raise ValueError("Threshold debe estar entre 0 y 1")
+        return float(threshold)
+    
+    def _aplicar_threshold(self, prob_positivo: np.ndarray, prob_negativo: np.ndarray, threshold: float) -> np.ndarray:
+        """
+        Decide la clase de cada texto según el threshold de la petición.
+        
+        Con el threshold 0.5 se reproduce la decisión de modelo.predict
+        (clase con mayor probabilidad).
+        
+        Returns:
+            Array booleano, True donde la predicción es Positivo
+        """
+        return _es_positivo(prob_positivo, prob_negativo, threshold)
+    
+    # ============================================
+    # PREDICCIÓN BÁSICA
+    # ============================================
+    
+    def _validar(self, texto: str) -> str:
+        """
+        Valida un texto.
+        
+        Returns:
+            Texto limpio resultante de la validación
+            
+        Raises:
+            ValueError: Si el texto no supera la validación
         """
-        # Validar texto
         validacion = validar_texto(texto)
         if not validacion['valido']:
             raise ValueError(validacion['error'])
+        return validacion['texto_limpio']
+    
+    def _preparar(
+        self,
+        texto: str,
+        traducir: bool = False,
+        idioma_origen: str = 'auto',
+        resultado_traduccion: Optional[Dict] = None,
+        texto_limpio: Optional[str] = None
+    ) -> Dict:
+        """
+        Traduce (si corresponde) y limpia un texto ya validado.
+        
+        Args:
+            texto: Texto validado
+            traducir: Si True, intenta traducir al español
+            idioma_origen: Código de idioma origen
+            resultado_traduccion: Traducción ya obtenida (p. ej. en lote o de
+                forma asíncrona); si es None y hace falta, se traduce aquí
+            texto_limpio: Texto limpio de la validación (_validar); si no
+                hay traducción se usa tal cual en lugar de volver a limpiar
         
+        Returns:
+            Dict con el texto original, el texto limpio listo para
+            vectorizar y el idioma detectado
+        """
         texto_original = texto
         idioma_detectado = 'es'
         
         # Traducir si es necesario
         if traducir and idioma_origen != 'es':
-            resultado_traduccion = traducir_texto(
-                texto=texto,
-                idioma_origen=idioma_origen,
-                idioma_destino='es'
-            )
+            if resultado_traduccion is None:
+                resultado_traduccion = traducir_texto(
+                    texto=texto,
+                    idioma_origen=idioma_origen,
+                    idioma_destino='es'
+                )
             
             if resultado_traduccion['traduccion_exitosa']:
                 texto = resultado_traduccion['texto_traducido']
                 idioma_detectado = resultado_traduccion['idioma_detectado']
+                texto_limpio = None
                 logger.info(f"Texto traducido de {idioma_detectado} a español")
         
-        # Limpiar texto
-        texto_limpio = limpiar_texto(texto)
+        if texto_limpio is None:
+            marca = time.perf_counter()
+            texto_limpio = limpiar_texto(texto)
+            registrar_etapa('limpieza', marca)
+        
+        return {
+            'texto': texto_original,
+            'texto_limpio': texto_limpio,
+            'idioma_detectado': idioma_detectado if traducir else None
+        }
+    
+    async def _apreparar(
+        self,
+        texto: str,
+        traducir: bool = False,
+        idioma_origen: str = 'auto',
+        texto_limpio: Optional[str] = None
+    ) -> Dict:
+        """Igual que _preparar, pero la traducción no bloquea el event loop."""
+        resultado_traduccion = None
+        if traducir and idioma_origen != 'es':
+            resultado_traduccion = await traducir_texto_async(texto, idioma_origen, 'es')
+        return self._preparar(texto, traducir, idioma_origen, resultado_traduccion, texto_limpio)
+    
+    def _decidir(
+        self,
+        preparado: Dict,
+        prob_positivo: float,
+        prob_negativo: float,
+        threshold: float
+    ) -> ResultadoPrediccion:
+        """
+        Aplica el threshold a las probabilidades de un texto.
+        
+        Args:
+            preparado: Resultado de _preparar
+            prob_positivo: Probabilidad de la clase Positivo
+            prob_negativo: Probabilidad de la clase Negativo
+            threshold: Threshold de la petición
+            
+        Returns:
+            ResultadoPrediccion con clase, probabilidad y confianza
+        """
+        # Aplicar threshold (0.5 reproduce la decisión por defecto del modelo)
+        es_positivo = self._aplicar_threshold(prob_positivo, prob_negativo, threshold)
+        prediccion = 'Positivo' if es_positivo else 'Negativo'
         
-        # Vectorizar
-        texto_vectorizado = self.vectorizador.transform([texto_limpio])
+        # Probabilidad de la clase predicha
+        probabilidad = float(prob_positivo if prediccion == 'Positivo' else prob_negativo)
         
-        # Predecir
-        prediccion = self.modelo.predict(texto_vectorizado)[0]
-        probabilidades = self.modelo.predict_proba(texto_vectorizado)[0]
+        return ResultadoPrediccion(
+            prevision=prediccion,
+            probabilidad=probabilidad,
+            confianza=obtener_nivel_confianza(probabilidad),
+            idioma_detectado=preparado['idioma_detectado']
+        )
+    
+    def _construir_respuesta(self, texto: str, resultado: ResultadoPrediccion) -> SentimentResponse:
+        """
+        Arma la respuesta de una predicción.
         
-        # Obtener probabilidad de la clase predicha
-        clase_positiva_idx = list(self.modelo.classes_).index('Positivo')
-        clase_negativa_idx = list(self.modelo.classes_).index('Negativo')
+        Args:
+            texto: Texto original de la petición
+            resultado: Resultado calculado o recuperado de la cache
+            
+        Returns:
+            SentimentResponse con la predicción
+        """
+        marca = time.perf_counter()
+        logger.info(f"Predicción: {resultado.prevision} ({resultado.probabilidad:.4f})")
         
-        prob_positivo = probabilidades[clase_positiva_idx]
-        prob_negativo = probabilidades[clase_negativa_idx]
+        respuesta = SentimentResponse(
+            prevision=resultado.prevision,
+            probabilidad=round(resultado.probabilidad, 4),
+            texto=texto,
+            idioma_detectado=resultado.idioma_detectado,
+            confianza=resultado.confianza
+        )
+        registrar_etapa('respuesta', marca)
+        return respuesta
+    
+    def _clave_cache(self, texto_limpio: str, traducir: bool, idioma_origen: str, threshold: float) -> Tuple:
+        """
+        Clave de cache de una predicción: texto normalizado, idioma, versión
+        del modelo y threshold de la petición. Un cambio de modelo o threshold
+        produce claves nuevas, por lo que nunca se sirven resultados obsoletos.
+        """
+        return (
+            texto_limpio,
+            idioma_origen if traducir else None,
+            self.version_modelo,
+            threshold
+        )
+    
+    def _puntuar_microlote(self, textos_limpios: List[str]) -> List[Tuple[float, float]]:
+        """Función de lote del MicroBatcher: un predict_proba para todo el lote."""
+        observar_tamano_lote('microlote', len(textos_limpios))
+        prob_positivo, prob_negativo = self._probabilidades(textos_limpios)
+        return list(zip(prob_positivo, prob_negativo))
+    
+    def predecir(
+        self,
+        texto: str,
+        traducir: bool = False,
+        idioma_origen: str = 'auto',
+        threshold: Optional[float] = None
+    ) -> SentimentResponse:
+        """
+        Realiza predicción de sentimiento básica.
         
-        # Aplicar threshold personalizado si está configurado
-        if self.threshold != 0.5:
-            if prob_positivo >= self.threshold:
-                prediccion = 'Positivo'
-            else:
-                prediccion = 'Negativo'
+        Args:
+            texto: Texto a analizar
+            traducir: Si True, intenta traducir al español
+            idioma_origen: Código de idioma origen ('auto' para detección)
+            threshold: Threshold de esta petición (default: el configurado)
+            
+        Returns:
+            SentimentResponse con la predicción
+        """
+        threshold = self._resolver_threshold(threshold)
+        texto_limpio = self._validar(texto)
+        clave = self._clave_cache(texto_limpio, traducir, idioma_origen, threshold)
+        resultado = self.cache.obtener(clave) if self.cache is not None else None
         
-        # Probabilidad de la clase predicha
-        probabilidad = prob_positivo if prediccion == 'Positivo' else prob_negativo
+        if resultado is None:
+            preparado = self._preparar(texto, traducir, idioma_origen, texto_limpio=texto_limpio)
+            
+            # Vectorizar y predecir
+            probs_positivo, probs_negativo = self._probabilidades([preparado['texto_limpio']])
+            self._copiar_a_sombra([preparado['texto_limpio']], probs_positivo, probs_negativo, threshold)
+            resultado = self._decidir(preparado, probs_positivo[0], probs_negativo[0], threshold)
+            
+            if self.cache is not None:
+                self.cache.guardar(clave, resultado)
         
-        logger.info(f"Predicción: {prediccion} ({probabilidad:.4f})")
+        return self._construir_respuesta(texto, resultado)
+    
+    async def predecir_async(
+        self,
+        texto: str,
+        traducir: bool = False,
+        idioma_origen: str = 'auto',
+        threshold: Optional[float] = None
+    ) -> SentimentResponse:
+        """
+        Igual que predecir, pero sin bloquear el event loop: la traducción
+        usa el cliente asíncrono y el scoring pasa por el MicroBatcher (o por
+        el pool de inferencia) para agruparse con otras peticiones. El
+        MicroBatcher solo devuelve probabilidades, así que peticiones con
+        thresholds distintos comparten el mismo lote.
         
-        return SentimentResponse(
-            prevision=prediccion,
-            probabilidad=round(float(probabilidad), 4),
-            texto=texto_original,
-            idioma_detectado=idioma_detectado if traducir else None,
-            confianza=obtener_nivel_confianza(probabilidad)
-        )
+        Args:
+            texto: Texto a analizar
+            traducir: Si True, intenta traducir al español
+            idioma_origen: Código de idioma origen ('auto' para detección)
+            threshold: Threshold de esta petición (default: el configurado)
+            
+        Returns:
+            SentimentResponse con la predicción
+        """
+        threshold = self._resolver_threshold(threshold)
+        texto_limpio = self._validar(texto)
+        clave = self._clave_cache(texto_limpio, traducir, idioma_origen, threshold)
+        resultado = self.cache.obtener(clave) if self.cache is not None else None
+        
+        if resultado is None:
+            preparado = await self._apreparar(texto, traducir, idioma_origen, texto_limpio)
+            if self.microbatcher is not None:
+                # El lote se puntúa en el hilo del MicroBatcher, fuera del contexto de la petición
+                marca = time.perf_counter()
+                prob_positivo, prob_negativo = await self.microbatcher.enviar(preparado['texto_limpio'])
+                registrar_etapa('microlote', marca)
+            else:
+                probs_positivo, probs_negativo = await obtener_ejecutor().ejecutar(
+                    self._probabilidades, [preparado['texto_limpio']]
+                )
+                prob_positivo, prob_negativo = probs_positivo[0], probs_negativo[0]
+            self._copiar_a_sombra([preparado['texto_limpio']], [prob_positivo], [prob_negativo], threshold)
+            resultado = self._decidir(preparado, prob_positivo, prob_negativo, threshold)
+            
+            if self.cache is not None:
+                self.cache.guardar(clave, resultado)
+        
+        return self._construir_respuesta(texto, resultado)
     
     # ============================================
     # PREDICCIÓN CON EXPLICABILIDAD
@@ -166,7 +659,8 @@ class SentimentPredictor:
         texto: str,
         top_n: int = 5,
         traducir: bool = False,
-        idioma_origen: str = 'auto'
+        idioma_origen: str = 'auto',
+        threshold: Optional[float] = None
     ) -> SentimentExplainResponse:
         """
         Realiza predicción con explicación de palabras importantes.
@@ -176,64 +670,45 @@ class SentimentPredictor:
             top_n: Número de palabras más importantes a retornar
             traducir: Si True, intenta traducir al español
             idioma_origen: Código de idioma origen
+            threshold: Threshold de esta petición (default: el configurado)
             
         Returns:
             SentimentExplainResponse con predicción y explicación
         """
-        # Obtener predicción básica
-        prediccion_basica = self.predecir(texto, traducir, idioma_origen)
-        
-        # Limpiar texto para obtener features
-        texto_limpio = limpiar_texto(
-            prediccion_basica.texto if not traducir 
-            else traducir_texto(prediccion_basica.texto)['texto_traducido']
+        # Preparar (una sola traducción) y vectorizar una sola vez
+        threshold = self._resolver_threshold(threshold)
+        texto_limpio = self._validar(texto)
+        preparado = self._preparar(texto, traducir, idioma_origen, texto_limpio=texto_limpio)
+        return self._explicar(texto, preparado, top_n, threshold)
+    
+    async def predecir_con_explicacion_async(
+        self,
+        texto: str,
+        top_n: int = 5,
+        traducir: bool = False,
+        idioma_origen: str = 'auto',
+        threshold: Optional[float] = None
+    ) -> SentimentExplainResponse:
+        """
+        Igual que predecir_con_explicacion, con la traducción en el cliente
+        asíncrono y el cálculo en el pool de inferencia.
+        """
+        threshold = self._resolver_threshold(threshold)
+        texto_limpio = self._validar(texto)
+        preparado = await self._apreparar(texto, traducir, idioma_origen, texto_limpio)
+        return await obtener_ejecutor().ejecutar(self._explicar, texto, preparado, top_n, threshold)
+    
+    def _explicar(self, texto: str, preparado: Dict, top_n: int, threshold: float) -> SentimentExplainResponse:
+        """Vectoriza un texto preparado y arma la predicción con su explicación."""
+        matriz, probs_positivo, probs_negativo = self._vectorizar_y_puntuar([preparado['texto_limpio']])
+        self._copiar_a_sombra([preparado['texto_limpio']], probs_positivo, probs_negativo, threshold)
+        prediccion_basica = self._construir_respuesta(
+            texto, self._decidir(preparado, probs_positivo[0], probs_negativo[0], threshold)
         )
         
-        # Vectorizar
-        texto_vectorizado = self.vectorizador.transform([texto_limpio])
-        
-        # Obtener palabras importantes
-        feature_names = self.vectorizador.get_feature_names_out()
-        texto_array = texto_vectorizado.toarray()[0]
-        
-        # Obtener índices de features no-cero (palabras presentes)
-        indices_presentes = texto_array.nonzero()[0]
-        
-        # Obtener coeficientes del modelo (solo funciona con modelos lineales)
-        try:
-            if hasattr(self.modelo, 'feature_log_prob_'):
-                # Para Naive Bayes
-                clase_positiva_idx = list(self.modelo.classes_).index('Positivo')
-                coeficientes = self.modelo.feature_log_prob_[clase_positiva_idx]
-            elif hasattr(self.modelo, 'coef_'):
-                # Para Logistic Regression
-                coeficientes = self.modelo.coef_[0]
-            else:
-                coeficientes = None
-        except:
-            coeficientes = None
-        
-        # Calcular importancia de palabras presentes
-        palabras_importantes = []
-        palabras_influyentes_lista = []
-        
-        if coeficientes is not None:
-            for idx in indices_presentes:
-                palabra = feature_names[idx]
-                peso = float(coeficientes[idx])
-                tf_idf_valor = float(texto_array[idx])
-                importancia = abs(peso * tf_idf_valor)
-                
-                palabras_importantes.append({
-                    'palabra': palabra,
-                    'importancia': round(importancia, 4),
-                    'sentimiento': 'Positivo' if peso > 0 else 'Negativo'
-                })
-            
-            # Ordenar por importancia
-            palabras_importantes.sort(key=lambda x: x['importancia'], reverse=True)
-            palabras_influyentes_lista = [p['palabra'] for p in palabras_importantes[:top_n]]
-            palabras_importantes = palabras_importantes[:top_n]
+        # Calcular importancia solo sobre las features presentes (fila dispersa)
+        palabras_importantes = self._palabras_importantes(matriz.columnas, matriz.valores, top_n)
+        palabras_influyentes_lista = [p['palabra'] for p in palabras_importantes]
         
         return SentimentExplainResponse(
             sentimiento=prediccion_basica.prevision,
@@ -246,14 +721,365 @@ class SentimentPredictor:
             confianza=prediccion_basica.confianza
         )
     
+    def _palabras_importantes(
+        self,
+        columnas: np.ndarray,
+        valores: np.ndarray,
+        top_n: int
+    ) -> List[Dict]:
+        """
+        Selecciona las top_n palabras con mayor |coeficiente × tf-idf|.
+        
+        Usa una partición parcial (np.partition) sobre las entradas no nulas
+        de la fila, sin densificar el vector ni ordenar todas las features.
+        
+        Args:
+            columnas: Columnas no nulas de la fila TF-IDF
+            valores: Valores TF-IDF de esas columnas
+            top_n: Número de palabras a retornar
+            
+        Returns:
+            Lista de dicts con palabra, importancia y sentimiento
+        """
+        if self._coeficientes is None or top_n <= 0 or len(columnas) == 0:
+            return []
+        
+        pesos = self._coeficientes[columnas]
+        importancias = np.round(np.abs(pesos * valores), 4)
+        
+        seleccion = np.arange(len(columnas))
+        if len(columnas) > top_n:
+            # k-ésima mayor importancia; los empates en el corte se resuelven
+            # por columna, igual que el ordenamiento estable anterior
+            corte = -np.partition(-importancias, top_n - 1)[top_n - 1]
+            mayores = np.flatnonzero(importancias > corte)
+            empatados = np.flatnonzero(importancias == corte)[:top_n - len(mayores)]
+            seleccion = np.concatenate([mayores, empatados])
+        
+        # Orden descendente por importancia; a igual importancia, por columna
+        seleccion = seleccion[np.lexsort((columnas[seleccion], -importancias[seleccion]))]
+        
+        return [
+            {
+                'palabra': str(self._nombres_features[columnas[i]]),
+                'importancia': float(importancias[i]),
+                'sentimiento': 'Positivo' if pesos[i] > 0 else 'Negativo'
+            }
+            for i in seleccion
+        ]
+    
     # ============================================
     # PREDICCIÓN BATCH
     # ============================================
     
+    def predecir_lote(
+        self,
+        textos: List[str],
+        traducir: bool = False,
+        idioma_origen: str = 'auto',
+        usar_cache: bool = True,
+        threshold: Optional[float] = None
+    ) -> Dict:
+        """
+        Motor de predicción batch vectorizado.
+        
+        Valida y limpia todos los textos, consulta la cache para todo el lote
+        y, solo para los fallos, construye una única matriz CSR con un solo
+        transform y ejecuta un solo predict_proba. El threshold y los niveles
+        de confianza se aplican con NumPy sobre el lote completo. Los textos
+        que no superan la validación se marcan en la máscara 'validos' en
+        lugar de lanzar una excepción.
+        
+        Args:
+            textos: Lista de textos a analizar
+            traducir: Si True, intenta traducir cada texto al español
+            idioma_origen: Código de idioma origen
+            usar_cache: Si False, no consulta ni llena la cache (trabajos
+                masivos que desalojarían las entradas del tráfico normal)
+            threshold: Threshold de esta petición (default: el configurado)
+            
+        Returns:
+            Dict con arrays alineados con la entrada:
+                validos, errores, prevision, probabilidad, confianza,
+                idioma_detectado; y tiempos_etapas con la duración (ms)
+                de cada etapa
+        """
+        estado = self._iniciar_lote(textos, traducir, idioma_origen, usar_cache, threshold)
+        
+        preparados = None
+        if estado['fallos'] and traducir and idioma_origen != 'es':
+            originales, idiomas, grupos = self._agrupar_por_idioma(estado, textos, idioma_origen)
+            
+            marca = time.perf_counter()
+            traducciones = traducir_grupos(grupos, 'es')
+            estado['tiempos']['traduccion_ms'] = _ms_desde(marca)
+            
+            preparados = self._preparar_traducidos(originales, idiomas, grupos, traducciones, idioma_origen, estado)
+        
+        return self._completar_lote(estado, preparados)
+    
+    async def predecir_lote_async(
+        self,
+        textos: List[str],
+        traducir: bool = False,
+        idioma_origen: str = 'auto',
+        threshold: Optional[float] = None
+    ) -> Dict:
+        """
+        Igual que predecir_lote, sin bloquear el event loop: las etapas de
+        CPU se ejecutan en el pool de inferencia y la traducción masiva en el
+        cliente de traducción asíncrono.
+        """
+        ejecutor = obtener_ejecutor()
+        estado = await ejecutor.ejecutar(self._iniciar_lote, textos, traducir, idioma_origen, True, threshold)
+        
+        preparados = None
+        if estado['fallos'] and traducir and idioma_origen != 'es':
+            originales, idiomas, grupos = await ejecutor.ejecutar(
+                self._agrupar_por_idioma, estado, textos, idioma_origen
+            )
+            
+            marca = time.perf_counter()
+            traducciones = await traducir_grupos_async(grupos, 'es')
+            estado['tiempos']['traduccion_ms'] = _ms_desde(marca)
+            
+            preparados = await ejecutor.ejecutar(
+                self._preparar_traducidos, originales, idiomas, grupos, traducciones, idioma_origen, estado
+            )
+        
+        # Con pool de procesos, el event loop reparte los bloques entre workers
+        probabilidades = None
+        if self.procesos is not None and estado['fallos']:
+            preparados = self._preparados_sin_traducir(estado, preparados)
+            probabilidades = await self.procesos.apuntuar([p['texto_limpio'] for p in preparados])
+        
+        return await ejecutor.ejecutar(self._completar_lote, estado, preparados, probabilidades)
+    
+    def _iniciar_lote(
+        self,
+        textos: List[str],
+        traducir: bool,
+        idioma_origen: str,
+        usar_cache: bool = True,
+        threshold: Optional[float] = None
+    ) -> Dict:
+        """
+        Primera etapa del lote: validar todos los textos y consultar la cache.
+        
+        Returns:
+            Dict de estado del lote (validos, errores, posiciones, claves,
+            textos limpios, resultados en cache, fallos, threshold y tiempos)
+        
+        Raises:
+            ValueError: Si el threshold está fuera de [0, 1]
+        """
+        threshold = self._resolver_threshold(threshold)
+        n = len(textos)
+        observar_tamano_lote('lote', n)
+        validos = np.zeros(n, dtype=bool)
+        errores: List[Optional[str]] = [None] * n
+        tiempos: Dict = {}
+        marca = time.perf_counter()
+        
+        # Validar todo el lote y calcular las claves de cache
+        posiciones: List[int] = []
+        claves: List[Tuple] = []
+        limpios_validacion: List[str] = []
+        
+        cadenas: List[int] = []
+        for i, texto in enumerate(textos):
+            if isinstance(texto, str):
+                cadenas.append(i)
+            else:
+                errores[i] = 'El texto debe ser una cadena de caracteres'
+        
+        # Los textos se limpian juntos (limpiar_many) y una sola vez
+        for i, validacion in zip(cadenas, validar_textos([textos[i] for i in cadenas])):
+            if not validacion['valido']:
+                errores[i] = validacion['error']
+                continue
+            
+            validos[i] = True
+            posiciones.append(i)
+            limpios_validacion.append(validacion['texto_limpio'])
+            claves.append(self._clave_cache(validacion['texto_limpio'], traducir, idioma_origen, threshold))
+        
+        tiempos['validacion_ms'] = _ms_desde(marca)
+        marca = time.perf_counter()
+        
+        # Consultar la cache para todo el lote de una vez
+        if self.cache is not None and usar_cache:
+            resultados: List[Optional[ResultadoPrediccion]] = self.cache.obtener_muchos(claves)
+        else:
+            resultados = [None] * len(claves)
+        
+        tiempos['cache_ms'] = _ms_desde(marca)
+        
+        return {
+            'n': n,
+            'traducir': traducir,
+            'validos': validos,
+            'errores': errores,
+            'posiciones': posiciones,
+            'claves': claves,
+            'limpios_validacion': limpios_validacion,
+            'resultados': resultados,
+            # Solo se traducen y puntúan los fallos de cache
+            'fallos': [j for j, resultado in enumerate(resultados) if resultado is None],
+            'usar_cache': usar_cache,
+            'threshold': threshold,
+            'tiempos': tiempos
+        }
+    
+    def _agrupar_por_idioma(
+        self,
+        estado: Dict,
+        textos: List[str],
+        idioma_origen: str
+    ) -> Tuple[List[str], List[str], Dict[str, List[str]]]:
+        """
+        Etapa de detección: idioma de cada fallo de cache (si es 'auto') y
+        grupos de textos únicos por idioma, listos para una petición masiva
+        por grupo.
+        
+        Returns:
+            Tupla (textos originales, idioma de cada uno, grupos idioma -> textos)
+        """
+        marca = time.perf_counter()
+        originales = [textos[estado['posiciones'][j]] for j in estado['fallos']]
+        if idioma_origen == 'auto':
+            idiomas = detectar_idiomas(originales)
+        else:
+            idiomas = [idioma_origen] * len(originales)
+        
+        grupos: Dict[str, Dict[str, None]] = {}
+        for texto, idioma in zip(originales, idiomas):
+            grupos.setdefault(idioma, {})[texto] = None
+        
+        estado['tiempos']['deteccion_ms'] = _ms_desde(marca)
+        estado['tiempos']['idiomas'] = {idioma: len(unicos) for idioma, unicos in grupos.items()}
+        return originales, idiomas, {idioma: list(unicos) for idioma, unicos in grupos.items()}
+    
+    def _preparar_traducidos(
+        self,
+        originales: List[str],
+        idiomas: List[str],
+        grupos: Dict[str, List[str]],
+        traducciones: Dict[str, List[Dict]],
+        idioma_origen: str,
+        estado: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Aplica las traducciones de cada grupo a los textos originales.
+        
+        Con el estado del lote, los textos que no se traducen reutilizan el
+        texto limpio de la validación.
+        
+        Returns:
+            Lista de dicts de _preparar alineada con originales
+        """
+        por_texto = {
+            (idioma, texto): traduccion
+            for idioma, unicos in grupos.items()
+            for texto, traduccion in zip(unicos, traducciones[idioma])
+        }
+        if estado is not None:
+            limpios = [estado['limpios_validacion'][j] for j in estado['fallos']]
+        else:
+            limpios = [None] * len(originales)
+        return [
+            self._preparar(texto, True, idioma_origen, por_texto[(idioma, texto)], texto_limpio)
+            for texto, idioma, texto_limpio in zip(originales, idiomas, limpios)
+        ]
+    
+    def _preparados_sin_traducir(self, estado: Dict, preparados: Optional[List[Dict]]) -> List[Dict]:
+        """Textos a puntuar de los fallos: los traducidos o los limpios de la validación."""
+        if preparados is not None:
+            return preparados
+        return [
+            {
+                'texto_limpio': estado['limpios_validacion'][j],
+                'idioma_detectado': 'es' if estado['traducir'] else None
+            }
+            for j in estado['fallos']
+        ]
+    
+    def _completar_lote(
+        self,
+        estado: Dict,
+        preparados: Optional[List[Dict]],
+        probabilidades: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> Dict:
+        """
+        Última etapa del lote: puntuar todos los fallos en una sola matriz,
+        guardarlos en la cache y armar los arrays de salida.
+        
+        Args:
+            estado: Estado devuelto por _iniciar_lote
+            preparados: Textos traducidos de los fallos (None si no se tradujo)
+            probabilidades: Probabilidades ya calculadas de los fallos (opcional)
+            
+        Returns:
+            Dict con el formato de predecir_lote
+        """
+        n = estado['n']
+        resultados = estado['resultados']
+        fallos = estado['fallos']
+        claves = estado['claves']
+        tiempos = estado['tiempos']
+        
+        if fallos:
+            preparados = self._preparados_sin_traducir(estado, preparados)
+            
+            marca = time.perf_counter()
+            if probabilidades is None:
+                probabilidades = self._probabilidades([p['texto_limpio'] for p in preparados])
+            prob_positivo, prob_negativo = probabilidades
+            self._copiar_a_sombra([p['texto_limpio'] for p in preparados], prob_positivo, prob_negativo, estado['threshold'])
+            es_positivo = self._aplicar_threshold(prob_positivo, prob_negativo, estado['threshold'])
+            prob_clase = np.where(es_positivo, prob_positivo, prob_negativo)
+            niveles = obtener_niveles_confianza(prob_clase)
+            
+            nuevos = []
+            for k, j in enumerate(fallos):
+                resultados[j] = ResultadoPrediccion(
+                    prevision='Positivo' if es_positivo[k] else 'Negativo',
+                    probabilidad=float(prob_clase[k]),
+                    confianza=str(niveles[k]),
+                    idioma_detectado=preparados[k]['idioma_detectado']
+                )
+                nuevos.append((claves[j], resultados[j]))
+            
+            if self.cache is not None and estado['usar_cache']:
+                self.cache.guardar_muchos(nuevos)
+            tiempos['puntuacion_ms'] = _ms_desde(marca)
+        
+        prevision = np.full(n, 'Error', dtype=object)
+        probabilidad = np.zeros(n, dtype=np.float64)
+        confianza = np.full(n, 'Baja', dtype=object)
+        idiomas: List[Optional[str]] = [None] * n
+        
+        for i, resultado in zip(estado['posiciones'], resultados):
+            prevision[i] = resultado.prevision
+            probabilidad[i] = resultado.probabilidad
+            confianza[i] = resultado.confianza
+            idiomas[i] = resultado.idioma_detectado
+        
+        return {
+            'validos': estado['validos'],
+            'errores': estado['errores'],
+            'prevision': prevision,
+            'probabilidad': probabilidad,
+            'confianza': confianza,
+            'idioma_detectado': idiomas,
+            'tiempos_etapas': tiempos
+        }
+    
     def predecir_batch(
         self,
         textos: List[str],
-        traducir: bool = False
+        traducir: bool = False,
+        threshold: Optional[float] = None
     ) -> BatchSentimentResponse:
         """
         Realiza predicción en múltiples textos.
@@ -261,44 +1087,128 @@ class SentimentPredictor:
         Args:
             textos: Lista de textos a analizar
             traducir: Si True, intenta traducir cada texto
+            threshold: Threshold de esta petición (default: el configurado)
             
         Returns:
             BatchSentimentResponse con todas las predicciones
         """
+        lote = self.predecir_lote(textos, traducir=traducir, threshold=threshold)
         resultados = []
-        exitosos = 0
-        fallidos = 0
         
-        for texto in textos:
-            try:
-                prediccion = self.predecir(texto, traducir=traducir)
-                resultados.append(prediccion)
-                exitosos += 1
-            except Exception as e:
-                logger.error(f"Error prediciendo texto: {e}")
-                fallidos += 1
-                # Agregar resultado con error
+        for i, texto in enumerate(textos):
+            if not lote['validos'][i]:
+                logger.error(f"Error prediciendo texto: {lote['errores'][i]}")
                 resultados.append(SentimentResponse(
                     prevision="Error",
                     probabilidad=0.0,
-                    texto=texto,
+                    texto=texto if isinstance(texto, str) else str(texto),
                     confianza="Baja"
                 ))
+                continue
+            
+            # Los valores ya vienen validados del motor batch
+            resultados.append(SentimentResponse.model_construct(
+                prevision=lote['prevision'][i],
+                probabilidad=round(float(lote['probabilidad'][i]), 4),
+                texto=texto,
+                idioma_detectado=lote['idioma_detectado'][i],
+                confianza=lote['confianza'][i]
+            ))
+        
+        exitosos = int(lote['validos'].sum())
         
         return BatchSentimentResponse(
             predicciones=resultados,
             total=len(textos),
             exitosos=exitosos,
-            fallidos=fallidos
+            fallidos=len(textos) - exitosos
         )
     
+    def calentar_cache(self, entradas: List[Tuple[Tuple, ResultadoPrediccion]]) -> int:
+        """
+        Puntúa con este modelo entradas de la cache de otro predictor y las
+        guarda con las claves de este (la versión del modelo forma parte de
+        la clave). Solo sirven las de textos que no se tradujeron: la clave
+        guarda el texto limpio original, no la traducción.
+        
+        Args:
+            entradas: Pares (clave, resultado) de CachePredicciones.recientes
+            
+        Returns:
+            Número de entradas guardadas
+        """
+        if self.cache is None:
+            return 0
+        
+        reutilizables = [
+            (clave, resultado) for clave, resultado in entradas
+            if clave[1] is None or resultado.idioma_detectado == 'es'
+        ]
+        if not reutilizables:
+            return 0
+        
+        prob_positivo, prob_negativo = self._probabilidades([clave[0] for clave, _ in reutilizables])
+        pares = []
+        for i, ((texto_limpio, idioma, _, threshold), resultado) in enumerate(reutilizables):
+            nuevo = self._decidir(
+                {'idioma_detectado': resultado.idioma_detectado}, prob_positivo[i], prob_negativo[i], threshold
+            )
+            pares.append((self._clave_cache(texto_limpio, idioma is not None, idioma, threshold), nuevo))
+        self.cache.guardar_muchos(pares)
+        return len(pares)
+    
+    # ============================================
+    # CICLO DE VIDA (USOS Y RETIRO)
+    # ============================================
+    
+    def adquirir(self):
+        """Registra un usuario del predictor (ver adquirir_predictor)."""
+        with self._usos_lock:
+            self._usos += 1
+    
+    def liberar(self):
+        """Da de baja un usuario; si el predictor ya fue sustituido y era el último, lo cierra."""
+        with self._usos_lock:
+            self._usos -= 1
+            cerrar = self._retirado and self._usos == 0
+        if cerrar:
+            self._cerrar_en_segundo_plano()
+    
+    def retirar(self):
+        """
+        Marca el predictor como sustituido: se cierra en cuanto no lo use
+        nadie (ya mismo, si no tiene usuarios).
+        """
+        with self._usos_lock:
+            self._retirado = True
+            cerrar = self._usos == 0
+        if cerrar:
+            self._cerrar_en_segundo_plano()
+    
+    @property
+    def usos(self) -> int:
+        return self._usos
+    
+    def _cerrar_en_segundo_plano(self):
+        # liberar() puede llamarse desde el event loop; cerrar el pool espera a sus procesos
+        threading.Thread(target=self.cerrar, name="retiro-modelo", daemon=True).start()
+    
+    def cerrar(self):
+        """Detiene el MicroBatcher y cierra el pool de procesos."""
+        if self.microbatcher is not None:
+            self.microbatcher.detener()
+        if self.procesos is not None:
+            self.procesos.cerrar()
+        logger.info(f"🗑️ Modelo retirado: {self.version_modelo}")
+    
     # ============================================
     # CONFIGURACIÓN DE THRESHOLD
     # ============================================
     
     def configurar_threshold(self, threshold: float):
         """
-        Configura el threshold de decisión.
+        Configura el threshold de decisión por defecto (el de las peticiones
+        que no indican uno).
         
         Args:
             threshold: Valor entre 0 y 1
@@ -306,9 +1216,155 @@ class SentimentPredictor:
         if not 0 <= threshold <= 1:
             raise ValueError("Threshold debe estar entre 0 y 1")
         
+        if threshold != self.threshold and self.cache is not None:
+            self.cache.invalidar()
+        
         self.threshold = threshold
         logger.info(f"Threshold configurado a: {threshold}")
     
+    # ============================================
+    # BARRIDO DE THRESHOLDS
+    # ============================================
+    
+    def barrer_thresholds(
+        self,
+        textos: List[str],
+        thresholds: List[float],
+        etiquetas: Optional[List[str]] = None,
+        traducir: bool = False,
+        idioma_origen: str = 'es',
+        incluir_predicciones: bool = False
+    ) -> Dict:
+        """
+        Evalúa varios thresholds sobre un lote calculando las probabilidades
+        una sola vez.
+        
+        Las decisiones de todos los thresholds salen de una comparación con
+        broadcasting (thresholds x textos) y los conteos de una suma por fila.
+        No usa la cache de predicciones: es tráfico de ajuste, no de producción.
+        
+        Args:
+            textos: Textos a puntuar
+            thresholds: Thresholds a evaluar (cada uno en [0, 1])
+            etiquetas: Clase real de cada texto ('Positivo'/'Negativo'),
+                alineada con textos; con ellas se calcula la matriz de
+                confusión y las métricas de cada threshold
+            traducir: Si True, intenta traducir cada texto al español
+            idioma_origen: Código de idioma origen
+            incluir_predicciones: Si True, añade la clase de cada texto para
+                cada threshold (None en los textos no válidos)
+        
+        Returns:
+            Dict con totales, errores por texto, el resultado de cada
+            threshold, el mejor por F1 (si hay etiquetas) y tiempos por etapa
+        
+        Raises:
+            ValueError: Si los thresholds o las etiquetas no son válidos
+        """
+        umbrales = np.asarray(thresholds, dtype=np.float64)
+        if umbrales.ndim != 1 or len(umbrales) == 0:
+            raise ValueError("Se requiere una lista no vacía de thresholds")
+        if np.any((umbrales < 0) | (umbrales > 1)) or np.any(np.isnan(umbrales)):
+            raise ValueError("Cada threshold debe estar entre 0 y 1")
+        
+        if etiquetas is not None:
+            if len(etiquetas) != len(textos):
+                raise ValueError("'etiquetas' debe tener un elemento por texto")
+            invalidas = sorted({str(e) for e in etiquetas if e not in self.clases})
+            if invalidas:
+                raise ValueError(f"Etiquetas desconocidas: {', '.join(invalidas)} (use {', '.join(self.clases)})")
+        
+        estado = self._iniciar_lote(textos, traducir, idioma_origen, usar_cache=False)
+        tiempos = estado['tiempos']
+        
+        preparados = None
+        if estado['fallos'] and traducir and idioma_origen != 'es':
+            originales, idiomas, grupos = self._agrupar_por_idioma(estado, textos, idioma_origen)
+            marca = time.perf_counter()
+            traducciones = traducir_grupos(grupos, 'es')
+            tiempos['traduccion_ms'] = _ms_desde(marca)
+            preparados = self._preparar_traducidos(originales, idiomas, grupos, traducciones, idioma_origen, estado)
+        preparados = self._preparados_sin_traducir(estado, preparados)
+        
+        # Probabilidades una sola vez para todos los thresholds
+        marca = time.perf_counter()
+        if preparados:
+            prob_positivo, prob_negativo = self._probabilidades([p['texto_limpio'] for p in preparados])
+        else:
+            prob_positivo = prob_negativo = np.zeros(0, dtype=np.float64)
+        tiempos['puntuacion_ms'] = _ms_desde(marca)
+        
+        # Decisiones (thresholds x textos válidos) por broadcasting
+        marca = time.perf_counter()
+        decisiones = prob_positivo[np.newaxis, :] >= umbrales[:, np.newaxis]
+        por_defecto = umbrales == 0.5
+        if por_defecto.any():
+            # 0.5 reproduce modelo.predict, como _es_positivo
+            decisiones[por_defecto] = prob_positivo > prob_negativo
+        
+        m = decisiones.shape[1]
+        positivos = decisiones.sum(axis=1)
+        
+        metricas = None
+        if etiquetas is not None:
+            reales = np.array([etiquetas[i] == 'Positivo' for i in estado['posiciones']], dtype=bool)
+            vp = (decisiones & reales).sum(axis=1)
+            fp = positivos - vp
+            fn = int(reales.sum()) - vp
+            vn = m - vp - fp - fn
+            
+            def dividir(a: np.ndarray, b: np.ndarray) -> List[Optional[float]]:
+                return [round(float(x) / y, 6) if y else None for x, y in zip(a, b)]
+            
+            precision = dividir(vp, vp + fp)
+            recall = dividir(vp, vp + fn)
+            f1 = dividir(2 * vp, 2 * vp + fp + fn)
+            exactitud = dividir(vp + vn, np.full(len(umbrales), m))
+            metricas = (vp, fp, vn, fn, precision, recall, f1, exactitud)
+        tiempos['barrido_ms'] = _ms_desde(marca)
+        
+        resultados = []
+        for k, umbral in enumerate(umbrales):
+            resultado: Dict = {
+                "threshold": float(umbral),
+                "positivos": int(positivos[k]),
+                "negativos": int(m - positivos[k]),
+                "porcentaje_positivos": round(float(positivos[k]) / m * 100, 2) if m else 0
+            }
+            if metricas is not None:
+                vp, fp, vn, fn, precision, recall, f1, exactitud = metricas
+                resultado["confusion"] = {"vp": int(vp[k]), "fp": int(fp[k]), "vn": int(vn[k]), "fn": int(fn[k])}
+                resultado.update({
+                    "precision": precision[k],
+                    "recall": recall[k],
+                    "f1": f1[k],
+                    "exactitud": exactitud[k]
+                })
+            if incluir_predicciones:
+                predicciones: List[Optional[str]] = [None] * estado['n']
+                for i, positivo in zip(estado['posiciones'], decisiones[k]):
+                    predicciones[i] = 'Positivo' if positivo else 'Negativo'
+                resultado["predicciones"] = predicciones
+            resultados.append(resultado)
+        
+        mejor = None
+        if metricas is not None:
+            candidatos = [r for r in resultados if r["f1"] is not None]
+            if candidatos:
+                mejor = max(candidatos, key=lambda r: r["f1"])["threshold"]
+        
+        return {
+            "total": estado['n'],
+            "validos": m,
+            "errores": [
+                {"indice": i, "error": error}
+                for i, error in enumerate(estado['errores']) if error is not None
+            ],
+            "thresholds": resultados,
+            "mejor_threshold_f1": mejor,
+            "tiempos_etapas": tiempos
+        }
+    
     # ============================================
     # INFORMACIÓN DEL MODELO
     # ============================================
@@ -321,12 +1377,16 @@ class SentimentPredictor:
             Dict con información del modelo
         """
         return {
-            "modelo_tipo": type(self.modelo).__name__,
-            "clases": list(self.modelo.classes_),
-            "num_features": len(self.vectorizador.get_feature_names_out()),
+            "modelo_tipo": self.modelo_tipo,
+            "version_modelo": self.version_modelo,
+            "clases": list(self.clases),
+            "num_features": len(self._nombres_features),
             "threshold_actual": self.threshold,
+            "motor": "lineal" if self.motor is not None else "sklearn",
+            "procesos_inferencia": self.procesos.max_procesos if self.procesos is not None else 0,
             "modelo_path": str(self.model_path),
-            "vectorizador_path": str(self.vectorizer_path)
+            "vectorizador_path": str(self.vectorizer_path),
+            "bundle_path": str(self.bundle_path) if self.bundle_path is not None else None
         }
 
 
@@ -337,14 +1397,25 @@ class SentimentPredictor:
 # Esta variable se inicializará en main.py al arrancar la aplicación
 predictor: Optional[SentimentPredictor] = None
 
+# Protege la sustitución del predictor frente a adquirir_predictor
+_predictor_lock = threading.Lock()
+
 
-def inicializar_predictor():
+def inicializar_predictor(iniciar_procesos: bool = True):
     """
     Inicializa el predictor global.
-    Esta función se llama al arrancar la aplicación.
+    Esta función se llama al arrancar la aplicación; si el modelo ya se
+    precargó en el proceso maestro (PRECARGA_MODELO), no lo vuelve a cargar.
+    
+    Args:
+        iniciar_procesos: Si False, no crea todavía el pool de procesos ni el
+            MicroBatcher
     """
     global predictor
-    predictor = SentimentPredictor()
+    if predictor is None:
+        predictor = SentimentPredictor(iniciar_procesos=iniciar_procesos)
+    elif iniciar_procesos:
+        predictor.iniciar_procesos()
     return predictor
 
 
@@ -360,4 +1431,455 @@ def obtener_predictor() -> SentimentPredictor:
     """
     if predictor is None:
         raise RuntimeError("El predictor no ha sido inicializado")
-    return predictor
\ No newline at end of file
+    return predictor
+
+
+def adquirir_predictor() -> SentimentPredictor:
+    """
+    Obtiene el predictor actual y lo retiene: aunque se active otro modelo,
+    no se cierra hasta que se llame a liberar(). Es atómico respecto a la
+    sustitución, así que nunca se retiene un predictor ya cerrado.
+    
+    Raises:
+        RuntimeError: Si el predictor no ha sido inicializado
+    """
+    with _predictor_lock:
+        actual = obtener_predictor()
+        actual.adquirir()
+    return actual
+
+
+@contextmanager
+def usar_predictor() -> Iterator[SentimentPredictor]:
+    """
+    Context manager de adquirir_predictor/liberar: todo lo que se puntúe
+    dentro usa el mismo modelo y su pool sigue abierto hasta salir.
+    """
+    actual = adquirir_predictor()
+    try:
+        yield actual
+    finally:
+        actual.liberar()
+
+# ============================================
+# REGISTRO DE MODELOS (ACTIVACIÓN EN CALIENTE)
+# ============================================
+
+
+class ModeloComparable(NamedTuple):
+    """Versión cargada como motor lineal para /sentiment/compare"""
+    nombre: str
+    version_modelo: str
+    modelo_tipo: str
+    motor: MotorLineal
+
+
+def _clave_archivos(version: Dict) -> Tuple:
+    """Rutas y fechas de modificación: cambia si se reescribe la versión."""
+    rutas = [version[c] for c in ("modelo_path", "vectorizador_path", "bundle_path") if c in version]
+    if version["tipo"] == "bundle":
+        rutas = [str(p) for p in sorted(Path(version["bundle_path"]).iterdir())]
+    return tuple((ruta, os.stat(ruta).st_mtime_ns) for ruta in rutas)
+
+
+class RegistroModelos:
+    """
+    Versiones de modelo disponibles y activación en caliente.
+    
+    Una versión es un sentiment_model*.pkl (con el tfidf_vectorizer*.pkl del
+    mismo sufijo, o tfidf_vectorizer.pkl si no existe) o un directorio de
+    bundle de app/artefactos.py. activar() carga la versión en un hilo, la
+    calienta y sustituye el predictor global con una sola asignación: las
+    peticiones, flujos NDJSON y trabajos en curso retienen el predictor
+    anterior (usar_predictor) y terminan con él. El anterior se cierra
+    (MicroBatcher y pool de procesos) cuando termina el último de ellos.
+    
+    Las claves de la cache de predicciones incluyen la versión del modelo,
+    así que las del anterior no le sirven al nuevo. Antes de la sustitución
+    se puntúan con el nuevo las MODELOS_CALENTAR_CACHE entradas usadas más
+    recientemente (calentar_cache); las de textos traducidos no se pueden
+    reutilizar sin volver a traducir y llegan a la cache con el tráfico.
+    
+    El registro es por proceso: con varios workers de gunicorn, cada uno
+    activa su propia copia.
+    """
+    
+    def __init__(self, directorio: str = None):
+        """
+        Args:
+            directorio: Directorio de versiones (default: MODELOS_DIRECTORIO)
+        """
+        self.directorio = Path(directorio or config.MODELOS_DIRECTORIO)
+        self._lock = threading.Lock()
+        # Activación en curso o la última terminada
+        self._activacion: Optional[Dict] = None
+        self._activaciones = 0
+        # Versiones cargadas para comparar: nombre -> (clave de archivos, modelo)
+        self._comparables: Dict[str, Tuple[Tuple, ModeloComparable]] = {}
+        self._comparables_lock = threading.Lock()
+    
+    def descubrir(self) -> Dict[str, Dict]:
+        """
+        Busca las versiones disponibles en el directorio.
+        
+        Returns:
+            Dict nombre -> rutas de la versión ('pkl' o 'bundle')
+        """
+        versiones: Dict[str, Dict] = {}
+        if not self.directorio.is_dir():
+            return versiones
+        
+        for ruta in sorted(self.directorio.glob("sentiment_model*.pkl")):
+            sufijo = ruta.stem[len("sentiment_model"):]
+            vectorizador = self.directorio / f"tfidf_vectorizer{sufijo}.pkl"
+            if not vectorizador.exists():
+                vectorizador = self.directorio / "tfidf_vectorizer.pkl"
+            versiones[ruta.stem] = {
+                "nombre": ruta.stem,
+                "tipo": "pkl",
+                "modelo_path": str(ruta),
+                "vectorizador_path": str(vectorizador)
+            }
+        
+        for ruta in sorted(p for p in self.directorio.iterdir() if (p / "metadata.json").is_file()):
+            versiones[ruta.name] = {"nombre": ruta.name, "tipo": "bundle", "bundle_path": str(ruta)}
+        
+        return versiones
+    
+    @staticmethod
+    def _es_activa(version: Dict, actual: Optional[SentimentPredictor]) -> bool:
+        """Indica si el predictor se cargó desde esa versión."""
+        if actual is None:
+            return False
+        if version["tipo"] == "bundle":
+            return actual.bundle_path is not None and actual.bundle_path.resolve() == Path(version["bundle_path"]).resolve()
+        return (
+            actual.bundle_path is None
+            and actual.model_path.resolve() == Path(version["modelo_path"]).resolve()
+            and actual.vectorizer_path.resolve() == Path(version["vectorizador_path"]).resolve()
+        )
+    
+    def listar(self) -> Dict:
+        """
+        Lista las versiones disponibles y marca la activa.
+        
+        Returns:
+            Dict con la versión activa, las versiones y el estado de la
+            última activación
+        """
+        actual = predictor
+        versiones = [
+            {**version, "activa": self._es_activa(version, actual)}
+            for version in self.descubrir().values()
+        ]
+        return {
+            "version_activa": actual.version_modelo if actual is not None else None,
+            "versiones": versiones,
+            "activacion": self.estado()
+        }
+    
+    def estado(self) -> Optional[Dict]:
+        """Estado de la activación en curso o de la última."""
+        with self._lock:
+            return dict(self._activacion) if self._activacion is not None else None
+    
+    def activar(self, nombre: str, esperar: bool = False) -> Dict:
+        """
+        Activa una versión: la carga y calienta en un hilo aparte y después
+        sustituye el predictor global.
+        
+        Args:
+            nombre: Nombre de la versión (ver descubrir())
+            esperar: Si True, carga en el hilo actual y devuelve al terminar
+            
+        Returns:
+            Estado de la activación
+            
+        Raises:
+            KeyError: Si la versión no existe
+            RuntimeError: Si ya hay una activación en curso
+        """
+        versiones = self.descubrir()
+        if nombre not in versiones:
+            raise KeyError(f"Versión de modelo no encontrada: {nombre}")
+        
+        with self._lock:
+            if self._activacion is not None and self._activacion["estado"] in ("cargando", "calentando"):
+                raise RuntimeError(f"Ya hay una activación en curso: {self._activacion['nombre']}")
+            self._activaciones += 1
+            self._activacion = {
+                "id": self._activaciones,
+                "nombre": nombre,
+                "estado": "cargando",
+                "inicio": datetime.now().isoformat(),
+                "version_modelo": None,
+                "version_anterior": None,
+                "cache_calentada": None,
+                "duracion_ms": None,
+                "error": None
+            }
+        
+        if esperar:
+            self._cargar_y_sustituir(versiones[nombre])
+        else:
+            threading.Thread(
+                target=self._cargar_y_sustituir,
+                args=(versiones[nombre],),
+                name="activacion-modelo",
+                daemon=True
+            ).start()
+        return self.estado()
+    
+    def _actualizar(self, **cambios):
+        with self._lock:
+            self._activacion.update(cambios)
+    
+    def _cargar_y_sustituir(self, version: Dict):
+        """
+        Carga, calienta (caminos de código y cache) y sustituye el predictor
+        global (hilo de activación).
+        """
+        global predictor
+        inicio = time.perf_counter()
+        
+        try:
+            # bundle_path="" evita que MODELO_BUNDLE sustituya a los .pkl
+            nuevo = SentimentPredictor(
+                model_path=version.get("modelo_path"),
+                vectorizer_path=version.get("vectorizador_path"),
+                bundle_path=version.get("bundle_path", "")
+            )
+            
+            # Calentamiento: primeras llamadas por cada camino (lote, simple y
+            # explicabilidad) antes de recibir tráfico
+            self._actualizar(estado="calentando", version_modelo=nuevo.version_modelo)
+            nuevo.predecir_lote(FRASES_VERIFICACION)
+            nuevo.predecir(FRASES_VERIFICACION[0])
+            nuevo.predecir_con_explicacion(FRASES_VERIFICACION[0])
+            
+            # Cache: las entradas más usadas del modelo actual, puntuadas con el nuevo
+            actual = predictor
+            cache_calentada = 0
+            if actual is not None and actual.cache is not None and config.MODELOS_CALENTAR_CACHE > 0:
+                cache_calentada = nuevo.calentar_cache(actual.cache.recientes(config.MODELOS_CALENTAR_CACHE))
+        except Exception as e:
+            logger.error(f"❌ Error activando el modelo {version['nombre']}: {e}")
+            self._actualizar(estado="error", error=str(e), duracion_ms=_ms_desde(inicio))
+            return
+        
+        with self._lock, _predictor_lock:
+            anterior = predictor
+            if anterior is not None:
+                nuevo.configurar_threshold(anterior.threshold)
+            # Una sola asignación: cada petición usa el predictor que obtuvo al empezar
+            predictor = nuevo
+            self._activacion.update(
+                estado="activa",
+                version_anterior=anterior.version_modelo if anterior is not None else None,
+                cache_calentada=cache_calentada,
+                duracion_ms=_ms_desde(inicio)
+            )
+        
+        logger.info(f"🔄 Modelo activado: {version['nombre']} ({nuevo.version_modelo})")
+        
+        # El anterior sigue vivo mientras lo usen peticiones, flujos o trabajos
+        if anterior is not None and anterior is not nuevo:
+            anterior.retirar()
+    
+    # ============================================
+    # COMPARACIÓN DE MODELOS
+    # ============================================
+    
+    def cargar_comparable(self, version: Dict) -> ModeloComparable:
+        """Carga el motor lineal de una versión (sin pool ni cache)."""
+        if version["tipo"] == "bundle":
+            bundle = cargar_bundle(version["bundle_path"])
+            return ModeloComparable(
+                version["nombre"], bundle.metadata["version_modelo"],
+                bundle.metadata["modelo_tipo"], bundle.motor
+            )
+        
+        modelo = joblib.load(version["modelo_path"])
+        vectorizador = joblib.load(version["vectorizador_path"])
+        return ModeloComparable(
+            version["nombre"],
+            _version_pkl(version["modelo_path"], version["vectorizador_path"]),
+            type(modelo).__name__,
+            MotorLineal.desde_sklearn(modelo, vectorizador)
+        )
+    
+    def modelos_comparables(self) -> Tuple[List[ModeloComparable], List[Dict]]:
+        """
+        Carga (o reutiliza) todas las versiones como motores lineales.
+        
+        Returns:
+            Tupla (modelos, versiones omitidas con el motivo)
+        """
+        modelos: List[ModeloComparable] = []
+        omitidos: List[Dict] = []
+        versiones = self.descubrir()
+        
+        for nombre, version in versiones.items():
+            try:
+                clave = _clave_archivos(version)
+                guardado = self._comparables.get(nombre)
+                if guardado is None or guardado[0] != clave:
+                    guardado = (clave, self.cargar_comparable(version))
+                    self._comparables[nombre] = guardado
+                modelos.append(guardado[1])
+            except Exception as e:
+                # p. ej. un modelo que no se reduce a motor lineal
+                logger.warning(f"⚠️ Versión {nombre} no comparable: {e}")
+                omitidos.append({"nombre": nombre, "error": str(e)})
+        
+        for nombre in set(self._comparables) - set(versiones):
+            del self._comparables[nombre]
+        
+        return modelos, omitidos
+    
+    def comparar(self, textos: List[str], threshold: float = 0.5) -> Dict:
+        """
+        Puntúa los mismos textos con todas las versiones.
+        
+        Los textos se validan y limpian una vez y se vectorizan una vez por
+        vectorizador distinto (firma_vectorizador): las versiones que lo
+        comparten solo añaden un producto disperso por los pesos.
+        
+        Args:
+            textos: Textos a comparar (sin traducción)
+            threshold: Umbral de decisión aplicado a todas las versiones
+            
+        Returns:
+            Dict con las predicciones de cada versión por texto y el acuerdo
+            entre versiones
+        """
+        marca = time.perf_counter()
+        tiempos: Dict = {}
+        
+        # Validar y limpiar una sola vez
+        errores: List[Optional[str]] = [None] * len(textos)
+        posiciones: List[int] = []
+        limpios: List[str] = []
+        cadenas: List[int] = []
+        for i, texto in enumerate(textos):
+            if isinstance(texto, str):
+                cadenas.append(i)
+            else:
+                errores[i] = 'El texto debe ser una cadena de caracteres'
+        for i, validacion in zip(cadenas, validar_textos([textos[i] for i in cadenas])):
+            if not validacion['valido']:
+                errores[i] = validacion['error']
+                continue
+            posiciones.append(i)
+            limpios.append(validacion['texto_limpio'])
+        tiempos['validacion_ms'] = _ms_desde(marca)
+        
+        with self._comparables_lock:
+            modelos, omitidos = self.modelos_comparables()
+        if not modelos:
+            raise RuntimeError("No hay versiones de modelo comparables")
+        
+        # Una vectorización por vectorizador distinto
+        marca = time.perf_counter()
+        matrices: Dict[str, MatrizTfidf] = {}
+        for modelo in modelos:
+            firma = modelo.motor.firma_vectorizador()
+            if firma not in matrices:
+                matrices[firma] = modelo.motor.vectorizar_lote(limpios)
+        tiempos['vectorizacion_ms'] = _ms_desde(marca)
+        
+        marca = time.perf_counter()
+        positivos: Dict[str, np.ndarray] = {}
+        prob_positivos: Dict[str, np.ndarray] = {}
+        probabilidades: Dict[str, np.ndarray] = {}
+        for modelo in modelos:
+            prob_positivo, prob_negativo = modelo.motor.puntuar(matrices[modelo.motor.firma_vectorizador()])
+            es_positivo = _es_positivo(prob_positivo, prob_negativo, threshold)
+            positivos[modelo.nombre] = es_positivo
+            prob_positivos[modelo.nombre] = prob_positivo
+            # Probabilidad de la clase predicha
+            probabilidades[modelo.nombre] = np.where(es_positivo, prob_positivo, prob_negativo)
+        tiempos['puntuacion_ms'] = _ms_desde(marca)
+        
+        nombres = [m.nombre for m in modelos]
+        decisiones = np.array([positivos[n] for n in nombres]).reshape(len(nombres), len(limpios))
+        unanimes = np.all(decisiones == decisiones[0], axis=0)
+        
+        resultados: List[Dict] = []
+        fila = 0
+        for i, texto in enumerate(textos):
+            if errores[i] is not None:
+                resultados.append({"texto": str(texto)[:200], "error": errores[i]})
+                continue
+            predicciones = {}
+            for nombre in nombres:
+                probabilidad = float(probabilidades[nombre][fila])
+                predicciones[nombre] = {
+                    "prevision": 'Positivo' if positivos[nombre][fila] else 'Negativo',
+                    "probabilidad": round(probabilidad, 4),
+                    "confianza": obtener_nivel_confianza(probabilidad)
+                }
+            resultados.append({
+                "texto": texto[:200],
+                "predicciones": predicciones,
+                "unanime": bool(unanimes[fila])
+            })
+            fila += 1
+        
+        # Acuerdo por pares de versiones (probabilidad de Positivo)
+        pares = []
+        for a in range(len(nombres)):
+            for b in range(a + 1, len(nombres)):
+                delta = np.abs(prob_positivos[nombres[a]] - prob_positivos[nombres[b]])
+                pares.append({
+                    "modelos": [nombres[a], nombres[b]],
+                    "coincidencia": round(float(np.mean(decisiones[a] == decisiones[b])), 4) if len(limpios) else 1.0,
+                    "delta_prob_medio": round(float(delta.mean()), 6) if len(delta) else 0.0,
+                    "delta_prob_max": round(float(delta.max()), 6) if len(delta) else 0.0
+                })
+        
+        activo = predictor
+        return {
+            "modelos": [
+                {
+                    "nombre": m.nombre,
+                    "version_modelo": m.version_modelo,
+                    "modelo_tipo": m.modelo_tipo,
+                    "activo": activo is not None and activo.version_modelo == m.version_modelo,
+                    "positivos": int(np.count_nonzero(positivos[m.nombre]))
+                }
+                for m in modelos
+            ],
+            "omitidos": omitidos,
+            "threshold": threshold,
+            "total": len(limpios),
+            "errores": len(textos) - len(limpios),
+            "acuerdo": {
+                "unanimes": int(np.count_nonzero(unanimes)),
+                "tasa_unanimidad": round(float(np.mean(unanimes)), 4) if len(limpios) else 1.0,
+                "pares": pares
+            },
+            "vectorizaciones": len(matrices),
+            "resultados": resultados,
+            "tiempos_etapas": tiempos
+        }
+
+
+# Se crea en el primer uso
+registro: Optional[RegistroModelos] = None
+_registro_lock = threading.Lock()
+
+
+def obtener_registro() -> RegistroModelos:
+    """
+    Obtiene el registro de modelos del proceso.
+    
+    Returns:
+        RegistroModelos sobre MODELOS_DIRECTORIO
+    """
+    global registro
+    if registro is None:
+        with _registro_lock:
+            if registro is None:
+                registro = RegistroModelos()
+    return registro
@@ -0,0 +1,269 @@
+# ============================================
+# PROCESOS - INFERENCIA EN UN POOL DE PROCESOS
+# ============================================
+
+import asyncio
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import joblib
+import numpy as np
+
+from .artefactos import cargar_bundle
+from .motor import MatrizTfidf, MotorLineal, concatenar_matrices, matriz_desde_csr
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# CÓDIGO DEL PROCESO WORKER
+# ============================================
+
+# Estado de cada proceso worker (se carga una vez en el initializer)
+_modelo = None
+_vectorizador = None
+_motor: Optional[MotorLineal] = None
+_idx_positivo = 0
+_idx_negativo = 0
+
+
+def _inicializar_worker(model_path: str, vectorizer_path: str, usar_motor: bool, bundle_path: Optional[str]):
+    """Carga el modelo una sola vez al arrancar el proceso worker."""
+    global _modelo, _vectorizador, _motor, _idx_positivo, _idx_negativo
+
+    if bundle_path:
+        _motor = cargar_bundle(bundle_path).motor
+        return
+
+    _modelo = joblib.load(model_path)
+    _vectorizador = joblib.load(vectorizer_path)
+    clases = list(_modelo.classes_)
+    _idx_positivo = clases.index('Positivo')
+    _idx_negativo = clases.index('Negativo')
+
+    # El proceso principal ya verificó la paridad del motor lineal
+    _motor = MotorLineal.desde_sklearn(_modelo, _vectorizador) if usar_motor else None
+
+
+def _puntuar_bloque(textos_limpios: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Probabilidades (positivo, negativo) de un bloque de textos limpios."""
+    if _motor is not None:
+        return _motor.probabilidades(textos_limpios)
+
+    probabilidades = _modelo.predict_proba(_vectorizador.transform(textos_limpios))
+    return probabilidades[:, _idx_positivo], probabilidades[:, _idx_negativo]
+
+
+def _vectorizar_y_puntuar_bloque(textos_limpios: List[str]) -> Tuple[MatrizTfidf, np.ndarray, np.ndarray]:
+    """Matriz TF-IDF y probabilidades de un bloque (para explicar la predicción)."""
+    if _motor is not None:
+        matriz = _motor.vectorizar_lote(textos_limpios)
+        return (matriz, *_motor.puntuar(matriz))
+
+    csr = _vectorizador.transform(textos_limpios)
+    probabilidades = _modelo.predict_proba(csr)
+    return matriz_desde_csr(csr), probabilidades[:, _idx_positivo], probabilidades[:, _idx_negativo]
+
+
+def _listo() -> bool:
+    """Tarea vacía para forzar el arranque de los workers."""
+    return _modelo is not None or _motor is not None
+
+
+# ============================================
+# POOL (PROCESO PRINCIPAL)
+# ============================================
+
+class PoolProcesos:
+    """
+    Reparte el scoring entre varios procesos, cada uno con su copia del
+    modelo, para usar todos los núcleos detrás de un solo proceso de API.
+
+    Los lotes se dividen en bloques de al menos tamano_bloque textos, como
+    mucho uno por worker (el último puede ser menor), que se puntúan en
+    paralelo. Un lote de hasta tamano_bloque textos va entero a un solo
+    worker: repartirlo costaría más en serialización que lo que ahorra.
+    Si un worker muere, el pool se recrea y el lote se reintenta una vez.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        vectorizer_path: str,
+        bundle_path: Optional[str] = None,
+        usar_motor: bool = True,
+        max_procesos: int = 2,
+        tamano_bloque: int = 256
+    ):
+        """
+        Args:
+            model_path: Ruta al archivo .pkl del modelo
+            vectorizer_path: Ruta al archivo .pkl del vectorizador
+            bundle_path: Directorio de un bundle (si se indica, sustituye a los .pkl)
+            usar_motor: Si True, los workers puntúan con el motor lineal
+            max_procesos: Número de procesos worker
+            tamano_bloque: Mínimo de textos por bloque enviado a un worker
+        """
+        if max_procesos < 1:
+            raise ValueError("max_procesos debe ser al menos 1")
+
+        self.model_path = str(model_path)
+        self.vectorizer_path = str(vectorizer_path)
+        self.bundle_path = str(bundle_path) if bundle_path else None
+        self.usar_motor = usar_motor
+        self.max_procesos = max_procesos
+        self.tamano_bloque = max(tamano_bloque, 1)
+
+        self._lock = threading.Lock()
+        self._bloques = 0
+        self._textos = 0
+        self._reinicios = 0
+
+        self._pool = self._crear_pool()
+
+    def _crear_pool(self) -> ProcessPoolExecutor:
+        """Crea el pool y espera a que todos los workers hayan cargado el modelo."""
+        # 'spawn': el proceso de la API tiene hilos, y fork con hilos no es seguro
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_procesos,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_inicializar_worker,
+            initargs=(self.model_path, self.vectorizer_path, self.usar_motor, self.bundle_path)
+        )
+        for futuro in [pool.submit(_listo) for _ in range(self.max_procesos)]:
+            futuro.result()
+
+        logger.info(f"✅ Pool de inferencia con {self.max_procesos} procesos listo")
+        return pool
+
+    def reiniciar(self, roto: Optional[ProcessPoolExecutor] = None):
+        """
+        Sustituye el pool por uno nuevo. Los bloques en curso terminan en el
+        pool anterior, que se cierra en segundo plano.
+
+        Args:
+            roto: Pool que falló; si ya fue sustituido por otro hilo, no se
+                vuelve a reiniciar
+        """
+        with self._lock:
+            if roto is not None and self._pool is not roto:
+                return
+            anterior = self._pool
+            self._pool = self._crear_pool()
+            self._reinicios += 1
+        threading.Thread(target=anterior.shutdown, kwargs={"wait": True}, daemon=True).start()
+        logger.info("🔄 Pool de procesos de inferencia reiniciado")
+
+    def _bloques_de(self, textos_limpios: List[str]) -> List[List[str]]:
+        """
+        Divide un lote en bloques para repartir entre los workers: como mucho
+        max_procesos bloques y ninguno menor que tamano_bloque salvo el
+        último, así que un lote de hasta tamano_bloque textos es un solo bloque.
+        """
+        tamano = max(self.tamano_bloque, math.ceil(len(textos_limpios) / self.max_procesos))
+        return [textos_limpios[i:i + tamano] for i in range(0, len(textos_limpios), tamano)]
+
+    def _unir(self, textos_limpios: List[str], resultados: List[Tuple[np.ndarray, np.ndarray]]):
+        """Concatena los resultados de los bloques y actualiza los contadores."""
+        with self._lock:
+            self._bloques += len(resultados)
+            self._textos += len(textos_limpios)
+
+        return (
+            np.concatenate([positivo for positivo, _ in resultados]),
+            np.concatenate([negativo for _, negativo in resultados])
+        )
+
+    def _repartir(self, funcion, bloques: List[List[str]]) -> List:
+        """Ejecuta funcion sobre cada bloque en los workers (reintenta una vez si el pool se rompe)."""
+        for intento in range(2):
+            pool = self._pool
+            try:
+                futuros = [pool.submit(funcion, bloque) for bloque in bloques]
+                return [futuro.result() for futuro in futuros]
+            except BrokenProcessPool:
+                if intento:
+                    raise
+                logger.error("❌ Un worker de inferencia terminó inesperadamente, reiniciando el pool")
+                self.reiniciar(roto=pool)
+
+    def puntuar(self, textos_limpios: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula las probabilidades de un lote repartiéndolo entre los workers.
+
+        Returns:
+            Tupla (prob_positivo, prob_negativo) alineada con la entrada
+        """
+        if not textos_limpios:
+            vacio = np.zeros(0, dtype=np.float64)
+            return vacio, vacio
+
+        return self._unir(textos_limpios, self._repartir(_puntuar_bloque, self._bloques_de(textos_limpios)))
+
+    def vectorizar_y_puntuar(self, textos_limpios: List[str]) -> Tuple[MatrizTfidf, np.ndarray, np.ndarray]:
+        """
+        Como puntuar, pero devuelve también la matriz TF-IDF (la necesita la
+        explicación de la predicción).
+
+        Returns:
+            Tupla (matriz TF-IDF, prob_positivo, prob_negativo) alineada con la entrada
+        """
+        if not textos_limpios:
+            vacio = np.zeros(0, dtype=np.float64)
+            return MatrizTfidf(np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), vacio, 0), vacio, vacio
+
+        resultados = self._repartir(_vectorizar_y_puntuar_bloque, self._bloques_de(textos_limpios))
+        prob_positivo, prob_negativo = self._unir(textos_limpios, [(pp, pn) for _, pp, pn in resultados])
+        return concatenar_matrices([matriz for matriz, _, _ in resultados]), prob_positivo, prob_negativo
+
+    async def apuntuar(self, textos_limpios: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Versión asíncrona de puntuar: el event loop reparte los bloques y
+        espera sus resultados sin ocupar ningún hilo.
+
+        Returns:
+            Tupla (prob_positivo, prob_negativo) alineada con la entrada
+        """
+        if not textos_limpios:
+            vacio = np.zeros(0, dtype=np.float64)
+            return vacio, vacio
+
+        bloques = self._bloques_de(textos_limpios)
+        for intento in range(2):
+            pool = self._pool
+            try:
+                resultados = await asyncio.gather(*[
+                    asyncio.wrap_future(pool.submit(_puntuar_bloque, bloque)) for bloque in bloques
+                ])
+                return self._unir(textos_limpios, resultados)
+            except BrokenProcessPool:
+                if intento:
+                    raise
+                logger.error("❌ Un worker de inferencia terminó inesperadamente, reiniciando el pool")
+                await asyncio.get_running_loop().run_in_executor(None, self.reiniciar, pool)
+
+    def estadisticas(self) -> Dict:
+        """
+        Obtiene los contadores del pool.
+
+        Returns:
+            Dict con procesos, bloques y textos puntuados y reinicios
+        """
+        with self._lock:
+            return {
+                "procesos": self.max_procesos,
+                "tamano_bloque": self.tamano_bloque,
+                "bloques": self._bloques,
+                "textos": self._textos,
+                "reinicios": self._reinicios
+            }
+
+    def cerrar(self):
+        """Cierra el pool esperando a que terminen los bloques en curso."""
+        self._pool.shutdown(wait=True)
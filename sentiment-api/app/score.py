@@ -0,0 +1,245 @@
+# ============================================
+# SCORE - PUNTUACIÓN MASIVA SIN LA API
+# ============================================
+#
+# Uso (desde sentiment-api/):
+#   python -m app.score ENTRADA SALIDA [--columna C] [--columna-id ID]
+#                       [--procesos N] [--bloque FILAS] [--idioma es]
+#
+# ENTRADA y SALIDA pueden ser .csv, .jsonl/.ndjson o .parquet (Parquet
+# requiere pyarrow); el formato sale de la extensión. El archivo se lee por
+# bloques (app/archivos.py) y cada bloque se puntúa en un pool de procesos con
+# SentimentPredictor.predecir_lote (validar_textos + limpiar_many + scoring
+# vectorizado). Como mucho hay 2 bloques por proceso en vuelo y los
+# resultados se escriben en orden en cuanto están listos, así que la memoria
+# no crece con el tamaño del archivo.
+#
+# El modelo se carga una vez en el proceso principal antes de crear el pool:
+# con fork los procesos lo heredan en copy-on-write (como gunicorn --preload).
+
+import argparse
+import gc
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Tuple
+import logging
+
+from .archivos import EscritorResultados, LectorArchivo, Registro, detectar_formato, resultados_de_lote
+from .prediccion import inicializar_predictor, obtener_predictor
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Cada cuántos segundos se informa del progreso
+INTERVALO_PROGRESO = 5.0
+
+
+# ============================================
+# PUNTUACIÓN DE UN BLOQUE (PROCESO WORKER)
+# ============================================
+
+def _iniciar_worker():
+    """Carga el modelo en el worker si no lo heredó del proceso principal."""
+    inicializar_predictor(iniciar_procesos=False)
+
+
+def puntuar_bloque(indice: int, registros: List[Registro], idioma: str) -> Tuple[int, List[Dict], Dict]:
+    """
+    Puntúa un bloque de registros.
+
+    Args:
+        indice: Posición del bloque en el archivo
+        registros: Registros leídos
+        idioma: Código de idioma ('es': sin traducción)
+
+    Returns:
+        Tupla (indice, filas de resultado, tiempos por etapa en ms)
+    """
+    inicio = time.perf_counter()
+    lote = obtener_predictor().predecir_lote(
+        [registro.texto for registro in registros],
+        traducir=idioma != 'es',
+        idioma_origen=idioma,
+        usar_cache=False
+    )
+    filas = resultados_de_lote(registros, lote)
+    tiempos = dict(lote['tiempos_etapas'])
+    tiempos['bloque_ms'] = (time.perf_counter() - inicio) * 1000
+    return indice, filas, tiempos
+
+
+# ============================================
+# LECTURA, REPARTO Y ESCRITURA
+# ============================================
+
+def _sumar(totales: Dict[str, float], tiempos: Dict[str, float]):
+    for etapa, ms in tiempos.items():
+        totales[etapa] = totales.get(etapa, 0.0) + ms
+
+
+def puntuar_archivo(
+    entrada: str,
+    salida: str,
+    columna: str = None,
+    columna_id: str = None,
+    procesos: int = 0,
+    tamano_bloque: int = 5000,
+    idioma: str = "es"
+) -> Dict:
+    """
+    Puntúa un archivo completo y escribe los resultados.
+
+    Args:
+        entrada: Archivo de reseñas (.csv, .jsonl o .parquet)
+        salida: Archivo de resultados (el formato sale de la extensión)
+        columna: Columna o campo del texto (default: autodetectada)
+        columna_id: Columna o campo que se copia como 'id'
+        procesos: Procesos worker (0: núcleos de la máquina; 1: sin pool)
+        tamano_bloque: Filas por bloque
+        idioma: Código de idioma ('es': sin traducción)
+
+    Returns:
+        Dict con filas, totales por clase, errores, filas/s y tiempos por etapa
+    """
+    procesos = procesos or os.cpu_count() or 1
+    inicio = time.perf_counter()
+
+    # Modelo cargado antes del fork y congelado para que el GC no toque sus páginas
+    inicializar_predictor(iniciar_procesos=False)
+    gc.freeze()
+    tiempos_carga = (time.perf_counter() - inicio) * 1000
+
+    totales = {"filas": 0, "positivos": 0, "negativos": 0, "errores": 0}
+    etapas: Dict[str, float] = {"carga_modelo_ms": tiempos_carga, "lectura_ms": 0.0, "escritura_ms": 0.0}
+    etapas_workers: Dict[str, float] = {}
+    inicio_puntuacion = time.perf_counter()
+    ultimo_aviso = inicio_puntuacion
+
+    with LectorArchivo(entrada, columna=columna, columna_id=columna_id) as lector, \
+            EscritorResultados(salida, detectar_formato(salida)) as escritor:
+
+        def escribir(filas: List[Dict], tiempos: Dict):
+            nonlocal ultimo_aviso
+            marca = time.perf_counter()
+            escritor.escribir(filas)
+            etapas["escritura_ms"] += (time.perf_counter() - marca) * 1000
+            _sumar(etapas_workers, tiempos)
+
+            totales["filas"] += len(filas)
+            for fila in filas:
+                if fila["error"] is not None:
+                    totales["errores"] += 1
+                elif fila["prevision"] == "Positivo":
+                    totales["positivos"] += 1
+                else:
+                    totales["negativos"] += 1
+
+            ahora = time.perf_counter()
+            if ahora - ultimo_aviso >= INTERVALO_PROGRESO:
+                ultimo_aviso = ahora
+                velocidad = totales["filas"] / (ahora - inicio_puntuacion)
+                print(f"  {totales['filas']} filas ({lector.fraccion_leida:.0%}, {velocidad:.0f} filas/s)",
+                      file=sys.stderr)
+
+        bloques = iter(lector.bloques(tamano_bloque))
+
+        def leer():
+            marca = time.perf_counter()
+            bloque = next(bloques, None)
+            etapas["lectura_ms"] += (time.perf_counter() - marca) * 1000
+            return bloque
+
+        if procesos == 1:
+            indice = 0
+            while (bloque := leer()) is not None:
+                _, filas, tiempos = puntuar_bloque(indice, bloque, idioma)
+                escribir(filas, tiempos)
+                indice += 1
+        else:
+            contexto = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+            with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto, initializer=_iniciar_worker) as pool:
+                en_vuelo = set()
+                terminados: Dict[int, Tuple[List[Dict], Dict]] = {}
+                siguiente_envio = 0
+                siguiente_escritura = 0
+                agotado = False
+
+                while not agotado or en_vuelo:
+                    # Mantener hasta 2 bloques por proceso en vuelo
+                    while not agotado and len(en_vuelo) < 2 * procesos:
+                        bloque = leer()
+                        if bloque is None:
+                            agotado = True
+                            break
+                        en_vuelo.add(pool.submit(puntuar_bloque, siguiente_envio, bloque, idioma))
+                        siguiente_envio += 1
+
+                    if not en_vuelo:
+                        break
+                    listos, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                    for futuro in listos:
+                        indice, filas, tiempos = futuro.result()
+                        terminados[indice] = (filas, tiempos)
+
+                    # Escribir en el orden del archivo
+                    while siguiente_escritura in terminados:
+                        escribir(*terminados.pop(siguiente_escritura))
+                        siguiente_escritura += 1
+
+    duracion = time.perf_counter() - inicio_puntuacion
+    etapas["total_ms"] = (time.perf_counter() - inicio) * 1000
+    return {
+        **totales,
+        "procesos": procesos,
+        "filas_por_segundo": round(totales["filas"] / duracion, 1) if duracion else 0.0,
+        "duracion_segundos": round(duracion, 2),
+        "tiempos_etapas_ms": {etapa: round(ms, 1) for etapa, ms in etapas.items()},
+        # Suma de todos los workers (con varios procesos supera el tiempo real)
+        "tiempos_workers_ms": {etapa: round(ms, 1) for etapa, ms in etapas_workers.items()}
+    }
+
+
+# ============================================
+# HERRAMIENTA DE LÍNEA DE COMANDOS
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Puntuar un archivo de reseñas sin la API")
+    parser.add_argument("entrada", help="Archivo .csv, .jsonl o .parquet")
+    parser.add_argument("salida", help="Archivo de resultados (.csv, .jsonl o .parquet)")
+    parser.add_argument("--columna", help="Columna del texto (default: text, texto, review...)")
+    parser.add_argument("--columna-id", help="Columna que se copia como 'id' en los resultados")
+    parser.add_argument("--procesos", type=int, default=0, help="Procesos worker (0: todos los núcleos)")
+    parser.add_argument("--bloque", type=int, default=5000, help="Filas por bloque")
+    parser.add_argument("--idioma", default="es", help="'es' (sin traducción), otro código o 'auto'")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    try:
+        resumen = puntuar_archivo(
+            args.entrada, args.salida,
+            columna=args.columna,
+            columna_id=args.columna_id,
+            procesos=args.procesos,
+            tamano_bloque=args.bloque,
+            idioma=args.idioma
+        )
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+
+    print(f"✅ {resumen['filas']} filas en {resumen['duracion_segundos']}s "
+          f"({resumen['filas_por_segundo']} filas/s, {resumen['procesos']} procesos)")
+    print(f"   Positivos: {resumen['positivos']}  Negativos: {resumen['negativos']}  Errores: {resumen['errores']}")
+    print("   Etapas (proceso principal):")
+    for etapa, ms in resumen["tiempos_etapas_ms"].items():
+        print(f"     {etapa:<22} {ms:>12.1f} ms")
+    print("   Etapas (suma de workers):")
+    for etapa, ms in resumen["tiempos_workers_ms"].items():
+        print(f"     {etapa:<22} {ms:>12.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
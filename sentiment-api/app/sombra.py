@@ -0,0 +1,308 @@
+# ============================================
+# SOMBRA - EVALUACIÓN DE UN MODELO CANDIDATO CON TRÁFICO REAL
+# ============================================
+#
+# Una muestra de los textos que puntúa el predictor se copia a una cola
+# acotada; un hilo en segundo plano los puntúa con el modelo candidato (una
+# versión del registro, ver GET /models) y acumula discrepancias, diferencias
+# de probabilidad y latencia. La respuesta al cliente nunca espera al
+# candidato: si la cola está llena, la copia se descarta.
+
+import logging
+import queue
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from . import config
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Máximo de textos que el hilo sombra puntúa de una vez
+LOTE_MAX = 256
+
+
+class EvaluadorSombra:
+    """
+    Puntúa en segundo plano una muestra del tráfico con un modelo candidato.
+
+    enviar() solo sortea la muestra y hace put_nowait en la cola: no bloquea
+    ni puntúa en el hilo de la petición. Las métricas móviles cubren los
+    últimos 'ventana' textos evaluados; los contadores totales, toda la vida
+    del evaluador.
+    """
+
+    def __init__(
+        self,
+        candidato,
+        muestreo: float = 0.1,
+        cola_max: int = 1000,
+        ventana: int = 10000
+    ):
+        """
+        Args:
+            candidato: ModeloComparable del registro (app/prediccion.py)
+            muestreo: Fracción (0-1] de textos puntuados que se copian
+            cola_max: Máximo de lotes en cola
+            ventana: Textos evaluados que cuentan en las métricas móviles
+        """
+        if not 0 < muestreo <= 1:
+            raise ValueError("El muestreo debe estar en (0, 1]")
+
+        self.candidato = candidato
+        self.muestreo = muestreo
+        self.inicio = datetime.now().isoformat()
+        self._cola: queue.Queue = queue.Queue(maxsize=cola_max)
+        self._lock = threading.Lock()
+
+        # Por texto evaluado: discrepancia, |Δ prob. positivo| y espera en cola
+        self._discrepancias: deque = deque(maxlen=ventana)
+        self._deltas: deque = deque(maxlen=ventana)
+        self._esperas_ms: deque = deque(maxlen=ventana)
+        # Por lote puntuado: latencia del candidato por texto
+        self._latencias_ms: deque = deque(maxlen=ventana)
+
+        # Contadores totales
+        self._muestreados = 0
+        self._descartados = 0
+        self._evaluados = 0
+        self._discrepancias_total = 0
+        self._errores = 0
+
+        self._hilo = threading.Thread(target=self._bucle, name="evaluador-sombra", daemon=True)
+        self._hilo.start()
+
+    # ============================================
+    # CAMINO PRINCIPAL (NO BLOQUEANTE)
+    # ============================================
+
+    def enviar(
+        self,
+        textos_limpios: List[str],
+        prob_positivo: np.ndarray,
+        prob_negativo: np.ndarray,
+        threshold: float
+    ):
+        """
+        Copia una muestra de un lote ya puntuado por el modelo principal.
+
+        Args:
+            textos_limpios: Textos puntuados
+            prob_positivo: Probabilidades Positivo del modelo principal
+            prob_negativo: Probabilidades Negativo del modelo principal
+            threshold: Threshold con el que decide el modelo principal
+        """
+        elegidos = [i for i in range(len(textos_limpios)) if random.random() < self.muestreo]
+        if not elegidos:
+            return
+
+        elemento = (
+            [textos_limpios[i] for i in elegidos],
+            np.asarray(prob_positivo)[elegidos],
+            np.asarray(prob_negativo)[elegidos],
+            threshold,
+            time.perf_counter()
+        )
+        try:
+            self._cola.put_nowait(elemento)
+            descartados = 0
+        except queue.Full:
+            descartados = len(elegidos)
+
+        with self._lock:
+            self._muestreados += len(elegidos)
+            self._descartados += descartados
+
+    # ============================================
+    # HILO SOMBRA
+    # ============================================
+
+    def _bucle(self):
+        """Puntúa la cola con el candidato hasta recibir None."""
+        while True:
+            elementos = [self._cola.get()]
+            # Agrupar lo que ya esté en cola en un solo lote
+            while elementos[-1] is not None and sum(len(e[0]) for e in elementos) < LOTE_MAX:
+                try:
+                    elementos.append(self._cola.get_nowait())
+                except queue.Empty:
+                    break
+
+            detener = elementos[-1] is None
+            elementos = [e for e in elementos if e is not None]
+            if elementos:
+                try:
+                    self._evaluar(elementos)
+                except Exception as e:
+                    logger.error(f"❌ Error en el evaluador sombra: {e}")
+                    with self._lock:
+                        self._errores += sum(len(e[0]) for e in elementos)
+            if detener:
+                return
+
+    def _evaluar(self, elementos: List):
+        """Puntúa un grupo de elementos de la cola y actualiza las métricas."""
+        from .prediccion import _es_positivo
+
+        textos = [t for elemento in elementos for t in elemento[0]]
+        marca = time.perf_counter()
+        sombra_positivo, sombra_negativo = self.candidato.motor.probabilidades(textos)
+        fin = time.perf_counter()
+
+        discrepancias: List[bool] = []
+        deltas: List[float] = []
+        esperas: List[float] = []
+        desde = 0
+        for lote, prob_positivo, prob_negativo, threshold, encolado in elementos:
+            hasta = desde + len(lote)
+            principal = _es_positivo(prob_positivo, prob_negativo, threshold)
+            sombra = _es_positivo(sombra_positivo[desde:hasta], sombra_negativo[desde:hasta], threshold)
+            discrepancias.extend((principal != sombra).tolist())
+            deltas.extend(np.abs(sombra_positivo[desde:hasta] - prob_positivo).tolist())
+            esperas.extend([(marca - encolado) * 1000] * len(lote))
+            desde = hasta
+
+        with self._lock:
+            self._discrepancias.extend(discrepancias)
+            self._deltas.extend(deltas)
+            self._esperas_ms.extend(esperas)
+            self._latencias_ms.append((fin - marca) * 1000 / len(textos))
+            self._evaluados += len(textos)
+            self._discrepancias_total += sum(discrepancias)
+
+    def detener(self, timeout: float = 5.0):
+        """Detiene el hilo sombra tras vaciar la cola."""
+        try:
+            self._cola.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("⚠️ Cola sombra llena al detener: se abandona")
+            return
+        self._hilo.join(timeout)
+
+    # ============================================
+    # MÉTRICAS
+    # ============================================
+
+    def estadisticas(self) -> Dict:
+        """
+        Obtiene las métricas del evaluador.
+
+        Returns:
+            Dict con el candidato, contadores totales, estado de la cola y
+            métricas móviles (discrepancia, Δ de probabilidad y latencias)
+        """
+        with self._lock:
+            discrepancias = np.array(self._discrepancias, dtype=bool)
+            deltas = np.array(self._deltas, dtype=np.float64)
+            esperas = np.array(self._esperas_ms, dtype=np.float64)
+            latencias = np.array(self._latencias_ms, dtype=np.float64)
+            totales = {
+                "muestreados": self._muestreados,
+                "descartados": self._descartados,
+                "evaluados": self._evaluados,
+                "discrepancias": self._discrepancias_total,
+                "errores": self._errores
+            }
+
+        def percentil(valores: np.ndarray, p: float) -> Optional[float]:
+            return round(float(np.percentile(valores, p)), 6) if len(valores) else None
+
+        return {
+            "candidato": self.candidato.nombre,
+            "version_candidato": self.candidato.version_modelo,
+            "muestreo": self.muestreo,
+            "inicio": self.inicio,
+            "totales": totales,
+            "cola": {"tamano": self._cola.qsize(), "max": self._cola.maxsize},
+            "ventana": {
+                "textos": len(discrepancias),
+                "tasa_discrepancia": round(float(discrepancias.mean()), 6) if len(discrepancias) else None,
+                "delta_prob_medio": round(float(deltas.mean()), 6) if len(deltas) else None,
+                "delta_prob_p99": percentil(deltas, 99),
+                "delta_prob_max": round(float(deltas.max()), 6) if len(deltas) else None,
+                "latencia_ms_por_texto_p50": percentil(latencias, 50),
+                "latencia_ms_por_texto_p99": percentil(latencias, 99),
+                "espera_cola_ms_p50": percentil(esperas, 50),
+                "espera_cola_ms_p99": percentil(esperas, 99)
+            }
+        }
+
+
+# ============================================
+# INSTANCIA GLOBAL
+# ============================================
+
+_evaluador: Optional[EvaluadorSombra] = None
+_evaluador_lock = threading.Lock()
+
+
+def obtener_evaluador() -> Optional[EvaluadorSombra]:
+    """
+    Obtiene el evaluador sombra del proceso.
+
+    Returns:
+        EvaluadorSombra activo, o None si no hay modelo sombra
+    """
+    return _evaluador
+
+
+def iniciar_sombra(nombre: str, muestreo: Optional[float] = None) -> EvaluadorSombra:
+    """
+    Empieza a evaluar una versión del registro en sombra (sustituye a la
+    anterior, si la había).
+
+    Args:
+        nombre: Versión del registro (ver GET /models)
+        muestreo: Fracción de textos copiados (default: SOMBRA_MUESTREO)
+
+    Returns:
+        El nuevo EvaluadorSombra
+
+    Raises:
+        KeyError: Si la versión no existe
+        ValueError: Si el muestreo está fuera de rango
+    """
+    global _evaluador
+    from .prediccion import obtener_registro
+
+    registro = obtener_registro()
+    versiones = registro.descubrir()
+    if nombre not in versiones:
+        raise KeyError(f"Versión de modelo no encontrada: {nombre}")
+
+    with _evaluador_lock:
+        evaluador = EvaluadorSombra(
+            candidato=registro.cargar_comparable(versiones[nombre]),
+            muestreo=config.SOMBRA_MUESTREO if muestreo is None else muestreo,
+            cola_max=config.SOMBRA_COLA_MAX,
+            ventana=config.SOMBRA_VENTANA
+        )
+        anterior, _evaluador = _evaluador, evaluador
+
+    if anterior is not None:
+        anterior.detener()
+    logger.info(f"👥 Modelo sombra: {nombre} ({evaluador.candidato.version_modelo}, muestreo {evaluador.muestreo})")
+    return evaluador
+
+
+def detener_sombra() -> bool:
+    """
+    Deja de evaluar en sombra.
+
+    Returns:
+        True si había un evaluador activo
+    """
+    global _evaluador
+    with _evaluador_lock:
+        anterior, _evaluador = _evaluador, None
+    if anterior is None:
+        return False
+    anterior.detener()
+    logger.info("👥 Modelo sombra detenido")
+    return True
@@ -0,0 +1,379 @@
+# ============================================
+# TRABAJOS - PUNTUACIÓN MASIVA ASÍNCRONA DE ARCHIVOS
+# ============================================
+#
+# POST /jobs guarda el archivo subido en TRABAJOS_DIRECTORIO/<id>/ y encola
+# el trabajo en un pool local de hilos. El trabajo lee el archivo por bloques
+# (app/archivos.py), los puntúa con predecir_lote y va añadiendo los
+# resultados a un archivo en disco, así que ni la entrada ni la salida se
+# cargan enteras en memoria. El estado y el progreso se guardan en una tabla
+# SQLite compartida por todos los workers de la máquina: cualquiera puede
+# responder GET /jobs/{id}.
+
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+import logging
+
+from . import config
+from .archivos import EscritorResultados, LectorArchivo, detectar_formato, resultados_de_lote
+from .prediccion import adquirir_predictor
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Estados de un trabajo
+PENDIENTE = "pendiente"
+PROCESANDO = "procesando"
+COMPLETADO = "completado"
+ERROR = "error"
+
+
+class ArchivoDemasiadoGrande(Exception):
+    """El archivo subido supera TRABAJOS_MAX_BYTES"""
+
+
+def _proceso_vivo(pid: Optional[int]) -> bool:
+    """Indica si existe un proceso con ese pid."""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class GestorTrabajos:
+    """
+    Crea, ejecuta y consulta trabajos de puntuación masiva.
+
+    Cada trabajo lo ejecuta el proceso que lo recibió; si ese proceso muere,
+    el siguiente gestor que arranque lo marca como error.
+    """
+
+    def __init__(
+        self,
+        directorio: str,
+        max_concurrentes: int = 1,
+        tamano_bloque: int = 2000,
+        max_bytes: int = 2 * 1024 ** 3,
+        retencion_horas: float = 24.0
+    ):
+        """
+        Args:
+            directorio: Directorio de archivos y de la base de datos
+            max_concurrentes: Trabajos ejecutados a la vez en este proceso
+            tamano_bloque: Filas por llamada a predecir_lote
+            max_bytes: Tamaño máximo del archivo subido
+            retencion_horas: Tiempo que se conservan los trabajos terminados
+        """
+        self.directorio = Path(directorio)
+        self.tamano_bloque = tamano_bloque
+        self.max_bytes = max_bytes
+        self.retencion_horas = retencion_horas
+
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrentes, thread_name_prefix="trabajo")
+
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        with self._conexion() as conexion:
+            conexion.execute("""
+                CREATE TABLE IF NOT EXISTS trabajos (
+                    id TEXT PRIMARY KEY,
+                    estado TEXT NOT NULL,
+                    archivo TEXT NOT NULL,
+                    formato TEXT NOT NULL,
+                    columna TEXT,
+                    columna_id TEXT,
+                    idioma TEXT NOT NULL,
+                    bytes INTEGER NOT NULL,
+                    filas INTEGER NOT NULL DEFAULT 0,
+                    positivos INTEGER NOT NULL DEFAULT 0,
+                    negativos INTEGER NOT NULL DEFAULT 0,
+                    errores INTEGER NOT NULL DEFAULT 0,
+                    progreso REAL NOT NULL DEFAULT 0,
+                    version_modelo TEXT,
+                    error TEXT,
+                    pid INTEGER,
+                    creado REAL NOT NULL,
+                    iniciado REAL,
+                    terminado REAL
+                )
+            """)
+            conexion.execute("CREATE INDEX IF NOT EXISTS idx_trabajos_creado ON trabajos (creado)")
+
+        self._marcar_interrumpidos()
+
+    # ============================================
+    # BASE DE DATOS
+    # ============================================
+
+    def _conexion(self) -> sqlite3.Connection:
+        """Conexión propia de cada hilo (sqlite3 no comparte conexiones entre hilos)."""
+        conexion = getattr(self._local, "conexion", None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.directorio / "trabajos.sqlite3", timeout=5.0, isolation_level=None)
+            conexion.row_factory = sqlite3.Row
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = conexion
+        return conexion
+
+    def _actualizar(self, id_trabajo: str, **campos):
+        asignaciones = ", ".join(f"{campo} = ?" for campo in campos)
+        self._conexion().execute(
+            f"UPDATE trabajos SET {asignaciones} WHERE id = ?",
+            (*campos.values(), id_trabajo)
+        )
+
+    def _marcar_interrumpidos(self):
+        """Marca como error los trabajos sin terminar cuyo proceso ya no existe."""
+        filas = self._conexion().execute(
+            "SELECT id, pid FROM trabajos WHERE estado IN (?, ?)", (PENDIENTE, PROCESANDO)
+        ).fetchall()
+        for fila in filas:
+            if not _proceso_vivo(fila["pid"]):
+                self._actualizar(
+                    fila["id"], estado=ERROR, terminado=time.time(),
+                    error="Interrumpido: el proceso que lo ejecutaba terminó"
+                )
+                logger.warning(f"⚠️ Trabajo {fila['id']} interrumpido")
+
+    # ============================================
+    # CREACIÓN Y EJECUCIÓN
+    # ============================================
+
+    def _directorio_trabajo(self, id_trabajo: str) -> Path:
+        return self.directorio / id_trabajo
+
+    def crear(
+        self,
+        nombre_archivo: str,
+        origen: BinaryIO,
+        columna: Optional[str] = None,
+        columna_id: Optional[str] = None,
+        idioma: str = "es",
+        formato: Optional[str] = None
+    ) -> Dict:
+        """
+        Guarda el archivo subido y encola el trabajo (bloqueante: copia a disco).
+
+        Args:
+            nombre_archivo: Nombre original (su extensión define el formato)
+            origen: Archivo abierto en modo binario
+            columna: Columna o campo del texto (default: autodetectada)
+            columna_id: Columna o campo que se copia como 'id'
+            idioma: Código de idioma ('es': sin traducción; 'auto' detecta)
+            formato: 'csv' o 'jsonl' (default: según la extensión)
+
+        Returns:
+            Estado inicial del trabajo
+
+        Raises:
+            ValueError: Si el formato o las columnas no son válidos
+            ArchivoDemasiadoGrande: Si el archivo supera max_bytes
+        """
+        formato = formato or detectar_formato(nombre_archivo)
+        self.limpiar_antiguos()
+
+        id_trabajo = uuid.uuid4().hex
+        carpeta = self._directorio_trabajo(id_trabajo)
+        carpeta.mkdir()
+        entrada = carpeta / f"entrada.{formato}"
+
+        try:
+            copiados = 0
+            with open(entrada, "wb") as destino:
+                while True:
+                    fragmento = origen.read(1024 * 1024)
+                    if not fragmento:
+                        break
+                    copiados += len(fragmento)
+                    if copiados > self.max_bytes:
+                        raise ArchivoDemasiadoGrande(f"El archivo supera {self.max_bytes} bytes")
+                    destino.write(fragmento)
+
+            # Comprobar el formato y la columna antes de aceptar el trabajo
+            with LectorArchivo(entrada, formato, columna, columna_id) as lector:
+                next(iter(lector), None)
+                columna = lector.columna
+        except Exception:
+            shutil.rmtree(carpeta, ignore_errors=True)
+            raise
+
+        self._conexion().execute(
+            """
+            INSERT INTO trabajos (id, estado, archivo, formato, columna, columna_id, idioma, bytes, pid, creado)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (id_trabajo, PENDIENTE, nombre_archivo, formato, columna, columna_id, idioma,
+             copiados, os.getpid(), time.time())
+        )
+        self._pool.submit(self._ejecutar, id_trabajo)
+
+        logger.info(f"📥 Trabajo {id_trabajo} creado: {nombre_archivo} ({copiados} bytes)")
+        return self.obtener(id_trabajo)
+
+    def _ejecutar(self, id_trabajo: str):
+        """Puntúa el archivo de un trabajo por bloques (hilo del pool)."""
+        trabajo = self._conexion().execute("SELECT * FROM trabajos WHERE id = ?", (id_trabajo,)).fetchone()
+        carpeta = self._directorio_trabajo(id_trabajo)
+        entrada = carpeta / f"entrada.{trabajo['formato']}"
+        parcial = carpeta / f"resultado.{trabajo['formato']}.parcial"
+
+        # El mismo modelo para todo el archivo, aunque se active otro durante el
+        # trabajo: se retiene (y su pool sigue abierto) hasta que termina
+        predictor = adquirir_predictor()
+        idioma = trabajo["idioma"]
+        totales = {"filas": 0, "positivos": 0, "negativos": 0, "errores": 0}
+
+        try:
+            self._actualizar(
+                id_trabajo, estado=PROCESANDO, iniciado=time.time(), version_modelo=predictor.version_modelo
+            )
+            with LectorArchivo(entrada, trabajo["formato"], trabajo["columna"], trabajo["columna_id"]) as lector, \
+                    EscritorResultados(parcial, trabajo["formato"]) as escritor:
+                for bloque in lector.bloques(self.tamano_bloque):
+                    lote = predictor.predecir_lote(
+                        [registro.texto for registro in bloque],
+                        traducir=idioma != 'es',
+                        idioma_origen=idioma,
+                        usar_cache=False
+                    )
+                    escritor.escribir(resultados_de_lote(bloque, lote))
+
+                    validos = int(lote['validos'].sum())
+                    positivos = int((lote['prevision'] == 'Positivo').sum())
+                    totales["filas"] += len(bloque)
+                    totales["positivos"] += positivos
+                    totales["negativos"] += validos - positivos
+                    totales["errores"] += len(bloque) - validos
+                    self._actualizar(id_trabajo, progreso=lector.fraccion_leida, **totales)
+
+            parcial.rename(carpeta / f"resultado.{trabajo['formato']}")
+            self._actualizar(id_trabajo, estado=COMPLETADO, progreso=1.0, terminado=time.time())
+            logger.info(f"✅ Trabajo {id_trabajo} completado: {totales['filas']} filas")
+        except Exception as e:
+            logger.error(f"❌ Error en el trabajo {id_trabajo}: {e}", exc_info=True)
+            parcial.unlink(missing_ok=True)
+            self._actualizar(id_trabajo, estado=ERROR, error=str(e), terminado=time.time())
+        finally:
+            entrada.unlink(missing_ok=True)
+            predictor.liberar()
+
+    # ============================================
+    # CONSULTA
+    # ============================================
+
+    @staticmethod
+    def _formatear(fila: sqlite3.Row) -> Dict:
+        trabajo = dict(fila)
+        del trabajo["pid"]
+        fin = trabajo["terminado"] or time.time()
+        duracion = fin - trabajo["iniciado"] if trabajo["iniciado"] else None
+        trabajo["progreso_porcentaje"] = round(trabajo.pop("progreso") * 100, 2)
+        trabajo["duracion_segundos"] = round(duracion, 2) if duracion is not None else None
+        trabajo["filas_por_segundo"] = round(trabajo["filas"] / duracion, 1) if duracion else None
+        for campo in ("creado", "iniciado", "terminado"):
+            if trabajo[campo] is not None:
+                trabajo[campo] = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(trabajo[campo]))
+        return trabajo
+
+    def obtener(self, id_trabajo: str) -> Optional[Dict]:
+        """
+        Estado y progreso de un trabajo.
+
+        Returns:
+            Dict del trabajo, o None si no existe
+        """
+        fila = self._conexion().execute("SELECT * FROM trabajos WHERE id = ?", (id_trabajo,)).fetchone()
+        return self._formatear(fila) if fila is not None else None
+
+    def listar(self, limite: int = 50) -> List[Dict]:
+        """Trabajos más recientes primero."""
+        filas = self._conexion().execute(
+            "SELECT * FROM trabajos ORDER BY creado DESC LIMIT ?", (limite,)
+        ).fetchall()
+        return [self._formatear(fila) for fila in filas]
+
+    def ruta_resultado(self, id_trabajo: str) -> Optional[Path]:
+        """
+        Archivo de resultados de un trabajo completado.
+
+        Returns:
+            Ruta del archivo, o None si el trabajo no está completado
+        """
+        trabajo = self.obtener(id_trabajo)
+        if trabajo is None or trabajo["estado"] != COMPLETADO:
+            return None
+        return self._directorio_trabajo(id_trabajo) / f"resultado.{trabajo['formato']}"
+
+    # ============================================
+    # MANTENIMIENTO
+    # ============================================
+
+    def limpiar_antiguos(self) -> int:
+        """
+        Elimina los trabajos terminados hace más de retencion_horas.
+
+        Returns:
+            Número de trabajos eliminados
+        """
+        limite = time.time() - self.retencion_horas * 3600
+        filas = self._conexion().execute(
+            "SELECT id FROM trabajos WHERE terminado IS NOT NULL AND terminado < ?", (limite,)
+        ).fetchall()
+        for fila in filas:
+            shutil.rmtree(self._directorio_trabajo(fila["id"]), ignore_errors=True)
+            self._conexion().execute("DELETE FROM trabajos WHERE id = ?", (fila["id"],))
+        return len(filas)
+
+    def cerrar(self):
+        """Cancela los trabajos pendientes y no espera a los que están en curso."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ============================================
+# INSTANCIA GLOBAL
+# ============================================
+
+_gestor: Optional[GestorTrabajos] = None
+_gestor_lock = threading.Lock()
+
+
+def obtener_gestor_trabajos() -> GestorTrabajos:
+    """
+    Obtiene el gestor de trabajos del proceso (se crea en el primer uso).
+
+    Returns:
+        GestorTrabajos configurado según app/config.py
+    """
+    global _gestor
+    if _gestor is None:
+        with _gestor_lock:
+            if _gestor is None:
+                _gestor = GestorTrabajos(
+                    directorio=config.TRABAJOS_DIRECTORIO,
+                    max_concurrentes=config.TRABAJOS_CONCURRENTES,
+                    tamano_bloque=config.TRABAJOS_TAMANO_BLOQUE,
+                    max_bytes=config.TRABAJOS_MAX_BYTES,
+                    retencion_horas=config.TRABAJOS_RETENCION_HORAS
+                )
+    return _gestor
+
+
+def cerrar_gestor_trabajos():
+    """Cierra el pool de trabajos (al apagar la API)."""
+    global _gestor
+    if _gestor is not None:
+        _gestor.cerrar()
+        _gestor = None
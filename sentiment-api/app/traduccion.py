@@ -0,0 +1,539 @@
+# ============================================
+# TRADUCCION - CLIENTE CON POOL, CONCURRENCIA Y DEADLINES
+# ============================================
+
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple, Type
+import logging
+
+from . import config
+from .cache_traducciones import CacheTraducciones, obtener_cache_traducciones
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class ErrorTraduccion(Exception):
+    """Error al traducir un texto (red, límite de peticiones o deadline)"""
+
+
+# ============================================
+# BACKENDS
+# ============================================
+
+class BackendTraduccion(ABC):
+    """
+    Backend de traducción. Las llamadas son bloqueantes; el cliente se
+    encarga de la concurrencia, los reintentos y los deadlines.
+    """
+
+    nombre = "base"
+
+    @abstractmethod
+    def traducir(self, texto: str, origen: str, destino: str, timeout: float) -> str:
+        """Traduce un texto o lanza ErrorTraduccion."""
+
+    def peticiones(self, textos: List[str]) -> List[List[str]]:
+        """
+        Reparte un lote en los grupos que se traducen con una sola llamada a
+        traducir_lote (una petición). Por defecto, un texto por petición.
+        """
+        return [[texto] for texto in textos]
+
+    def traducir_lote(self, textos: List[str], origen: str, destino: str, timeout: float) -> List[Optional[str]]:
+        """
+        Traduce varios textos del mismo idioma. Por defecto, uno a uno; un
+        texto que falla queda en None.
+
+        Raises:
+            ErrorTraduccion: Si no se pudo traducir ningún texto
+        """
+        resultados: List[Optional[str]] = []
+        ultimo_error: Optional[ErrorTraduccion] = None
+        for texto in textos:
+            try:
+                resultados.append(self.traducir(texto, origen, destino, timeout))
+            except ErrorTraduccion as e:
+                ultimo_error = e
+                resultados.append(None)
+        if ultimo_error is not None and all(r is None for r in resultados):
+            raise ultimo_error
+        return resultados
+
+    def cerrar(self):
+        """Libera los recursos del backend."""
+
+
+class BackendGoogle(BackendTraduccion):
+    """
+    Google Translate (misma página móvil que usa deep_translator), con una
+    sesión HTTP compartida y conexiones keep-alive.
+    """
+
+    nombre = "google"
+    URL = "https://translate.google.com/m"
+
+    # Límite de caracteres por petición de Google Translate
+    MAX_CARACTERES = 5000
+
+    def __init__(self, max_conexiones: int = 16):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._sesion = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=max_conexiones, pool_maxsize=max_conexiones)
+        self._sesion.mount("https://", adaptador)
+        self._sesion.headers["User-Agent"] = "Mozilla/5.0 (sentiment-api)"
+
+    def _pedir(self, texto: str, origen: str, destino: str, timeout: float) -> str:
+        from bs4 import BeautifulSoup
+
+        respuesta = self._sesion.get(
+            self.URL,
+            params={"sl": origen, "tl": destino, "q": texto},
+            timeout=timeout
+        )
+        if respuesta.status_code == 429:
+            raise ErrorTraduccion("Google Translate: demasiadas peticiones (429)")
+        if respuesta.status_code != 200:
+            raise ErrorTraduccion(f"Google Translate respondió {respuesta.status_code}")
+
+        soup = BeautifulSoup(respuesta.text, "html.parser")
+        elemento = soup.find("div", {"class": "t0"}) or soup.find("div", {"class": "result-container"})
+        if elemento is None:
+            raise ErrorTraduccion("Traducción no encontrada en la respuesta")
+        return elemento.get_text()
+
+    def traducir(self, texto: str, origen: str, destino: str, timeout: float) -> str:
+        texto = texto.strip()
+        if not texto or origen == destino:
+            return texto
+        if len(texto) > self.MAX_CARACTERES:
+            raise ErrorTraduccion(f"El texto supera {self.MAX_CARACTERES} caracteres")
+        return self._pedir(texto, origen, destino, timeout).strip()
+
+    def peticiones(self, textos: List[str]) -> List[List[str]]:
+        """
+        Agrupa textos de una línea en peticiones de hasta MAX_CARACTERES
+        (unidos por saltos de línea); un texto con saltos de línea va solo.
+        """
+        grupos: List[List[str]] = []
+        grupo: List[str] = []
+        largo = 0
+        for texto in textos:
+            # Los textos con saltos de línea no se pueden agrupar por líneas
+            if "\n" in texto.strip():
+                grupos.append([texto])
+                continue
+            if grupo and largo + len(texto) > self.MAX_CARACTERES:
+                grupos.append(grupo)
+                grupo, largo = [], 0
+            grupo.append(texto)
+            largo += len(texto) + 1
+        if grupo:
+            grupos.append(grupo)
+        return grupos
+
+    def traducir_lote(self, textos: List[str], origen: str, destino: str, timeout: float) -> List[Optional[str]]:
+        """
+        Traduce un grupo de peticiones() con una sola petición. Si la
+        respuesta no conserva el número de líneas devuelve None en todos los
+        textos (el cliente los traduce entonces uno a uno).
+        """
+        if len(textos) == 1:
+            return [self.traducir(textos[0], origen, destino, timeout)]
+        unido = "\n".join(texto.strip() for texto in textos)
+        lineas = self._pedir(unido, origen, destino, timeout).strip().split("\n")
+        if len(lineas) != len(textos):
+            return [None] * len(textos)
+        return [linea.strip() for linea in lineas]
+
+    def cerrar(self):
+        self._sesion.close()
+
+
+class BackendLocal(BackendTraduccion):
+    """
+    Backend sin red para pruebas y benchmarks: devuelve el mismo texto tras
+    una latencia simulada configurable.
+    """
+
+    nombre = "local"
+
+    def __init__(self, latencia_ms: float = 0.0):
+        self.latencia = latencia_ms / 1000.0
+
+    def _esperar(self, timeout: float):
+        """Simula la petición; si supera el timeout falla como lo haría la red."""
+        if self.latencia > timeout:
+            time.sleep(timeout)
+            raise ErrorTraduccion(f"Timeout del backend local ({timeout:.3f}s)")
+        if self.latencia:
+            time.sleep(self.latencia)
+
+    def traducir(self, texto: str, origen: str, destino: str, timeout: float) -> str:
+        self._esperar(timeout)
+        return texto.strip()
+
+    def peticiones(self, textos: List[str]) -> List[List[str]]:
+        # Una sola "petición" para todo el lote
+        return [textos]
+
+    def traducir_lote(self, textos: List[str], origen: str, destino: str, timeout: float) -> List[str]:
+        self._esperar(timeout)
+        return [texto.strip() for texto in textos]
+
+
+BACKENDS: Dict[str, Type[BackendTraduccion]] = {
+    BackendGoogle.nombre: BackendGoogle,
+    BackendLocal.nombre: BackendLocal,
+}
+
+
+def registrar_backend(clase: Type[BackendTraduccion]):
+    """Registra un backend adicional, seleccionable con TRADUCCION_BACKEND."""
+    BACKENDS[clase.nombre] = clase
+
+
+def crear_backend(nombre: str) -> BackendTraduccion:
+    """
+    Crea el backend configurado.
+
+    Raises:
+        ValueError: Si el nombre no corresponde a ningún backend registrado
+    """
+    if nombre == BackendGoogle.nombre:
+        return BackendGoogle(max_conexiones=config.TRADUCCION_MAX_CONCURRENCIA)
+    if nombre == BackendLocal.nombre:
+        return BackendLocal(latencia_ms=config.TRADUCCION_LATENCIA_LOCAL_MS)
+    if nombre in BACKENDS:
+        return BACKENDS[nombre]()
+    raise ValueError(f"Backend de traducción desconocido: {nombre}")
+
+
+# ============================================
+# CLIENTE
+# ============================================
+
+class ClienteTraduccion:
+    """
+    Cliente de traducción compartido por todo el proceso.
+
+    - Consulta la cache persistente antes de llamar al backend.
+    - Limita las llamadas simultáneas al backend con un semáforo.
+    - Aplica un deadline a cada petición al backend (también a cada una de
+      las peticiones de un lote) y reintentos con backoff dentro de él; los
+      textos que una petición masiva no devuelve se traducen en paralelo
+      bajo un único deadline.
+    - Ofrece API síncrona (para código en hilos) y asíncrona (para el event
+      loop); la asíncrona ejecuta las llamadas en un pool de hilos propio.
+    """
+
+    def __init__(
+        self,
+        backend: BackendTraduccion,
+        max_concurrencia: int = 8,
+        timeout_segundos: float = 5.0,
+        max_reintentos: int = 3,
+        cache: Optional[CacheTraducciones] = None
+    ):
+        """
+        Args:
+            backend: Backend que realiza las traducciones
+            max_concurrencia: Máximo de llamadas simultáneas al backend
+            timeout_segundos: Deadline de cada traducción (incluye reintentos)
+            max_reintentos: Intentos por traducción
+            cache: Cache persistente de traducciones (opcional)
+        """
+        self.backend = backend
+        self.max_concurrencia = max_concurrencia
+        self.timeout = timeout_segundos
+        self.max_reintentos = max_reintentos
+        self.cache = cache
+
+        self._semaforo = threading.BoundedSemaphore(max_concurrencia)
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrencia, thread_name_prefix="traduccion")
+        # Aparte de _pool: sus hilos esperan a estas tareas (traducir_grupos)
+        self._pool_textos = ThreadPoolExecutor(max_workers=max_concurrencia, thread_name_prefix="traduccion-texto")
+
+        self._lock = threading.Lock()
+        self._llamadas = 0
+        self._reintentos = 0
+        self._errores = 0
+        self._timeouts = 0
+
+    # ============================================
+    # LLAMADAS AL BACKEND
+    # ============================================
+
+    def _con_reintentos(self, funcion, deadline: float, max_reintentos: int):
+        """Ejecuta una llamada al backend con semáforo, reintentos y deadline."""
+        ultimo_error: Optional[Exception] = None
+
+        for intento in range(max_reintentos):
+            restante = deadline - time.monotonic()
+            if restante <= 0 or not self._semaforo.acquire(timeout=restante):
+                with self._lock:
+                    self._timeouts += 1
+                raise ErrorTraduccion(f"Deadline de traducción agotado ({self.timeout}s)")
+
+            try:
+                with self._lock:
+                    self._llamadas += 1
+                    if intento:
+                        self._reintentos += 1
+                return funcion(max(deadline - time.monotonic(), 0.001))
+            except Exception as e:
+                ultimo_error = e
+                logger.warning(f"Intento {intento + 1}/{max_reintentos} falló: {str(e)}")
+            finally:
+                self._semaforo.release()
+
+            # Backoff exponencial sin superar el deadline
+            espera = min(0.1 * (2 ** intento), deadline - time.monotonic())
+            if espera > 0 and intento < max_reintentos - 1:
+                time.sleep(espera)
+
+        with self._lock:
+            self._errores += 1
+        raise ErrorTraduccion(str(ultimo_error))
+
+    # ============================================
+    # API SÍNCRONA
+    # ============================================
+
+    def traducir(
+        self,
+        texto: str,
+        origen: str,
+        destino: str = 'es',
+        max_reintentos: Optional[int] = None
+    ) -> str:
+        """
+        Traduce un texto.
+
+        Raises:
+            ErrorTraduccion: Si todos los intentos fallan o vence el deadline
+        """
+        if self.cache is not None:
+            en_cache = self.cache.obtener(origen, destino, texto)
+            if en_cache is not None:
+                return en_cache
+
+        deadline = time.monotonic() + self.timeout
+        traduccion = self._con_reintentos(
+            lambda restante: self.backend.traducir(texto, origen, destino, restante),
+            deadline,
+            max_reintentos or self.max_reintentos
+        )
+
+        if self.cache is not None and traduccion:
+            self.cache.guardar(origen, destino, texto, traduccion)
+        return traduccion
+
+    def traducir_lote(self, textos: List[str], origen: str, destino: str = 'es') -> List[Optional[str]]:
+        """
+        Traduce varios textos del mismo idioma con una petición masiva.
+        Los textos repetidos se traducen una sola vez.
+
+        Returns:
+            Lista alineada con la entrada (None en los textos que fallaron)
+        """
+        unicos = list(dict.fromkeys(textos))
+        traducidos: Dict[str, str] = {}
+
+        if self.cache is not None:
+            traducidos.update(self.cache.obtener_muchos(origen, destino, unicos))
+
+        pendientes = [texto for texto in unicos if texto not in traducidos]
+        if pendientes:
+            nuevos: List[Tuple[str, str]] = []
+            for grupo in self.backend.peticiones(pendientes):
+                nuevos.extend(self._traducir_peticion(grupo, origen, destino))
+            traducidos.update(nuevos)
+            if self.cache is not None:
+                self.cache.guardar_muchos(origen, destino, nuevos)
+
+        return [traducidos.get(texto) for texto in textos]
+
+    def _traducir_peticion(self, grupo: List[str], origen: str, destino: str) -> List[Tuple[str, str]]:
+        """
+        Traduce un grupo de backend.peticiones() con su propio deadline, de
+        modo que un lote grande no agota un único deadline compartido y las
+        peticiones que ya respondieron se conservan. Si la petición responde
+        pero sin algunos textos, esos se traducen uno a uno en paralelo, todos
+        dentro de un mismo deadline; si falla entera, no se insiste texto a
+        texto.
+
+        Returns:
+            Pares (texto, traducción) de los textos traducidos
+        """
+        try:
+            resultado = self._con_reintentos(
+                lambda restante: self.backend.traducir_lote(grupo, origen, destino, restante),
+                time.monotonic() + self.timeout,
+                self.max_reintentos
+            )
+        except ErrorTraduccion as e:
+            logger.error(f"Traducción de una petición de {len(grupo)} textos falló: {e}")
+            return []
+
+        nuevos = [(texto, traducido) for texto, traducido in zip(grupo, resultado) if traducido]
+        faltantes = [texto for texto, traducido in zip(grupo, resultado) if traducido is None]
+        if len(grupo) > 1 and faltantes:
+            nuevos.extend(self._traducir_faltantes(faltantes, origen, destino))
+        return nuevos
+
+    def _traducir_faltantes(self, textos: List[str], origen: str, destino: str) -> List[Tuple[str, str]]:
+        """
+        Traduce uno a uno los textos que una petición masiva no devolvió. Las
+        llamadas van en paralelo (el semáforo sigue limitando las simultáneas)
+        y comparten un deadline: el grupo tarda como mucho timeout_segundos,
+        no uno por texto.
+
+        Returns:
+            Pares (texto, traducción) de los textos traducidos a tiempo
+        """
+        deadline = time.monotonic() + self.timeout
+
+        def traducir(texto: str) -> str:
+            return self._con_reintentos(
+                lambda restante: self.backend.traducir(texto, origen, destino, restante),
+                deadline,
+                self.max_reintentos
+            )
+
+        futuros = {self._pool_textos.submit(traducir, texto): texto for texto in textos}
+        terminados, pendientes = wait(futuros, timeout=max(deadline - time.monotonic(), 0))
+        for futuro in pendientes:
+            futuro.cancel()
+        if pendientes:
+            logger.warning(f"Deadline agotado con {len(pendientes)} textos del lote sin traducir")
+
+        nuevos: List[Tuple[str, str]] = []
+        for futuro in terminados:
+            try:
+                traducido = futuro.result()
+            except ErrorTraduccion as e:
+                logger.warning(f"Traducción de un texto del lote falló: {e}")
+                continue
+            if traducido:
+                nuevos.append((futuros[futuro], traducido))
+        return nuevos
+
+    def traducir_grupos(self, grupos: Dict[str, List[str]], destino: str = 'es') -> Dict[str, List[Optional[str]]]:
+        """
+        Traduce varios grupos de textos (idioma -> textos) con una petición
+        masiva por grupo; los grupos se traducen en paralelo.
+
+        Returns:
+            Dict idioma -> traducciones alineadas con los textos del grupo
+        """
+        futuros = {
+            origen: self._pool.submit(self.traducir_lote, textos, origen, destino)
+            for origen, textos in grupos.items()
+        }
+        return {origen: futuro.result() for origen, futuro in futuros.items()}
+
+    # ============================================
+    # API ASÍNCRONA
+    # ============================================
+
+    async def atraducir(self, texto: str, origen: str, destino: str = 'es') -> str:
+        """Versión asíncrona de traducir: no bloquea el event loop."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._pool, self.traducir, texto, origen, destino),
+                timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise ErrorTraduccion(f"Deadline de traducción agotado ({self.timeout}s)")
+
+    async def atraducir_lote(self, textos: List[str], origen: str, destino: str = 'es') -> List[Optional[str]]:
+        """
+        Versión asíncrona de traducir_lote: no bloquea el event loop. Sin
+        deadline global: cada petición del lote lleva el suyo.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self.traducir_lote, textos, origen, destino)
+
+    async def atraducir_grupos(self, grupos: Dict[str, List[str]], destino: str = 'es') -> Dict[str, List[Optional[str]]]:
+        """Versión asíncrona de traducir_grupos: un atraducir_lote por grupo, en paralelo."""
+        traducciones = await asyncio.gather(*[
+            self.atraducir_lote(textos, origen, destino) for origen, textos in grupos.items()
+        ])
+        return dict(zip(grupos, traducciones))
+
+    # ============================================
+    # MÉTRICAS Y CIERRE
+    # ============================================
+
+    def estadisticas(self) -> Dict:
+        """
+        Obtiene los contadores del cliente.
+
+        Returns:
+            Dict con llamadas, reintentos, errores y timeouts
+        """
+        with self._lock:
+            return {
+                "backend": self.backend.nombre,
+                "max_concurrencia": self.max_concurrencia,
+                "timeout_segundos": self.timeout,
+                "llamadas": self._llamadas,
+                "reintentos": self._reintentos,
+                "errores": self._errores,
+                "timeouts": self._timeouts
+            }
+
+    def cerrar(self):
+        """Cierra el pool de hilos y la sesión del backend."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool_textos.shutdown(wait=False, cancel_futures=True)
+        self.backend.cerrar()
+
+
+# ============================================
+# INSTANCIA GLOBAL
+# ============================================
+
+_cliente: Optional[ClienteTraduccion] = None
+_cliente_lock = threading.Lock()
+
+
+def obtener_cliente_traduccion() -> ClienteTraduccion:
+    """
+    Obtiene el cliente de traducción del proceso (lo crea en el primer uso).
+
+    Returns:
+        ClienteTraduccion configurado según app/config.py
+    """
+    global _cliente
+    if _cliente is None:
+        with _cliente_lock:
+            if _cliente is None:
+                _cliente = ClienteTraduccion(
+                    backend=crear_backend(config.TRADUCCION_BACKEND),
+                    max_concurrencia=config.TRADUCCION_MAX_CONCURRENCIA,
+                    timeout_segundos=config.TRADUCCION_TIMEOUT_SEGUNDOS,
+                    max_reintentos=config.TRADUCCION_MAX_REINTENTOS,
+                    cache=obtener_cache_traducciones()
+                )
+                logger.info(f"Cliente de traducción: backend '{_cliente.backend.nombre}'")
+    return _cliente
+
+
+def cerrar_cliente_traduccion():
+    """Cierra el cliente global (se llama al apagar la API)."""
+    global _cliente
+    with _cliente_lock:
+        if _cliente is not None:
+            _cliente.cerrar()
+            _cliente = None
@@ -2,131 +2,180 @@
 # UTILS - FUNCIONES AUXILIARES
 # ============================================
 
-import re
-import string
-from typing import Dict, Optional
-from deep_translator import GoogleTranslator
+from typing import Dict, List, Optional
+import numpy as np
 import logging
+import time
+from .ejecucion import obtener_ejecutor
+from .idioma import obtener_detector
+from .metricas import observar_etapa, registrar_etapa
+# limpiar_texto se reexporta aquí: los módulos existentes la importan de utils
+from .normalizacion import limpiar_many, limpiar_texto
+from .traduccion import ErrorTraduccion, obtener_cliente_traduccion
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
 # ============================================
-# FUNCIONES DE LIMPIEZA DE TEXTO
+# FUNCIONES DE TRADUCCIÓN
 # ============================================
 
-def limpiar_texto(texto: str) -> str:
+def _resolver_idioma(texto: str, idioma_origen: str) -> str:
+    """Idioma del texto: el indicado o el detectado si es 'auto' ('es' si falla)."""
+    if idioma_origen != 'auto':
+        return idioma_origen
+    # Si falla la detección, asumir que ya está en español
+    marca = time.perf_counter()
+    idioma = obtener_detector().detectar(texto) or 'es'
+    registrar_etapa('deteccion_idioma', marca)
+    return idioma
+
+
+def _resultado_traduccion(
+    texto_traducido: str,
+    idioma_detectado: str,
+    error: Optional[str] = None
+) -> Dict[str, any]:
+    """Dict de resultado común a todas las funciones de traducción."""
+    return {
+        'texto_traducido': texto_traducido,
+        'idioma_detectado': idioma_detectado if error is None else 'unknown',
+        'traduccion_exitosa': error is None,
+        'error': error
+    }
+
+
+def traducir_texto(
+    texto: str, 
+    idioma_origen: str = 'auto',
+    idioma_destino: str = 'es',
+    max_reintentos: int = 3
+) -> Dict[str, any]:
     """
-    Limpia y preprocesa un texto para análisis de sentimiento.
+    Traduce un texto al español usando el cliente de traducción compartido.
     
     Args:
-        texto: Texto a limpiar
+        texto: Texto a traducir
+        idioma_origen: Código del idioma origen ('auto' para detección automática)
+        idioma_destino: Código del idioma destino (default: 'es')
+        max_reintentos: Número máximo de intentos si falla
         
     Returns:
-        Texto limpio y procesado
+        Dict con resultado de la traducción
     """
-    # Convertir a minúsculas
-    texto = texto.lower()
-    
-    # Eliminar URLs
-    texto = re.sub(r'http\S+|www\S+|https\S+', '', texto)
+    idioma_detectado = _resolver_idioma(texto, idioma_origen)
     
-    # Eliminar menciones (@usuario)
-    texto = re.sub(r'@\w+', '', texto)
+    # Si ya está en español, no traducir
+    if idioma_detectado == 'es':
+        return _resultado_traduccion(texto, 'es')
     
-    # Eliminar hashtags (#tema)
-    texto = re.sub(r'#\w+', '', texto)
+    marca = time.perf_counter()
+    try:
+        texto_traducido = obtener_cliente_traduccion().traducir(
+            texto, idioma_detectado, idioma_destino, max_reintentos=max_reintentos
+        )
+    except ErrorTraduccion as e:
+        # Todos los intentos fallaron, devolver texto original
+        logger.error(f"Traducción falló: {str(e)}")
+        return _resultado_traduccion(texto, idioma_detectado, error=str(e))
+    finally:
+        registrar_etapa('traduccion', marca)
     
-    # Eliminar números
-    texto = re.sub(r'\d+', '', texto)
+    return _resultado_traduccion(texto_traducido, idioma_detectado)
+
+
+async def traducir_texto_async(
+    texto: str,
+    idioma_origen: str = 'auto',
+    idioma_destino: str = 'es'
+) -> Dict[str, any]:
+    """
+    Versión asíncrona de traducir_texto: ni la detección de idioma (CPU,
+    en el pool de inferencia) ni la llamada de red bloquean el event loop.
     
-    # Eliminar puntuación
-    texto = texto.translate(str.maketrans('', '', string.punctuation))
+    Returns:
+        Dict con resultado de la traducción
+    """
+    if idioma_origen == 'auto':
+        idioma_detectado = await obtener_ejecutor().ejecutar(_resolver_idioma, texto, idioma_origen)
+    else:
+        idioma_detectado = idioma_origen
+    if idioma_detectado == 'es':
+        return _resultado_traduccion(texto, 'es')
     
-    # Eliminar espacios múltiples
-    texto = re.sub(r'\s+', ' ', texto).strip()
+    marca = time.perf_counter()
+    try:
+        texto_traducido = await obtener_cliente_traduccion().atraducir(
+            texto, idioma_detectado, idioma_destino
+        )
+    except ErrorTraduccion as e:
+        logger.error(f"Traducción falló: {str(e)}")
+        return _resultado_traduccion(texto, idioma_detectado, error=str(e))
+    finally:
+        registrar_etapa('traduccion', marca)
     
-    return texto
+    return _resultado_traduccion(texto_traducido, idioma_detectado)
 
 
-# ============================================
-# FUNCIONES DE TRADUCCIÓN
-# ============================================
+def _resultados_grupos(
+    grupos: Dict[str, List[str]],
+    traducidos: Dict[str, List[Optional[str]]]
+) -> Dict[str, List[Dict[str, any]]]:
+    """Convierte las traducciones de cada grupo al formato de traducir_texto."""
+    resultados = {}
+    for idioma, textos in grupos.items():
+        if idioma not in traducidos:
+            resultados[idioma] = [_resultado_traduccion(texto, idioma) for texto in textos]
+            continue
+        resultados[idioma] = [
+            _resultado_traduccion(traducido, idioma) if traducido is not None
+            else _resultado_traduccion(texto, idioma, error='Traducción no disponible')
+            for texto, traducido in zip(textos, traducidos[idioma])
+        ]
+    return resultados
 
-def traducir_texto(
-    texto: str, 
-    idioma_origen: str = 'auto',
-    idioma_destino: str = 'es',
-    max_reintentos: int = 3
-) -> Dict[str, any]:
+
+def traducir_grupos(
+    grupos: Dict[str, List[str]],
+    idioma_destino: str = 'es'
+) -> Dict[str, List[Dict[str, any]]]:
     """
-    Traduce un texto al español usando Google Translate.
+    Traduce textos agrupados por idioma: una petición masiva por idioma,
+    todas en paralelo. Los grupos en español no se traducen.
     
     Args:
-        texto: Texto a traducir
-        idioma_origen: Código del idioma origen ('auto' para detección automática)
+        grupos: Dict idioma -> textos de ese idioma
         idioma_destino: Código del idioma destino (default: 'es')
-        max_reintentos: Número máximo de intentos si falla
         
     Returns:
-        Dict con resultado de la traducción
+        Dict idioma -> lista de dicts con el formato de traducir_texto
     """
-    for intento in range(max_reintentos):
-        try:
-            # Detectar idioma si es 'auto'
-            if idioma_origen == 'auto':
-                # Intentar detectar el idioma
-                try:
-                    from langdetect import detect
-                    idioma_detectado = detect(texto)
-                except:
-                    # Si falla la detección, asumir que ya está en español
-                    idioma_detectado = 'es'
-            else:
-                idioma_detectado = idioma_origen
-            
-            # Si ya está en español, no traducir
-            if idioma_detectado == 'es':
-                return {
-                    'texto_traducido': texto,
-                    'idioma_detectado': 'es',
-                    'traduccion_exitosa': True,
-                    'error': None
-                }
-            
-            # Traducir usando deep-translator
-            traductor = GoogleTranslator(source=idioma_detectado, target=idioma_destino)
-            texto_traducido = traductor.translate(texto)
-            
-            logger.info(f"Traducción exitosa: {idioma_detectado} -> {idioma_destino}")
-            
-            return {
-                'texto_traducido': texto_traducido,
-                'idioma_detectado': idioma_detectado,
-                'traduccion_exitosa': True,
-                'error': None
-            }
-            
-        except Exception as e:
-            logger.warning(f"Intento {intento + 1}/{max_reintentos} falló: {str(e)}")
-            
-            if intento == max_reintentos - 1:
-                # Último intento falló, devolver texto original
-                logger.error(f"Traducción falló después de {max_reintentos} intentos")
-                return {
-                    'texto_traducido': texto,
-                    'idioma_detectado': 'unknown',
-                    'traduccion_exitosa': False,
-                    'error': str(e)
-                }
-    
-    # No debería llegar aquí, pero por si acaso
-    return {
-        'texto_traducido': texto,
-        'idioma_detectado': 'unknown',
-        'traduccion_exitosa': False,
-        'error': 'Error desconocido'
-    }
+    pendientes = {idioma: textos for idioma, textos in grupos.items() if idioma != idioma_destino}
+    traducidos = {}
+    if pendientes:
+        marca = time.perf_counter()
+        traducidos = obtener_cliente_traduccion().traducir_grupos(pendientes, idioma_destino)
+        registrar_etapa('traduccion', marca)
+    return _resultados_grupos(grupos, traducidos)
+
+
+async def traducir_grupos_async(
+    grupos: Dict[str, List[str]],
+    idioma_destino: str = 'es'
+) -> Dict[str, List[Dict[str, any]]]:
+    """
+    Versión asíncrona de traducir_grupos: no bloquea el event loop.
+    
+    Returns:
+        Dict idioma -> lista de dicts con el formato de traducir_texto
+    """
+    pendientes = {idioma: textos for idioma, textos in grupos.items() if idioma != idioma_destino}
+    traducidos = {}
+    if pendientes:
+        marca = time.perf_counter()
+        traducidos = await obtener_cliente_traduccion().atraducir_grupos(pendientes, idioma_destino)
+        registrar_etapa('traduccion', marca)
+    return _resultados_grupos(grupos, traducidos)
 
 
 def detectar_idioma(texto: str) -> Optional[str]:
@@ -139,34 +188,31 @@ def detectar_idioma(texto: str) -> Optional[str]:
     Returns:
         Código del idioma detectado o None si falla
     """
-    try:
-        from langdetect import detect
-        return detect(texto)
-    except Exception as e:
-        logger.warning(f"Error detectando idioma: {str(e)}")
-        return None
+    return obtener_detector().detectar(texto)
 
 
-# ============================================
-# FUNCIONES DE VALIDACIÓN
-# ============================================
-
-def validar_texto(texto: str, min_length: int = 3, max_length: int = 5000) -> Dict[str, any]:
+def detectar_idiomas(textos: List[str]) -> List[str]:
     """
-    Valida que un texto cumple con los requisitos mínimos.
+    Detecta el idioma de varios textos; los repetidos se detectan una vez.
     
     Args:
-        texto: Texto a validar
-        min_length: Longitud mínima permitida
-        max_length: Longitud máxima permitida
+        textos: Textos a analizar
         
     Returns:
-        Dict con resultado de la validación
+        Lista de códigos de idioma ('es' donde la detección falla)
     """
-    # Eliminar espacios en blanco
-    texto = texto.strip()
-    
-    # Validar longitud
+    marca = time.perf_counter()
+    idiomas = [idioma or 'es' for idioma in obtener_detector().detectar_muchos(textos)]
+    registrar_etapa('deteccion_idioma', marca)
+    return idiomas
+
+
+# ============================================
+# FUNCIONES DE VALIDACIÓN
+# ============================================
+
+def _validar_longitud(texto: str, min_length: int, max_length: int) -> Optional[Dict[str, any]]:
+    """Resultado de validación fallida por longitud, o None si es correcta."""
     if len(texto) < min_length:
         return {
             'valido': False,
@@ -181,8 +227,12 @@ def validar_texto(texto: str, min_length: int = 3, max_length: int = 5000) -> Di
             'texto_limpio': texto
         }
     
+    return None
+
+
+def _validar_limpio(texto_limpio: str) -> Dict[str, any]:
+    """Resultado de validación de un texto ya limpio."""
     # Validar que no esté vacío después de limpiar
-    texto_limpio = limpiar_texto(texto)
     if len(texto_limpio) < 2:
         return {
             'valido': False,
@@ -197,6 +247,82 @@ def validar_texto(texto: str, min_length: int = 3, max_length: int = 5000) -> Di
     }
 
 
+def validar_texto(texto: str, min_length: int = 3, max_length: int = 5000) -> Dict[str, any]:
+    """
+    Valida que un texto cumple con los requisitos mínimos.
+    
+    El 'texto_limpio' de un texto válido es el de limpiar_texto: quien
+    valida puede puntuarlo directamente sin volver a limpiar.
+    
+    Args:
+        texto: Texto a validar
+        min_length: Longitud mínima permitida
+        max_length: Longitud máxima permitida
+        
+    Returns:
+        Dict con resultado de la validación
+    """
+    inicio = time.perf_counter()
+    
+    # Eliminar espacios en blanco
+    texto = texto.strip()
+    
+    # Validar longitud
+    fallo = _validar_longitud(texto, min_length, max_length)
+    if fallo is not None:
+        registrar_etapa('validacion', inicio)
+        return fallo
+    
+    # Limpiar (etapa aparte en las métricas)
+    marca = time.perf_counter()
+    texto_limpio = limpiar_texto(texto)
+    limpieza = time.perf_counter() - marca
+    
+    resultado = _validar_limpio(texto_limpio)
+    observar_etapa('limpieza', limpieza)
+    observar_etapa('validacion', time.perf_counter() - inicio - limpieza)
+    return resultado
+
+
+def validar_textos(textos: List[str], min_length: int = 3, max_length: int = 5000) -> List[Dict[str, any]]:
+    """
+    Valida muchos textos: igual que validar_texto en cada uno, pero los que
+    pasan el control de longitud se limpian juntos con limpiar_many.
+    
+    Args:
+        textos: Textos a validar
+        min_length: Longitud mínima permitida
+        max_length: Longitud máxima permitida
+        
+    Returns:
+        Lista de dicts de validación alineada con textos
+    """
+    inicio = time.perf_counter()
+    resultados: List[Optional[Dict[str, any]]] = []
+    pendientes: List[int] = []
+    candidatos: List[str] = []
+    
+    for i, texto in enumerate(textos):
+        texto = texto.strip()
+        fallo = _validar_longitud(texto, min_length, max_length)
+        resultados.append(fallo)
+        if fallo is None:
+            pendientes.append(i)
+            candidatos.append(texto)
+    
+    # Limpiar (etapa aparte en las métricas)
+    marca = time.perf_counter()
+    limpios = limpiar_many(candidatos)
+    limpieza = time.perf_counter() - marca
+    
+    for i, texto_limpio in zip(pendientes, limpios):
+        resultados[i] = _validar_limpio(texto_limpio)
+    
+    observar_etapa('limpieza', limpieza)
+    observar_etapa('validacion', time.perf_counter() - inicio - limpieza)
+    return resultados
+
+
 # ============================================
 # FUNCIONES DE FORMATO
 # ============================================
@@ -231,4 +357,22 @@ def obtener_nivel_confianza(probabilidad: float) -> str:
     elif probabilidad >= 0.60:
         return "Media"
     else:
-        return "Baja"
\ No newline at end of file
+        return "Baja"
+
+
+def obtener_niveles_confianza(probabilidades: np.ndarray) -> np.ndarray:
+    """
+    Versión vectorizada de obtener_nivel_confianza para un lote.
+    
+    Args:
+        probabilidades: Array de valores entre 0 y 1
+        
+    Returns:
+        Array con el nivel de confianza de cada probabilidad
+    """
+    probabilidades = np.asarray(probabilidades, dtype=np.float64)
+    return np.select(
+        [probabilidades >= 0.90, probabilidades >= 0.75, probabilidades >= 0.60],
+        ["Muy Alta", "Alta", "Media"],
+        default="Baja"
+    )
@@ -0,0 +1,267 @@
+# ============================================
+# VOCABULARIO - ÍNDICE COMPACTO TOKEN -> COLUMNA
+# ============================================
+#
+# Sustituye al dict vocabulary_ de TfidfVectorizer en el camino de servicio.
+# Los términos se guardan ordenados en un solo bloque UTF-8, el mismo formato
+# que vocab_terminos.bin/vocab_offsets.npy/vocab_columnas.npy de un bundle,
+# y esos archivos se abren con memory-mapping (páginas compartidas entre
+# procesos). En memoria propia del proceso solo queda un array ordenado con
+# el hash de cada término, su posición y un directorio de cubos (unos
+# 16-20 bytes por término).
+#
+# Búsqueda de un lote de tokens:
+#   1. hash() de cada token; sus bits altos eligen un cubo de un directorio
+#      sobre los hashes ordenados (como un searchsorted sin bisección).
+#   2. Cada coincidencia se confirma comparando los bytes del token con los
+#      del término (vectorizado), así que el resultado es exacto.
+#   3. Si el hash coincide pero los bytes no (colisión), el token se busca
+#      por bisección en los términos ordenados.
+#
+# hash() de str depende de PYTHONHASHSEED: los hashes se calculan al cargar,
+# en cada proceso, nunca se guardan en el bundle.
+
+import mmap
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Convierte int64 en uint64 conservando el orden (para tomar los bits altos)
+_BIT_SIGNO = np.uint64(1 << 63)
+
+
+def empaquetar(vocabulario: Dict[str, int]) -> Tuple[bytes, np.ndarray, np.ndarray]:
+    """
+    Términos ordenados en un solo bloque UTF-8 con sus offsets y columnas.
+
+    Returns:
+        Tupla (bytes separados por '\\n', offsets int64[n + 1], columnas int32[n])
+    """
+    terminos = sorted(vocabulario)
+    codificados = [t.encode("utf-8") for t in terminos]
+    offsets = np.zeros(len(codificados) + 1, dtype=np.int64)
+    np.cumsum([len(c) + 1 for c in codificados], out=offsets[1:])
+    columnas = np.array([vocabulario[t] for t in terminos], dtype=np.int32)
+    return b"\n".join(codificados), offsets, columnas
+
+
+class NombresFeatures(Sequence):
+    """Nombres de features por columna (como get_feature_names_out) sin materializarlos."""
+
+    def __init__(self, vocabulario: "VocabularioCompacto"):
+        self._vocabulario = vocabulario
+
+    def __len__(self) -> int:
+        return len(self._vocabulario)
+
+    def __getitem__(self, columna: int) -> str:
+        return self._vocabulario.termino(int(columna))
+
+
+class VocabularioCompacto(Mapping):
+    """
+    Vocabulario token -> columna de solo lectura sobre términos empaquetados.
+
+    Frente al dict (objetos str e int más la tabla hash) ocupa los bytes de
+    los términos, 12 bytes por término con memory-mapping (offset y columna)
+    y el índice de hashes, que es la única memoria propia del proceso.
+    """
+
+    def __init__(self, datos: Union[bytes, mmap.mmap], offsets: np.ndarray, columnas: np.ndarray):
+        """
+        Args:
+            datos: Términos UTF-8 ordenados y separados por '\\n'
+            offsets: Inicio de cada término en bytes (n + 1 elementos)
+            columnas: Columna de cada término
+        """
+        if len(offsets) != len(columnas) + 1:
+            raise ValueError("offsets debe tener un elemento más que columnas")
+
+        self._datos = datos
+        self._octetos = np.frombuffer(datos, dtype=np.uint8) if len(datos) else np.zeros(0, dtype=np.uint8)
+        self.offsets = offsets
+        self.columnas = columnas
+        self._posiciones: Optional[np.ndarray] = None
+
+        # Hashes ordenados y posición (en el orden de los términos) de cada uno
+        hashes = np.fromiter(
+            (hash(self._bytes_termino(posicion).decode("utf-8")) for posicion in range(len(columnas))),
+            dtype=np.int64, count=len(columnas)
+        )
+        orden = np.argsort(hashes, kind="stable")
+        self._hashes = hashes[orden]
+        self._posicion_hash = orden.astype(np.int32)
+
+        # Directorio: cubo (bits altos del hash) -> primer índice en _hashes
+        bits = max(int(len(columnas)).bit_length(), 1)
+        self._desplazamiento = np.uint64(64 - bits)
+        cubos = (self._hashes.view(np.uint64) ^ _BIT_SIGNO) >> self._desplazamiento
+        self._directorio = np.searchsorted(cubos, np.arange((1 << bits) + 1)).astype(np.int32)
+
+    @classmethod
+    def desde_diccionario(cls, vocabulario: Dict[str, int]) -> "VocabularioCompacto":
+        """Construye el índice en memoria a partir de un dict token -> columna."""
+        return cls(*empaquetar(vocabulario))
+
+    @classmethod
+    def cargar(cls, ruta: Union[str, Path]) -> "VocabularioCompacto":
+        """
+        Abre con memory-mapping los archivos de vocabulario de un bundle.
+
+        Args:
+            ruta: Directorio del bundle
+        """
+        ruta = Path(ruta)
+        with open(ruta / "vocab_terminos.bin", "rb") as archivo:
+            tamano = archivo.seek(0, 2)
+            datos = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) if tamano else b""
+        # np.asarray: vistas ndarray del mapeo, sin la sobrecarga de np.memmap al indexar
+        return cls(
+            datos,
+            np.asarray(np.load(ruta / "vocab_offsets.npy", mmap_mode="r")),
+            np.asarray(np.load(ruta / "vocab_columnas.npy", mmap_mode="r"))
+        )
+
+    # ============================================
+    # BÚSQUEDA
+    # ============================================
+
+    def _bytes_termino(self, posicion: int) -> bytes:
+        return self._datos[int(self.offsets[posicion]):int(self.offsets[posicion + 1]) - 1]
+
+    def _bisecar(self, codificado: bytes) -> Optional[int]:
+        """Posición exacta de un término por bisección en el orden de los términos."""
+        desde, hasta = 0, len(self.columnas)
+        while desde < hasta:
+            medio = (desde + hasta) // 2
+            termino = self._bytes_termino(medio)
+            if termino == codificado:
+                return medio
+            if termino < codificado:
+                desde = medio + 1
+            else:
+                hasta = medio
+        return None
+
+    def _indices_hash(self, hashes: np.ndarray) -> np.ndarray:
+        """Índice en _hashes de cada hash (-1 si no está)."""
+        cubos = (hashes.view(np.uint64) ^ _BIT_SIGNO) >> self._desplazamiento
+        indices = self._directorio[cubos].astype(np.int64)
+        fines = self._directorio[cubos + 1]
+        resultado = np.full(len(hashes), -1, dtype=np.int64)
+
+        # Recorrer cada cubo (pocos elementos) solo con los hashes aún sin resolver
+        activos = np.flatnonzero(indices < fines)
+        while len(activos):
+            actuales = indices[activos]
+            encontrados = self._hashes[actuales] == hashes[activos]
+            resultado[activos[encontrados]] = actuales[encontrados]
+            activos = activos[~encontrados]
+            indices[activos] += 1
+            activos = activos[indices[activos] < fines[activos]]
+        return resultado
+
+    def _confirmar(self, octetos: np.ndarray, inicios: np.ndarray, posiciones: np.ndarray) -> np.ndarray:
+        """
+        Máscara de los tokens cuyos bytes coinciden con los del término candidato.
+
+        Args:
+            octetos: Tokens candidatos en UTF-8, cada uno seguido de '\\n'
+            inicios: Inicio de cada token en octetos
+            posiciones: Posición del término candidato de cada token
+        """
+        segmentos = np.diff(inicios, append=len(octetos))
+        inicios_termino = self.offsets[posiciones]
+        iguales = segmentos == self.offsets[posiciones + 1] - inicios_termino
+
+        # Cada token con su '\n' frente al término con el suyo (el último
+        # término no lleva '\n': los separadores no se comparan)
+        indices = np.arange(len(octetos)) + np.repeat(inicios_termino - inicios, segmentos)
+        np.minimum(indices, len(self._octetos) - 1, out=indices)
+        distintos = self._octetos[indices] != octetos
+        distintos[octetos == 10] = False
+        return iguales & ~np.logical_or.reduceat(distintos, inicios)
+
+    def buscar_muchos(self, tokens: List[str]) -> np.ndarray:
+        """
+        Columnas de una lista de tokens.
+
+        Args:
+            tokens: Tokens o n-gramas ya tokenizados (sin saltos de línea)
+
+        Returns:
+            Array int64 alineado con la entrada, con -1 donde el token no está
+        """
+        columnas = np.full(len(tokens), -1, dtype=np.int64)
+        if not tokens or not len(self._hashes):
+            return columnas
+
+        indices = self._indices_hash(np.fromiter(map(hash, tokens), dtype=np.int64, count=len(tokens)))
+        candidatos = np.flatnonzero(indices >= 0)
+        if not len(candidatos):
+            return columnas
+
+        # Una sola codificación para todos los candidatos, separados por '\n'
+        seleccionados = [tokens[i] for i in candidatos.tolist()]
+        octetos = np.frombuffer(("\n".join(seleccionados) + "\n").encode("utf-8"), dtype=np.uint8)
+        inicios = np.zeros(len(candidatos), dtype=np.int64)
+        inicios[1:] = np.flatnonzero(octetos == 10)[:-1] + 1
+
+        posiciones = self._posicion_hash[indices[candidatos]]
+        confirmados = self._confirmar(octetos, inicios, posiciones)
+        columnas[candidatos[confirmados]] = self.columnas[posiciones[confirmados]]
+
+        # Colisiones de hash: búsqueda exacta en los términos ordenados
+        for i in np.flatnonzero(~confirmados).tolist():
+            posicion = self._bisecar(seleccionados[i].encode("utf-8"))
+            if posicion is not None:
+                columnas[candidatos[i]] = self.columnas[posicion]
+        return columnas
+
+    def termino(self, columna: int) -> str:
+        """Término de una columna."""
+        if self._posiciones is None:
+            # Solo lo usa la explicabilidad: se calcula en el primer uso
+            posiciones = np.empty(len(self.columnas), dtype=np.int32)
+            posiciones[self.columnas] = np.arange(len(self.columnas), dtype=np.int32)
+            self._posiciones = posiciones
+        return self._bytes_termino(int(self._posiciones[columna])).decode("utf-8")
+
+    def empaquetado(self) -> Tuple[Union[bytes, mmap.mmap], np.ndarray, np.ndarray]:
+        """Términos, offsets y columnas en el formato de empaquetar()."""
+        return self._datos, self.offsets, self.columnas
+
+    def nombres_features(self) -> NombresFeatures:
+        """Nombres de features indexables por columna."""
+        return NombresFeatures(self)
+
+    def memoria_bytes(self) -> Dict[str, int]:
+        """
+        Bytes ocupados por el índice.
+
+        Returns:
+            Dict con los bytes con memory-mapping (compartibles entre procesos),
+            los propios del proceso y el total
+        """
+        compartidos = len(self._datos) + self.offsets.nbytes + self.columnas.nbytes
+        propios = self._hashes.nbytes + self._posicion_hash.nbytes + self._directorio.nbytes
+        return {"compartidos": compartidos, "propios": propios, "total": compartidos + propios}
+
+    # ============================================
+    # INTERFAZ DE MAPPING (token -> columna)
+    # ============================================
+
+    def __getitem__(self, token: str) -> int:
+        columna = int(self.buscar_muchos([token])[0])
+        if columna < 0:
+            raise KeyError(token)
+        return columna
+
+    def __iter__(self) -> Iterator[str]:
+        for posicion in range(len(self.columnas)):
+            yield self._bytes_termino(posicion).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.columnas)
@@ -0,0 +1,79 @@
+# ============================================
+# BENCHMARK - ARRANQUE: PKL VS BUNDLE
+# ============================================
+#
+# Uso (desde sentiment-api/):
+#   python -m app.artefactos exportar            # genera modelos_serializados/bundle
+#   python -m benchmarks.arranque [--bundle DIR] [--repeticiones 5]
+#
+# Cada medición se hace en un proceso nuevo: tiempo de import de
+# app.prediccion, tiempo de construcción de SentimentPredictor, RSS final
+# y si scikit-learn quedó importado.
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = """
+import json, sys, time
+inicio = time.perf_counter()
+from app.prediccion import SentimentPredictor
+importado = time.perf_counter()
+SentimentPredictor(bundle_path=sys.argv[1] or None)
+listo = time.perf_counter()
+
+rss_kb = 0
+with open('/proc/self/status') as f:
+    for linea in f:
+        if linea.startswith('VmRSS:'):
+            rss_kb = int(linea.split()[1])
+
+print(json.dumps({
+    'import_ms': (importado - inicio) * 1000,
+    'arranque_ms': (listo - importado) * 1000,
+    'rss_mb': rss_kb / 1024,
+    'sklearn': any(m == 'sklearn' or m.startswith('sklearn.') for m in sys.modules)
+}))
+"""
+
+
+def medir(bundle: str, repeticiones: int) -> dict:
+    """Mediana de varias ejecuciones en procesos nuevos."""
+    muestras = []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, "-c", SCRIPT, bundle],
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent.parent
+        )
+        muestras.append(json.loads(salida.stdout.strip().splitlines()[-1]))
+
+    return {
+        clave: statistics.median(m[clave] for m in muestras) if clave != 'sklearn' else muestras[0][clave]
+        for clave in muestras[0]
+    }
+
+
+def main():
+    por_defecto = Path(__file__).parent.parent / "modelos_serializados" / "bundle"
+
+    parser = argparse.ArgumentParser(description="Benchmark de arranque pkl vs bundle")
+    parser.add_argument("--bundle", default=str(por_defecto))
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    if not Path(args.bundle, "metadata.json").exists():
+        sys.exit(f"No hay bundle en {args.bundle}; genéralo con: python -m app.artefactos exportar")
+
+    resultados = {"pkl + sklearn": medir("", args.repeticiones), "bundle": medir(args.bundle, args.repeticiones)}
+
+    print(f"{'':<16}{'import (ms)':>12}{'arranque (ms)':>15}{'RSS (MB)':>10}{'sklearn':>9}")
+    for nombre, r in resultados.items():
+        print(f"{nombre:<16}{r['import_ms']:>12.0f}{r['arranque_ms']:>15.0f}{r['rss_mb']:>10.1f}{'sí' if r['sklearn'] else 'no':>9}")
+
+
+if __name__ == "__main__":
+    main()
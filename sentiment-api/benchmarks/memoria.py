@@ -0,0 +1,85 @@
+# ============================================
+# BENCHMARK - MEMORIA POR WORKER CON Y SIN PRECARGA
+# ============================================
+#
+# Uso (desde sentiment-api/):
+#   python -m benchmarks.memoria [--workers 8] [--bundle DIR]
+#
+# Arranca gunicorn (gunicorn.conf.py) dos veces, con PRECARGA_MODELO=0
+# (cada worker carga su modelo) y con PRECARGA_MODELO=1 (el maestro carga
+# y los workers heredan las páginas), y muestra RSS y PSS de cada proceso.
+# PSS reparte las páginas compartidas, así que su total es la memoria real.
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from app.memoria import reporte_workers
+
+RAIZ = Path(__file__).parent.parent
+
+
+def medir(workers: int, precarga: bool, bundle: str, puerto: int, espera: float) -> dict:
+    """Arranca gunicorn, espera a que todos los workers estén listos y mide."""
+    entorno = dict(
+        os.environ,
+        PRECARGA_MODELO="1" if precarga else "0",
+        WEB_CONCURRENCY=str(workers),
+        PORT=str(puerto),
+        MODELO_BUNDLE=bundle
+    )
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        cwd=RAIZ, env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+
+    listos = threading.Semaphore(0)
+
+    def leer_log():
+        for linea in proceso.stderr:
+            if "Application startup complete" in linea:
+                listos.release()
+
+    threading.Thread(target=leer_log, daemon=True).start()
+    try:
+        for _ in range(workers):
+            if not listos.acquire(timeout=espera):
+                raise RuntimeError("Los workers no arrancaron a tiempo")
+        time.sleep(1.0)
+        return reporte_workers(proceso.pid)
+    finally:
+        proceso.send_signal(signal.SIGTERM)
+        proceso.wait(timeout=30)
+
+
+def imprimir(nombre: str, reporte: dict):
+    print(f"\n{nombre}")
+    print(f"{'proceso':<10}{'pid':>8}{'RSS (MB)':>10}{'PSS (MB)':>10}{'privado (MB)':>14}")
+    for etiqueta, p in [("maestro", reporte["maestro"])] + [("worker", w) for w in reporte["workers"]]:
+        privado = p.get("privado_limpio_mb", 0.0) + p.get("privado_sucio_mb", 0.0)
+        print(f"{etiqueta:<10}{p['pid']:>8}{p.get('rss_mb', 0.0):>10.1f}{p.get('pss_mb', 0.0):>10.1f}{privado:>14.1f}")
+    print(f"{'total':<18}{reporte['total_rss_mb']:>10.1f}{reporte['total_pss_mb']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria por worker con y sin precarga del modelo")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--bundle", default="", help="Directorio de bundle (vacío: .pkl)")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--espera", type=float, default=120.0, help="Segundos máximos por worker")
+    args = parser.parse_args()
+
+    if not Path("/proc/self/smaps_rollup").exists():
+        sys.exit("Este benchmark necesita Linux (/proc/<pid>/smaps_rollup)")
+
+    for nombre, precarga in (("Sin precarga (un modelo por worker)", False), ("Con precarga (pre-fork)", True)):
+        imprimir(nombre, medir(args.workers, precarga, args.bundle, args.puerto, args.espera))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# ============================================
+# BENCHMARK - MOTOR LINEAL VS SKLEARN
+# ============================================
+#
+# Uso (desde sentiment-api/):
+#   python -m benchmarks.motor [corpus.txt] [--repeticiones 2000]
+#
+# Verifica la paridad del motor lineal contra transform + predict_proba y
+# mide la latencia de un texto y de un lote de 1000 textos.
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+import numpy as np
+
+from app.prediccion import SentimentPredictor
+from app.motor import MotorLineal
+from app.normalizacion import limpiar_many
+
+
+def cargar_corpus(ruta: str = None, n: int = 2000) -> List[str]:
+    """Lee un texto por línea o genera un corpus sintético con el vocabulario."""
+    if ruta:
+        with open(ruta, encoding="utf-8") as f:
+            return limpiar_many(linea for linea in f if linea.strip())
+
+    predictor = SentimentPredictor()
+    vocabulario = list(predictor.vectorizador.vocabulary_)
+    aleatorio = random.Random(0)
+    return limpiar_many(
+        " ".join(aleatorio.choice(vocabulario) for _ in range(aleatorio.randint(1, 30)))
+        for _ in range(n)
+    )
+
+
+def medir(funcion: Callable, repeticiones: int) -> float:
+    """Tiempo medio por llamada en microsegundos."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del motor lineal")
+    parser.add_argument("corpus", nargs="?", help="Archivo con un texto por línea")
+    parser.add_argument("--repeticiones", type=int, default=2000)
+    args = parser.parse_args()
+
+    predictor = SentimentPredictor()
+    modelo, vectorizador = predictor.modelo, predictor.vectorizador
+    motor = MotorLineal.desde_sklearn(modelo, vectorizador)
+    idx_positivo = list(modelo.classes_).index('Positivo')
+
+    corpus = cargar_corpus(args.corpus)
+
+    # Paridad
+    matriz = vectorizador.transform(corpus)
+    referencia = modelo.predict_proba(matriz)[:, idx_positivo]
+    etiquetas = modelo.predict(matriz) == 'Positivo'
+    prob_positivo, prob_negativo = motor.probabilidades(corpus)
+    tfidf = motor.vectorizar_lote(corpus)
+
+    print(f"Textos: {len(corpus)}")
+    print(f"TF-IDF idéntico bit a bit: {np.array_equal(matriz.tocoo().data, tfidf.valores) and np.array_equal(matriz.indices, tfidf.columnas)}")
+    print(f"Diferencia máx. de probabilidad: {np.max(np.abs(prob_positivo - referencia)):.3e}")
+    print(f"Etiquetas coincidentes: {np.mean((prob_positivo > prob_negativo) == etiquetas):.4%}")
+
+    # Latencia
+    texto = corpus[0]
+    lote = corpus[:1000]
+    n = args.repeticiones
+
+    sklearn_uno = medir(lambda: modelo.predict_proba(vectorizador.transform([texto])), n)
+    motor_uno = medir(lambda: motor.probabilidades([texto]), n)
+    sklearn_lote = medir(lambda: modelo.predict_proba(vectorizador.transform(lote)), 20)
+    motor_lote = medir(lambda: motor.probabilidades(lote), 20)
+
+    print(f"\n{'':<22}{'sklearn':>12}{'motor':>12}{'speedup':>10}")
+    print(f"{'1 texto (µs)':<22}{sklearn_uno:>12.1f}{motor_uno:>12.1f}{sklearn_uno / motor_uno:>9.1f}x")
+    print(f"{'1000 textos (ms)':<22}{sklearn_lote / 1000:>12.2f}{motor_lote / 1000:>12.2f}{sklearn_lote / motor_lote:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
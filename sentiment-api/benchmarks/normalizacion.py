@@ -0,0 +1,112 @@
+# ============================================
+# BENCHMARK - NORMALIZADOR DE UNA PASADA VS LIMPIEZA ORIGINAL
+# ============================================
+#
+# Uso (desde sentiment-api/):
+#   python -m benchmarks.normalizacion [corpus.txt] [--fuzz 200000]
+#
+# Verifica que app/normalizacion.py produce exactamente la misma salida que
+# la limpieza original (seis pasadas) sobre un corpus de reseñas y sobre
+# textos aleatorios con los casos difíciles (URLs pegadas a menciones,
+# '##', dígitos y espacios Unicode, todos los code points), y mide el tiempo
+# por texto de cada implementación. Sale con código 1 si hay diferencias.
+
+import argparse
+import random
+import re
+import string
+import sys
+import time
+from typing import Callable, List
+
+from app.normalizacion import limpiar_many, limpiar_texto
+
+
+def limpiar_texto_original(texto: str) -> str:
+    """Implementación anterior de utils.limpiar_texto (referencia)."""
+    texto = texto.lower()
+    texto = re.sub(r'http\S+|www\S+|https\S+', '', texto)
+    texto = re.sub(r'@\w+', '', texto)
+    texto = re.sub(r'#\w+', '', texto)
+    texto = re.sub(r'\d+', '', texto)
+    texto = texto.translate(str.maketrans('', '', string.punctuation))
+    texto = re.sub(r'\s+', ' ', texto).strip()
+    return texto
+
+
+# Reseñas sintéticas si no se pasa un corpus
+PALABRAS = (
+    "el producto llegó tarde pero funciona muy bien , ¡recomendado! 5 estrellas "
+    "@tienda #oferta https://t.co/abc www.ejemplo.com mala calidad no lo compren "
+    "ÉXITO Ñandú 100% garantía... (devolución) precio/calidad :) 😡 😍"
+).split()
+
+# Fragmentos que ejercitan el orden de las pasadas originales
+FRAGMENTOS = list("abHhtpTwW@#_19 \t\n.:/!¿¡áÉñİΣ٣²  \x1c\x85") + [
+    "http", "https://x.co/a", "www", "www.", "@", "#", "##", "@@", "ana@", "#123",
+]
+
+
+def corpus_resenas(n: int, aleatorio: random.Random) -> List[str]:
+    return [" ".join(aleatorio.choice(PALABRAS) for _ in range(aleatorio.randint(3, 60))) for _ in range(n)]
+
+
+def corpus_fuzz(n: int, aleatorio: random.Random) -> List[str]:
+    textos = ["".join(aleatorio.choice(FRAGMENTOS) for _ in range(aleatorio.randint(0, 30))) for _ in range(n)]
+    # Cada code point solo y entre letras (espacios, dígitos y mayúsculas Unicode)
+    textos += [f"{c}{c} a{c}b #{c}x @x{c}" for c in map(chr, range(0x110000)) if not 0xD800 <= ord(c) < 0xE000]
+    return textos
+
+
+def diferencias(textos: List[str]) -> List[str]:
+    nuevos = limpiar_many(textos)
+    return [t for t, nuevo in zip(textos, nuevos) if nuevo != limpiar_texto_original(t) or nuevo != limpiar_texto(t)]
+
+
+def medir(funcion: Callable[[List[str]], object], textos: List[str], repeticiones: int = 3) -> float:
+    """Mejor tiempo por texto en microsegundos."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(textos)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor / len(textos) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paridad y velocidad del normalizador")
+    parser.add_argument("corpus", nargs="?", help="Archivo con un texto por línea")
+    parser.add_argument("--muestras", type=int, default=20000, help="Reseñas sintéticas si no hay corpus")
+    parser.add_argument("--fuzz", type=int, default=200000, help="Textos aleatorios para la paridad")
+    args = parser.parse_args()
+
+    aleatorio = random.Random(0)
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            corpus = [linea.rstrip("\n") for linea in f if linea.strip()]
+    else:
+        corpus = corpus_resenas(args.muestras, aleatorio)
+    fuzz = corpus_fuzz(args.fuzz, aleatorio)
+
+    # Paridad
+    fallos = diferencias(corpus) + diferencias(fuzz)
+    print(f"Textos comparados: {len(corpus) + len(fuzz)} ({len(corpus)} corpus, {len(fuzz)} fuzz)")
+    print(f"Salidas distintas: {len(fallos)}")
+    for texto in fallos[:5]:
+        print(f"  {texto!r}: {limpiar_texto_original(texto)!r} != {limpiar_texto(texto)!r}")
+
+    # Velocidad sobre el corpus
+    original = medir(lambda ts: [limpiar_texto_original(t) for t in ts], corpus)
+    uno_a_uno = medir(lambda ts: [limpiar_texto(t) for t in ts], corpus)
+    lote = medir(limpiar_many, corpus)
+
+    print(f"\n{'µs por texto':<22}{'tiempo':>10}{'speedup':>10}")
+    print(f"{'original':<22}{original:>10.2f}{'1.0x':>10}")
+    print(f"{'limpiar_texto':<22}{uno_a_uno:>10.2f}{original / uno_a_uno:>9.1f}x")
+    print(f"{'limpiar_many':<22}{lote:>10.2f}{original / lote:>9.1f}x")
+
+    sys.exit(1 if fallos else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# ============================================
+# BENCHMARK - ESCALADO DEL POOL DE PROCESOS
+# ============================================
+#
+# Uso (desde sentiment-api/):
+#   python -m benchmarks.procesos [corpus.txt] [--procesos 1,2,4] [--lote 1000]
+#
+# Mide el throughput (textos/s) del scoring en el proceso de la API y con
+# el pool de procesos para distintos números de workers. Varios hilos
+# envían lotes a la vez, como lo harían peticiones concurrentes.
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+import numpy as np
+
+from app.prediccion import SentimentPredictor
+from app.procesos import PoolProcesos
+from benchmarks.motor import cargar_corpus
+
+
+def throughput(puntuar: Callable, lotes: List[List[str]], concurrencia: int) -> float:
+    """Textos por segundo puntuando todos los lotes con varios hilos."""
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        list(pool.map(puntuar, lotes))
+    return sum(len(lote) for lote in lotes) / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del pool de procesos de inferencia")
+    parser.add_argument("corpus", nargs="?", help="Archivo con un texto por línea")
+    parser.add_argument("--procesos", default=",".join(str(n) for n in sorted({1, 2, os.cpu_count() or 1})))
+    parser.add_argument("--lote", type=int, default=1000)
+    parser.add_argument("--textos", type=int, default=20000)
+    args = parser.parse_args()
+
+    predictor = SentimentPredictor()
+    corpus = cargar_corpus(args.corpus, n=args.textos)
+    lotes = [corpus[i:i + args.lote] for i in range(0, len(corpus), args.lote)]
+    referencia, _ = predictor._probabilidades(corpus)
+
+    print(f"Núcleos: {os.cpu_count()}  Textos: {len(corpus)}  Lote: {args.lote}")
+    print(f"\n{'modo':<22}{'textos/s':>12}{'escalado':>10}")
+
+    base = throughput(predictor._probabilidades, lotes, concurrencia=4)
+    print(f"{'en proceso':<22}{base:>12.0f}{1.0:>9.2f}x")
+
+    for n in [int(x) for x in args.procesos.split(",")]:
+        pool = PoolProcesos(
+            model_path=predictor.model_path,
+            vectorizer_path=predictor.vectorizer_path,
+            usar_motor=predictor.motor is not None,
+            max_procesos=n
+        )
+        try:
+            positivo, _ = pool.puntuar(corpus)
+            assert np.allclose(positivo, referencia), "El pool no reproduce las probabilidades"
+            valor = throughput(pool.puntuar, lotes, concurrencia=max(4, n))
+        finally:
+            pool.cerrar()
+        print(f"{f'{n} procesos':<22}{valor:>12.0f}{valor / base:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# ============================================
+# BENCHMARK - VOCABULARIO COMPACTO VS DICT
+# ============================================
+#
+# Uso (desde sentiment-api/):
+#   python -m app.artefactos exportar            # genera modelos_serializados/bundle
+#   python -m benchmarks.vocabulario [--bundle DIR] [corpus.txt]
+#
+# Compara el dict token -> columna con el índice de app/vocabulario.py:
+# memoria que ocupa, tiempo de búsqueda de los tokens de un lote y de un
+# texto, y que las probabilidades del motor sean idénticas con ambos.
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from app.artefactos import cargar_bundle
+from app.motor import MotorLineal
+from app.vocabulario import VocabularioCompacto
+from benchmarks.motor import cargar_corpus
+
+
+def memoria_dict(terminos, columnas) -> int:
+    """Bytes que reserva Python para construir el dict (str, int y tabla hash)."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    # Copias nuevas de cada término, como las que crea el unpickle del vectorizador
+    vocabulario = {t.encode("utf-8").decode("utf-8"): int(c) for t, c in zip(terminos, columnas)}
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del vocabulario
+    return despues - antes
+
+
+def con_vocabulario(motor: MotorLineal, vocabulario) -> MotorLineal:
+    """Copia del motor con otro vocabulario."""
+    return MotorLineal(
+        vocabulario=vocabulario,
+        idf=motor.idf,
+        pesos=motor.pesos,
+        sesgo=motor.sesgo,
+        clases=motor.clases,
+        token_pattern=motor.token_pattern,
+        ngram_range=motor.ngram_range,
+        lowercase=motor.lowercase,
+        stop_words=motor.stop_words,
+        binary=motor.binary,
+        sublinear_tf=motor.sublinear_tf,
+        norm=motor.norm,
+        escala=motor.escala,
+        complemento_exacto=motor.complemento_exacto
+    )
+
+
+def medir(funcion, repeticiones: int) -> float:
+    """Tiempo medio por llamada en microsegundos."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def main():
+    por_defecto = Path(__file__).parent.parent / "modelos_serializados" / "bundle"
+
+    parser = argparse.ArgumentParser(description="Benchmark del vocabulario compacto")
+    parser.add_argument("corpus", nargs="?", help="Archivo con un texto por línea")
+    parser.add_argument("--bundle", default=str(por_defecto))
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    if not Path(args.bundle, "metadata.json").exists():
+        sys.exit(f"No hay bundle en {args.bundle}; genéralo con: python -m app.artefactos exportar")
+
+    compacto = VocabularioCompacto.cargar(args.bundle)
+    terminos = list(compacto)
+    diccionario = dict(zip(terminos, compacto.columnas.tolist()))
+
+    base = cargar_bundle(args.bundle).motor
+    motor_dict = con_vocabulario(base, diccionario)
+    motor_compacto = con_vocabulario(base, compacto)
+
+    corpus = cargar_corpus(args.corpus, n=1000)
+    tokens_lote = [t for texto in corpus for t in motor_dict._tokens(texto)]
+    tokens_texto = motor_dict._tokens(corpus[0])
+
+    # Paridad: mismas columnas y mismas probabilidades
+    buscar = diccionario.get
+    esperadas = np.array([buscar(t, -1) for t in tokens_lote])
+    if not np.array_equal(compacto.buscar_muchos(tokens_lote), esperadas):
+        sys.exit("❌ El índice compacto no devuelve las mismas columnas que el dict")
+    for textos in (corpus[:1], corpus[:8], corpus):
+        if not np.array_equal(motor_compacto.probabilidades(textos)[0], motor_dict.probabilidades(textos)[0]):
+            sys.exit("❌ Las probabilidades cambian con el índice compacto")
+
+    print(f"Términos: {len(compacto)}  tokens del lote: {len(tokens_lote)}")
+    print(f"\n{'':<22}{'dict':>12}{'compacto':>12}")
+    memoria = compacto.memoria_bytes()
+    print(f"{'memoria (KB)':<22}{memoria_dict(terminos, compacto.columnas.tolist()) / 1024:>12.0f}"
+          f"{memoria['total'] / 1024:>12.0f}")
+    print(f"{'  propia del proceso':<22}{'':>12}{memoria['propios'] / 1024:>12.0f}")
+
+    filas = [
+        ("búsqueda lote (µs)", lambda: [buscar(t) for t in tokens_lote], lambda: compacto.buscar_muchos(tokens_lote)),
+        ("búsqueda texto (µs)", lambda: [buscar(t) for t in tokens_texto], lambda: compacto.buscar_muchos(tokens_texto)),
+        ("motor 1000 textos (µs)", lambda: motor_dict.probabilidades(corpus), lambda: motor_compacto.probabilidades(corpus)),
+        ("motor 1 texto (µs)", lambda: motor_dict.probabilidades(corpus[:1]), lambda: motor_compacto.probabilidades(corpus[:1]))
+    ]
+    for nombre, con_dict, con_compacto in filas:
+        repeticiones = args.repeticiones if "lote" in nombre or "1000" in nombre else args.repeticiones * 20
+        print(f"{nombre:<22}{medir(con_dict, repeticiones):>12.1f}{medir(con_compacto, repeticiones):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# ============================================
+# GUNICORN - WORKERS PRE-FORK CON MODELO COMPARTIDO
+# ============================================
+#
+# Uso (desde sentiment-api/):
+#   gunicorn -c gunicorn.conf.py app.main:app
+#
+# El modelo se carga una vez en el maestro (preload_app + PRECARGA_MODELO)
+# y los workers comparten sus páginas en copy-on-write. El reparto de
+# memoria por worker se consulta en GET /memory/stats.
+
+import gc
+import os
+
+# Se lee antes de importar app.main en el maestro
+os.environ.setdefault("PRECARGA_MODELO", "1")
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.environ["PRECARGA_MODELO"].strip().lower() in ("1", "true", "si", "sí", "yes", "on")
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+
+
+def pre_fork(server, worker):
+    # Congelar también lo creado por gunicorn tras la precarga
+    gc.freeze()
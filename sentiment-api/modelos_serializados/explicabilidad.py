@@ -2,6 +2,12 @@
 # ============================================
 # FUNCIÓN DE EXPLICABILIDAD PARA PRODUCCIÓN
 # ============================================
+#
+# Uso (desde sentiment-api/, para que el paquete app sea importable):
+#   from modelos_serializados.explicabilidad import predecir_con_explicacion
+
+# Misma limpieza que la API (sentiment-api/app/normalizacion.py)
+from app.normalizacion import limpiar_texto
 
 def predecir_con_explicacion(texto, modelo, vectorizador, top_features=5):
     """
@@ -17,15 +23,8 @@ def predecir_con_explicacion(texto, modelo, vectorizador, top_features=5):
             ]
         }
     """
-    import re
-    import string
-
     # Limpiar texto
-    texto_limpio = texto.lower()
-    texto_limpio = re.sub(r'http\S+|www\S+|https\S+', '', texto_limpio)
-    texto_limpio = re.sub(r'@\w+|#\w+|\d+', '', texto_limpio)
-    texto_limpio = texto_limpio.translate(str.maketrans('', '', string.punctuation))
-    texto_limpio = re.sub(r'\s+', ' ', texto_limpio).strip()
+    texto_limpio = limpiar_texto(texto)
 
     # Vectorizar
     texto_vec = vectorizador.transform([texto_limpio])
@@ -2,26 +2,22 @@
 # ============================================
 # FUNCIÓN MULTILINGÜE PARA BACK-END
 # ============================================
+#
+# Uso (desde sentiment-api/, para que el paquete app sea importable):
+#   python -m modelos_serializados.funcion_multilingue
+
+from pathlib import Path
 
-from googletrans import Translator
-import re
-import string
 import joblib
 
-# Cargar modelo y vectorizador
-modelo = joblib.load('sentiment_model.pkl')
-vectorizador = joblib.load('tfidf_vectorizer.pkl')
-translator = Translator()
+# Misma limpieza y traducción que la API (sentiment-api/app/)
+from app.normalizacion import limpiar_texto
+from app.utils import traducir_texto
 
-def limpiar_texto(texto):
-    texto = texto.lower()
-    texto = re.sub(r'http\S+|www\S+|https\S+', '', texto)
-    texto = re.sub(r'@\w+', '', texto)
-    texto = re.sub(r'#\w+', '', texto)
-    texto = re.sub(r'\d+', '', texto)
-    texto = texto.translate(str.maketrans('', '', string.punctuation))
-    texto = re.sub(r'\s+', ' ', texto).strip()
-    return texto
+# Cargar modelo y vectorizador (junto a este archivo)
+DIRECTORIO = Path(__file__).parent
+modelo = joblib.load(DIRECTORIO / 'sentiment_model.pkl')
+vectorizador = joblib.load(DIRECTORIO / 'tfidf_vectorizer.pkl')
 
 def predecir_sentimiento_api(texto, idioma='auto'):
     '''
@@ -40,21 +36,11 @@ def predecir_sentimiento_api(texto, idioma='auto'):
         }
     '''
 
-    # Traducir si no es español
-    if idioma != 'es':
-        try:
-            traduccion = translator.translate(texto, src=idioma, dest='es')
-            texto_es = traduccion.text
-            idioma_detectado = traduccion.src
-            traduccion_ok = True
-        except:
-            texto_es = texto
-            idioma_detectado = 'desconocido'
-            traduccion_ok = False
-    else:
-        texto_es = texto
-        idioma_detectado = 'es'
-        traduccion_ok = True
+    # Traducir si no es español (si falla, se predice sobre el original)
+    traduccion = traducir_texto(texto, idioma_origen=idioma, idioma_destino='es')
+    texto_es = traduccion['texto_traducido']
+    idioma_detectado = traduccion['idioma_detectado']
+    traduccion_ok = traduccion['traduccion_exitosa']
 
     # Predecir
     texto_limpio = limpiar_texto(texto_es)
@@ -72,6 +58,7 @@ def predecir_sentimiento_api(texto, idioma='auto'):
     }
 
 # Ejemplo de uso
-resultado = predecir_sentimiento_api("This hotel is amazing!", idioma='auto')
-print(resultado)
-# Output: {"prevision": "Positivo", "probabilidad": 0.95, ...}
+if __name__ == "__main__":
+    resultado = predecir_sentimiento_api("This hotel is amazing!", idioma='auto')
+    print(resultado)
+    # Output: {"prevision": "Positivo", "probabilidad": 0.95, ...}
@@ -1,12 +1,13 @@
 
 import streamlit as st
 import joblib
-import re
-import string
 import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime
 
+# Misma limpieza que la API (app/normalizacion.py)
+from app.normalizacion import limpiar_texto
+
 # Configuración de la página
 st.set_page_config(
     page_title="Análisis de Sentimientos",
@@ -30,17 +31,6 @@ def cargar_modelo():
         st.error(f"Error al cargar el modelo: {e}")
         return None, None
 
-def limpiar_texto(texto):
-    """Limpia el texto para análisis"""
-    texto = texto.lower()
-    texto = re.sub(r'http\S+|www\S+|https\S+', '', texto)
-    texto = re.sub(r'@\w+', '', texto)
-    texto = re.sub(r'#\w+', '', texto)
-    texto = re.sub(r'\d+', '', texto)
-    texto = texto.translate(str.maketrans('', '', string.punctuation))
-    texto = re.sub(r'\s+', ' ', texto).strip()
-    return texto
-
 def predecir_sentimiento(texto, modelo, vectorizador, threshold=0.5):
     """Predice el sentimiento con threshold personalizable"""
     texto_limpio = limpiar_texto(texto)
@@ -0,0 +1,73 @@
+# ============================================
+# TESTS - FIXTURES COMPARTIDAS
+# ============================================
+
+import time
+
+import joblib
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
+
+from app import config, prediccion
+
+# Reseñas de hotel en español ya normalizadas (minúsculas, sin puntuación)
+CORPUS = [
+    ("excelente hotel me encantó todo", "Positivo"),
+    ("muy buena ubicación y personal amable", "Positivo"),
+    ("la habitación era muy limpia y cómoda", "Positivo"),
+    ("desayuno excelente y buen precio volvería", "Positivo"),
+    ("servicio horrible comida pésima hotel sucio", "Negativo"),
+    ("no volvería nunca una experiencia terrible", "Negativo"),
+    ("la habitación estaba sucia y el baño roto", "Negativo"),
+    ("personal grosero y precio muy caro", "Negativo"),
+]
+
+
+@pytest.fixture(scope="session")
+def directorio_modelos(tmp_path_factory):
+    """
+    Directorio de versiones con dos modelos sobre el mismo vectorizador:
+    sentiment_model (MultinomialNB) y sentiment_model_lr (LogisticRegression).
+    """
+    directorio = tmp_path_factory.mktemp("modelos")
+    textos, etiquetas = zip(*CORPUS)
+    vectorizador = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True).fit(textos)
+    matriz = vectorizador.transform(textos)
+    joblib.dump(vectorizador, directorio / "tfidf_vectorizer.pkl")
+    joblib.dump(MultinomialNB().fit(matriz, etiquetas), directorio / "sentiment_model.pkl")
+    joblib.dump(LogisticRegression().fit(matriz, etiquetas), directorio / "sentiment_model_lr.pkl")
+    return directorio
+
+
+@pytest.fixture
+def configuracion(monkeypatch, directorio_modelos):
+    """Configuración aislada: sin pool de procesos, sombra ni traducción por red."""
+    monkeypatch.setattr(config, "MODELOS_DIRECTORIO", str(directorio_modelos))
+    monkeypatch.setattr(config, "MODELO_BUNDLE", "")
+    monkeypatch.setattr(config, "INFERENCIA_PROCESOS", 0)
+    monkeypatch.setattr(config, "TRADUCCION_BACKEND", "local")
+    monkeypatch.setattr(config, "TRADUCCION_CACHE_ACTIVA", False)
+    return config
+
+
+@pytest.fixture
+def predictor(configuracion, directorio_modelos, monkeypatch):
+    """Predictor global cargado desde directorio_modelos (se cierra al terminar)."""
+    actual = prediccion.SentimentPredictor(
+        model_path=directorio_modelos / "sentiment_model.pkl",
+        vectorizer_path=directorio_modelos / "tfidf_vectorizer.pkl",
+        bundle_path=""
+    )
+    monkeypatch.setattr(prediccion, "predictor", actual)
+    yield actual
+    prediccion.predictor.cerrar()
+
+
+def esperar(condicion, timeout: float = 10.0):
+    """Espera a que condicion() sea verdadera (falla al agotar el timeout)."""
+    limite = time.monotonic() + timeout
+    while not condicion():
+        assert time.monotonic() < limite, "condición no cumplida a tiempo"
+        time.sleep(0.01)
@@ -0,0 +1,66 @@
+# ============================================
+# TESTS - BARRIDO DE THRESHOLDS
+# ============================================
+
+import pytest
+
+from conftest import CORPUS
+
+TEXTOS = [texto for texto, _ in CORPUS] + ["ok"]  # el último no supera la validación
+ETIQUETAS = [etiqueta for _, etiqueta in CORPUS] + ["Positivo"]
+THRESHOLDS = [0.0, 0.3, 0.5, 0.7, 1.0]
+
+
+def test_coincide_con_la_prediccion_por_threshold(predictor):
+    barrido = predictor.barrer_thresholds(TEXTOS, THRESHOLDS, incluir_predicciones=True)
+
+    assert (barrido["total"], barrido["validos"]) == (len(TEXTOS), len(TEXTOS) - 1)
+    assert [e["indice"] for e in barrido["errores"]] == [len(TEXTOS) - 1]
+    for threshold, resultado in zip(THRESHOLDS, barrido["thresholds"]):
+        lote = predictor.predecir_lote(TEXTOS, usar_cache=False, threshold=threshold)
+        esperadas = [p if valido else None for p, valido in zip(lote["prevision"], lote["validos"])]
+        assert resultado["threshold"] == threshold
+        assert resultado["predicciones"] == esperadas
+        assert resultado["positivos"] == esperadas.count("Positivo")
+        assert resultado["negativos"] == esperadas.count("Negativo")
+
+
+def test_matriz_de_confusion_y_mejor_f1(predictor):
+    barrido = predictor.barrer_thresholds(TEXTOS, THRESHOLDS, etiquetas=ETIQUETAS, incluir_predicciones=True)
+
+    for resultado in barrido["thresholds"]:
+        pares = [(p, e) for p, e in zip(resultado["predicciones"], ETIQUETAS) if p is not None]
+        esperada = {
+            "vp": sum(p == e == "Positivo" for p, e in pares),
+            "fp": sum(p == "Positivo" != e for p, e in pares),
+            "vn": sum(p == e == "Negativo" for p, e in pares),
+            "fn": sum(p == "Negativo" != e for p, e in pares),
+        }
+        assert resultado["confusion"] == esperada
+        assert resultado["exactitud"] == round((esperada["vp"] + esperada["vn"]) / len(pares), 6)
+
+    # threshold 1.0: ningún positivo, precisión indefinida
+    assert barrido["thresholds"][-1]["precision"] is None
+    # threshold 0.0: todo positivo, recall completo
+    assert barrido["thresholds"][0]["recall"] == 1.0
+
+    mejor = max((r for r in barrido["thresholds"] if r["f1"] is not None), key=lambda r: r["f1"])
+    assert barrido["mejor_threshold_f1"] == mejor["threshold"]
+
+
+def test_no_usa_la_cache(predictor):
+    predictor.barrer_thresholds(TEXTOS, THRESHOLDS)
+
+    assert predictor.cache.estadisticas()["entradas"] == 0
+
+
+@pytest.mark.parametrize("thresholds, etiquetas", [
+    ([], None),
+    ([1.5], None),
+    ([float("nan")], None),
+    ([0.5], ETIQUETAS[:-1]),
+    ([0.5], ["Neutro"] * len(TEXTOS)),
+])
+def test_parametros_invalidos(predictor, thresholds, etiquetas):
+    with pytest.raises(ValueError):
+        predictor.barrer_thresholds(TEXTOS, thresholds, etiquetas=etiquetas)
@@ -0,0 +1,95 @@
+# ============================================
+# TESTS - CACHE DE PREDICCIONES (LRU + TTL)
+# ============================================
+
+import pytest
+
+from app import cache as modulo_cache
+from app.cache import CachePredicciones
+
+
+class Reloj:
+    """Sustituye a time.monotonic en app.cache."""
+
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self):
+        return self.ahora
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    reloj = Reloj()
+    monkeypatch.setattr(modulo_cache.time, "monotonic", reloj)
+    return reloj
+
+
+def test_guardar_y_obtener():
+    cache = CachePredicciones(max_entradas=10)
+    cache.guardar("a", 1)
+
+    assert cache.obtener("a") == 1
+    assert cache.obtener("b") is None
+    estadisticas = cache.estadisticas()
+    assert (estadisticas["aciertos"], estadisticas["fallos"]) == (1, 1)
+    assert estadisticas["tasa_aciertos"] == 0.5
+
+
+def test_desaloja_la_menos_usada_recientemente():
+    cache = CachePredicciones(max_entradas=2)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    cache.obtener("a")  # 'b' pasa a ser la menos usada
+    cache.guardar("c", 3)
+
+    assert cache.obtener("b") is None
+    assert cache.obtener("a") == 1
+    assert cache.obtener("c") == 3
+    assert cache.estadisticas()["desalojos"] == 1
+
+
+def test_las_entradas_expiran(reloj):
+    cache = CachePredicciones(max_entradas=10, ttl_segundos=60)
+    cache.guardar("a", 1)
+
+    reloj.ahora += 59
+    assert cache.obtener("a") == 1
+    reloj.ahora += 2
+    assert cache.obtener("a") is None
+    assert cache.estadisticas()["expiraciones"] == 1
+    assert cache.estadisticas()["entradas"] == 0
+
+
+def test_operaciones_por_lote():
+    cache = CachePredicciones(max_entradas=10)
+    cache.guardar_muchos([("a", 1), ("b", 2)])
+
+    assert cache.obtener_muchos(["a", "x", "b"]) == [1, None, 2]
+
+
+def test_recientes_no_cuenta_como_consulta(reloj):
+    cache = CachePredicciones(max_entradas=10, ttl_segundos=60)
+    cache.guardar("viejo", 0)
+    reloj.ahora += 30
+    cache.guardar_muchos([("a", 1), ("b", 2)])
+    cache.obtener("a")
+    reloj.ahora += 31  # 'viejo' expira
+
+    assert cache.recientes(10) == [("a", 1), ("b", 2)]
+    assert cache.recientes(1) == [("a", 1)]
+    assert cache.estadisticas()["aciertos"] == 1
+
+
+def test_invalidar():
+    cache = CachePredicciones(max_entradas=10)
+    cache.guardar("a", 1)
+    cache.invalidar()
+
+    assert cache.obtener("a") is None
+    assert cache.estadisticas()["invalidaciones"] == 1
+
+
+def test_max_entradas_invalido():
+    with pytest.raises(ValueError):
+        CachePredicciones(max_entradas=0)
@@ -0,0 +1,84 @@
+# ============================================
+# TESTS - ANÁLISIS EN STREAMING (NDJSON)
+# ============================================
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+
+@pytest.fixture
+def cliente(predictor, monkeypatch):
+    monkeypatch.setattr(main, "STREAM_TAMANO_BLOQUE", 2)
+    monkeypatch.setattr(main, "STREAM_MAX_BYTES_LINEA", 64)
+    return TestClient(main.app)
+
+
+def _enviar(cliente, cuerpo):
+    respuesta = cliente.post("/sentiment/stream?idioma=es", content=cuerpo)
+    assert respuesta.status_code == 200
+    assert respuesta.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(linea) for linea in respuesta.text.splitlines()]
+
+
+def test_una_linea_por_texto_y_resumen(cliente, predictor):
+    entrada = [
+        json.dumps("excelente hotel me encantó"),
+        json.dumps({"text": "hotel sucio y personal grosero", "id": "r-2"}),
+        "",
+        json.dumps({"texto": "la habitación era muy limpia"}),
+    ]
+    salida = _enviar(cliente, "\n".join(entrada).encode())
+
+    *registros, resumen = salida
+    assert [r["indice"] for r in registros] == [1, 2, 4]
+    assert registros[1]["id"] == "r-2"
+    esperadas = predictor.predecir_lote(
+        ["excelente hotel me encantó", "hotel sucio y personal grosero", "la habitación era muy limpia"],
+        idioma_origen='es', usar_cache=False
+    )
+    assert [r["prevision"] for r in registros] == list(esperadas["prevision"])
+    assert resumen["resumen"]["total"] == 3
+    assert resumen["resumen"]["errores"] == 0
+    assert resumen["resumen"]["positivos"] == list(esperadas["prevision"]).count("Positivo")
+
+
+def test_errores_por_linea_sin_cortar_el_flujo(cliente):
+    entrada = [
+        "{no es json",
+        json.dumps({"id": 7}),
+        json.dumps([1, 2]),
+        json.dumps("x" * 100),
+        json.dumps("ok"),
+        json.dumps("excelente hotel"),
+    ]
+    salida = _enviar(cliente, "\n".join(entrada).encode())
+
+    *registros, resumen = salida
+    assert [r["indice"] for r in registros] == [1, 2, 3, 4, 5, 6]
+    assert all("error" in r for r in registros[:5])
+    assert "64 bytes" in registros[3]["error"]
+    assert registros[5]["prevision"] == "Positivo"
+    assert (resumen["resumen"]["total"], resumen["resumen"]["errores"]) == (1, 5)
+
+
+def test_lineas_partidas_entre_fragmentos(cliente):
+    cuerpo = (json.dumps("excelente hotel") + "\n" + json.dumps("hotel sucio") + "\n").encode()
+
+    def fragmentos():
+        for i in range(0, len(cuerpo), 5):
+            yield cuerpo[i:i + 5]
+
+    *registros, resumen = _enviar(cliente, fragmentos())
+
+    assert [r["texto"] for r in registros] == ["excelente hotel", "hotel sucio"]
+    assert resumen["resumen"]["total"] == 2
+
+
+def test_retiene_el_predictor_durante_el_flujo(cliente, predictor):
+    _enviar(cliente, json.dumps("excelente hotel").encode())
+
+    assert predictor.usos == 0
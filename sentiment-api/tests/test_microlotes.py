@@ -0,0 +1,92 @@
+# ============================================
+# TESTS - MICROLOTES
+# ============================================
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.microlotes import MicroBatcher
+
+
+class Registro:
+    """Función de lote que anota el tamaño de cada lote recibido."""
+
+    def __init__(self):
+        self.lotes = []
+
+    def __call__(self, elementos):
+        self.lotes.append(list(elementos))
+        return [elemento * 2 for elemento in elementos]
+
+
+def test_vacia_al_llenarse_sin_esperar_la_ventana():
+    registro = Registro()
+
+    async def escenario():
+        agrupador = MicroBatcher(registro, max_tamano=4, max_espera_ms=60_000)
+        return await asyncio.gather(*(agrupador.enviar(i) for i in range(8)))
+
+    resultados = asyncio.run(asyncio.wait_for(escenario(), timeout=5))
+
+    assert resultados == [i * 2 for i in range(8)]
+    assert registro.lotes == [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+
+def test_vacia_al_vencer_la_ventana():
+    registro = Registro()
+
+    async def escenario():
+        agrupador = MicroBatcher(registro, max_tamano=64, max_espera_ms=5)
+        resultados = await asyncio.gather(*(agrupador.enviar(i) for i in range(3)))
+        return resultados, agrupador.estadisticas()
+
+    resultados, estadisticas = asyncio.run(asyncio.wait_for(escenario(), timeout=5))
+
+    assert resultados == [0, 2, 4]
+    assert registro.lotes == [[0, 1, 2]]
+    assert estadisticas["lotes_procesados"] == 1
+    assert estadisticas["tamano_lote_max"] == 3
+    assert estadisticas["profundidad_cola"] == 0
+
+
+def test_usa_el_ejecutor():
+    registro = Registro()
+
+    async def escenario():
+        with ThreadPoolExecutor(max_workers=1) as ejecutor:
+            agrupador = MicroBatcher(registro, max_tamano=2, max_espera_ms=5, ejecutor=ejecutor)
+            return await asyncio.gather(agrupador.enviar(1), agrupador.enviar(2))
+
+    assert asyncio.run(escenario()) == [2, 4]
+
+
+def test_el_error_del_lote_llega_a_cada_llamada():
+    def fallar(elementos):
+        raise ValueError("lote roto")
+
+    async def escenario():
+        agrupador = MicroBatcher(fallar, max_tamano=2, max_espera_ms=5)
+        return await asyncio.gather(agrupador.enviar(1), agrupador.enviar(2), return_exceptions=True)
+
+    resultados = asyncio.run(escenario())
+
+    assert all(isinstance(r, ValueError) for r in resultados)
+
+
+def test_detenido_rechaza_elementos_nuevos():
+    async def escenario():
+        agrupador = MicroBatcher(Registro(), max_tamano=2, max_espera_ms=5)
+        agrupador.detener()
+        assert agrupador.detenido
+        await agrupador.enviar(1)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(escenario())
+
+
+@pytest.mark.parametrize("argumentos", [{"max_tamano": 0}, {"max_espera_ms": -1}])
+def test_parametros_invalidos(argumentos):
+    with pytest.raises(ValueError):
+        MicroBatcher(Registro(), **argumentos)
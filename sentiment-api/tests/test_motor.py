@@ -0,0 +1,139 @@
+# ============================================
+# TESTS - PARIDAD DEL MOTOR LINEAL CON SCIKIT-LEARN
+# ============================================
+#
+# Uso (desde sentiment-api/):
+#   python -m pytest tests/test_motor.py
+
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
+
+from app.motor import MotorLineal
+from app.normalizacion import limpiar_texto
+from app.prediccion import FRASES_VERIFICACION
+
+# Artefactos que sirve la API
+MODELOS_SERIALIZADOS = Path(__file__).parent.parent / "modelos_serializados"
+
+CORPUS = [
+    ("excelente producto llegó rápido y funciona muy bien", "Positivo"),
+    ("me encantó la calidad es muy buena lo recomiendo", "Positivo"),
+    ("buen precio buena atención volvería a comprar", "Positivo"),
+    ("todo perfecto el envío fue rápido excelente", "Positivo"),
+    ("pésimo servicio nunca llegó el pedido", "Negativo"),
+    ("mala calidad se rompió al segundo día", "Negativo"),
+    ("no lo recomiendo muy malo y caro", "Negativo"),
+    ("horrible atención devolví el producto roto", "Negativo"),
+]
+
+# Textos sin ningún token del vocabulario
+FUERA_DE_VOCABULARIO = ["zzz qqq", "xyzzy plugh", "foo bar baz", "lorem ipsum"]
+
+MIXTOS = [
+    "excelente producto muy bueno",
+    "",
+    "pésimo servicio y mala calidad",
+    "zzz qqq",
+    "   ",
+    "lo recomiendo excelente excelente excelente",
+    "producto",
+]
+
+# Hasta MotorLineal.LOTE_PEQUENO el conteo va por otro camino: se prueban ambos
+TAMANOS = (1, MotorLineal.LOTE_PEQUENO, MotorLineal.LOTE_PEQUENO + 5, 200)
+
+MODELOS = {
+    "MultinomialNB": lambda: MultinomialNB(),
+    "LogisticRegression": lambda: LogisticRegression(),
+}
+
+
+@pytest.fixture(params=list(MODELOS), scope="module")
+def ajustados(request):
+    """Vectorizador y modelo ajustados sobre CORPUS, con su motor."""
+    textos, etiquetas = zip(*CORPUS)
+    vectorizador = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True)
+    modelo = MODELOS[request.param]().fit(vectorizador.fit_transform(textos), etiquetas)
+    return vectorizador, modelo, MotorLineal.desde_sklearn(modelo, vectorizador)
+
+
+def _lote(base, tamano):
+    return [base[i % len(base)] for i in range(tamano)]
+
+
+# MultinomialNB: el motor calcula sigmoide(log-odds) y sklearn normaliza con
+# logsumexp sobre las dos clases. Son la misma función, pero con otro orden de
+# operaciones de coma flotante: difieren en unos pocos ulp (< 1e-15 medido).
+# LogisticRegression: sklearn también aplica expit a x · coef + sesgo, y el
+# resultado es idéntico bit a bit.
+TOLERANCIA_NB = 1e-14
+
+
+def _comprobar_paridad(vectorizador, modelo, motor, textos):
+    csr = vectorizador.transform(textos)
+    esperado = modelo.predict_proba(csr)
+    clases = list(modelo.classes_)
+
+    # La vectorización es la de TfidfVectorizer, bit a bit
+    matriz = motor.vectorizar_lote(textos)
+    assert np.array_equal(matriz.filas, np.repeat(np.arange(csr.shape[0]), np.diff(csr.indptr)))
+    assert np.array_equal(matriz.columnas, csr.indices)
+    assert np.array_equal(matriz.valores, csr.data)
+
+    prob_positivo, prob_negativo = motor.puntuar(matriz)
+    assert prob_positivo.dtype == np.float64
+    assert prob_positivo.shape == (len(textos),)
+    for obtenido, clase in ((prob_positivo, "Positivo"), (prob_negativo, "Negativo")):
+        if type(modelo).__name__ == "LogisticRegression":
+            assert np.array_equal(obtenido, esperado[:, clases.index(clase)])
+        else:
+            np.testing.assert_allclose(obtenido, esperado[:, clases.index(clase)], rtol=0, atol=TOLERANCIA_NB)
+
+
+@pytest.mark.parametrize("tamano", TAMANOS)
+def test_paridad_textos_mixtos(ajustados, tamano):
+    _comprobar_paridad(*ajustados, _lote(MIXTOS, tamano))
+
+
+@pytest.mark.parametrize("tamano", TAMANOS)
+def test_paridad_lote_fuera_de_vocabulario(ajustados, tamano):
+    # Todas las filas vacías: la decisión es solo el sesgo
+    _comprobar_paridad(*ajustados, _lote(FUERA_DE_VOCABULARIO, tamano))
+
+
+@pytest.mark.parametrize("tamano", TAMANOS)
+def test_paridad_filas_vacias(ajustados, tamano):
+    _comprobar_paridad(*ajustados, [""] * tamano)
+
+
+def test_paridad_corpus(ajustados):
+    _comprobar_paridad(*ajustados, [texto for texto, _ in CORPUS])
+
+
+def test_lote_vacio(ajustados):
+    _, _, motor = ajustados
+    prob_positivo, prob_negativo = motor.probabilidades([])
+    assert prob_positivo.shape == prob_negativo.shape == (0,)
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_paridad_modelo_serializado():
+    # Los .pkl que carga la API (guardados con otra versión de sklearn)
+    ruta_modelo = MODELOS_SERIALIZADOS / "sentiment_model.pkl"
+    ruta_vectorizador = MODELOS_SERIALIZADOS / "tfidf_vectorizer.pkl"
+    if not (ruta_modelo.exists() and ruta_vectorizador.exists()):
+        pytest.skip("modelos_serializados/ sin artefactos")
+
+    modelo = joblib.load(ruta_modelo)
+    vectorizador = joblib.load(ruta_vectorizador)
+    motor = MotorLineal.desde_sklearn(modelo, vectorizador)
+    textos = [limpiar_texto(t) for t in FRASES_VERIFICACION] + MIXTOS + FUERA_DE_VOCABULARIO
+
+    for tamano in TAMANOS:
+        _comprobar_paridad(vectorizador, modelo, motor, _lote(textos, tamano))
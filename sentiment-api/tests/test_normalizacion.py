@@ -0,0 +1,45 @@
+# ============================================
+# TESTS - NORMALIZACIÓN (PARIDAD CON LA LIMPIEZA ORIGINAL)
+# ============================================
+#
+# La referencia es la implementación de seis pasadas que conserva
+# benchmarks/normalizacion.py. El barrido de todos los code points se queda
+# en el benchmark; aquí solo entran los que la limpieza trata aparte.
+
+import random
+import string
+
+import pytest
+
+from app.normalizacion import limpiar_many, limpiar_texto
+from benchmarks.normalizacion import FRAGMENTOS, corpus_resenas, limpiar_texto_original
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("¡Me ENCANTÓ el hotel!!! 10/10", "¡me encantó el hotel"),
+    ("ver https://t.co/abc y www.ejemplo.com ya", "ver y ya"),
+    ("@ana #oferta hola", "hola"),
+    ("@anahttps://t.co/x fin", "fin"),
+    ("##tema bien", "bien"),
+    ("  muchos\t\n espacios  ", "muchos espacios"),
+    ("", ""),
+])
+def test_casos_conocidos(texto, esperado):
+    assert limpiar_texto(texto) == esperado == limpiar_texto_original(texto)
+
+
+def test_paridad_con_la_limpieza_original():
+    aleatorio = random.Random(0)
+    textos = corpus_resenas(500, aleatorio)
+    textos += ["".join(aleatorio.choice(FRAGMENTOS) for _ in range(aleatorio.randint(0, 30))) for _ in range(5000)]
+    # Code points que la limpieza trata de forma especial: dígitos, espacios,
+    # mayúsculas (lower() puede cambiar la longitud) y puntuación
+    especiales = [
+        c for c in map(chr, range(0x110000))
+        if not 0xD800 <= ord(c) < 0xE000
+        and (c.isdigit() or c.isspace() or c.lower() != c or c in string.punctuation)
+    ]
+    textos += [f"{c}{c} a{c}b #{c}x @x{c}" for c in especiales]
+
+    assert limpiar_many(textos) == [limpiar_texto_original(t) for t in textos]
+    assert [limpiar_texto(t) for t in textos] == [limpiar_texto_original(t) for t in textos]
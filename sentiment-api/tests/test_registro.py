@@ -0,0 +1,166 @@
+# ============================================
+# TESTS - REGISTRO DE MODELOS Y ACTIVACIÓN EN CALIENTE
+# ============================================
+
+import pytest
+
+from app import prediccion
+from conftest import esperar
+
+
+def _pool_cerrado(procesos) -> bool:
+    try:
+        procesos.puntuar(["excelente hotel"])
+    except RuntimeError:
+        return True
+    return False
+
+
+@pytest.fixture
+def registro(predictor, directorio_modelos):
+    return prediccion.RegistroModelos(str(directorio_modelos))
+
+
+@pytest.fixture
+def con_procesos(configuracion, monkeypatch):
+    """Un proceso worker de inferencia (también para el predictor que se activa)."""
+    monkeypatch.setattr(configuracion, "INFERENCIA_PROCESOS", 1)
+    monkeypatch.setattr(configuracion, "INFERENCIA_PROCESOS_BLOQUE", 2)
+
+
+def test_predictor_sin_usuarios_se_cierra_al_activar_otro(registro, predictor):
+    registro.activar("sentiment_model_lr", esperar=True)
+
+    assert prediccion.obtener_predictor() is not predictor
+    esperar(lambda: predictor.microbatcher.detenido)
+
+
+def test_predictor_retenido_sigue_abierto_hasta_liberarlo(con_procesos, registro, predictor):
+    predictor.iniciar_procesos()
+    anterior = prediccion.adquirir_predictor()
+    assert anterior is predictor
+
+    registro.activar("sentiment_model_lr", esperar=True)
+    assert prediccion.obtener_predictor() is not anterior
+
+    # Un trabajo o flujo largo sigue puntuando con el modelo anterior y su pool
+    lote = anterior.predecir_lote(["excelente hotel", "hotel sucio", "personal amable"], usar_cache=False)
+    assert list(lote['prevision']) == ["Positivo", "Negativo", "Positivo"]
+    assert not anterior.microbatcher.detenido
+
+    anterior.liberar()
+    esperar(lambda: _pool_cerrado(anterior.procesos))
+    assert anterior.microbatcher.detenido
+
+
+def test_usar_predictor_retiene_durante_el_bloque(registro, predictor):
+    with prediccion.usar_predictor() as actual:
+        registro.activar("sentiment_model_lr", esperar=True)
+        assert actual.usos == 1
+        assert actual.predecir("excelente hotel").prevision == "Positivo"
+    assert actual.usos == 0
+
+
+def test_activacion_calienta_la_cache_con_las_entradas_recientes(registro, predictor):
+    predictor.predecir("excelente hotel me encantó")
+    predictor.predecir("hotel sucio y personal grosero", threshold=0.9)
+    predictor.predecir_lote(["la habitación era muy limpia"], traducir=True, idioma_origen='auto')
+
+    registro.activar("sentiment_model_lr", esperar=True)
+    nuevo = prediccion.obtener_predictor()
+
+    assert registro.estado()["cache_calentada"] == 3
+    peticiones = [("excelente hotel me encantó", None), ("hotel sucio y personal grosero", 0.9)]
+    aciertos = nuevo.cache.estadisticas()["aciertos"]
+    calentados = [nuevo.predecir(texto, threshold=threshold) for texto, threshold in peticiones]
+    assert nuevo.cache.estadisticas()["aciertos"] == aciertos + len(peticiones)
+
+    # Lo calentado es lo que el modelo nuevo calcula desde cero
+    nuevo.cache.invalidar()
+    assert [nuevo.predecir(texto, threshold=threshold) for texto, threshold in peticiones] == calentados
+
+
+def test_calentar_cache_descarta_textos_traducidos(predictor):
+    clave = predictor._clave_cache("great hotel", True, 'auto', 0.5)
+    traducido = prediccion.ResultadoPrediccion('Positivo', 0.9, 'Muy Alta', 'en')
+    assert predictor.calentar_cache([(clave, traducido)]) == 0
+
+
+def test_activar_requiere_token_de_administracion(predictor, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import main
+
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secreto")
+    cliente = TestClient(main.app)
+
+    assert cliente.post("/models/no_existe/activate").status_code == 403
+    assert cliente.post("/models/no_existe/activate", headers={"X-Admin-Token": "otro"}).status_code == 403
+    assert cliente.post("/models/no_existe/activate", headers={"X-Admin-Token": "secreto"}).status_code == 404
+
+
+def test_listar_marca_la_version_activa(registro, predictor):
+    versiones = {v["nombre"]: v for v in registro.listar()["versiones"]}
+    assert set(versiones) == {"sentiment_model", "sentiment_model_lr"}
+    assert versiones["sentiment_model"]["activa"] and not versiones["sentiment_model_lr"]["activa"]
+
+    registro.activar("sentiment_model_lr", esperar=True)
+    listado = registro.listar()
+
+    assert registro.estado()["estado"] == "activa"
+    assert listado["version_activa"] == prediccion.obtener_predictor().version_modelo
+    assert [v["nombre"] for v in listado["versiones"] if v["activa"]] == ["sentiment_model_lr"]
+
+
+def test_activar_version_desconocida(registro):
+    with pytest.raises(KeyError):
+        registro.activar("no_existe", esperar=True)
+
+
+def test_comparar_coincide_con_cada_version(registro, predictor, directorio_modelos):
+    textos = ["excelente hotel", "hotel sucio y caro", "ok", "personal amable pero baño roto"]
+    lr = prediccion.SentimentPredictor(
+        model_path=directorio_modelos / "sentiment_model_lr.pkl",
+        vectorizer_path=directorio_modelos / "tfidf_vectorizer.pkl",
+        bundle_path=""
+    )
+    try:
+        esperadas = {
+            "sentiment_model": predictor.predecir_lote(textos, usar_cache=False),
+            "sentiment_model_lr": lr.predecir_lote(textos, usar_cache=False),
+        }
+    finally:
+        lr.cerrar()
+
+    comparacion = registro.comparar(textos)
+
+    # Mismo vectorizador: una sola vectorización para las dos versiones
+    assert comparacion["vectorizaciones"] == 1
+    assert (comparacion["total"], comparacion["errores"]) == (3, 1)
+    assert "error" in comparacion["resultados"][2]
+    assert {m["nombre"]: m["activo"] for m in comparacion["modelos"]} == {
+        "sentiment_model": True, "sentiment_model_lr": False
+    }
+    for i, resultado in enumerate(comparacion["resultados"]):
+        if "error" in resultado:
+            continue
+        for nombre, lote in esperadas.items():
+            prediccion_version = resultado["predicciones"][nombre]
+            assert prediccion_version["prevision"] == lote["prevision"][i]
+            assert prediccion_version["probabilidad"] == pytest.approx(lote["probabilidad"][i], abs=1e-4)
+        previsiones = {p["prevision"] for p in resultado["predicciones"].values()}
+        assert resultado["unanime"] == (len(previsiones) == 1)
+
+    par, = comparacion["acuerdo"]["pares"]
+    assert par["coincidencia"] == comparacion["acuerdo"]["tasa_unanimidad"]
+
+
+def test_comparar_omite_versiones_que_no_cargan(predictor, directorio_modelos, tmp_path):
+    for archivo in ("tfidf_vectorizer.pkl", "sentiment_model.pkl"):
+        (tmp_path / archivo).write_bytes((directorio_modelos / archivo).read_bytes())
+    (tmp_path / "sentiment_model_roto.pkl").write_bytes(b"no es un pickle")
+
+    comparacion = prediccion.RegistroModelos(str(tmp_path)).comparar(["excelente hotel"])
+
+    assert [m["nombre"] for m in comparacion["modelos"]] == ["sentiment_model"]
+    assert [o["nombre"] for o in comparacion["omitidos"]] == ["sentiment_model_roto"]
+    assert comparacion["acuerdo"]["pares"] == []
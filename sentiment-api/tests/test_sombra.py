@@ -0,0 +1,118 @@
+# ============================================
+# TESTS - EVALUADOR SOMBRA
+# ============================================
+
+import threading
+
+import numpy as np
+import pytest
+
+from app import prediccion, sombra
+from app.sombra import EvaluadorSombra
+from conftest import CORPUS
+
+TEXTOS = [texto for texto, _ in CORPUS] + ["excelente pero sucio", "caro y grosero", "buena ubicación"]
+
+
+class CandidatoLento:
+    """Candidato cuyo motor no puntúa hasta que se libera (o falla)."""
+
+    nombre = "lento"
+    version_modelo = "lento-1"
+
+    def __init__(self, fallar: bool = False):
+        self.motor = self
+        self.fallar = fallar
+        self.liberado = threading.Event()
+
+    def probabilidades(self, textos):
+        self.liberado.wait(10)
+        if self.fallar:
+            raise RuntimeError("candidato roto")
+        return np.full(len(textos), 0.5), np.full(len(textos), 0.5)
+
+
+@pytest.fixture
+def registro(predictor, directorio_modelos, monkeypatch):
+    monkeypatch.setattr(prediccion, "registro", prediccion.RegistroModelos(str(directorio_modelos)))
+    yield prediccion.registro
+    sombra.detener_sombra()
+
+
+def test_mismo_modelo_sin_discrepancias(registro, predictor):
+    evaluador = sombra.iniciar_sombra("sentiment_model", muestreo=1.0)
+    predictor.predecir_lote(TEXTOS, usar_cache=False)
+    predictor.predecir("excelente hotel", threshold=0.9)
+    evaluador.detener()
+
+    estadisticas = evaluador.estadisticas()
+    assert estadisticas["totales"]["muestreados"] == estadisticas["totales"]["evaluados"] == len(TEXTOS) + 1
+    assert estadisticas["totales"]["discrepancias"] == 0
+    assert estadisticas["ventana"]["delta_prob_max"] == 0
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.6])
+def test_discrepancias_con_otro_modelo(registro, predictor, directorio_modelos, threshold):
+    candidato = prediccion.SentimentPredictor(
+        model_path=directorio_modelos / "sentiment_model_lr.pkl",
+        vectorizer_path=directorio_modelos / "tfidf_vectorizer.pkl",
+        bundle_path=""
+    )
+    try:
+        esperado = candidato.predecir_lote(TEXTOS, usar_cache=False, threshold=threshold)
+    finally:
+        candidato.cerrar()
+
+    evaluador = sombra.iniciar_sombra("sentiment_model_lr", muestreo=1.0)
+    principal = predictor.predecir_lote(TEXTOS, usar_cache=False, threshold=threshold)
+    evaluador.detener()
+
+    estadisticas = evaluador.estadisticas()
+    discrepancias = int(np.sum(principal["prevision"] != esperado["prevision"]))
+    assert estadisticas["candidato"] == "sentiment_model_lr"
+    assert estadisticas["totales"]["discrepancias"] == discrepancias
+    assert estadisticas["ventana"]["tasa_discrepancia"] == round(discrepancias / len(TEXTOS), 6)
+
+
+def test_cola_llena_descarta_sin_bloquear():
+    candidato = CandidatoLento()
+    evaluador = EvaluadorSombra(candidato, muestreo=1.0, cola_max=1)
+    probabilidades = np.full(2, 0.7)
+    for _ in range(5):
+        evaluador.enviar(["a", "b"], probabilidades, 1 - probabilidades, 0.5)
+
+    candidato.liberado.set()
+    evaluador.detener()
+    totales = evaluador.estadisticas()["totales"]
+
+    assert totales["muestreados"] == 10
+    assert totales["descartados"] > 0
+    assert totales["evaluados"] + totales["descartados"] == 10
+
+
+def test_errores_del_candidato_no_detienen_el_hilo():
+    candidato = CandidatoLento(fallar=True)
+    candidato.liberado.set()
+    evaluador = EvaluadorSombra(candidato, muestreo=1.0)
+    evaluador.enviar(["a", "b"], np.full(2, 0.7), np.full(2, 0.3), 0.5)
+    evaluador.enviar(["c"], np.full(1, 0.7), np.full(1, 0.3), 0.5)
+    evaluador.detener()
+
+    totales = evaluador.estadisticas()["totales"]
+    assert (totales["errores"], totales["evaluados"]) == (3, 0)
+
+
+def test_iniciar_sombra_sustituye_al_anterior(registro):
+    with pytest.raises(KeyError):
+        sombra.iniciar_sombra("no_existe")
+    with pytest.raises(ValueError):
+        EvaluadorSombra(CandidatoLento(), muestreo=0)
+
+    primero = sombra.iniciar_sombra("sentiment_model", muestreo=0.5)
+    segundo = sombra.iniciar_sombra("sentiment_model_lr", muestreo=0.5)
+
+    assert sombra.obtener_evaluador() is segundo
+    assert not primero._hilo.is_alive()
+    assert sombra.detener_sombra()
+    assert sombra.obtener_evaluador() is None
+    assert not sombra.detener_sombra()
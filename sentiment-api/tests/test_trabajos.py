@@ -0,0 +1,119 @@
+# ============================================
+# TESTS - TRABAJOS MASIVOS
+# ============================================
+
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app.trabajos import COMPLETADO, ERROR, PROCESANDO, ArchivoDemasiadoGrande, GestorTrabajos
+from conftest import CORPUS, esperar
+
+
+@pytest.fixture
+def gestor(predictor, tmp_path):
+    gestor = GestorTrabajos(str(tmp_path / "trabajos"), tamano_bloque=3)
+    yield gestor
+    gestor.cerrar()
+
+
+def _terminado(gestor, id_trabajo):
+    esperar(lambda: gestor.obtener(id_trabajo)["estado"] in (COMPLETADO, ERROR))
+    return gestor.obtener(id_trabajo)
+
+
+def test_csv_de_principio_a_fin(gestor, predictor):
+    textos = [texto for texto, _ in CORPUS] + ["ok"]
+    entrada = io.StringIO()
+    escritor = csv.writer(entrada)
+    escritor.writerow(["codigo", "resena"])
+    escritor.writerows([f"r{i}", texto] for i, texto in enumerate(textos))
+
+    creado = gestor.crear("reseñas.csv", io.BytesIO(entrada.getvalue().encode()), columna_id="codigo")
+    assert creado["columna"] == "resena"
+
+    trabajo = _terminado(gestor, creado["id"])
+    assert trabajo["estado"] == COMPLETADO
+    assert trabajo["progreso_porcentaje"] == 100
+    assert trabajo["version_modelo"] == predictor.version_modelo
+
+    with open(gestor.ruta_resultado(creado["id"]), newline="", encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    esperadas = predictor.predecir_lote(textos, idioma_origen='es', usar_cache=False)
+    assert [f["id"] for f in filas] == [f"r{i}" for i in range(len(textos))]
+    assert [f["prevision"] or None for f in filas[:-1]] == list(esperadas["prevision"][:-1])
+    assert filas[-1]["error"]
+    assert (trabajo["filas"], trabajo["errores"]) == (len(textos), 1)
+    assert trabajo["positivos"] == list(esperadas["prevision"][:-1]).count("Positivo")
+    # El predictor se libera al terminar y la entrada se borra
+    assert predictor.usos == 0
+    assert not list((gestor.directorio / creado["id"]).glob("entrada.*"))
+
+
+def test_jsonl(gestor):
+    cuerpo = "\n".join(json.dumps({"text": texto}) for texto, _ in CORPUS[:2]).encode()
+    creado = gestor.crear("reseñas.jsonl", io.BytesIO(cuerpo))
+
+    assert _terminado(gestor, creado["id"])["estado"] == COMPLETADO
+    with open(gestor.ruta_resultado(creado["id"]), encoding="utf-8") as f:
+        assert [json.loads(linea)["prevision"] for linea in f] == ["Positivo", "Positivo"]
+
+
+def test_crear_rechaza_entradas_invalidas(gestor):
+    with pytest.raises(ValueError):
+        gestor.crear("reseñas.csv", io.BytesIO(b"a,b\n1,2\n"))
+    with pytest.raises(ValueError):
+        gestor.crear("reseñas.xlsx", io.BytesIO(b"texto\nhola\n"))
+
+    gestor.max_bytes = 10
+    with pytest.raises(ArchivoDemasiadoGrande):
+        gestor.crear("reseñas.csv", io.BytesIO(b"texto\nexcelente hotel\n"))
+
+    # Sin trabajos ni carpetas a medio crear
+    assert gestor.listar() == []
+    assert [p.name for p in gestor.directorio.iterdir() if p.is_dir()] == []
+
+
+def test_ruta_resultado_solo_de_trabajos_completados(gestor):
+    assert gestor.obtener("no_existe") is None
+    assert gestor.ruta_resultado("no_existe") is None
+
+
+def test_recupera_trabajos_interrumpidos(predictor, tmp_path):
+    directorio = tmp_path / "trabajos"
+    gestor = GestorTrabajos(str(directorio))
+    muerto = subprocess.Popen([sys.executable, "-c", "pass"])
+    muerto.wait()
+    for id_trabajo, pid in (("huerfano", muerto.pid), ("en_curso", os.getpid())):
+        gestor._conexion().execute(
+            "INSERT INTO trabajos (id, estado, archivo, formato, idioma, bytes, pid, creado) "
+            "VALUES (?, ?, 'a.csv', 'csv', 'es', 0, ?, ?)",
+            (id_trabajo, PROCESANDO, pid, time.time())
+        )
+    gestor.cerrar()
+
+    # El siguiente gestor que arranca marca los del proceso que ya no existe
+    nuevo = GestorTrabajos(str(directorio))
+    try:
+        huerfano = nuevo.obtener("huerfano")
+        assert huerfano["estado"] == ERROR
+        assert "Interrumpido" in huerfano["error"]
+        assert nuevo.obtener("en_curso")["estado"] == PROCESANDO
+    finally:
+        nuevo.cerrar()
+
+
+def test_limpiar_antiguos(gestor):
+    creado = gestor.crear("reseñas.csv", io.BytesIO(b"texto\nexcelente hotel\n"))
+    _terminado(gestor, creado["id"])
+
+    gestor.retencion_horas = 0
+    assert gestor.limpiar_antiguos() == 1
+    assert gestor.obtener(creado["id"]) is None
+    assert not (gestor.directorio / creado["id"]).exists()
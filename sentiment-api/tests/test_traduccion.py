@@ -0,0 +1,79 @@
+# ============================================
+# TESTS - CLIENTE DE TRADUCCIÓN
+# ============================================
+
+import threading
+import time
+
+from app.traduccion import BackendTraduccion, ClienteTraduccion, ErrorTraduccion
+
+
+class BackendSinLineas(BackendTraduccion):
+    """
+    Backend cuya petición masiva nunca conserva las líneas (el cliente cae
+    en la traducción uno a uno) y cuya traducción individual tarda 'latencia'.
+    """
+
+    nombre = "sin_lineas"
+
+    def __init__(self, latencia: float, fallar: frozenset = frozenset()):
+        self.latencia = latencia
+        self.fallar = fallar
+        self.simultaneas = 0
+        self.max_simultaneas = 0
+        self._lock = threading.Lock()
+
+    def traducir(self, texto, origen, destino, timeout):
+        with self._lock:
+            self.simultaneas += 1
+            self.max_simultaneas = max(self.max_simultaneas, self.simultaneas)
+        try:
+            time.sleep(min(self.latencia, timeout))
+            if self.latencia > timeout:
+                raise ErrorTraduccion("timeout")
+            if texto in self.fallar:
+                raise ErrorTraduccion("no traducible")
+            return texto.upper()
+        finally:
+            with self._lock:
+                self.simultaneas -= 1
+
+    def peticiones(self, textos):
+        return [textos]
+
+    def traducir_lote(self, textos, origen, destino, timeout):
+        return [None] * len(textos)
+
+
+TEXTOS = [f"reseña {i}" for i in range(8)]
+
+
+def test_textos_faltantes_en_paralelo():
+    backend = BackendSinLineas(latencia=0.2, fallar=frozenset({"reseña 3"}))
+    cliente = ClienteTraduccion(backend, max_concurrencia=4, timeout_segundos=2.0, max_reintentos=1)
+    try:
+        inicio = time.monotonic()
+        traducciones = cliente.traducir_lote(TEXTOS, "en")
+        duracion = time.monotonic() - inicio
+    finally:
+        cliente.cerrar()
+
+    assert traducciones == [None if t == "reseña 3" else t.upper() for t in TEXTOS]
+    # 8 textos de 0.2 s con 4 a la vez: dos tandas, no ocho
+    assert duracion < 1.0
+    assert backend.max_simultaneas == 4
+
+
+def test_textos_faltantes_con_un_solo_deadline():
+    backend = BackendSinLineas(latencia=5.0)
+    cliente = ClienteTraduccion(backend, max_concurrencia=2, timeout_segundos=0.3, max_reintentos=3)
+    try:
+        inicio = time.monotonic()
+        traducciones = cliente.traducir_lote(TEXTOS, "en")
+        duracion = time.monotonic() - inicio
+    finally:
+        cliente.cerrar()
+
+    assert traducciones == [None] * len(TEXTOS)
+    # Un deadline para todo el grupo, no uno por texto (8 x 0.3 s)
+    assert duracion < 1.0
@@ -0,0 +1,83 @@
+# ============================================
+# TESTS - VOCABULARIO COMPACTO
+# ============================================
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+from app import config, vocabulario
+from app.artefactos import cargar_bundle, exportar_bundle
+from app.motor import MotorLineal
+from app.vocabulario import VocabularioCompacto
+from conftest import CORPUS
+
+TERMINOS = {
+    "hotel": 4, "hotel limpio": 7, "limpio": 0, "ñandú": 2, "habitación": 5,
+    "a": 1, "ab": 3, "abc": 6, "😍": 8, "muy buena": 9,
+}
+
+# Ausentes: prefijos, extensiones y variantes de términos existentes
+AUSENTES = ["", "hote", "hotels", "hotel limpi", "abcd", "b", "ñandu", "habitacion", "😡", "muy  buena"]
+
+
+@pytest.fixture(params=["memoria", "archivos"])
+def compacto(request, tmp_path):
+    if request.param == "memoria":
+        return VocabularioCompacto.desde_diccionario(TERMINOS)
+    datos, offsets, columnas = vocabulario.empaquetar(TERMINOS)
+    (tmp_path / "vocab_terminos.bin").write_bytes(datos)
+    np.save(tmp_path / "vocab_offsets.npy", offsets)
+    np.save(tmp_path / "vocab_columnas.npy", columnas)
+    return VocabularioCompacto.cargar(tmp_path)
+
+
+def test_equivale_al_diccionario(compacto):
+    tokens = list(TERMINOS) + AUSENTES + list(TERMINOS)
+
+    assert compacto.buscar_muchos(tokens).tolist() == [TERMINOS.get(t, -1) for t in tokens]
+    assert dict(compacto) == TERMINOS
+    assert len(compacto) == len(TERMINOS)
+    assert compacto["hotel limpio"] == 7
+    assert "hotels" not in compacto
+    with pytest.raises(KeyError):
+        compacto["hotels"]
+
+
+def test_termino_por_columna(compacto):
+    nombres = compacto.nombres_features()
+
+    assert [nombres[c] for c in range(len(nombres))] == sorted(TERMINOS, key=TERMINOS.get)
+
+
+def test_colisiones_de_hash(monkeypatch):
+    # Todos los términos de la misma longitud colisionan: se resuelven por bisección
+    monkeypatch.setattr(vocabulario, "hash", len, raising=False)
+    compacto = VocabularioCompacto.desde_diccionario(TERMINOS)
+    tokens = list(TERMINOS) + AUSENTES
+
+    assert compacto.buscar_muchos(tokens).tolist() == [TERMINOS.get(t, -1) for t in tokens]
+
+
+def test_vocabulario_vacio():
+    compacto = VocabularioCompacto.desde_diccionario({})
+
+    assert compacto.buscar_muchos(["hotel"]).tolist() == [-1]
+    assert len(compacto) == 0
+
+
+def test_bundle_compacto_da_las_mismas_probabilidades(monkeypatch, tmp_path):
+    textos, etiquetas = zip(*CORPUS)
+    vectorizador = TfidfVectorizer(ngram_range=(1, 2)).fit(textos)
+    modelo = MultinomialNB().fit(vectorizador.transform(textos), etiquetas)
+    ruta = exportar_bundle(modelo, vectorizador, tmp_path / "bundle")
+    pruebas = list(textos) + ["hotel desconocido zzz", "excelente excelente personal"]
+
+    monkeypatch.setattr(config, "VOCABULARIO_COMPACTO", True)
+    motor_compacto = cargar_bundle(ruta).motor
+    assert isinstance(motor_compacto.vocabulario, VocabularioCompacto)
+
+    motor_dict = MotorLineal.desde_sklearn(modelo, vectorizador)
+    for compacto, referencia in zip(motor_compacto.probabilidades(pruebas), motor_dict.probabilidades(pruebas)):
+        assert np.array_equal(compacto, referencia)